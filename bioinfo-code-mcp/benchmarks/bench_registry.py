@@ -0,0 +1,102 @@
+"""Benchmark: Registry search latency with a large generated catalog.
+
+Adds synthetic operations (shaped like ones generated from OpenAPI specs)
+to the built-in registry and reports registration throughput and
+per-query search latency percentiles.
+
+Usage:
+    python benchmarks/bench_registry.py              # 10,000 operations
+    python benchmarks/bench_registry.py --ops 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bioinfo_code_mcp.registry import Operation, OperationParam, Registry
+
+SERVICES = ["ncbi", "uniprot", "pdb", "ensembl", "kegg", "reactome", "chembl", "gtex",
+            "clinvar", "gnomad", "string", "interpro", "pfam", "rfam", "biogrid", "omim"]
+ACTIONS = ["get", "list", "search", "fetch", "lookup", "map", "annotate", "export",
+           "summarize", "count", "compare", "align"]
+RESOURCES = ["gene", "transcript", "protein", "variant", "structure", "pathway",
+             "compound", "assay", "tissue", "expression", "domain", "family",
+             "interaction", "publication", "taxonomy", "ortholog", "sequence", "feature"]
+QUALIFIERS = ["by_id", "by_symbol", "by_region", "by_accession", "batch", "summary",
+              "details", "history", "xrefs", "evidence"]
+
+QUERIES = [
+    ("gene lookup", {}),
+    ("protein structure", {}),
+    ("variant annotate clinical", {}),
+    ("pathway", {"module": "reactome"}),
+    ("fetch sequence", {"tags": ["batch"]}),
+    ("orth", {}),
+    ("", {"module": "gtex"}),
+    ("zzz nothing", {}),
+]
+
+
+def synthetic_operations(count: int, seed: int) -> list[Operation]:
+    rng = random.Random(seed)
+    ops = []
+    for i in range(count):
+        service = rng.choice(SERVICES)
+        action, resource = rng.choice(ACTIONS), rng.choice(RESOURCES)
+        qualifier = rng.choice(QUALIFIERS)
+        method = f"{action}_{resource}_{qualifier}_{i}"
+        ops.append(Operation(
+            name=f"{service}.{method}",
+            module=service,
+            method=f"{service}.{method}(id)",
+            description=(
+                f"{action.title()} {resource} records {qualifier.replace('_', ' ')} from {service}"
+            ),
+            tags=[service, resource, action, qualifier.split("_")[-1]],
+            params=[
+                OperationParam("id", "str", f"{resource} identifier"),
+                OperationParam("limit", "int", "Maximum results", required=False, default="100"),
+            ],
+            returns=f"List of {resource} dicts",
+        ))
+    return ops
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=10_000, help="synthetic operations to add")
+    parser.add_argument("--repeat", type=int, default=200, help="timed runs per query")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    registry = Registry()
+    ops = synthetic_operations(args.ops, args.seed)
+    start = time.perf_counter()
+    registry.register_many(ops)
+    elapsed = time.perf_counter() - start
+    print(f"Registered {len(ops):,} operations in {elapsed * 1000:.0f} ms "
+          f"({len(registry):,} total, {elapsed / len(ops) * 1e6:.1f} µs/op)\n")
+
+    print(f"{'query':<28} {'filter':<22} {'hits':>4} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for query, filters in QUERIES:
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            results = registry.search(query, **filters)
+            times.append((time.perf_counter() - t0) * 1000)
+        times.sort()
+        p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+        label = ", ".join(f"{k}={v}" for k, v in filters.items()) or "-"
+        print(f"{query or '(none)':<28} {label:<22} {len(results):>4} "
+              f"{statistics.median(times):>9.3f} {p99:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
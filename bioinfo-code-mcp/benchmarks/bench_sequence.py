@@ -0,0 +1,84 @@
+"""Benchmark: pure-Python vs vectorized sequence utilities.
+
+Times ``gc_content``, ``translate``, ``find_orfs`` and ``restriction_sites``
+from ``utils/sequence.py`` (forced onto their pure-Python paths) against
+the NumPy implementations in ``utils/fastseq.py`` on a random sequence,
+checking that both return identical results.
+
+Usage:
+    python benchmarks/bench_sequence.py                  # 1 Mb
+    python benchmarks/bench_sequence.py --size 50000000  # chromosome-scale
+    python benchmarks/bench_sequence.py --size 250000000 --fast-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bioinfo_code_mcp.utils import fastseq, sequence
+
+
+def random_dna(size: int, seed: int) -> str:
+    rng = np.random.default_rng(seed)
+    return np.frombuffer(b"ACGT", dtype=np.uint8)[rng.integers(0, 4, size)].tobytes().decode()
+
+
+def timed(fn: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000, help="sequence length in bp")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--fast-only", action="store_true", help="skip the pure-Python baseline"
+    )
+    args = parser.parse_args()
+
+    dna = random_dna(args.size, args.seed)
+    sequence.VECTORIZE_THRESHOLD = sys.maxsize  # baseline = original loops
+
+    cases: list[tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+        ("gc_content", lambda: sequence.gc_content(dna), lambda: fastseq.gc_content(dna)),
+        ("translate", lambda: sequence.translate(dna), lambda: fastseq.translate(dna)),
+        ("find_orfs", lambda: sequence.find_orfs(dna), lambda: fastseq.find_orfs(dna)),
+        (
+            "restriction_sites",
+            lambda: sequence.restriction_sites(dna),
+            lambda: fastseq.restriction_sites(dna),
+        ),
+        ("six_frame_orfs", lambda: None, lambda: fastseq.six_frame_orfs(dna)),
+    ]
+
+    print(f"Sequence length: {args.size:,} bp\n")
+    print(f"{'function':<20} {'python (s)':>11} {'numpy (s)':>11} {'speedup':>9}  match")
+    for name, baseline, fast in cases:
+        fast_time, fast_result = timed(fast)
+        if args.fast_only or name == "six_frame_orfs":
+            print(f"{name:<20} {'-':>11} {fast_time:>11.3f} {'-':>9}  -")
+            continue
+        base_time, base_result = timed(baseline)
+        if isinstance(base_result, float):
+            match = abs(base_result - fast_result) < 1e-12
+        else:
+            match = base_result == fast_result
+        print(
+            f"{name:<20} {base_time:>11.3f} {fast_time:>11.3f} "
+            f"{base_time / fast_time:>8.1f}x  {'yes' if match else 'NO'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,7 @@ from fastapi.templating import Jinja2Templates
 from bioinfo_code_mcp.config import ServerConfig
 from bioinfo_code_mcp.registry import Registry
 from bioinfo_code_mcp.sandbox import Sandbox
+from bioinfo_code_mcp.workers import WorkerPool
 
 # ---------------------------------------------------------------------------
 # App setup
@@ -51,6 +52,8 @@ templates = Jinja2Templates(directory=PLAYGROUND_DIR / "templates")
 _sessions: dict[str, Sandbox] = {}
 _config = ServerConfig()
 _registry = Registry()
+# With SANDBOX_WORKERS set, sessions run in isolated worker processes
+_pool = WorkerPool(_config) if _config.sandbox_workers > 0 else None
 
 
 def _get_sandbox(session_id: str) -> Sandbox:
@@ -961,11 +964,13 @@ async def execute_code(request: Request):
     code = body.get("code", "")
     reset = body.get("reset_state", False)
 
-    sandbox = _get_sandbox(session_id)
-    if reset:
-        sandbox.reset_state()
-
-    result = await sandbox.execute(code)
+    if _pool is not None:
+        result = await _pool.execute(session_id, code, reset_state=bool(reset))
+    else:
+        sandbox = _get_sandbox(session_id)
+        if reset:
+            sandbox.reset_state()
+        result = await sandbox.execute(code)
     return JSONResponse({
         "success": result.success,
         "result": result.to_text(),
@@ -977,8 +982,10 @@ async def execute_code(request: Request):
 async def reset_state(request: Request):
     body = await request.json()
     session_id = body.get("session_id", "default")
-    sandbox = _get_sandbox(session_id)
-    sandbox.reset_state()
+    if _pool is not None:
+        _pool.reset_state(session_id)
+    else:
+        _get_sandbox(session_id).reset_state()
     return JSONResponse({"success": True, "message": "State cleared"})
 
 
@@ -0,0 +1,128 @@
+"""Request coalescing for single-ID lookups.
+
+Agent code frequently fans out single-ID calls, e.g.::
+
+    entries = await asyncio.gather(*(uniprot.fetch_entry(a) for a in accs))
+
+``RequestBatcher`` collects such concurrent calls for a short window and
+issues one multi-ID request per group, then fans the results back out to
+each awaiting caller. A window that collects only one ID falls back to the
+ordinary single-ID request, so sequential code (and the response cache)
+behaves exactly as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+FetchOne = Callable[[Hashable, str], Awaitable[Any]]
+FetchMany = Callable[[Hashable, list[str]], Awaitable[dict[str, Any]]]
+
+
+class RequestBatcher:
+    """Coalesce concurrent single-key loads into batched requests.
+
+    Args:
+        fetch_one: ``(group, key) -> result`` for a single key.
+        fetch_many: ``(group, keys) -> {key: result}`` for several keys.
+            Keys missing from the returned dict, or every key if the batch
+            request raises, are retried with ``fetch_one`` so each caller
+            sees the same result (or error) it would have without batching.
+        window: Seconds to wait for more keys before dispatching.
+        max_batch: Dispatch immediately once this many distinct keys are
+            pending in a group.
+    """
+
+    def __init__(
+        self,
+        fetch_one: FetchOne,
+        fetch_many: FetchMany,
+        *,
+        window: float = 0.01,
+        max_batch: int = 200,
+    ):
+        self._fetch_one = fetch_one
+        self._fetch_many = fetch_many
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[Hashable, dict[str, list[asyncio.Future[Any]]]] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.stats: dict[str, int] = {"calls": 0, "batches": 0, "batched_keys": 0}
+
+    async def load(self, group: Hashable, key: str) -> Any:
+        """Queue ``key`` in ``group`` and wait for its result."""
+        self.stats["calls"] += 1
+        if self.window <= 0:
+            return await self._fetch_one(group, key)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        pending = self._pending.setdefault(group, {})
+        pending.setdefault(key, []).append(future)
+
+        if len(pending) >= self.max_batch:
+            self._flush(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.window, self._flush, group)
+        return await future
+
+    def _flush(self, group: Hashable) -> None:
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(group, None)
+        if pending:
+            task = asyncio.ensure_future(self._dispatch(group, pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(
+        self, group: Hashable, pending: dict[str, list[asyncio.Future[Any]]]
+    ) -> None:
+        keys = list(pending)
+        if len(keys) == 1:
+            try:
+                results = {keys[0]: await self._fetch_one(group, keys[0])}
+            except Exception as exc:
+                _settle(pending[keys[0]], exc=exc)
+                return
+        else:
+            self.stats["batches"] += 1
+            self.stats["batched_keys"] += len(keys)
+            try:
+                results = await self._fetch_many(group, keys)
+            except Exception:
+                # One bad ID can fail the whole request; load each key alone
+                # so only the callers whose key is at fault see an error
+                results = {}
+
+        missing = [key for key in keys if key not in results]
+        if missing:
+            outcomes = await asyncio.gather(
+                *(self._fetch_one(group, key) for key in missing), return_exceptions=True
+            )
+            for key, outcome in zip(missing, outcomes, strict=True):
+                if isinstance(outcome, BaseException):
+                    _settle(pending.pop(key), exc=outcome)
+                else:
+                    results[key] = outcome
+
+        for key, futures in pending.items():
+            _settle(futures, result=results[key])
+
+
+def _settle(
+    futures: list[asyncio.Future[Any]],
+    result: Any = None,
+    exc: BaseException | None = None,
+) -> None:
+    for future in futures:
+        if future.done():
+            continue
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
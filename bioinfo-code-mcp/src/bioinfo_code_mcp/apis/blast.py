@@ -14,6 +14,8 @@ from typing import Any
 
 import httpx
 
+from .transport import SharedTransport, get_shared_transport
+
 
 class BLASTClient:
     """Async client for the NCBI BLAST API.
@@ -25,13 +27,27 @@ class BLASTClient:
 
     BASE_URL = "https://blast.ncbi.nlm.nih.gov/blast/Blast.cgi"
 
-    def __init__(self, timeout: int = 30, poll_interval: int = 15, max_polls: int = 40):
+    def __init__(
+        self,
+        timeout: int = 30,
+        poll_interval: int = 15,
+        max_polls: int = 40,
+        http: SharedTransport | None = None,
+    ):
         self._timeout = timeout
+        self._http = http or get_shared_transport()
         self._poll_interval = poll_interval
         self._max_polls = max_polls
 
-    def _client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(timeout=self._timeout)
+    async def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        resp = await self._http.get(url, timeout=self._timeout, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    async def _post(self, url: str, **kwargs: Any) -> httpx.Response:
+        resp = await self._http.post(url, timeout=self._timeout, **kwargs)
+        resp.raise_for_status()
+        return resp
 
     async def submit(
         self,
@@ -71,9 +87,7 @@ class BLASTClient:
         if extra_params:
             params.update(extra_params)
 
-        async with self._client() as client:
-            resp = await client.post(self.BASE_URL, data=params)
-            resp.raise_for_status()
+        resp = await self._post(self.BASE_URL, data=params)
 
         # Parse RID from response
         rid_match = re.search(r"RID = (\S+)", resp.text)
@@ -91,9 +105,7 @@ class BLASTClient:
             Status string: "WAITING", "READY", "FAILED", or "UNKNOWN".
         """
         params = {"CMD": "Get", "RID": rid, "FORMAT_TYPE": "XML"}
-        async with self._client() as client:
-            resp = await client.get(self.BASE_URL, params=params)
-            resp.raise_for_status()
+        resp = await self._get(self.BASE_URL, params=params)
 
         if "Status=WAITING" in resp.text:
             return "WAITING"
@@ -123,9 +135,7 @@ class BLASTClient:
             "RID": rid,
             "FORMAT_TYPE": format_type,
         }
-        async with self._client() as client:
-            resp = await client.get(self.BASE_URL, params=params)
-            resp.raise_for_status()
+        resp = await self._get(self.BASE_URL, params=params)
 
         if format_type in ("JSON2", "JSON2_S"):
             return resp.json()
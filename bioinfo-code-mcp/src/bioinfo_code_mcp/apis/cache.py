@@ -0,0 +1,283 @@
+"""Persistent on-disk response cache for the bioinformatics API clients.
+
+Sits inside ``SharedTransport`` in front of every ``apis/*`` client and
+stores successful GET responses in a single SQLite file, so repeated
+UniProt entries, PDB summaries, Ensembl lookups and Entrez esummaries are
+served locally across sessions.
+
+- Content-addressed: entries are keyed by a SHA-256 of the canonical
+  request (method, URL with sorted params, content-negotiation headers).
+  Credentials (``api_key``, ``email``) are excluded from the key.
+- Per-endpoint TTLs: only endpoints listed in ``DEFAULT_TTL_RULES`` are
+  cached; BLAST job polling and other volatile calls never are.
+- Conditional revalidation: stale entries carrying an ETag or
+  Last-Modified are revalidated with If-None-Match / If-Modified-Since.
+- Size-bounded LRU eviction by last access time.
+- Offline mode serves only cached data (stale entries included) and
+  raises ``OfflineCacheMissError`` for anything else.
+
+Methods are synchronous and thread-safe (one connection behind a lock);
+``SharedTransport`` calls them through ``asyncio.to_thread``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from ..config import ServerConfig
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# (host, path regex, TTL seconds) — first match wins
+DEFAULT_TTL_RULES: list[tuple[str, str, int]] = [
+    ("rest.uniprot.org", r"^/[a-z]+/search", DAY),
+    ("rest.uniprot.org", r"^/", 7 * DAY),
+    ("data.rcsb.org", r"^/", 7 * DAY),
+    ("rest.ensembl.org", r"^/vep/", DAY),
+    ("rest.ensembl.org", r"^/(lookup|sequence|xrefs|variation)/", 7 * DAY),
+    ("eutils.ncbi.nlm.nih.gov", r"/esearch\.fcgi$", HOUR),
+    ("eutils.ncbi.nlm.nih.gov", r"/(esummary|efetch|einfo|elink)\.fcgi$", DAY),
+]
+
+# Query params that identify the caller rather than the resource
+_UNKEYED_PARAMS = frozenset({"api_key", "email", "tool"})
+
+# Request headers that select a representation and so belong in the key
+_KEYED_HEADERS = ("accept", "content-type")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+class OfflineCacheMissError(RuntimeError):
+    """Raised in offline mode when a request has no cached response."""
+
+
+@dataclass
+class CacheEntry:
+    """A cached response row."""
+
+    key: str
+    status: int
+    content_type: str | None
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        headers = {"X-Cache": "HIT"}
+        if self.content_type:
+            headers["Content-Type"] = self.content_type
+        return httpx.Response(
+            self.status, headers=headers, content=self.body, request=request
+        )
+
+
+class ResponseCache:
+    """SQLite-backed, size-bounded LRU cache of API responses.
+
+    Args:
+        path: SQLite database file (created, with parents, on first use).
+        max_bytes: Total body size above which least-recently-used
+            entries are evicted.
+        offline: Serve only cached data; never touch the network.
+        ttl_rules: Override ``DEFAULT_TTL_RULES``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        offline: bool = False,
+        ttl_rules: list[tuple[str, str, int]] | None = None,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._rules = [
+            (host, re.compile(pattern), ttl)
+            for host, pattern, ttl in (DEFAULT_TTL_RULES if ttl_rules is None else ttl_rules)
+        ]
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self.stats: dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stores": 0,
+            "evictions": 0,
+            "offline_misses": 0,
+        }
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> ResponseCache:
+        return cls(
+            config.cache_path,
+            max_bytes=config.cache_max_mb * 1024 * 1024,
+            offline=config.offline,
+        )
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # Keys and TTLs
+    # ------------------------------------------------------------------
+
+    def ttl_for(self, request: httpx.Request) -> int | None:
+        """Return the TTL for a request, or None if it should not be cached."""
+        if request.method != "GET":
+            return None
+        host, path = request.url.host, request.url.path
+        for rule_host, pattern, ttl in self._rules:
+            if rule_host == host and pattern.search(path):
+                return ttl
+        return None
+
+    @staticmethod
+    def key_for(request: httpx.Request) -> str:
+        """Content-address a request: SHA-256 of its canonical form."""
+        params = sorted(
+            (k, v) for k, v in request.url.params.multi_items() if k not in _UNKEYED_PARAMS
+        )
+        canonical = {
+            "method": request.method,
+            "url": f"{request.url.scheme}://{request.url.host}{request.url.path}",
+            "params": params,
+            "headers": [request.headers.get(h, "") for h in _KEYED_HEADERS],
+        }
+        blob = json.dumps(canonical, separators=(",", ":")).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Read / write
+    # ------------------------------------------------------------------
+
+    def lookup(self, request: httpx.Request) -> CacheEntry | None:
+        """Fetch the entry for a request, touching its LRU timestamp."""
+        key = self.key_for(request)
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT status, content_type, body, etag, last_modified, expires_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+        return CacheEntry(key, *row)
+
+    def store(self, request: httpx.Request, response: httpx.Response, ttl: int) -> None:
+        """Store a successful response and evict LRU entries if over budget."""
+        body = response.content
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.key_for(request),
+                    str(request.url.copy_remove_param("api_key")),
+                    response.status_code,
+                    response.headers.get("Content-Type"),
+                    body,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    now,
+                    now + ttl,
+                    now,
+                    len(body),
+                ),
+            )
+            self.stats["stores"] += 1
+            self._evict(db)
+            db.commit()
+
+    def refresh(self, entry: CacheEntry, ttl: int) -> None:
+        """Extend a revalidated (304 Not Modified) entry's lifetime."""
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "UPDATE responses SET expires_at = ? WHERE key = ?", (time.time() + ttl, entry.key)
+            )
+            db.commit()
+            self.stats["revalidated"] += 1
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims: list[tuple[str]] = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.stats["evictions"] += len(victims)
+
+    def clear(self) -> None:
+        """Delete every cached response."""
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM responses")
+            db.commit()
+
+    def summary(self) -> dict[str, Any]:
+        """Hit/miss counters plus current entry count and size."""
+        entries, size = 0, 0
+        if self._conn is not None or self.path.exists():
+            with self._lock:
+                entries, size = self._db().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "offline": self.offline,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
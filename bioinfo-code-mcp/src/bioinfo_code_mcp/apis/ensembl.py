@@ -12,20 +12,29 @@ from typing import Any
 
 import httpx
 
+from .transport import SharedTransport, get_shared_transport
+
 
 class EnsemblClient:
     """Async client for the Ensembl REST API."""
 
     BASE_URL = "https://rest.ensembl.org"
 
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, http: SharedTransport | None = None):
         self._timeout = timeout
+        self._http = http or get_shared_transport()
 
-    def _client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(
+    async def _get(
+        self, url: str, headers: dict[str, str] | None = None, **kwargs: Any
+    ) -> httpx.Response:
+        resp = await self._http.get(
+            url,
             timeout=self._timeout,
-            headers={"Content-Type": "application/json"},
+            headers={"Content-Type": "application/json", **(headers or {})},
+            **kwargs,
         )
+        resp.raise_for_status()
+        return resp
 
     # ------------------------------------------------------------------
     # Lookup endpoints
@@ -46,13 +55,11 @@ class EnsemblClient:
         params: dict[str, str] = {}
         if expand:
             params["expand"] = "1"
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/lookup/id/{ensembl_id}",
-                params=params,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(
+            f"{self.BASE_URL}/lookup/id/{ensembl_id}",
+            params=params,
+        )
+        return resp.json()
 
     async def lookup_symbol(
         self, species: str, symbol: str, expand: bool = True
@@ -70,13 +77,11 @@ class EnsemblClient:
         params: dict[str, str] = {}
         if expand:
             params["expand"] = "1"
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/lookup/symbol/{species}/{symbol}",
-                params=params,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(
+            f"{self.BASE_URL}/lookup/symbol/{species}/{symbol}",
+            params=params,
+        )
+        return resp.json()
 
     # ------------------------------------------------------------------
     # Sequence endpoints
@@ -103,16 +108,14 @@ class EnsemblClient:
         if format_ == "fasta":
             headers["Content-Type"] = "text/x-fasta"
 
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/sequence/id/{ensembl_id}",
-                params=params,
-                headers=headers,
-            )
-            resp.raise_for_status()
-            if format_ == "fasta":
-                return resp.text
-            return resp.json()
+        resp = await self._get(
+            f"{self.BASE_URL}/sequence/id/{ensembl_id}",
+            params=params,
+            headers=headers,
+        )
+        if format_ == "fasta":
+            return resp.text
+        return resp.json()
 
     async def get_sequence_region(
         self,
@@ -128,12 +131,10 @@ class EnsemblClient:
         Returns:
             Dict with sequence and metadata.
         """
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/sequence/region/{species}/{region}",
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(
+            f"{self.BASE_URL}/sequence/region/{species}/{region}",
+        )
+        return resp.json()
 
     # ------------------------------------------------------------------
     # Variation endpoints
@@ -149,12 +150,10 @@ class EnsemblClient:
         Returns:
             Dict with variant details (alleles, MAF, consequences, etc.).
         """
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/variation/{species}/{variant_id}",
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(
+            f"{self.BASE_URL}/variation/{species}/{variant_id}",
+        )
+        return resp.json()
 
     async def get_vep(
         self,
@@ -170,12 +169,10 @@ class EnsemblClient:
         Returns:
             List of predicted variant consequences.
         """
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/vep/{species}/hgvs/{hgvs_notation}",
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(
+            f"{self.BASE_URL}/vep/{species}/hgvs/{hgvs_notation}",
+        )
+        return resp.json()
 
     # ------------------------------------------------------------------
     # Cross-reference endpoints
@@ -190,12 +187,10 @@ class EnsemblClient:
         Returns:
             List of cross-reference dicts (dbname, primary_id, display_id).
         """
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/xrefs/id/{ensembl_id}",
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(
+            f"{self.BASE_URL}/xrefs/id/{ensembl_id}",
+        )
+        return resp.json()
 
     # ------------------------------------------------------------------
     # Convenience methods
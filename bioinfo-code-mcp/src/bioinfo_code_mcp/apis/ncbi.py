@@ -8,10 +8,15 @@ Reference: https://www.ncbi.nlm.nih.gov/books/NBK25501/
 
 from __future__ import annotations
 
+import asyncio
+import re
 from typing import Any
 
 import httpx
 
+from .batching import RequestBatcher
+from .transport import SharedTransport, get_shared_transport
+
 
 class NCBIClient:
     """Thin async client for NCBI Entrez E-utilities.
@@ -22,10 +27,22 @@ class NCBIClient:
 
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, email: str, api_key: str | None = None, timeout: int = 30):
+    def __init__(
+        self,
+        email: str,
+        api_key: str | None = None,
+        timeout: int = 30,
+        http: SharedTransport | None = None,
+        batch_window: float = 0.01,
+    ):
         self.email = email
         self.api_key = api_key
         self._timeout = timeout
+        self._http = http or get_shared_transport()
+        # Concurrent single-ID esummary calls are coalesced into one request
+        self._summary_batcher = RequestBatcher(
+            self._esummary_one, self._esummary_batch, window=batch_window
+        )
 
     def _base_params(self) -> dict[str, str]:
         params: dict[str, str] = {"email": self.email, "retmode": "json"}
@@ -33,8 +50,15 @@ class NCBIClient:
             params["api_key"] = self.api_key
         return params
 
-    def _client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(timeout=self._timeout)
+    async def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        resp = await self._http.get(url, timeout=self._timeout, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    async def _post(self, url: str, **kwargs: Any) -> httpx.Response:
+        resp = await self._http.post(url, timeout=self._timeout, **kwargs)
+        resp.raise_for_status()
+        return resp
 
     # ------------------------------------------------------------------
     # E-utilities endpoints
@@ -65,10 +89,8 @@ class NCBIClient:
             "retmax": str(retmax),
             "sort": sort,
         }
-        async with self._client() as client:
-            resp = await client.get(f"{self.BASE_URL}/esearch.fcgi", params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self._get(f"{self.BASE_URL}/esearch.fcgi", params=params)
+        data = resp.json()
         result = data.get("esearchresult", {})
         return {
             "idlist": result.get("idlist", []),
@@ -102,14 +124,15 @@ class NCBIClient:
             "rettype": rettype,
             "retmode": retmode,
         }
-        async with self._client() as client:
-            resp = await client.get(f"{self.BASE_URL}/efetch.fcgi", params=params)
-            resp.raise_for_status()
-            return resp.text
+        resp = await self._get(f"{self.BASE_URL}/efetch.fcgi", params=params)
+        return resp.text
 
     async def esummary(self, db: str, ids: list[str]) -> list[dict[str, Any]]:
         """Get document summaries for a list of IDs.
 
+        Concurrent single-ID calls (e.g. from ``asyncio.gather``) are
+        transparently batched into one comma-separated request.
+
         Args:
             db: Database name.
             ids: List of database IDs.
@@ -117,19 +140,29 @@ class NCBIClient:
         Returns:
             List of summary dicts with fields like 'title', 'uid', etc.
         """
-        params = {
-            **self._base_params(),
-            "db": db,
-            "id": ",".join(ids),
-        }
-        async with self._client() as client:
-            resp = await client.get(f"{self.BASE_URL}/esummary.fcgi", params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        if len(ids) == 1:
+            summary = await self._summary_batcher.load(db, ids[0])
+            return [summary] if summary is not None else []
+        return await self._esummary_request(db, {"id": ",".join(ids)})
+
+    async def _esummary_request(
+        self, db: str, selector: dict[str, str]
+    ) -> list[dict[str, Any]]:
+        params = {**self._base_params(), "db": db, **selector}
+        resp = await self._get(f"{self.BASE_URL}/esummary.fcgi", params=params)
+        data = resp.json()
         result = data.get("result", {})
         uids = result.get("uids", [])
         return [result[uid] for uid in uids if uid in result]
 
+    async def _esummary_one(self, db: Any, uid: str) -> dict[str, Any] | None:
+        summaries = await self._esummary_request(db, {"id": uid})
+        return summaries[0] if summaries else None
+
+    async def _esummary_batch(self, db: Any, uids: list[str]) -> dict[str, Any]:
+        summaries = await self._esummary_request(db, {"id": ",".join(uids)})
+        return {s["uid"]: s for s in summaries if "uid" in s}
+
     async def einfo(self, db: str | None = None) -> dict[str, Any]:
         """Get information about NCBI databases or a specific database.
 
@@ -142,10 +175,8 @@ class NCBIClient:
         params = self._base_params()
         if db:
             params["db"] = db
-        async with self._client() as client:
-            resp = await client.get(f"{self.BASE_URL}/einfo.fcgi", params=params)
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(f"{self.BASE_URL}/einfo.fcgi", params=params)
+        return resp.json()
 
     async def elink(
         self,
@@ -173,10 +204,102 @@ class NCBIClient:
         }
         if linkname:
             params["linkname"] = linkname
-        async with self._client() as client:
-            resp = await client.get(f"{self.BASE_URL}/elink.fcgi", params=params)
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(f"{self.BASE_URL}/elink.fcgi", params=params)
+        return resp.json()
+
+    async def epost(self, db: str, ids: list[str]) -> dict[str, str]:
+        """Upload IDs to the Entrez history server.
+
+        Args:
+            db: Database name.
+            ids: List of database IDs.
+
+        Returns:
+            Dict with 'webenv' and 'query_key' for use in later requests.
+        """
+        params = {k: v for k, v in self._base_params().items() if k != "retmode"}
+        resp = await self._post(
+            f"{self.BASE_URL}/epost.fcgi",
+            data={**params, "db": db, "id": ",".join(ids)},
+        )
+        webenv = re.search(r"<WebEnv>(\S+?)</WebEnv>", resp.text)
+        query_key = re.search(r"<QueryKey>(\d+)</QueryKey>", resp.text)
+        if not webenv or not query_key:
+            raise RuntimeError(f"Could not parse EPost response: {resp.text[:500]}")
+        return {"webenv": webenv.group(1), "query_key": query_key.group(1)}
+
+    async def fetch_many(
+        self, db: str, ids: list[str], batch_size: int = 200
+    ) -> dict[str, dict[str, Any]]:
+        """Get summaries for many IDs in as few requests as possible.
+
+        Up to ``batch_size`` IDs go in one comma-separated esummary call.
+        Larger lists are posted once to the history server and paged
+        through with WebEnv/query_key, pages fetched concurrently.
+
+        Args:
+            db: Database name.
+            ids: List of database IDs (any length).
+            batch_size: IDs per request.
+
+        Returns:
+            Dict mapping uid → summary dict. IDs with no record are absent.
+        """
+        if not ids:
+            return {}
+        if len(ids) <= batch_size:
+            summaries = await self._esummary_request(db, {"id": ",".join(ids)})
+        else:
+            history = await self.epost(db, ids)
+            pages = await asyncio.gather(*(
+                self._esummary_request(db, {
+                    "WebEnv": history["webenv"],
+                    "query_key": history["query_key"],
+                    "retstart": str(start),
+                    "retmax": str(batch_size),
+                })
+                for start in range(0, len(ids), batch_size)
+            ))
+            summaries = [s for page in pages for s in page]
+        return {s["uid"]: s for s in summaries if "uid" in s}
+
+    async def efetch_many(
+        self,
+        db: str,
+        ids: list[str],
+        rettype: str = "fasta",
+        retmode: str = "text",
+        batch_size: int = 200,
+    ) -> str:
+        """Fetch full records for many IDs via the history server.
+
+        Args:
+            db: Database name.
+            ids: List of database IDs (any length).
+            rettype: Return type ("fasta", "gb", "abstract", ...).
+            retmode: Return format ("text", "xml").
+            batch_size: Records per request.
+
+        Returns:
+            Concatenated raw records, in history-server order.
+        """
+        if not ids:
+            return ""
+        if len(ids) <= batch_size:
+            return await self.efetch(db, ids, rettype=rettype, retmode=retmode)
+        history = await self.epost(db, ids)
+        base = {**self._base_params(), "db": db, "rettype": rettype, "retmode": retmode}
+        pages = await asyncio.gather(*(
+            self._get(f"{self.BASE_URL}/efetch.fcgi", params={
+                **base,
+                "WebEnv": history["webenv"],
+                "query_key": history["query_key"],
+                "retstart": str(start),
+                "retmax": str(batch_size),
+            })
+            for start in range(0, len(ids), batch_size)
+        ))
+        return "".join(page.text for page in pages)
 
     # ------------------------------------------------------------------
     # Convenience methods
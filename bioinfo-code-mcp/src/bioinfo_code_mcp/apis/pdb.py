@@ -12,6 +12,8 @@ from typing import Any
 
 import httpx
 
+from .transport import SharedTransport, get_shared_transport
+
 
 class PDBClient:
     """Async client for the RCSB PDB REST API."""
@@ -19,11 +21,19 @@ class PDBClient:
     DATA_URL = "https://data.rcsb.org/rest/v1"
     SEARCH_URL = "https://search.rcsb.org/rcsbsearch/v2/query"
 
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, http: SharedTransport | None = None):
         self._timeout = timeout
+        self._http = http or get_shared_transport()
+
+    async def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        resp = await self._http.get(url, timeout=self._timeout, **kwargs)
+        resp.raise_for_status()
+        return resp
 
-    def _client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(timeout=self._timeout)
+    async def _post(self, url: str, **kwargs: Any) -> httpx.Response:
+        resp = await self._http.post(url, timeout=self._timeout, **kwargs)
+        resp.raise_for_status()
+        return resp
 
     async def get_entry(self, pdb_id: str) -> dict[str, Any]:
         """Get basic entry information for a PDB structure.
@@ -34,10 +44,8 @@ class PDBClient:
         Returns:
             Dict with entry metadata (title, authors, resolution, etc.).
         """
-        async with self._client() as client:
-            resp = await client.get(f"{self.DATA_URL}/core/entry/{pdb_id}")
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(f"{self.DATA_URL}/core/entry/{pdb_id}")
+        return resp.json()
 
     async def get_entity(self, pdb_id: str, entity_id: int = 1) -> dict[str, Any]:
         """Get polymer entity info (sequence, source organism, etc.).
@@ -49,12 +57,10 @@ class PDBClient:
         Returns:
             Dict with entity-level data.
         """
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.DATA_URL}/core/polymer_entity/{pdb_id}/{entity_id}"
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(
+            f"{self.DATA_URL}/core/polymer_entity/{pdb_id}/{entity_id}"
+        )
+        return resp.json()
 
     async def get_assembly(self, pdb_id: str, assembly_id: int = 1) -> dict[str, Any]:
         """Get biological assembly information.
@@ -66,12 +72,10 @@ class PDBClient:
         Returns:
             Dict with assembly data.
         """
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.DATA_URL}/core/assembly/{pdb_id}/{assembly_id}"
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get(
+            f"{self.DATA_URL}/core/assembly/{pdb_id}/{assembly_id}"
+        )
+        return resp.json()
 
     async def search(
         self,
@@ -101,14 +105,12 @@ class PDBClient:
             "return_type": return_type,
             "request_options": {"rows": rows},
         }
-        async with self._client() as client:
-            resp = await client.post(
-                self.SEARCH_URL,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._post(
+            self.SEARCH_URL,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+        )
+        return resp.json()
 
     # ------------------------------------------------------------------
     # Convenience methods
@@ -0,0 +1,336 @@
+"""Shared, connection-pooled HTTP transport for the bioinformatics API clients.
+
+Every client in ``apis/*`` routes its requests through a single
+``SharedTransport`` so that:
+
+- TCP/TLS connections are pooled and kept alive across calls (and across
+  sandbox executions), with HTTP/2 multiplexing when ``h2`` is installed
+- Per-host token buckets enforce upstream rate limits (NCBI E-utilities
+  allow 3 req/s, or 10 req/s with an API key; Ensembl allows 15 req/s)
+- 429 responses (and 503s to idempotent requests) are retried
+  automatically, honouring the ``Retry-After`` header when the server
+  sends one
+- An optional ``ResponseCache`` serves repeated GETs from disk (see
+  ``apis/cache.py``)
+
+Pooled connections are bound to the event loop that opened them, so the
+transport keeps one lazily created ``httpx.AsyncClient`` per loop. Loops
+running concurrently in different threads never close each other's clients,
+and the client of a loop that has closed (a finished ``asyncio.run``) is
+dropped the next time any loop asks for one, so one transport can be shared
+by long-lived servers and by short-lived ``asyncio.run`` calls alike.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib.util
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+from ..config import ServerConfig
+from .cache import OfflineCacheMissError, ResponseCache
+
+# Requests per second allowed by each upstream service's usage policy
+DEFAULT_RATE_LIMITS: dict[str, float] = {
+    "eutils.ncbi.nlm.nih.gov": 3.0,
+    "blast.ncbi.nlm.nih.gov": 1.0,
+    "rest.ensembl.org": 15.0,
+    "rest.uniprot.org": 10.0,
+    "data.rcsb.org": 10.0,
+    "search.rcsb.org": 10.0,
+}
+
+# NCBI raises the E-utilities limit to 10 req/s for callers with an API key
+NCBI_API_KEY_RATE_LIMIT = 10.0
+
+RETRY_STATUSES = frozenset({429, 503})
+# A 429 is refused before processing, so only it is safe to resend for a
+# POST (BLAST submission, epost); a 503 may come after the work was done
+NON_IDEMPOTENT_RETRY_STATUSES = frozenset({429})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter.
+
+    Tokens are reserved synchronously (there is no ``await`` between reading
+    and updating the bucket), so concurrent coroutines on the same event loop
+    are serialised without a lock and the limiter can be shared across loops.
+    A caller that overdraws the bucket sleeps until its reserved token would
+    have been refilled.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        """Wait until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def parse_retry_after(value: str | None, default: float) -> float:
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return default
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class SharedTransport:
+    """Pooled, rate-limited HTTP transport shared by all API clients.
+
+    Args:
+        max_connections: Maximum concurrent connections in the pool.
+        max_keepalive_connections: Idle connections kept open for reuse.
+        keepalive_expiry: Seconds an idle connection stays in the pool.
+        http2: Enable HTTP/2. Falls back to HTTP/1.1 when ``h2`` is not
+            installed.
+        rate_limits: Host → requests/second. Hosts not listed are unlimited.
+        max_retries: Retries for 429/503 responses before giving up (503s
+            are only retried for idempotent methods).
+        backoff_seconds: Base delay when the server sends no ``Retry-After``.
+        max_retry_wait: Upper bound on any single retry delay.
+        transport: Optional ``httpx`` transport (e.g. ``httpx.MockTransport``)
+            used instead of the network, for tests.
+        cache: Optional persistent response cache for GET requests.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        rate_limits: dict[str, float] | None = None,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        max_retry_wait: float = 60.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_retry_wait = max_retry_wait
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._transport = transport
+        self.cache = cache
+        self._buckets: dict[str, TokenBucket] = {
+            host: TokenBucket(rate)
+            for host, rate in (DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits).items()
+        }
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._clients_lock = threading.Lock()
+        self.stats: dict[str, int] = {"requests": 0, "retries": 0, "clients_created": 0}
+
+    @classmethod
+    def from_config(cls, config: ServerConfig, **kwargs: Any) -> SharedTransport:
+        """Build a transport from server configuration."""
+        rate_limits = dict(DEFAULT_RATE_LIMITS)
+        if config.ncbi_api_key:
+            rate_limits["eutils.ncbi.nlm.nih.gov"] = NCBI_API_KEY_RATE_LIMIT
+        kwargs.setdefault("max_connections", config.http_max_connections)
+        kwargs.setdefault("http2", config.http2)
+        kwargs.setdefault("max_retries", config.http_max_retries)
+        kwargs.setdefault("rate_limits", rate_limits)
+        if config.cache_enabled:
+            kwargs.setdefault("cache", ResponseCache.from_config(config))
+        return cls(**kwargs)
+
+    def set_rate_limit(self, host: str, rate: float | None) -> None:
+        """Set (or remove, with ``None``) the requests/second limit for a host."""
+        if rate is None:
+            self._buckets.pop(host, None)
+        else:
+            self._buckets[host] = TokenBucket(rate)
+
+    def scale_rate_limits(self, factor: float) -> None:
+        """Multiply every host's rate limit by ``factor``.
+
+        Sandbox worker processes each hold their own transport, so the pool
+        gives each one ``1 / workers`` of the upstream budget.
+        """
+        for host, bucket in list(self._buckets.items()):
+            self._buckets[host] = TokenBucket(bucket.rate * factor)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=self._limits,
+                    http2=self.http2,
+                    transport=self._transport,
+                )
+                self._clients[loop] = client
+                self.stats["clients_created"] += 1
+            # Drop clients left behind by loops that have since closed
+            closed = [other for other in list(self._clients.keys()) if other.is_closed()]
+            orphaned = [self._clients.pop(other) for other in closed]
+        for stale in orphaned:
+            await _close_orphaned_client(stale)
+        return client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request through the cache and pool, rate-limited and retried.
+
+        Args:
+            method: HTTP method.
+            url: Absolute URL.
+            timeout: Per-request timeout in seconds.
+            **kwargs: Passed through to ``httpx.AsyncClient.build_request``
+                (``params``, ``headers``, ``data``, ``json``, ...).
+
+        Returns:
+            The final ``httpx.Response`` (status is not checked).
+
+        Raises:
+            OfflineCacheMissError: In offline mode, if the response is not cached.
+        """
+        client = await self._get_client()
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        request = client.build_request(method, url, **kwargs)
+
+        ttl = self.cache.ttl_for(request) if self.cache is not None else None
+        if self.cache is None or ttl is None:
+            if self.cache is not None and self.cache.offline:
+                raise OfflineCacheMissError(f"Offline and not cacheable: {method} {request.url}")
+            return await self._send(client, request)
+
+        # SQLite calls run in a worker thread so a slow disk never stalls the loop
+        cache = self.cache
+        entry = await asyncio.to_thread(cache.lookup, request)
+        if entry is not None and (entry.fresh or cache.offline):
+            cache.stats["hits"] += 1
+            return entry.to_response(request)
+        if cache.offline:
+            cache.stats["offline_misses"] += 1
+            raise OfflineCacheMissError(f"Offline and not cached: {method} {request.url}")
+
+        cache.stats["misses"] += 1
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        resp = await self._send(client, request)
+        if resp.status_code == 304 and entry is not None:
+            await asyncio.to_thread(cache.refresh, entry, ttl)
+            return entry.to_response(request)
+        if resp.status_code == 200:
+            await asyncio.to_thread(cache.store, request, resp, ttl)
+        return resp
+
+    async def _send(self, client: httpx.AsyncClient, request: httpx.Request) -> httpx.Response:
+        bucket = self._buckets.get(request.url.host)
+        retry_statuses = (
+            RETRY_STATUSES if request.method in IDEMPOTENT_METHODS else NON_IDEMPOTENT_RETRY_STATUSES
+        )
+        attempt = 0
+        while True:
+            if bucket is not None:
+                await bucket.acquire()
+            self.stats["requests"] += 1
+            resp = await client.send(request)
+            if resp.status_code not in retry_statuses or attempt >= self.max_retries:
+                return resp
+
+            delay = parse_retry_after(
+                resp.headers.get("Retry-After"),
+                default=self.backoff_seconds * 2**attempt,
+            )
+            await resp.aclose()
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(min(delay, self.max_retry_wait))
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close pooled connections on every loop."""
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+        for owner, client in clients:
+            if owner is loop:
+                await client.aclose()
+            elif owner.is_running():
+                # Its connections must close on the loop that owns them
+                asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+            else:
+                await _close_orphaned_client(client)
+
+
+async def _close_orphaned_client(client: httpx.AsyncClient) -> None:
+    """Close a client whose event loop has already closed."""
+    # Its sockets belong to a dead loop; closing them is best-effort
+    with contextlib.suppress(Exception):
+        await client.aclose()
+
+
+_shared: SharedTransport | None = None
+
+
+def get_shared_transport(config: ServerConfig | None = None) -> SharedTransport:
+    """Return the process-wide transport, creating it on first use.
+
+    The first caller's ``config`` determines pool size and rate limits;
+    later calls return the same instance so every client and sandbox
+    session shares one connection pool and one set of rate limiters.
+    """
+    global _shared
+    if _shared is None:
+        _shared = SharedTransport.from_config(config or ServerConfig())
+    return _shared
@@ -8,24 +8,49 @@ Reference: https://www.uniprot.org/help/api
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 import httpx
 
+from .batching import RequestBatcher
+from .transport import SharedTransport, get_shared_transport
+
 
 class UniProtClient:
     """Async client for the UniProt REST API."""
 
     BASE_URL = "https://rest.uniprot.org"
 
-    def __init__(self, timeout: int = 30):
+    # Accessions per /accessions request. The endpoint pages its results
+    # (500 per page at most), so batches are sized to fit one page; any
+    # further pages are followed through the Link header.
+    MAX_ACCESSIONS = 500
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        http: SharedTransport | None = None,
+        batch_window: float = 0.01,
+    ):
         self._timeout = timeout
+        self._http = http or get_shared_transport()
+        # Concurrent single-accession fetch_entry calls share one batch request
+        self._entry_batcher = RequestBatcher(
+            self._fetch_entry_one, self._fetch_entry_batch, window=batch_window
+        )
 
-    def _client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(
+    async def _get(
+        self, url: str, headers: dict[str, str] | None = None, **kwargs: Any
+    ) -> httpx.Response:
+        resp = await self._http.get(
+            url,
             timeout=self._timeout,
-            headers={"Accept": "application/json"},
+            headers={"Accept": "application/json", **(headers or {})},
+            **kwargs,
         )
+        resp.raise_for_status()
+        return resp
 
     async def search(
         self,
@@ -56,12 +81,10 @@ class UniProtClient:
         if fields:
             params["fields"] = ",".join(fields)
 
-        async with self._client() as client:
-            resp = await client.get(f"{self.BASE_URL}/{dataset}/search", params=params)
-            resp.raise_for_status()
-            if format_ == "json":
-                return resp.json()
-            return {"text": resp.text}
+        resp = await self._get(f"{self.BASE_URL}/{dataset}/search", params=params)
+        if format_ == "json":
+            return resp.json()
+        return {"text": resp.text}
 
     async def fetch_entry(
         self,
@@ -71,6 +94,9 @@ class UniProtClient:
     ) -> dict[str, Any]:
         """Fetch a single UniProt entry by accession.
 
+        Concurrent JSON lookups in UniProtKB are transparently batched into
+        one request to the accessions endpoint.
+
         Args:
             accession: UniProt accession (e.g. "P04637" for human p53).
             dataset: Dataset name.
@@ -79,16 +105,61 @@ class UniProtClient:
         Returns:
             Entry data as dict (JSON) or text.
         """
+        if dataset == "uniprotkb" and format_ == "json":
+            return await self._entry_batcher.load(dataset, accession)
         headers = {"Accept": "application/json"} if format_ == "json" else {}
-        async with self._client() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/{dataset}/{accession}",
-                headers=headers,
-            )
-            resp.raise_for_status()
-            if format_ == "json":
-                return resp.json()
-            return {"text": resp.text}
+        resp = await self._get(
+            f"{self.BASE_URL}/{dataset}/{accession}",
+            headers=headers,
+        )
+        if format_ == "json":
+            return resp.json()
+        return {"text": resp.text}
+
+    async def _fetch_entry_one(self, dataset: Any, accession: str) -> dict[str, Any]:
+        resp = await self._get(f"{self.BASE_URL}/{dataset}/{accession}")
+        return resp.json()
+
+    async def _fetch_entry_batch(
+        self, dataset: Any, accessions: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        resp = await self._get(
+            f"{self.BASE_URL}/{dataset}/accessions",
+            params={
+                "accessions": ",".join(accessions),
+                "size": str(min(len(accessions), self.MAX_ACCESSIONS)),
+            },
+        )
+        entries: dict[str, dict[str, Any]] = {}
+        while True:
+            for entry in resp.json().get("results", []):
+                if "primaryAccession" in entry:
+                    entries[entry["primaryAccession"]] = entry
+            next_url = resp.links.get("next", {}).get("url")
+            if not next_url:
+                return entries
+            # The next link carries the cursor and the original query
+            resp = await self._get(next_url)
+
+    async def fetch_many(self, accessions: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch many UniProtKB entries using the batch accessions endpoint.
+
+        Args:
+            accessions: UniProt accessions (any length; split into chunks
+                of ``MAX_ACCESSIONS`` fetched concurrently).
+
+        Returns:
+            Dict mapping primary accession → entry dict. Unknown or
+            secondary accessions are absent.
+        """
+        chunks = [
+            accessions[i : i + self.MAX_ACCESSIONS]
+            for i in range(0, len(accessions), self.MAX_ACCESSIONS)
+        ]
+        results = await asyncio.gather(
+            *(self._fetch_entry_batch("uniprotkb", chunk) for chunk in chunks)
+        )
+        return {acc: entry for batch in results for acc, entry in batch.items()}
 
     async def fetch_fasta(self, accession: str) -> str:
         """Fetch protein sequence in FASTA format.
@@ -99,10 +170,8 @@ class UniProtClient:
         Returns:
             FASTA-formatted sequence string.
         """
-        async with self._client() as client:
-            resp = await client.get(f"{self.BASE_URL}/uniprotkb/{accession}.fasta")
-            resp.raise_for_status()
-            return resp.text
+        resp = await self._get(f"{self.BASE_URL}/uniprotkb/{accession}.fasta")
+        return resp.text
 
     # ------------------------------------------------------------------
     # Convenience methods
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
+from pathlib import Path
 
 
 @dataclass
@@ -21,10 +22,35 @@ class ServerConfig:
     # Execution sandbox settings
     execution_timeout_seconds: int = int(os.environ.get("EXEC_TIMEOUT", "30"))
     max_output_chars: int = int(os.environ.get("MAX_OUTPUT_CHARS", "50000"))
+    # Worker processes for isolated execution (0 runs code in the server process)
+    sandbox_workers: int = int(os.environ.get("SANDBOX_WORKERS", "0"))
+    # Per-execution limits inside workers: CPU seconds, and memory above baseline
+    sandbox_cpu_seconds: int = int(os.environ.get("SANDBOX_CPU_SECONDS", "60"))
+    sandbox_memory_mb: int = int(os.environ.get("SANDBOX_MEMORY_MB", "2048"))
 
     # HTTP client defaults
     http_timeout_seconds: int = int(os.environ.get("HTTP_TIMEOUT", "30"))
     http_max_retries: int = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+    http_max_connections: int = int(os.environ.get("HTTP_MAX_CONNECTIONS", "20"))
+    http2: bool = os.environ.get("HTTP2", "1") != "0"
+    # Window for coalescing concurrent single-ID lookups (0 disables)
+    batch_window_ms: int = int(os.environ.get("BATCH_WINDOW_MS", "10"))
+
+    # Persistent response cache
+    cache_enabled: bool = os.environ.get("BIOINFO_CACHE", "1") != "0"
+    cache_path: str = os.environ.get(
+        "BIOINFO_CACHE_PATH",
+        str(Path.home() / ".cache" / "bioinfo-code-mcp" / "responses.sqlite"),
+    )
+    cache_max_mb: int = int(os.environ.get("BIOINFO_CACHE_MAX_MB", "256"))
+    offline: bool = os.environ.get("BIOINFO_OFFLINE", "0") == "1"
+
+    # Directories sandbox code may read data files from (os.pathsep-separated)
+    data_dirs: list[str] = field(
+        default_factory=lambda: [
+            d for d in os.environ.get("BIOINFO_DATA_DIR", "").split(os.pathsep) if d
+        ]
+    )
 
     # Server transport
     transport: str = os.environ.get("MCP_TRANSPORT", "stdio")
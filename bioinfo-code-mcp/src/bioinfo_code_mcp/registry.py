@@ -11,10 +11,30 @@ API methods and helpers before generating execution code.
 
 from __future__ import annotations
 
+import bisect
+import heapq
+import itertools
+import math
 import re
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words too common in descriptions to help ranking
+_STOPWORDS = frozenset({
+    "a", "an", "and", "as", "by", "for", "from", "in", "into",
+    "of", "on", "or", "the", "to", "with",
+})
+
+
+def _tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens ("ncbi.fetch_gene_info" → ncbi, fetch, gene, info)."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
 
 @dataclass
 class OperationParam:
@@ -72,13 +92,153 @@ class Operation:
         }
 
 
+def _weighted_terms(op: Operation, weights: dict[str, float]) -> dict[str, float]:
+    """Field-weighted term frequencies for one operation."""
+    fields = {
+        "name": op.name,
+        "module": op.module,
+        "description": op.description,
+        "tags": " ".join(op.tags),
+        "params": " ".join(f"{p.name} {p.description}" for p in op.params),
+        "returns": op.returns,
+    }
+    terms: dict[str, float] = {}
+    for field_name, text in fields.items():
+        weight = weights[field_name]
+        for term in _tokenize(text):
+            terms[term] = terms.get(term, 0.0) + weight
+    return terms
+
+
+def _discard(index: dict[str, set[str]], key: str, name: str) -> None:
+    members = index.get(key)
+    if members is not None:
+        members.discard(name)
+        if not members:
+            del index[key]
+
+
 class Registry:
-    """Searchable catalog of all bioinformatics operations available in the sandbox."""
+    """Searchable catalog of all bioinformatics operations available in the sandbox.
+
+    Operations are indexed as they are registered: a tokenized inverted
+    index over name, module, description, tags, params and return type is
+    ranked with BM25, module and tag filters are set lookups, and each
+    operation's ``to_dict`` payload is built once. Search cost therefore
+    depends on how many operations share the query terms, not on catalog
+    size, which keeps lookups sub-millisecond at 10k+ operations.
+    """
+
+    # BM25 parameters
+    K1 = 1.2
+    B = 0.75
+
+    # Per-field term weights (name and tags are the strongest signals)
+    FIELD_WEIGHTS: dict[str, float] = {
+        "name": 3.0,
+        "tags": 2.0,
+        "module": 1.5,
+        "description": 1.0,
+        "params": 0.5,
+        "returns": 0.5,
+    }
+
+    # Query terms this long or longer also match index terms they prefix
+    # ("orf" → "orfs"), at reduced weight
+    PREFIX_MIN_LENGTH = 3
+    PREFIX_WEIGHT = 0.5
 
     def __init__(self) -> None:
-        self._operations: list[Operation] = []
+        self._operations: dict[str, Operation] = {}
+        self._payloads: dict[str, dict[str, Any]] = {}
+        self._order: dict[str, int] = {}  # name → slot (registration order)
+        self._names: list[str | None] = []  # slot → name (None once removed, until compacted)
+        self._postings: dict[str, dict[str, float]] = {}
+        self._doc_terms: dict[str, dict[str, float]] = {}
+        self._doc_len: dict[str, float] = {}
+        self._total_len = 0.0
+        self._by_module: dict[str, set[str]] = {}
+        self._by_tag: dict[str, set[str]] = {}
+        self._vocabulary: list[str] | None = None
+        # Per-term (slots, BM25 weights), rebuilt lazily after any change
+        self._impacts: dict[str, tuple[np.ndarray, np.ndarray]] = {}
         self._build_registry()
 
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register(self, op: Operation) -> None:
+        """Add an operation to the catalog, replacing any with the same name."""
+        if op.name in self._operations:
+            self.unregister(op.name)
+        name = op.name
+        self._operations[name] = op
+        self._payloads[name] = op.to_dict()
+        self._order[name] = len(self._names)
+        self._names.append(name)
+        self._impacts.clear()
+
+        terms = _weighted_terms(op, self.FIELD_WEIGHTS)
+        self._doc_terms[name] = terms
+        self._doc_len[name] = length = sum(terms.values())
+        self._total_len += length
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = postings = {}
+                self._vocabulary = None
+            postings[name] = tf
+
+        self._by_module.setdefault(op.module.lower(), set()).add(name)
+        for tag in op.tags:
+            self._by_tag.setdefault(tag.lower(), set()).add(name)
+
+    def register_many(self, ops: list[Operation]) -> None:
+        """Register several operations (e.g. generated from an OpenAPI spec)."""
+        for op in ops:
+            self.register(op)
+
+    def unregister(self, name: str) -> bool:
+        """Remove an operation by name. Returns False if it was not registered."""
+        op = self._operations.pop(name, None)
+        if op is None:
+            return False
+        del self._payloads[name]
+        self._names[self._order.pop(name)] = None
+        self._impacts.clear()
+        self._total_len -= self._doc_len.pop(name)
+        for term in self._doc_terms.pop(name):
+            postings = self._postings[term]
+            del postings[name]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+        _discard(self._by_module, op.module.lower(), name)
+        for tag in op.tags:
+            _discard(self._by_tag, tag.lower(), name)
+        if len(self._names) > 2 * len(self._operations):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        """Drop removed slots so score arrays stay sized to the live catalog.
+
+        Slots are renumbered in registration order, so ties still break the
+        same way. Runs once removed slots outnumber live ones, which keeps
+        repeated replace/unregister churn amortized O(1).
+        """
+        self._names = [name for name in self._names if name is not None]
+        self._order = {name: slot for slot, name in enumerate(self._names)}
+        self._impacts.clear()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
     def search(
         self,
         query: str = "",
@@ -89,50 +249,124 @@ class Registry:
         """Search for operations matching a query.
 
         Args:
-            query: Free-text search query (matches name, description, tags).
+            query: Free-text search query, ranked by BM25 over name,
+                description, tags, params and return type.
             tags: Filter by tags (e.g. ["sequence", "ncbi"]).
             module: Filter by module name (e.g. "ncbi", "uniprot").
             limit: Maximum number of results.
 
         Returns:
-            List of operation dicts.
+            List of operation dicts, best match first (registration order
+            when there is no query). The dicts are shared; do not mutate.
         """
-        results = self._operations
-
+        candidates: set[str] | None = None
         if module:
-            results = [op for op in results if op.module.lower() == module.lower()]
-
+            candidates = self._by_module.get(module.lower(), set())
         if tags:
-            tag_set = {t.lower() for t in tags}
-            results = [
-                op for op in results if tag_set.intersection(t.lower() for t in op.tags)
-            ]
+            tagged: set[str] = set()
+            for tag in tags:
+                tagged |= self._by_tag.get(tag.lower(), set())
+            candidates = tagged if candidates is None else candidates & tagged
+
+        terms = _tokenize(query)
+        if not terms:
+            if candidates is None:
+                names = list(itertools.islice(self._operations, max(limit, 0)))
+            else:
+                names = heapq.nsmallest(limit, candidates, key=self._order.__getitem__)
+            return [self._payloads[name] for name in names]
 
-        if query:
-            results = [op for op in results if op.matches(query)]
+        if limit <= 0:
+            return []
+        scores = np.zeros(len(self._names))
+        for term, weight in self._expand(terms).items():
+            slots, impacts = self._term_impacts(term)
+            scores[slots] += weight * impacts
 
-        return [op.to_dict() for op in results[:limit]]
+        if candidates is None:
+            hits = np.flatnonzero(scores)
+        else:
+            slots = np.fromiter(
+                map(self._order.__getitem__, candidates), dtype=np.int64, count=len(candidates)
+            )
+            hits = slots[scores[slots] > 0]
+        if not len(hits):
+            return self._substring_search(query, candidates, limit)
+        if len(hits) > limit:
+            # Keep everything tied with the limit-th best so ties break by order
+            cutoff = np.partition(scores[hits], len(hits) - limit)[len(hits) - limit]
+            hits = hits[scores[hits] >= cutoff]
+        ranked = hits[np.lexsort((hits, -scores[hits]))][:limit]
+        names = self._names
+        return [self._payloads[names[slot]] for slot in ranked.tolist()]  # type: ignore[index]
+
+    def _substring_search(
+        self, query: str, candidates: set[str] | None, limit: int
+    ) -> list[dict[str, Any]]:
+        """Fallback for queries with no indexed terms: substring match ("p53" finds "tp53")."""
+        if candidates is None:
+            pool: Iterable[str] = self._operations
+        else:
+            pool = sorted(candidates, key=self._order.__getitem__)
+        operations = self._operations
+        names = (name for name in pool if operations[name].matches(query))
+        return [self._payloads[name] for name in itertools.islice(names, limit)]
+
+    def _term_impacts(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        """Slots containing ``term`` and their BM25 contribution (idf x saturated tf)."""
+        cached = self._impacts.get(term)
+        if cached is not None:
+            return cached
+        postings = self._postings[term]
+        count = len(postings)
+        n_docs = len(self._operations)
+        avg_len = self._total_len / n_docs
+        slots = np.fromiter(map(self._order.__getitem__, postings), dtype=np.int64, count=count)
+        tf = np.fromiter(postings.values(), dtype=np.float64, count=count)
+        lengths = np.fromiter(
+            map(self._doc_len.__getitem__, postings), dtype=np.float64, count=count
+        )
+        idf = math.log(1 + (n_docs - count + 0.5) / (count + 0.5))
+        k1, b = self.K1, self.B
+        impacts = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths / avg_len))
+        self._impacts[term] = cached = (slots, impacts)
+        return cached
+
+    def _expand(self, terms: list[str]) -> dict[str, float]:
+        """Map query terms to index terms: exact matches plus prefix matches."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        expanded: dict[str, float] = {}
+        for term in terms:
+            if term in self._postings:
+                expanded[term] = expanded.get(term, 0.0) + 1.0
+            if len(term) < self.PREFIX_MIN_LENGTH:
+                continue
+            i = bisect.bisect_right(vocabulary, term)
+            while i < len(vocabulary) and vocabulary[i].startswith(term):
+                match = vocabulary[i]
+                expanded[match] = expanded.get(match, 0.0) + self.PREFIX_WEIGHT
+                i += 1
+        return expanded
 
     def list_modules(self) -> list[dict[str, Any]]:
         """List all available modules with their operation counts."""
         modules: dict[str, int] = {}
-        for op in self._operations:
+        for op in self._operations.values():
             modules[op.module] = modules.get(op.module, 0) + 1
         return [{"module": m, "operation_count": c} for m, c in sorted(modules.items())]
 
     def list_tags(self) -> list[str]:
         """List all unique tags."""
         tags: set[str] = set()
-        for op in self._operations:
+        for op in self._operations.values():
             tags.update(op.tags)
         return sorted(tags)
 
     def get_operation(self, name: str) -> dict[str, Any] | None:
         """Get details for a specific operation by name."""
-        for op in self._operations:
-            if op.name == name:
-                return op.to_dict()
-        return None
+        return self._payloads.get(name)
 
     def _build_registry(self) -> None:
         """Populate the registry with all available operations."""
@@ -192,6 +426,70 @@ class Registry:
                 returns="List of summary dicts",
                 example='summaries = await ncbi.esummary("pubmed", ["12345678"])',
             ),
+            Operation(
+                name="ncbi.fetch_many",
+                module="ncbi",
+                method="ncbi.fetch_many(db, ids, batch_size=200)",
+                description=(
+                    "Get summaries for many NCBI IDs in one batched "
+                    "request (history server/WebEnv for large lists)"
+                ),
+                tags=["ncbi", "summary", "metadata", "batch", "fetch"],
+                params=[
+                    OperationParam("db", "str", "Database name"),
+                    OperationParam("ids", "list[str]", "List of database IDs (any length)"),
+                    OperationParam(
+                        "batch_size", "int", "IDs per request", required=False, default="200"
+                    ),
+                ],
+                returns="Dict of uid → summary dict",
+                example='summaries = await ncbi.fetch_many("gene", ["7157", "672", "675"])',
+            ),
+            Operation(
+                name="ncbi.efetch_many",
+                module="ncbi",
+                method="ncbi.efetch_many(db, ids, rettype='fasta', retmode='text', batch_size=200)",
+                description=(
+                    "Fetch full records for many NCBI IDs via "
+                    "the Entrez history server in paged batches"
+                ),
+                tags=["ncbi", "fetch", "sequence", "record", "batch"],
+                params=[
+                    OperationParam("db", "str", "Database name"),
+                    OperationParam("ids", "list[str]", "List of database IDs (any length)"),
+                    OperationParam(
+                        "rettype",
+                        "str",
+                        "Return type: fasta, gb, abstract",
+                        required=False,
+                        default="fasta",
+                    ),
+                    OperationParam(
+                        "retmode", "str", "Return format: text, xml", required=False, default="text"
+                    ),
+                    OperationParam(
+                        "batch_size", "int", "Records per request", required=False, default="200"
+                    ),
+                ],
+                returns="Concatenated raw records (FASTA, GenBank, XML, etc.)",
+                example='fasta = await ncbi.efetch_many("protein", accessions)',
+            ),
+            Operation(
+                name="ncbi.epost",
+                module="ncbi",
+                method="ncbi.epost(db, ids)",
+                description=(
+                    "Upload a list of IDs to the Entrez history "
+                    "server for use with WebEnv/query_key"
+                ),
+                tags=["ncbi", "history", "batch"],
+                params=[
+                    OperationParam("db", "str", "Database name"),
+                    OperationParam("ids", "list[str]", "List of database IDs"),
+                ],
+                returns="Dict with webenv and query_key",
+                example='history = await ncbi.epost("pubmed", pmids)',
+            ),
             Operation(
                 name="ncbi.einfo",
                 module="ncbi",
@@ -259,7 +557,7 @@ class Registry:
                 example='fasta = await ncbi.fetch_sequence("nucleotide", "NM_007294")',
             ),
         ]
-        self._operations.extend(ops)
+        self.register_many(ops)
 
     # ------------------------------------------------------------------
     # UniProt operations
@@ -293,6 +591,20 @@ class Registry:
                 returns="Full entry dict",
                 example='entry = await uniprot.fetch_entry("P04637")',
             ),
+            Operation(
+                name="uniprot.fetch_many",
+                module="uniprot",
+                method="uniprot.fetch_many(accessions)",
+                description=(
+                    "Fetch many UniProtKB entries at once using the batch accessions endpoint"
+                ),
+                tags=["uniprot", "protein", "entry", "fetch", "batch"],
+                params=[
+                    OperationParam("accessions", "list[str]", "UniProt accessions (any length)"),
+                ],
+                returns="Dict of primary accession → entry dict",
+                example='entries = await uniprot.fetch_many(["P04637", "P38398", "P51587"])',
+            ),
             Operation(
                 name="uniprot.fetch_fasta",
                 module="uniprot",
@@ -344,7 +656,7 @@ class Registry:
                 example='go_terms = await uniprot.get_go_terms("P04637")',
             ),
         ]
-        self._operations.extend(ops)
+        self.register_many(ops)
 
     # ------------------------------------------------------------------
     # PDB operations
@@ -415,7 +727,7 @@ class Registry:
                 example='summary = await pdb.get_structure_summary("6LU7")',
             ),
         ]
-        self._operations.extend(ops)
+        self.register_many(ops)
 
     # ------------------------------------------------------------------
     # Ensembl operations
@@ -514,7 +826,7 @@ class Registry:
                 example='summary = await ensembl.get_gene_summary("TP53")',
             ),
         ]
-        self._operations.extend(ops)
+        self.register_many(ops)
 
     # ------------------------------------------------------------------
     # BLAST operations
@@ -577,7 +889,7 @@ class Registry:
                 example='results = await blast.blastp("MEEPQSDP...")',
             ),
         ]
-        self._operations.extend(ops)
+        self.register_many(ops)
 
     # ------------------------------------------------------------------
     # Sequence utility operations
@@ -631,6 +943,21 @@ class Registry:
                 returns="List of ORF dicts (start, end, length, frame, protein)",
                 example='orfs = seq_utils.find_orfs(dna_sequence, min_length=300)',
             ),
+            Operation(
+                name="seq.six_frame_orfs",
+                module="sequence_utils",
+                method="seq_utils.six_frame_orfs(dna, min_length=100)",
+                description="Find ORFs on both strands (all six reading frames)",
+                tags=["sequence", "orf", "gene", "prediction", "strand", "utility"],
+                params=[
+                    OperationParam("dna", "str", "DNA sequence"),
+                    OperationParam(
+                        "min_length", "int", "Min ORF length in nt", required=False, default="100"
+                    ),
+                ],
+                returns="List of ORF dicts (start, end, length, strand, frame, protein)",
+                example='orfs = seq_utils.six_frame_orfs(genome, min_length=300)',
+            ),
             Operation(
                 name="seq.restriction_sites",
                 module="sequence_utils",
@@ -688,7 +1015,7 @@ class Registry:
                 example='comp = seq_utils.amino_acid_composition("MEEPQSDPSVEP")',
             ),
         ]
-        self._operations.extend(ops)
+        self.register_many(ops)
 
     # ------------------------------------------------------------------
     # Format utility operations
@@ -736,6 +1063,119 @@ class Registry:
                 returns="List of BEDRecord objects",
                 example='regions = fmt.parse_bed(bed_text)',
             ),
+            Operation(
+                name="fmt.iter_fasta",
+                module="format_utils",
+                method="fmt.iter_fasta(source)",
+                description=(
+                    "Stream FASTA records from a file path "
+                    "(plain or gzip), open file, mmap or lines"
+                ),
+                tags=["format", "fasta", "parser", "stream", "file", "large", "utility"],
+                params=[
+                    OperationParam(
+                        "source", "str | file", "Path under BIOINFO_DATA_DIR, file, or lines"
+                    ),
+                ],
+                returns="Iterator of FastaRecord objects",
+                example=(
+                    'for rec in fmt.iter_fasta("/data/proteome.fa.gz"):\n'
+                    '    print(rec.id, rec.length)'
+                ),
+            ),
+            Operation(
+                name="fmt.fasta_index",
+                module="format_utils",
+                method="fmt.FastaIndex.open(path)",
+                description=(
+                    "Random access to a sequence region by name "
+                    "via a .fai index (built on first use)"
+                ),
+                tags=["format", "fasta", "index", "faidx", "region", "file", "large", "utility"],
+                params=[
+                    OperationParam("path", "str", "Uncompressed FASTA path under BIOINFO_DATA_DIR"),
+                ],
+                returns="FastaIndex with names, length(name), fetch(name, start, end), get(name)",
+                example=(
+                    'with fmt.FastaIndex.open("/data/genome.fa") as fa:\n'
+                    '    region = fa.fetch("chr1", 100000, 100500)'
+                ),
+            ),
+            Operation(
+                name="fmt.iter_gff",
+                module="format_utils",
+                method="fmt.iter_gff(source)",
+                description=(
+                    "Stream GFF3 records from a file path (plain or gzip), open file, mmap or lines"
+                ),
+                tags=[
+                    "format", "gff", "annotation", "parser", "stream", "file", "large", "utility",
+                ],
+                params=[
+                    OperationParam(
+                        "source", "str | file", "Path under BIOINFO_DATA_DIR, file, or lines"
+                    ),
+                ],
+                returns="Iterator of GFFRecord objects",
+                example=(
+                    'genes = [f for f in fmt.iter_gff("/data/genes.gff3.gz") '
+                    'if f.feature_type == "gene"]'
+                ),
+            ),
+            Operation(
+                name="fmt.gff_columns",
+                module="format_utils",
+                method="fmt.gff_columns(source, attributes=())",
+                description="Read GFF3 features into NumPy columns for vectorized filtering",
+                tags=[
+                    "format", "gff", "annotation", "columnar", "numpy", "file", "large", "utility",
+                ],
+                params=[
+                    OperationParam(
+                        "source", "str | file", "Path under BIOINFO_DATA_DIR, file, or lines"
+                    ),
+                    OperationParam(
+                        "attributes", "list", "Attribute keys to extract as columns", required=False
+                    ),
+                ],
+                returns="Dict of column → NumPy array (seqid, type, start, end, strand, ...)",
+                example='cols = fmt.gff_columns("/data/genes.gff3", attributes=["ID"])',
+            ),
+            Operation(
+                name="fmt.iter_bed",
+                module="format_utils",
+                method="fmt.iter_bed(source)",
+                description=(
+                    "Stream BED records from a file path (plain or gzip), open file, mmap or lines"
+                ),
+                tags=["format", "bed", "genomic", "parser", "stream", "file", "large", "utility"],
+                params=[
+                    OperationParam(
+                        "source", "str | file", "Path under BIOINFO_DATA_DIR, file, or lines"
+                    ),
+                ],
+                returns="Iterator of BEDRecord objects",
+                example='total = sum(r.length for r in fmt.iter_bed("/data/peaks.bed.gz"))',
+            ),
+            Operation(
+                name="fmt.bed_columns",
+                module="format_utils",
+                method="fmt.bed_columns(source)",
+                description=(
+                    "Read BED intervals into NumPy columns (chrom, start, end, name, score, strand)"
+                ),
+                tags=["format", "bed", "genomic", "columnar", "numpy", "file", "large", "utility"],
+                params=[
+                    OperationParam(
+                        "source", "str | file", "Path under BIOINFO_DATA_DIR, file, or lines"
+                    ),
+                ],
+                returns="Dict of column → NumPy array",
+                example=(
+                    'cols = fmt.bed_columns("/data/peaks.bed")\n'
+                    'widths = cols["end"] - cols["start"]'
+                ),
+            ),
             Operation(
                 name="fmt.parse_clustal",
                 module="format_utils",
@@ -747,4 +1187,4 @@ class Registry:
                 example='alignment = fmt.parse_clustal(clustal_text)',
             ),
         ]
-        self._operations.extend(ops)
+        self.register_many(ops)
@@ -7,29 +7,140 @@ pre-loaded bioinformatics API clients and utilities.
 Design principles (from Cloudflare Code Mode & Ronacher's Code MCPs):
 - Stateful: `state` dict persists across executions within a session
 - Pre-loaded: API clients and helpers are available without imports
-- Sandboxed: Restricted builtins prevent file/network/OS access outside APIs
+- Sandboxed: Restricted builtins prevent file/network/OS access outside APIs,
+  and private, dunder and frame attributes are rejected so agent code cannot
+  walk from an exposed object back to module globals
 - Async-native: All API calls use async/await
 """
 
 from __future__ import annotations
 
+import ast
 import asyncio
 import io
 import json
 import traceback
-from contextlib import redirect_stdout
+from collections.abc import Iterable
+from types import SimpleNamespace
 from typing import Any
 
 from .apis.blast import BLASTClient
 from .apis.ensembl import EnsemblClient
 from .apis.ncbi import NCBIClient
 from .apis.pdb import PDBClient
+from .apis.transport import get_shared_transport
 from .apis.uniprot import UniProtClient
 from .config import ServerConfig
 from .utils import formats as fmt_module
 from .utils import sequence as seq_module
 
 
+# What agent code sees as ``fmt``, ``asyncio`` and ``json``. Modules are never
+# exposed directly: their own imports (os, codecs, subprocess helpers) and
+# ``restrict_paths`` would be reachable as attributes.
+_FMT_EXPORTS = (
+    "FastaRecord",
+    "GFFRecord",
+    "BEDRecord",
+    "FaiEntry",
+    "FastaIndex",
+    "parse_fasta",
+    "iter_fasta",
+    "write_fasta",
+    "parse_gff",
+    "iter_gff",
+    "gff_columns",
+    "parse_bed",
+    "iter_bed",
+    "bed_columns",
+    "parse_clustal",
+)
+_ASYNCIO_EXPORTS = (
+    "gather",
+    "sleep",
+    "wait",
+    "wait_for",
+    "as_completed",
+    "create_task",
+    "Semaphore",
+    "Lock",
+    "Event",
+    "Queue",
+    "TimeoutError",
+    "CancelledError",
+)
+_JSON_EXPORTS = ("dumps", "loads", "JSONDecodeError")
+
+# Attribute names agent code may not use, checked in the source before it runs
+# and again in getattr/setattr/vars. Private and dunder names lead from any
+# function back to its module globals (``f.__globals__``) and into host
+# internals (``uniprot._http``); frame, code and loop attributes do the same
+# from generators, coroutines and tasks; the numpy array methods write files.
+_BLOCKED_ATTRIBUTES = frozenset({
+    "gi_frame", "gi_code", "cr_frame", "cr_code", "ag_frame", "ag_code",
+    "f_globals", "f_locals", "f_builtins", "f_back", "f_code",
+    "tb_frame", "tb_next", "get_loop", "get_coro",
+    "tofile", "dump",
+})
+
+
+def _is_blocked_attribute(name: str) -> bool:
+    return name.startswith("_") or name in _BLOCKED_ATTRIBUTES
+
+
+def _namespace(module: Any, names: Iterable[str]) -> SimpleNamespace:
+    return SimpleNamespace(**{name: getattr(module, name) for name in names})
+
+
+def _public_names(module: Any) -> list[str]:
+    """Public functions and classes defined in ``module`` itself, not imported."""
+    return [
+        name for name, value in vars(module).items()
+        if not name.startswith("_") and getattr(value, "__module__", None) == module.__name__
+    ]
+
+
+class SandboxAccessError(Exception):
+    """Agent code referenced an attribute or name the sandbox does not expose."""
+
+
+def _check_source(tree: ast.AST) -> None:
+    """Reject blocked attribute access and dunder names before the code runs.
+
+    Line numbers are reported against the agent's code, not the wrapper.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute):
+            names = [node.attr]
+        elif isinstance(node, ast.MatchClass):
+            names = node.kwd_attrs
+        elif isinstance(node, ast.Name) and node.id.startswith("__"):
+            raise SandboxAccessError(f"name '{node.id}' is not available (line {node.lineno - 1})")
+        else:
+            continue
+        for name in names:
+            if _is_blocked_attribute(name):
+                raise SandboxAccessError(
+                    f"attribute '{name}' is not accessible (line {node.lineno - 1})"
+                )
+
+
+def _guarded_getattr(obj: Any, name: str, *default: Any) -> Any:
+    if isinstance(name, str) and _is_blocked_attribute(name):
+        raise AttributeError(f"attribute '{name}' is not accessible in the sandbox")
+    return getattr(obj, name, *default)
+
+
+def _guarded_setattr(obj: Any, name: str, value: Any) -> None:
+    if isinstance(name, str) and _is_blocked_attribute(name):
+        raise AttributeError(f"attribute '{name}' is not accessible in the sandbox")
+    setattr(obj, name, value)
+
+
+def _guarded_vars(obj: Any) -> dict[str, Any]:
+    return {name: value for name, value in vars(obj).items() if not _is_blocked_attribute(name)}
+
+
 # Restricted builtins — allow standard computation, block dangerous ops
 _SAFE_BUILTINS: dict[str, Any] = {
     # Types and constructors
@@ -83,13 +194,13 @@ _SAFE_BUILTINS: dict[str, Any] = {
     "isinstance": isinstance,
     "issubclass": issubclass,
     "hasattr": hasattr,
-    "getattr": getattr,
-    "setattr": setattr,
+    "getattr": _guarded_getattr,
+    "setattr": _guarded_setattr,
     "callable": callable,
     "id": id,
     "hash": hash,
     "dir": dir,
-    "vars": vars,
+    "vars": _guarded_vars,
     # I/O (print only — captured)
     "print": print,
     # Exceptions
@@ -102,7 +213,7 @@ _SAFE_BUILTINS: dict[str, Any] = {
     "StopIteration": StopIteration,
     "AttributeError": AttributeError,
     # JSON
-    "json": json,
+    "json": _namespace(json, _JSON_EXPORTS),
 }
 
 
@@ -186,25 +297,40 @@ class Sandbox:
         self.config = config
         self.state: dict[str, Any] = {}
 
-        # Pre-instantiate API clients
+        # Pre-instantiate API clients on the process-wide connection pool so
+        # keep-alive connections and rate limits span all sessions
+        self.http = get_shared_transport(config)
+        timeout = config.http_timeout_seconds
+        batch_window = config.batch_window_ms / 1000
         self.ncbi = NCBIClient(
             email=config.ncbi_email,
             api_key=config.ncbi_api_key,
-            timeout=config.http_timeout_seconds,
+            timeout=timeout,
+            http=self.http,
+            batch_window=batch_window,
         )
-        self.uniprot = UniProtClient(timeout=config.http_timeout_seconds)
-        self.pdb = PDBClient(timeout=config.http_timeout_seconds)
-        self.ensembl = EnsemblClient(timeout=config.http_timeout_seconds)
-        self.blast = BLASTClient(timeout=config.http_timeout_seconds)
+        self.uniprot = UniProtClient(timeout=timeout, http=self.http, batch_window=batch_window)
+        self.pdb = PDBClient(timeout=timeout, http=self.http)
+        self.ensembl = EnsemblClient(timeout=timeout, http=self.http)
+        self.blast = BLASTClient(timeout=timeout, http=self.http)
 
     def reset_state(self) -> None:
         """Clear all persistent state."""
         self.state.clear()
 
-    def _build_globals(self) -> dict[str, Any]:
-        """Build the execution namespace with API clients, utils, and builtins."""
+    def _build_globals(self, stdout: io.StringIO) -> dict[str, Any]:
+        """Build the execution namespace with API clients, utils, and builtins.
+
+        ``print`` is bound to this execution's ``stdout`` buffer rather than
+        redirecting ``sys.stdout``, so concurrent executions never interleave.
+        """
+
+        def _print(*args: Any, **kwargs: Any) -> None:
+            kwargs["file"] = stdout
+            print(*args, **kwargs)
+
         return {
-            "__builtins__": _SAFE_BUILTINS,
+            "__builtins__": {**_SAFE_BUILTINS, "print": _print},
             # API clients — agents call these with await
             "ncbi": self.ncbi,
             "uniprot": self.uniprot,
@@ -212,12 +338,13 @@ class Sandbox:
             "ensembl": self.ensembl,
             "blast": self.blast,
             # Utilities — synchronous helpers
-            "seq_utils": seq_module,
-            "fmt": fmt_module,
+            "seq_utils": _namespace(seq_module, _public_names(seq_module)),
+            # Fresh per execution so attributes set by one run never leak
+            "fmt": _namespace(fmt_module, _FMT_EXPORTS),
             # Persistent state dict
             "state": self.state,
             # Async support
-            "asyncio": asyncio,
+            "asyncio": _namespace(asyncio, _ASYNCIO_EXPORTS),
         }
 
     async def execute(self, code: str) -> ExecutionResult:
@@ -237,19 +364,21 @@ class Sandbox:
         indented = "\n".join(f"    {line}" for line in code.splitlines())
         wrapped = f"async def __sandbox_main__():\n{indented}"
 
-        exec_globals = self._build_globals()
         stdout_capture = io.StringIO()
+        exec_globals = self._build_globals(stdout_capture)
 
         try:
-            # Compile the wrapped code
-            compiled = compile(wrapped, "<sandbox>", "exec")
+            # Parse and vet the wrapped code before anything runs
+            tree = ast.parse(wrapped, "<sandbox>")
+            _check_source(tree)
+            compiled = compile(tree, "<sandbox>", "exec")
 
             # Execute to define the function
             exec(compiled, exec_globals)  # noqa: S102
 
             # Run the async function with stdout capture and timeout
             async_fn = exec_globals["__sandbox_main__"]
-            with redirect_stdout(stdout_capture):
+            with fmt_module.restrict_paths(self.config.data_dirs):
                 result = await asyncio.wait_for(
                     async_fn(),
                     timeout=self.config.execution_timeout_seconds,
@@ -279,6 +408,12 @@ class Sandbox:
                 stdout=stdout_capture.getvalue(),
                 error=f"SyntaxError: {e.msg} (line {e.lineno})",
             )
+        except SandboxAccessError as e:
+            return ExecutionResult(
+                success=False,
+                stdout=stdout_capture.getvalue(),
+                error=f"SandboxAccessError: {e}",
+            )
         except Exception as e:
             tb = traceback.format_exc()
             # Clean up sandbox wrapper from traceback
@@ -300,7 +435,7 @@ class Sandbox:
         This is included in the MCP tool description so agents know
         what they can use in their generated code.
         """
-        return """Available in the execution environment:
+        description = """Available in the execution environment:
 
 ## API Clients (async — use `await`)
 - `ncbi` — NCBI Entrez (PubMed, Gene, Nucleotide, Protein)
@@ -310,8 +445,11 @@ class Sandbox:
 - `blast` — NCBI BLAST (sequence similarity search)
 
 ## Utilities (synchronous)
-- `seq_utils` — reverse_complement, translate, gc_content, find_orfs, restriction_sites, molecular_weight
+- `seq_utils` — reverse_complement, translate, gc_content, find_orfs, six_frame_orfs,
+  restriction_sites, molecular_weight (vectorized for long sequences)
 - `fmt` — parse_fasta, write_fasta, parse_gff, parse_bed, parse_clustal
+- `fmt` (files under BIOINFO_DATA_DIR, plain or .gz) — iter_fasta, iter_gff, iter_bed,
+  gff_columns, bed_columns (NumPy), FastaIndex.open(path).fetch(name, start, end)
 
 ## State
 - `state` — persistent dict across executions (e.g., state["last_result"] = ...)
@@ -326,3 +464,15 @@ class Sandbox:
 - Return a value to send it back as the result
 - Use `state` to persist data between executions
 - Use `print()` for intermediate output"""
+
+        cache = self.http.cache
+        if cache is not None:
+            stats = cache.summary()
+            mode = "OFFLINE — only cached responses available" if stats["offline"] else "on"
+            description += (
+                f"\n\n## Response cache ({mode})\n"
+                f"- {stats['entries']} cached responses ({stats['bytes'] // 1024} KiB)\n"
+                f"- This process: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['revalidated']} revalidated (hit rate {stats['hit_rate']:.0%})"
+            )
+        return description
@@ -38,6 +38,7 @@ from typing import Any
 from .config import load_config
 from .registry import Registry
 from .sandbox import Sandbox
+from .workers import WorkerPool
 
 logger = logging.getLogger("bioinfo-code-mcp")
 
@@ -58,6 +59,8 @@ def create_server():
     config = load_config()
     registry = Registry()
     sandbox = Sandbox(config)
+    # With SANDBOX_WORKERS set, code runs in isolated worker processes
+    pool = WorkerPool(config) if config.sandbox_workers > 0 else None
 
     server = Server("bioinfo-code-mcp")
 
@@ -205,10 +208,14 @@ def create_server():
         if not code.strip():
             return [TextContent(type="text", text="Error: No code provided")]
 
-        if args.get("reset_state"):
-            sb.reset_state()
-
-        result = await sb.execute(code)
+        if pool is not None:
+            result = await pool.execute(
+                "default", code, reset_state=bool(args.get("reset_state"))
+            )
+        else:
+            if args.get("reset_state"):
+                sb.reset_state()
+            result = await sb.execute(code)
         return [TextContent(type="text", text=result.to_text())]
 
     return server, config
@@ -0,0 +1,278 @@
+"""Vectorized sequence operations for large (chromosome-scale) inputs.
+
+NumPy/bytes-backed counterparts of the helpers in ``sequence.py``. They
+return exactly the same results, but work on ``uint8`` arrays instead of
+per-character Python loops:
+
+- Bases are encoded once through a 256-entry lookup table (T/C/A/G → 0-3,
+  anything else → 4), so case-folding and validation cost one pass.
+- Codons become base-5 integers (0-124) and are translated with a single
+  table gather, so an unknown base yields ``X`` without any branching.
+- ORFs are found per frame from vectorized start/stop masks and a
+  ``searchsorted`` pairing of each ATG with its next in-frame stop.
+- Restriction sites are matched as packed 2-bit k-mers, one rolling pass
+  per distinct site length shared by every enzyme of that length.
+
+``sequence.py`` dispatches to these automatically above
+``VECTORIZE_THRESHOLD`` bases; they can also be called directly.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+import numpy as np
+
+from .sequence import COMMON_ENZYMES
+
+# NCBI standard genetic code (table 1), codons enumerated in TCAG order
+_BASES = b"TCAG"
+_AMINO_ACIDS = "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"
+
+_BASE_CODES = np.full(256, 4, dtype=np.uint8)
+for _code, _base in enumerate(_BASES):
+    _BASE_CODES[_base] = _code
+    _BASE_CODES[_base + 32] = _code  # lowercase
+
+# Complement in code space: T<->A, C<->G, unknown stays unknown
+_COMPLEMENT_CODES = np.array([2, 3, 0, 1, 4], dtype=np.uint8)
+
+# Base-5 codon index → amino acid byte; any codon with an unknown base → X
+_AA_TABLE = np.full(125, ord("X"), dtype=np.uint8)
+for _i, _aa in enumerate(_AMINO_ACIDS):
+    _AA_TABLE[(_i // 16) * 25 + (_i // 4 % 4) * 5 + _i % 4] = ord(_aa)
+
+
+def _codon_index(codon: str) -> int:
+    c1, c2, c3 = (_BASES.index(b) for b in codon.encode())
+    return c1 * 25 + c2 * 5 + c3
+
+
+START_CODON = _codon_index("ATG")
+STOP_CODONS = np.array([_codon_index(c) for c in ("TAA", "TAG", "TGA")], dtype=np.int16)
+
+# Bases per chunk for k-mer scanning (bounds temporary array size)
+_CHUNK = 1 << 22
+
+# Largest k-mer length matched through a dense 4**k membership table
+_TABLE_MAX_K = 11
+
+_FIXED_SITE = re.compile(r"[ACGT]{1,16}")
+
+
+def as_bytes(seq: str | bytes) -> bytes:
+    """Return the sequence as ASCII bytes (non-ASCII characters become ``?``)."""
+    if isinstance(seq, bytes):
+        return seq
+    return seq.encode("ascii", "replace")
+
+
+def encode(seq: str | bytes) -> np.ndarray:
+    """Encode a nucleotide sequence as ``uint8`` codes (T=0, C=1, A=2, G=3, other=4)."""
+    return _BASE_CODES[np.frombuffer(as_bytes(seq), dtype=np.uint8)]
+
+
+def codon_indices(codes: np.ndarray, frame: int = 0) -> np.ndarray:
+    """Return base-5 codon indices (0-124) for every complete codon in a frame."""
+    n = max(0, (len(codes) - frame) // 3)
+    triplets = codes[frame : frame + 3 * n].reshape(n, 3).astype(np.int16)
+    return triplets[:, 0] * 25 + triplets[:, 1] * 5 + triplets[:, 2]
+
+
+def gc_content(seq: str | bytes) -> float:
+    """Calculate GC content (fraction of A/T/C/G/U bases that are G or C)."""
+    counts = np.bincount(np.frombuffer(as_bytes(seq), dtype=np.uint8), minlength=256)
+    gc = sum(int(counts[ord(b)]) for b in "GCgc")
+    total = sum(int(counts[ord(b)]) for b in "ATCGUatcgu")
+    return gc / total if total > 0 else 0.0
+
+
+def translate(dna: str | bytes, reading_frame: int = 0) -> str:
+    """Translate DNA to protein with a single lookup-table gather."""
+    if reading_frame < 0:
+        raise ValueError("reading_frame must be non-negative")
+    return _AA_TABLE[codon_indices(encode(dna), reading_frame)].tobytes().decode("ascii")
+
+
+def _frame_orfs(codons: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Pair ATGs with their next in-frame stop, scanning left to right.
+
+    Matches the greedy scan in ``sequence.find_orfs``: the first ATG before
+    a stop opens an ORF, nested ATGs are skipped, and scanning resumes after
+    the stop. Returns codon indices of each ORF's start and stop.
+    """
+    starts = np.flatnonzero(codons == START_CODON)
+    stops = np.flatnonzero(np.isin(codons, STOP_CODONS))
+    if len(starts) == 0 or len(stops) == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    next_stop = np.searchsorted(stops, starts, side="right")
+    has_stop = next_stop < len(stops)
+    starts, next_stop = starts[has_stop], next_stop[has_stop]
+
+    # Only the first ATG sharing a given stop starts an ORF
+    first = np.ones(len(next_stop), dtype=bool)
+    first[1:] = next_stop[1:] != next_stop[:-1]
+    return starts[first], stops[next_stop[first]]
+
+
+def _strand_orfs(codes: np.ndarray, min_length: int) -> list[tuple[int, int, int, str]]:
+    """Return ``(start, end, frame, protein)`` for ORFs on one strand."""
+    found: list[tuple[int, int, int, str]] = []
+    min_codons = -(-min_length // 3)
+    for frame in range(3):
+        codons = codon_indices(codes, frame)
+        starts, stops = _frame_orfs(codons)
+        keep = (stops - starts + 1) >= min_codons
+        if not keep.any():
+            continue
+        protein = _AA_TABLE[codons].tobytes()
+        for k, s in zip(starts[keep].tolist(), stops[keep].tolist(), strict=True):
+            found.append(
+                (frame + 3 * k, frame + 3 * s + 3, frame, protein[k : s + 1].decode("ascii"))
+            )
+    return found
+
+
+def find_orfs(dna: str | bytes, min_length: int = 100) -> list[dict[str, Any]]:
+    """Find forward-strand open reading frames (same output as ``sequence.find_orfs``).
+
+    Args:
+        dna: DNA sequence.
+        min_length: Minimum ORF length in nucleotides (including the stop codon).
+
+    Returns:
+        List of dicts with 'start', 'end', 'length', 'frame', 'protein',
+        longest first.
+    """
+    orfs = [
+        {"start": start, "end": end, "length": end - start, "frame": frame, "protein": protein}
+        for start, end, frame, protein in _strand_orfs(encode(dna), min_length)
+    ]
+    return sorted(orfs, key=lambda x: x["length"], reverse=True)
+
+
+def six_frame_orfs(dna: str | bytes, min_length: int = 100) -> list[dict[str, Any]]:
+    """Find open reading frames in all six frames (both strands).
+
+    Reverse-strand coordinates are reported on the forward strand, so
+    ``dna[start:end]`` always spans the ORF.
+
+    Args:
+        dna: DNA sequence.
+        min_length: Minimum ORF length in nucleotides (including the stop codon).
+
+    Returns:
+        List of dicts with 'start', 'end', 'length', 'strand' ("+"/"-"),
+        'frame' (0-2 on that strand) and 'protein', longest first.
+    """
+    codes = encode(dna)
+    size = len(codes)
+    orfs = [
+        {"start": start, "end": end, "length": end - start, "strand": "+",
+         "frame": frame, "protein": protein}
+        for start, end, frame, protein in _strand_orfs(codes, min_length)
+    ]
+    reverse = _COMPLEMENT_CODES[codes[::-1]]
+    orfs.extend(
+        {"start": size - end, "end": size - start, "length": end - start, "strand": "-",
+         "frame": frame, "protein": protein}
+        for start, end, frame, protein in _strand_orfs(reverse, min_length)
+    )
+    return sorted(orfs, key=lambda x: x["length"], reverse=True)
+
+
+def _kmer_hits(codes: np.ndarray, k: int, targets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return positions and packed codes of every k-mer equal to one of ``targets``."""
+    positions: list[np.ndarray] = []
+    values: list[np.ndarray] = []
+    # Membership via a dense lookup table when it fits (4**11 = 4 MB)
+    table: np.ndarray | None = None
+    if k <= _TABLE_MAX_K:
+        table = np.zeros(4**k, dtype=bool)
+        table[targets] = True
+    windows = len(codes) - k + 1
+    for lo in range(0, max(windows, 0), _CHUNK):
+        hi = min(windows, lo + _CHUNK)
+        chunk = codes[lo : hi + k - 1]
+        packed = chunk & 3
+        kmers = packed[: hi - lo].astype(np.uint32)
+        for j in range(1, k):
+            kmers <<= 2
+            kmers |= packed[j : j + hi - lo]
+        hits = np.flatnonzero(table[kmers] if table is not None else np.isin(kmers, targets))
+
+        # Drop windows containing a non-ACGT base (rare, so check hits only)
+        unknown = chunk == 4
+        if len(hits) and unknown.any():
+            seen = np.concatenate(([0], np.cumsum(unknown, dtype=np.int64)))
+            hits = hits[seen[hits + k] == seen[hits]]
+
+        positions.append(hits + lo)
+        values.append(kmers[hits])
+    if not positions:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty.astype(np.uint32)
+    return np.concatenate(positions), np.concatenate(values)
+
+
+def _non_overlapping(positions: np.ndarray, k: int) -> list[int]:
+    """Drop overlapping hits the way ``re.finditer`` would."""
+    if len(positions) < 2 or np.all(np.diff(positions) >= k):
+        return positions.tolist()
+    kept: list[int] = []
+    for pos in positions.tolist():
+        if not kept or pos >= kept[-1] + k:
+            kept.append(pos)
+    return kept
+
+
+def restriction_sites(
+    seq: str | bytes, enzyme_patterns: dict[str, str] | None = None
+) -> dict[str, list[int]]:
+    """Find restriction enzyme sites (same output as ``sequence.restriction_sites``).
+
+    Plain ``ACGT`` recognition sites (up to 16 bp) are matched as packed
+    k-mers, one pass per distinct site length; any other pattern is
+    treated as a regular expression, as in ``sequence.restriction_sites``.
+
+    Args:
+        seq: DNA sequence.
+        enzyme_patterns: Dict of enzyme_name → recognition sequence.
+            Defaults to ``COMMON_ENZYMES``.
+
+    Returns:
+        Dict mapping enzyme name to list of cut positions.
+    """
+    if enzyme_patterns is None:
+        enzyme_patterns = COMMON_ENZYMES
+    raw = as_bytes(seq)
+    upper: bytes | None = None
+
+    by_length: dict[int, dict[int, list[str]]] = {}
+    found: dict[str, list[int]] = {}
+    for name, pattern in enzyme_patterns.items():
+        if _FIXED_SITE.fullmatch(pattern):
+            packed = 0
+            for base in encode(pattern).tolist():
+                packed = (packed << 2) | base
+            by_length.setdefault(len(pattern), {}).setdefault(packed, []).append(name)
+        else:
+            if upper is None:
+                upper = raw.upper()
+            found[name] = [m.start() for m in re.finditer(pattern.encode(), upper)]
+
+    codes = encode(raw) if by_length else np.empty(0, dtype=np.uint8)
+    for k, names_by_code in by_length.items():
+        positions, values = _kmer_hits(
+            codes, k, np.array(list(names_by_code), dtype=np.uint32)
+        )
+        for packed, names in names_by_code.items():
+            hits = _non_overlapping(positions[values == packed], k)
+            for name in names:
+                found[name] = hits
+
+    # Preserve the caller's enzyme order and omit enzymes with no sites
+    return {name: found[name] for name in enzyme_patterns if found.get(name)}
@@ -2,15 +2,92 @@
 
 Lightweight parsers for common formats (FASTA, GenBank, GFF, BED) that
 agents can use to process data returned from API calls.
+
+``parse_*`` take an in-memory string and return a list. For large files
+use the streaming ``iter_fasta`` / ``iter_gff`` / ``iter_bed`` (one record
+at a time from a path, gzip stream, open file, mmap or iterable of lines),
+``gff_columns`` / ``bed_columns`` (NumPy columns instead of objects), and
+``FastaIndex`` (``.fai`` random access to one sequence by name).
+
+Inside the sandbox, paths are only readable under the directories set by
+``restrict_paths`` (``BIOINFO_DATA_DIR``).
 """
 
 from __future__ import annotations
 
+import gzip
+import io
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Any
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+
+# Anything the streaming parsers accept: a path (plain or .gz), an open
+# text/binary file, an mmap, or an iterable of lines
+Source = str | os.PathLike | IO[Any] | mmap.mmap | Iterable[str]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Directories paths may be read from; None means unrestricted
+_data_roots: ContextVar[tuple[Path, ...] | None] = ContextVar("data_roots", default=None)
+
+
+@contextmanager
+def restrict_paths(roots: Iterable[str | os.PathLike]) -> Iterator[None]:
+    """Only allow file paths under ``roots`` within this context.
+
+    The sandbox wraps each execution in this so agent code can read data
+    files from ``BIOINFO_DATA_DIR`` but nothing else. An empty ``roots``
+    blocks path access entirely; in-memory sources are unaffected.
+    """
+    token = _data_roots.set(tuple(Path(r).resolve() for r in roots))
+    try:
+        yield
+    finally:
+        _data_roots.reset(token)
+
+
+def _check_path(path: str | os.PathLike) -> Path:
+    resolved = Path(path).expanduser().resolve()
+    roots = _data_roots.get()
+    if roots is not None and not any(resolved.is_relative_to(root) for root in roots):
+        raise PermissionError(
+            f"{path}: file access is limited to BIOINFO_DATA_DIR"
+            + (f" ({', '.join(map(str, roots))})" if roots else " (not set)")
+        )
+    return resolved
+
+
+def _is_gzip(path: Path) -> bool:
+    with open(path, "rb") as fh:
+        return fh.read(2) == _GZIP_MAGIC
+
+
+def _iter_lines(source: Source) -> Iterator[str]:
+    """Yield text lines from any supported source, closing files we open."""
+    if isinstance(source, (str, os.PathLike)):
+        path = _check_path(source)
+        opener = gzip.open if _is_gzip(path) else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as fh:
+            yield from fh
+    elif isinstance(source, mmap.mmap):
+        source.seek(0)
+        for line in iter(source.readline, b""):
+            yield line.decode("utf-8", errors="replace")
+    elif isinstance(source, (io.RawIOBase, io.BufferedIOBase)):
+        yield from io.TextIOWrapper(source, encoding="utf-8", errors="replace")
+    else:
+        for line in source:
+            yield line.decode("utf-8", errors="replace") if isinstance(line, bytes) else line
 
 
-@dataclass
+@dataclass(slots=True)
 class FastaRecord:
     """A single FASTA record."""
 
@@ -50,32 +127,38 @@ def parse_fasta(text: str) -> list[FastaRecord]:
     Returns:
         List of FastaRecord objects.
     """
-    records: list[FastaRecord] = []
+    return list(iter_fasta(text.splitlines()))
+
+
+def iter_fasta(source: Source) -> Iterator[FastaRecord]:
+    """Stream FASTA records from a file, gzip stream, mmap or lines.
+
+    Only one record is held in memory at a time.
+
+    Args:
+        source: Path (``.gz`` detected automatically), open file, mmap,
+            or iterable of lines.
+
+    Yields:
+        FastaRecord objects in file order.
+    """
     current_header = ""
     current_seq_parts: list[str] = []
 
-    for line in text.strip().splitlines():
+    for line in _iter_lines(source):
         line = line.strip()
         if not line:
             continue
         if line.startswith(">"):
             if current_header or current_seq_parts:
-                records.append(FastaRecord(
-                    header=current_header,
-                    sequence="".join(current_seq_parts),
-                ))
+                yield FastaRecord(header=current_header, sequence="".join(current_seq_parts))
             current_header = line[1:].strip()
             current_seq_parts = []
         else:
             current_seq_parts.append(line)
 
     if current_header or current_seq_parts:
-        records.append(FastaRecord(
-            header=current_header,
-            sequence="".join(current_seq_parts),
-        ))
-
-    return records
+        yield FastaRecord(header=current_header, sequence="".join(current_seq_parts))
 
 
 def write_fasta(records: list[FastaRecord], line_width: int = 80) -> str:
@@ -97,7 +180,7 @@ def write_fasta(records: list[FastaRecord], line_width: int = 80) -> str:
     return "\n".join(lines) + "\n"
 
 
-@dataclass
+@dataclass(slots=True)
 class GFFRecord:
     """A single GFF3/GTF record."""
 
@@ -134,24 +217,44 @@ def parse_gff(text: str) -> list[GFFRecord]:
     Returns:
         List of GFFRecord objects.
     """
-    records: list[GFFRecord] = []
-    for line in text.strip().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        parts = line.split("\t")
-        if len(parts) < 9:
-            continue
+    return list(iter_gff(text.splitlines()))
+
+
+def _gff_fields(line: str) -> list[str] | None:
+    """Split a GFF data line into its 9 columns, or None for other lines."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    parts = line.split("\t")
+    return parts if len(parts) >= 9 else None
 
-        # Parse attributes (key=value pairs separated by ;)
-        attrs: dict[str, str] = {}
-        for attr in parts[8].split(";"):
-            attr = attr.strip()
-            if "=" in attr:
-                k, v = attr.split("=", 1)
-                attrs[k.strip()] = v.strip()
 
-        records.append(GFFRecord(
+def _gff_attributes(column: str) -> dict[str, str]:
+    # Parse attributes (key=value pairs separated by ;)
+    attrs: dict[str, str] = {}
+    for attr in column.split(";"):
+        attr = attr.strip()
+        if "=" in attr:
+            k, v = attr.split("=", 1)
+            attrs[k.strip()] = v.strip()
+    return attrs
+
+
+def iter_gff(source: Source) -> Iterator[GFFRecord]:
+    """Stream GFF3 records from a file, gzip stream, mmap or lines.
+
+    Args:
+        source: Path (``.gz`` detected automatically), open file, mmap,
+            or iterable of lines.
+
+    Yields:
+        GFFRecord objects in file order.
+    """
+    for line in _iter_lines(source):
+        parts = _gff_fields(line)
+        if parts is None:
+            continue
+        yield GFFRecord(
             seqid=parts[0],
             source=parts[1],
             feature_type=parts[2],
@@ -160,12 +263,46 @@ def parse_gff(text: str) -> list[GFFRecord]:
             score=parts[5],
             strand=parts[6],
             phase=parts[7],
-            attributes=attrs,
-        ))
-    return records
+            attributes=_gff_attributes(parts[8]),
+        )
+
+
+def gff_columns(source: Source, attributes: Iterable[str] = ()) -> dict[str, np.ndarray]:
+    """Read GFF3 features into NumPy columns instead of record objects.
 
+    Far more compact than a list of GFFRecord for genome-wide annotation,
+    and ready for vectorized filtering (e.g. ``cols["type"] == "gene"``).
 
-@dataclass
+    Args:
+        source: Path (``.gz`` detected automatically), open file, mmap,
+            or iterable of lines.
+        attributes: Attribute keys to extract as extra columns (missing
+            values become "").
+
+    Returns:
+        Dict of column name → array: seqid, source, type, score, strand,
+        phase (str), start, end (int64), plus one str column per attribute.
+    """
+    wanted = list(attributes)
+    names = ["seqid", "source", "type", "start", "end", "score", "strand", "phase"]
+    columns: dict[str, list[Any]] = {name: [] for name in names + wanted}
+    for line in _iter_lines(source):
+        parts = _gff_fields(line)
+        if parts is None:
+            continue
+        for name, value in zip(names, parts, strict=False):
+            columns[name].append(value)
+        if wanted:
+            attrs = _gff_attributes(parts[8])
+            for key in wanted:
+                columns[key].append(attrs.get(key, ""))
+    return {
+        name: np.array(values, dtype=np.int64 if name in ("start", "end") else str)
+        for name, values in columns.items()
+    }
+
+
+@dataclass(slots=True)
 class BEDRecord:
     """A single BED record."""
 
@@ -201,13 +338,38 @@ def parse_bed(text: str) -> list[BEDRecord]:
     Returns:
         List of BEDRecord objects.
     """
-    records: list[BEDRecord] = []
-    for line in text.strip().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or line.startswith("track") or line.startswith("browser"):
-            continue
-        parts = line.split("\t")
-        if len(parts) < 3:
+    return list(iter_bed(text.splitlines()))
+
+
+def _bed_fields(line: str) -> list[str] | None:
+    """Split a BED data line into columns, or None for headers/comments."""
+    line = line.strip()
+    if not line or line.startswith("#") or line.startswith("track") or line.startswith("browser"):
+        return None
+    parts = line.split("\t")
+    return parts if len(parts) >= 3 else None
+
+
+def _bed_score(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def iter_bed(source: Source) -> Iterator[BEDRecord]:
+    """Stream BED records (BED3 through BED6) from a file, gzip stream, mmap or lines.
+
+    Args:
+        source: Path (``.gz`` detected automatically), open file, mmap,
+            or iterable of lines.
+
+    Yields:
+        BEDRecord objects in file order.
+    """
+    for line in _iter_lines(source):
+        parts = _bed_fields(line)
+        if parts is None:
             continue
         rec = BEDRecord(
             chrom=parts[0],
@@ -217,14 +379,218 @@ def parse_bed(text: str) -> list[BEDRecord]:
         if len(parts) > 3:
             rec.name = parts[3]
         if len(parts) > 4:
-            try:
-                rec.score = int(parts[4])
-            except ValueError:
-                pass
+            rec.score = _bed_score(parts[4])
         if len(parts) > 5:
             rec.strand = parts[5]
-        records.append(rec)
-    return records
+        yield rec
+
+
+def bed_columns(source: Source) -> dict[str, np.ndarray]:
+    """Read BED intervals into NumPy columns instead of record objects.
+
+    Args:
+        source: Path (``.gz`` detected automatically), open file, mmap,
+            or iterable of lines.
+
+    Returns:
+        Dict of column name → array: chrom, name, strand (str) and
+        start, end, score (int64). Missing optional columns take the
+        BEDRecord defaults.
+    """
+    chrom: list[str] = []
+    start: list[int] = []
+    end: list[int] = []
+    name: list[str] = []
+    score: list[int] = []
+    strand: list[str] = []
+    for line in _iter_lines(source):
+        parts = _bed_fields(line)
+        if parts is None:
+            continue
+        chrom.append(parts[0])
+        start.append(int(parts[1]))
+        end.append(int(parts[2]))
+        name.append(parts[3] if len(parts) > 3 else "")
+        score.append(_bed_score(parts[4]) if len(parts) > 4 else 0)
+        strand.append(parts[5] if len(parts) > 5 else ".")
+    return {
+        "chrom": np.array(chrom, dtype=str),
+        "start": np.array(start, dtype=np.int64),
+        "end": np.array(end, dtype=np.int64),
+        "name": np.array(name, dtype=str),
+        "score": np.array(score, dtype=np.int64),
+        "strand": np.array(strand, dtype=str),
+    }
+
+
+@dataclass(slots=True)
+class FaiEntry:
+    """One line of a samtools-style ``.fai`` index."""
+
+    name: str
+    length: int
+    offset: int
+    line_bases: int
+    line_width: int
+
+
+class FastaIndex:
+    """Random access to sequences in a FASTA file via a ``.fai`` index.
+
+    The index records where each sequence starts and its line layout, so
+    ``fetch`` seeks straight to the requested bases through an mmap
+    instead of scanning the file. Compatible with ``samtools faidx``.
+
+    Usage::
+
+        with fmt.FastaIndex.open("genome.fa") as fa:
+            region = fa.fetch("chr1", 1_000_000, 1_000_500)
+
+    Args:
+        path: Uncompressed FASTA file.
+        entries: Parsed index entries, in file order.
+    """
+
+    def __init__(self, path: str | os.PathLike, entries: list[FaiEntry]):
+        self.path = _check_path(path)
+        self._entries = {entry.name: entry for entry in entries}
+        self._file: IO[bytes] | None = None
+        self._mm: mmap.mmap | None = None
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> FastaIndex:
+        """Load ``<path>.fai``, building it first if missing or out of date."""
+        fasta = _check_path(path)
+        fai = fasta.with_name(fasta.name + ".fai")
+        if fai.exists() and fai.stat().st_mtime >= fasta.stat().st_mtime:
+            return cls.load(fasta, fai)
+        return cls.build(fasta)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, fai: str | os.PathLike | None = None) -> FastaIndex:
+        """Read an existing ``.fai`` file (default ``<path>.fai``)."""
+        fasta = _check_path(path)
+        fai_path = _check_path(fai) if fai is not None else fasta.with_name(fasta.name + ".fai")
+        entries = []
+        with open(fai_path, encoding="utf-8") as fh:
+            for line in fh:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) >= 5:
+                    entries.append(FaiEntry(parts[0], *(int(p) for p in parts[1:5])))
+        return cls(fasta, entries)
+
+    @classmethod
+    def build(cls, path: str | os.PathLike, *, write: bool = True) -> FastaIndex:
+        """Scan a FASTA file once and index it.
+
+        Args:
+            path: Uncompressed FASTA file.
+            write: Also save the index as ``<path>.fai``.
+
+        Raises:
+            ValueError: If the file is gzip-compressed, or a sequence has
+                lines of uneven length (other than its last line).
+        """
+        fasta = _check_path(path)
+        if _is_gzip(fasta):
+            raise ValueError(f"{path}: cannot index gzip-compressed FASTA; use iter_fasta")
+
+        entries: list[FaiEntry] = []
+        current: FaiEntry | None = None
+        ragged = False  # saw a short line; any further sequence line is an error
+        offset = 0
+        with open(fasta, "rb") as fh:
+            for line in fh:
+                size = len(line)
+                if line.startswith(b">"):
+                    words = line[1:].split(None, 1)
+                    name = words[0].decode("utf-8", errors="replace") if words else ""
+                    current = FaiEntry(name, 0, offset + size, 0, 0)
+                    entries.append(current)
+                    ragged = False
+                elif current is not None:
+                    bases = len(line.rstrip(b"\r\n"))
+                    if bases and ragged:
+                        raise ValueError(
+                            f"{path}: different line length in sequence '{current.name}'"
+                        )
+                    if current.line_bases == 0:
+                        current.line_bases, current.line_width = bases, size
+                    elif bases != current.line_bases or size != current.line_width:
+                        ragged = True
+                    current.length += bases
+                offset += size
+
+        index = cls(fasta, entries)
+        if write:
+            index.write(fasta.with_name(fasta.name + ".fai"))
+        return index
+
+    def write(self, fai: str | os.PathLike) -> None:
+        """Save the index in ``.fai`` format."""
+        with open(_check_path(fai), "w", encoding="utf-8") as fh:
+            for e in self._entries.values():
+                fh.write(f"{e.name}\t{e.length}\t{e.offset}\t{e.line_bases}\t{e.line_width}\n")
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def length(self, name: str) -> int:
+        """Length of a sequence in bases."""
+        return self._entry(name).length
+
+    def _entry(self, name: str) -> FaiEntry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Sequence '{name}' not in {self.path.name}") from None
+
+    def _map(self) -> mmap.mmap:
+        if self._mm is None:
+            # Re-checked here: ``path`` is a plain attribute and may have changed
+            self._file = open(_check_path(self.path), "rb")  # noqa: SIM115 — closed in close()
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def fetch(self, name: str, start: int = 0, end: int | None = None) -> str:
+        """Return bases ``[start, end)`` (0-based, half-open) of a sequence."""
+        entry = self._entry(name)
+        start = max(0, start)
+        end = entry.length if end is None else min(end, entry.length)
+        if start >= end:
+            return ""
+
+        def file_offset(pos: int) -> int:
+            row, col = divmod(pos, entry.line_bases)
+            return entry.offset + row * entry.line_width + col
+
+        raw = self._map()[file_offset(start) : file_offset(end - 1) + 1]
+        return raw.replace(b"\n", b"").replace(b"\r", b"").decode("ascii", errors="replace")
+
+    def get(self, name: str) -> FastaRecord:
+        """Return a whole sequence as a FastaRecord (header is the name only)."""
+        return FastaRecord(header=name, sequence=self.fetch(name))
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> FastaIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
 
 
 def parse_clustal(text: str) -> dict[str, str]:
@@ -2,6 +2,10 @@
 
 Provides common bioinformatics sequence operations that agents can call
 directly in generated code without re-implementing from scratch.
+
+``gc_content``, ``translate``, ``find_orfs`` and ``restriction_sites``
+switch to the NumPy implementations in ``fastseq.py`` for sequences of
+``VECTORIZE_THRESHOLD`` bases or more; results are identical either way.
 """
 
 from __future__ import annotations
@@ -32,6 +36,24 @@ CODON_TABLE: dict[str, str] = {
 
 COMPLEMENT_MAP = str.maketrans("ATCGatcg", "TAGCtagc")
 
+# Default recognition sites for restriction_sites()
+COMMON_ENZYMES: dict[str, str] = {
+    "EcoRI": "GAATTC",
+    "BamHI": "GGATCC",
+    "HindIII": "AAGCTT",
+    "NotI": "GCGGCCGC",
+    "XhoI": "CTCGAG",
+    "SalI": "GTCGAC",
+    "NdeI": "CATATG",
+    "BglII": "AGATCT",
+    "PstI": "CTGCAG",
+    "SmaI": "CCCGGG",
+}
+
+# Sequences at least this long use the vectorized fastseq implementations
+# (below it, NumPy setup costs more than the pure-Python loop)
+VECTORIZE_THRESHOLD = 10_000
+
 
 def reverse_complement(seq: str) -> str:
     """Return the reverse complement of a DNA sequence.
@@ -67,6 +89,10 @@ def translate(dna: str, reading_frame: int = 0) -> str:
     Returns:
         Protein sequence string (single-letter codes, * = stop).
     """
+    if len(dna) >= VECTORIZE_THRESHOLD and reading_frame >= 0:
+        from . import fastseq
+
+        return fastseq.translate(dna, reading_frame)
     seq = dna.upper()
     protein = []
     for i in range(reading_frame, len(seq) - 2, 3):
@@ -85,6 +111,10 @@ def gc_content(seq: str) -> float:
     Returns:
         GC content as a fraction (0.0 to 1.0).
     """
+    if len(seq) >= VECTORIZE_THRESHOLD:
+        from . import fastseq
+
+        return fastseq.gc_content(seq)
     seq = seq.upper()
     gc = sum(1 for b in seq if b in "GC")
     total = sum(1 for b in seq if b in "ATCGU")
@@ -157,6 +187,10 @@ def find_orfs(dna: str, min_length: int = 100) -> list[dict[str, Any]]:
     Returns:
         List of dicts with 'start', 'end', 'length', 'frame', 'protein'.
     """
+    if len(dna) >= VECTORIZE_THRESHOLD:
+        from . import fastseq
+
+        return fastseq.find_orfs(dna, min_length)
     seq = dna.upper()
     orfs = []
     for frame in range(3):
@@ -187,30 +221,39 @@ def find_orfs(dna: str, min_length: int = 100) -> list[dict[str, Any]]:
     return sorted(orfs, key=lambda x: x["length"], reverse=True)
 
 
+def six_frame_orfs(dna: str, min_length: int = 100) -> list[dict[str, Any]]:
+    """Find open reading frames on both strands (all six frames).
+
+    Args:
+        dna: DNA sequence string.
+        min_length: Minimum ORF length in nucleotides.
+
+    Returns:
+        List of dicts with 'start', 'end', 'length', 'strand', 'frame',
+        'protein'. Reverse-strand ORFs use forward-strand coordinates.
+    """
+    from . import fastseq
+
+    return fastseq.six_frame_orfs(dna, min_length)
+
+
 def restriction_sites(seq: str, enzyme_patterns: dict[str, str] | None = None) -> dict[str, list[int]]:
     """Find restriction enzyme cut sites in a DNA sequence.
 
     Args:
         seq: DNA sequence.
         enzyme_patterns: Dict of enzyme_name → recognition sequence.
-            Defaults to a small set of common enzymes.
+            Defaults to ``COMMON_ENZYMES``.
 
     Returns:
         Dict mapping enzyme name to list of cut positions.
     """
+    if len(seq) >= VECTORIZE_THRESHOLD:
+        from . import fastseq
+
+        return fastseq.restriction_sites(seq, enzyme_patterns)
     if enzyme_patterns is None:
-        enzyme_patterns = {
-            "EcoRI": "GAATTC",
-            "BamHI": "GGATCC",
-            "HindIII": "AAGCTT",
-            "NotI": "GCGGCCGC",
-            "XhoI": "CTCGAG",
-            "SalI": "GTCGAC",
-            "NdeI": "CATATG",
-            "BglII": "AGATCT",
-            "PstI": "CTGCAG",
-            "SmaI": "CCCGGG",
-        }
+        enzyme_patterns = COMMON_ENZYMES
     seq_upper = seq.upper()
     results: dict[str, list[int]] = {}
     for name, pattern in enzyme_patterns.items():
@@ -0,0 +1,488 @@
+"""Process-isolated worker pool for sandbox execution.
+
+``Sandbox.execute`` runs agent code inside the server's own event loop, so
+a CPU-heavy snippet (ORF scanning a genome, say) stalls every other tool
+call. ``WorkerPool`` runs executions in pre-warmed worker processes
+instead:
+
+- Each worker imports the sandbox, builds the API clients once, and keeps
+  a ``Sandbox`` (and its ``state``) per session it has served.
+- Executions for different sessions run truly in parallel; executions
+  for one session are serialized.
+- Each execution gets a CPU-time budget (``RLIMIT_CPU``) and each worker
+  an address-space cap above its baseline (``RLIMIT_AS``). A worker that
+  exceeds the wall-clock timeout is killed and replaced.
+- After every execution the worker returns a pickled snapshot of the
+  session's ``state``. When a session's home worker is busy or has died,
+  the next idle worker restores that snapshot and takes over, so sessions
+  migrate between workers without losing state. Values that cannot be
+  pickled (open files, generators) stay on their home worker only.
+
+Untrusted results travel back as JSON, never as pickles, so a crafted
+object cannot execute code in the server process. Snapshots are only
+ever unpickled inside workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import Any
+
+from .config import ServerConfig
+from .sandbox import ExecutionResult, Sandbox
+
+try:
+    import resource
+except ImportError:  # pragma: no cover — Windows has no rlimits
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger("bioinfo-code-mcp")
+
+# Extra wall-clock allowance before a worker is considered hung
+_KILL_GRACE_SECONDS = 5.0
+_START_TIMEOUT_SECONDS = 60.0
+
+
+class CPULimitExceeded(BaseException):
+    """Raised inside a worker when an execution uses up its CPU budget.
+
+    A ``BaseException`` so that agent code's ``except Exception`` cannot
+    swallow it.
+    """
+
+
+class WorkerLostError(RuntimeError):
+    """The worker process died or stopped responding mid-execution."""
+
+
+# ----------------------------------------------------------------------
+# Worker process side
+# ----------------------------------------------------------------------
+
+
+def _on_sigxcpu(signum: int, frame: Any) -> None:
+    raise CPULimitExceeded
+
+
+def _cpu_used() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _set_cpu_budget(seconds: int) -> None:
+    if resource is None or seconds <= 0:
+        return
+    soft = int(_cpu_used() + seconds) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, resource.RLIM_INFINITY))
+
+
+def _clear_cpu_budget() -> None:
+    if resource is not None:
+        resource.setrlimit(resource.RLIMIT_CPU, (resource.RLIM_INFINITY, resource.RLIM_INFINITY))
+
+
+def _apply_memory_limit(megabytes: int) -> None:
+    """Cap the worker's address space at its current size plus ``megabytes``."""
+    if resource is None or megabytes <= 0:
+        return
+    try:
+        with open("/proc/self/statm") as fh:
+            baseline = int(fh.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        baseline = 0
+    limit = baseline + megabytes * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _snapshot(state: dict[str, Any]) -> tuple[bytes, list[str]]:
+    """Pickle ``state``, leaving out (and naming) values that can't be pickled."""
+    try:
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), []
+    except Exception:
+        pass
+    picklable: dict[str, Any] = {}
+    skipped: list[str] = []
+    for key, value in state.items():
+        try:
+            pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            skipped.append(str(key))
+        else:
+            picklable[key] = value
+    return pickle.dumps(picklable, protocol=pickle.HIGHEST_PROTOCOL), skipped
+
+
+def _jsonable(value: Any) -> Any:
+    """Reduce a result to JSON-compatible data (the parent never unpickles results)."""
+    try:
+        return json.loads(json.dumps(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return json.loads(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def _worker_main(
+    conn: Connection,
+    config: ServerConfig,
+    cpu_seconds: int,
+    memory_mb: int,
+    rate_scale: float,
+) -> None:
+    """Worker process loop: receive jobs, run them, reply with result + snapshot."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the server handles Ctrl-C
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+    from .apis.transport import get_shared_transport
+
+    get_shared_transport(config).scale_rate_limits(rate_scale)
+    loop = asyncio.new_event_loop()
+    sandboxes: dict[str, Sandbox] = {}
+    Sandbox(config)  # warm imports and client construction
+    _apply_memory_limit(memory_mb)
+    conn.send_bytes(b'{"ready": true}')
+
+    while True:
+        try:
+            header = json.loads(conn.recv_bytes())
+        except (EOFError, OSError):
+            break
+        if header.get("op") == "shutdown":
+            break
+
+        for stale in header.get("evict", ()):
+            sandboxes.pop(stale, None)
+        session_id = header["session"]
+        sandbox = sandboxes.get(session_id)
+        if sandbox is None:
+            sandbox = sandboxes[session_id] = Sandbox(config)
+        if header.get("restore"):
+            restored = pickle.loads(conn.recv_bytes()) if header.get("has_snapshot") else {}
+            sandbox.state.clear()
+            sandbox.state.update(restored)
+
+        try:
+            _set_cpu_budget(cpu_seconds)
+            result = loop.run_until_complete(sandbox.execute(header["code"]))
+        except CPULimitExceeded:
+            result = ExecutionResult(
+                success=False,
+                error=f"CPULimitExceeded: execution used more than {cpu_seconds}s of CPU time",
+                state_keys=list(sandbox.state.keys()),
+            )
+            # The signal may have landed inside the event loop itself
+            loop.close()
+            loop = asyncio.new_event_loop()
+        finally:
+            _clear_cpu_budget()
+
+        try:
+            snapshot, skipped = _snapshot(sandbox.state)
+        except MemoryError:
+            snapshot, skipped = None, list(map(str, sandbox.state))
+        reply = {
+            "success": result.success,
+            "result": _jsonable(result.result),
+            "stdout": result.stdout,
+            "error": result.error,
+            "state_keys": [str(k) for k in result.state_keys],
+            "unpicklable": skipped,
+            "has_snapshot": snapshot is not None,
+        }
+        conn.send_bytes(json.dumps(reply).encode())
+        if snapshot is not None:
+            conn.send_bytes(snapshot)
+
+    loop.close()
+
+
+# ----------------------------------------------------------------------
+# Server side
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class _Worker:
+    index: int
+    process: multiprocessing.process.BaseProcess
+    conn: Connection
+    # Session → state version this worker currently holds
+    sessions: dict[str, int] = field(default_factory=dict)
+    busy: bool = False
+
+
+@dataclass
+class _Session:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    version: int = 0
+    snapshot: bytes | None = None
+    home: int | None = None
+
+
+class WorkerPool:
+    """Pool of pre-warmed sandbox worker processes.
+
+    Args:
+        config: Server configuration (shared with every worker).
+        size: Number of worker processes. Defaults to
+            ``config.sandbox_workers``.
+        cpu_seconds: CPU-time budget per execution. Defaults to
+            ``config.sandbox_cpu_seconds``.
+        memory_mb: Address space each worker may grow by beyond its
+            baseline. Defaults to ``config.sandbox_memory_mb``.
+    """
+
+    def __init__(
+        self,
+        config: ServerConfig,
+        *,
+        size: int | None = None,
+        cpu_seconds: int | None = None,
+        memory_mb: int | None = None,
+    ):
+        self.config = config
+        self.size = max(1, size if size is not None else config.sandbox_workers)
+        self.cpu_seconds = cpu_seconds if cpu_seconds is not None else config.sandbox_cpu_seconds
+        self.memory_mb = memory_mb if memory_mb is not None else config.sandbox_memory_mb
+        # spawn: forking a process with a running event loop and threads is unsafe
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers: list[_Worker] = []
+        self._sessions: dict[str, _Session] = {}
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="sandbox-io")
+        self._idle: asyncio.Condition | None = None
+        self._start_lock: asyncio.Lock | None = None
+        self.stats: dict[str, int] = {
+            "executions": 0,
+            "migrations": 0,
+            "restores": 0,
+            "restarts": 0,
+            "timeouts": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Spawn and warm up all workers (called automatically on first use)."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+            self._idle = asyncio.Condition()
+        async with self._start_lock:
+            if self._workers:
+                return
+            loop = asyncio.get_running_loop()
+            spawns = [
+                loop.run_in_executor(self._executor, self._spawn, i) for i in range(self.size)
+            ]
+            self._workers = list(await asyncio.gather(*spawns))
+
+    def _spawn(self, index: int) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.config, self.cpu_seconds, self.memory_mb, 1 / self.size),
+            name=f"sandbox-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        try:
+            if not parent_conn.poll(_START_TIMEOUT_SECONDS):
+                raise EOFError
+            parent_conn.recv_bytes()  # ready
+        except (EOFError, OSError) as exc:
+            process.kill()
+            raise WorkerLostError(f"sandbox worker {index} did not start") from exc
+        return _Worker(index, process, parent_conn)
+
+    def _restart(self, worker: _Worker) -> _Worker:
+        self.stats["restarts"] += 1
+        worker.process.kill()
+        worker.process.join(timeout=5)
+        worker.conn.close()
+        replacement = self._spawn(worker.index)
+        self._workers[worker.index] = replacement
+        return replacement
+
+    async def close(self) -> None:
+        """Shut down all workers."""
+        for worker in self._workers:
+            with contextlib.suppress(OSError):
+                worker.conn.send_bytes(b'{"op": "shutdown"}')
+        for worker in self._workers:
+            worker.process.join(timeout=2)
+            if worker.process.is_alive():
+                worker.process.kill()
+            worker.conn.close()
+        self._workers = []
+        self._executor.shutdown(wait=False)
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    def _session(self, session_id: str) -> _Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session()
+        return session
+
+    def snapshot(self, session_id: str) -> bytes | None:
+        """Pickled ``state`` of a session after its last execution."""
+        session = self._sessions.get(session_id)
+        return session.snapshot if session else None
+
+    def restore(self, session_id: str, snapshot: bytes | None) -> None:
+        """Replace a session's state with a snapshot (``None`` clears it)."""
+        session = self._session(session_id)
+        session.snapshot = snapshot
+        session.version += 1  # every worker's copy is now stale
+
+    def reset_state(self, session_id: str) -> None:
+        """Clear a session's persistent state."""
+        self.restore(session_id, None)
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def _acquire(self, session_id: str, session: _Session) -> _Worker:
+        assert self._idle is not None
+        async with self._idle:
+            while True:
+                idle = [w for w in self._workers if not w.busy]
+                if idle:
+                    break
+                await self._idle.wait()
+            # Prefer the worker already holding this session's current state
+            worker = next(
+                (w for w in idle if w.sessions.get(session_id) == session.version),
+                None,
+            ) or min(idle, key=lambda w: len(w.sessions))
+            worker.busy = True
+        if session.home is not None and session.home != worker.index:
+            self.stats["migrations"] += 1
+        session.home = worker.index
+        return worker
+
+    async def _release(self, worker: _Worker) -> None:
+        assert self._idle is not None
+        async with self._idle:
+            self._workers[worker.index].busy = False
+            self._idle.notify()
+
+    def _roundtrip(
+        self, worker: _Worker, header: dict[str, Any], snapshot: bytes | None, timeout: float
+    ) -> tuple[dict[str, Any], bytes | None]:
+        try:
+            worker.conn.send_bytes(json.dumps(header).encode())
+            if snapshot is not None:
+                worker.conn.send_bytes(snapshot)
+            ready = worker.conn.poll(timeout)
+            if ready:
+                reply = json.loads(worker.conn.recv_bytes())
+                new_snapshot = worker.conn.recv_bytes() if reply.get("has_snapshot") else None
+        except (EOFError, OSError) as exc:
+            raise WorkerLostError(f"sandbox worker {worker.index} exited") from exc
+        if not ready:
+            raise TimeoutError(f"sandbox worker {worker.index} did not respond in {timeout:.0f}s")
+        return reply, new_snapshot
+
+    async def execute(
+        self, session_id: str, code: str, *, reset_state: bool = False
+    ) -> ExecutionResult:
+        """Run ``code`` for a session in a worker process.
+
+        Args:
+            session_id: Session whose ``state`` the code sees.
+            code: Python source, as for ``Sandbox.execute``.
+            reset_state: Clear the session's state first.
+
+        Returns:
+            ExecutionResult. ``result`` is JSON-compatible data (values
+            that are not are converted with ``str``/``repr``).
+        """
+        await self.start()
+        session = self._session(session_id)
+        async with session.lock:
+            if reset_state:
+                self.reset_state(session_id)
+            worker = await self._acquire(session_id, session)
+            loop = asyncio.get_running_loop()
+            try:
+                restore = worker.sessions.get(session_id) != session.version
+                evict = [
+                    s for s, v in worker.sessions.items()
+                    if s != session_id and self._sessions[s].version != v
+                ]
+                for stale in evict:
+                    del worker.sessions[stale]
+                header = {
+                    "session": session_id,
+                    "code": code,
+                    "restore": restore,
+                    "has_snapshot": restore and session.snapshot is not None,
+                    "evict": evict,
+                }
+                if restore and session.version:
+                    self.stats["restores"] += 1
+                self.stats["executions"] += 1
+                timeout = self.config.execution_timeout_seconds + _KILL_GRACE_SECONDS
+                try:
+                    reply, snapshot = await loop.run_in_executor(
+                        self._executor,
+                        self._roundtrip,
+                        worker,
+                        header,
+                        session.snapshot if header["has_snapshot"] else None,
+                        timeout,
+                    )
+                except (TimeoutError, WorkerLostError) as exc:
+                    timed_out = isinstance(exc, TimeoutError)
+                    if timed_out:
+                        self.stats["timeouts"] += 1
+                    logger.warning("Restarting sandbox worker %d: %s", worker.index, exc)
+                    worker = await loop.run_in_executor(self._executor, self._restart, worker)
+                    error = (
+                        f"Execution timed out after {self.config.execution_timeout_seconds}s"
+                        if timed_out
+                        else "Worker process crashed (e.g. out of memory)"
+                    )
+                    return ExecutionResult(
+                        success=False,
+                        error=f"{error}; state restored from the previous execution",
+                    )
+            finally:
+                await self._release(worker)
+
+            if reply["has_snapshot"]:
+                session.version += 1
+                session.snapshot = snapshot
+            worker.sessions[session_id] = session.version
+            stdout = reply["stdout"]
+            if reply["unpicklable"]:
+                stdout += (
+                    "[note] state keys kept only on this worker (not picklable, lost if the "
+                    f"session moves): {', '.join(reply['unpicklable'])}\n"
+                )
+            return ExecutionResult(
+                success=reply["success"],
+                result=reply["result"],
+                stdout=stdout,
+                error=reply["error"],
+                state_keys=reply["state_keys"],
+            )
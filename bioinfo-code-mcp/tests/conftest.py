@@ -0,0 +1,36 @@
+"""Shared test fixtures."""
+
+from __future__ import annotations
+
+import dataclasses
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bioinfo_code_mcp.apis.cache import ResponseCache
+from bioinfo_code_mcp.config import ServerConfig
+
+_DEFAULT_CACHE_PATH = ServerConfig.__dataclass_fields__["cache_path"].default
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_response_cache(tmp_path_factory):
+    """Keep the response cache out of the user's ~/.cache during tests.
+
+    Configs left at the default cache path get one throwaway database for
+    the session; tests that pass their own ``cache_path`` are unaffected.
+    """
+    cache_path = str(tmp_path_factory.mktemp("response-cache") / "responses.sqlite")
+    from_config = ResponseCache.from_config.__func__
+
+    def isolated_from_config(cls, config: ServerConfig) -> ResponseCache:
+        if config.cache_path == _DEFAULT_CACHE_PATH:
+            config = dataclasses.replace(config, cache_path=cache_path)
+        return from_config(cls, config)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ResponseCache, "from_config", classmethod(isolated_from_config))
+        yield cache_path
@@ -0,0 +1,329 @@
+"""Tests for coalescing concurrent single-ID lookups into batch requests."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bioinfo_code_mcp.apis.batching import RequestBatcher
+from bioinfo_code_mcp.apis.ncbi import NCBIClient
+from bioinfo_code_mcp.apis.transport import SharedTransport
+from bioinfo_code_mcp.apis.uniprot import UniProtClient
+from bioinfo_code_mcp.registry import Registry
+
+
+def _esummary_payload(uids: list[str]) -> dict:
+    result: dict = {"uids": uids}
+    for uid in uids:
+        result[uid] = {"uid": uid, "title": f"Record {uid}"}
+    return {"result": result}
+
+
+def _mock_http(handler) -> SharedTransport:
+    return SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+
+
+class TestRequestBatcher:
+    """Test the generic batcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_coalesce(self):
+        calls: list[list[str]] = []
+
+        async def one(group, key):
+            calls.append([key])
+            return key.upper()
+
+        async def many(group, keys):
+            calls.append(keys)
+            return {k: k.upper() for k in keys}
+
+        batcher = RequestBatcher(one, many, window=0.01)
+        results = await asyncio.gather(*(batcher.load("g", k) for k in ["a", "b", "c", "a"]))
+        assert results == ["A", "B", "C", "A"]
+        assert calls == [["a", "b", "c"]]
+
+    @pytest.mark.asyncio
+    async def test_single_load_uses_fetch_one(self):
+        calls: list[str] = []
+
+        async def one(group, key):
+            calls.append("one")
+            return key
+
+        async def many(group, keys):
+            calls.append("many")
+            return {}
+
+        batcher = RequestBatcher(one, many)
+        assert await batcher.load("g", "x") == "x"
+        assert calls == ["one"]
+
+    @pytest.mark.asyncio
+    async def test_groups_kept_separate(self):
+        seen: list[tuple] = []
+
+        async def one(group, key):
+            return key
+
+        async def many(group, keys):
+            seen.append((group, tuple(keys)))
+            return {k: k for k in keys}
+
+        batcher = RequestBatcher(one, many)
+        await asyncio.gather(
+            batcher.load("pubmed", "1"), batcher.load("pubmed", "2"),
+            batcher.load("gene", "3"), batcher.load("gene", "4"),
+        )
+        assert sorted(seen) == [("gene", ("3", "4")), ("pubmed", ("1", "2"))]
+
+    @pytest.mark.asyncio
+    async def test_missing_keys_fall_back_to_single(self):
+        async def one(group, key):
+            if key == "bad":
+                raise LookupError(key)
+            return f"single-{key}"
+
+        async def many(group, keys):
+            return {"a": "batched-a"}
+
+        batcher = RequestBatcher(one, many)
+        a, b, bad = await asyncio.gather(
+            batcher.load("g", "a"), batcher.load("g", "b"), batcher.load("g", "bad"),
+            return_exceptions=True,
+        )
+        assert a == "batched-a"
+        assert b == "single-b"
+        assert isinstance(bad, LookupError)
+
+    @pytest.mark.asyncio
+    async def test_batch_error_falls_back_per_key(self):
+        async def one(group, key):
+            if key == "bad":
+                raise LookupError(key)
+            return f"single-{key}"
+
+        async def many(group, keys):
+            raise RuntimeError("bad ID in batch")
+
+        batcher = RequestBatcher(one, many)
+        a, b, bad = await asyncio.gather(
+            batcher.load("g", "a"), batcher.load("g", "b"), batcher.load("g", "bad"),
+            return_exceptions=True,
+        )
+        assert a == "single-a"
+        assert b == "single-b"
+        assert isinstance(bad, LookupError)
+
+    @pytest.mark.asyncio
+    async def test_single_key_error_propagates(self):
+        async def one(group, key):
+            raise RuntimeError("upstream down")
+
+        async def many(group, keys):
+            raise AssertionError("should not batch")
+
+        batcher = RequestBatcher(one, many)
+        with pytest.raises(RuntimeError):
+            await batcher.load("g", "a")
+
+    @pytest.mark.asyncio
+    async def test_max_batch_flushes_early(self):
+        sizes: list[int] = []
+
+        async def one(group, key):
+            sizes.append(1)
+            return key
+
+        async def many(group, keys):
+            sizes.append(len(keys))
+            return {k: k for k in keys}
+
+        batcher = RequestBatcher(one, many, window=10, max_batch=3)
+        await asyncio.wait_for(
+            asyncio.gather(*(batcher.load("g", str(i)) for i in range(3))), timeout=1
+        )
+        assert sizes == [3]
+
+    @pytest.mark.asyncio
+    async def test_window_zero_disables(self):
+        calls: list[str] = []
+
+        async def one(group, key):
+            calls.append(key)
+            return key
+
+        async def many(group, keys):
+            raise AssertionError("should not batch")
+
+        batcher = RequestBatcher(one, many, window=0)
+        await asyncio.gather(batcher.load("g", "a"), batcher.load("g", "b"))
+        assert calls == ["a", "b"]
+
+
+class TestNCBIBatching:
+    """Test Entrez esummary coalescing and history-server fetches."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_esummary_one_request(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=_esummary_payload(request.url.params["id"].split(",")))
+
+        ncbi = NCBIClient(email="t@example.com", http=_mock_http(handler))
+        results = await asyncio.gather(*(ncbi.esummary("pubmed", [str(i)]) for i in range(5)))
+        assert [r[0]["uid"] for r in results] == ["0", "1", "2", "3", "4"]
+        assert len(requests) == 1
+        assert requests[0].url.params["id"] == "0,1,2,3,4"
+
+    @pytest.mark.asyncio
+    async def test_esummary_unknown_id_returns_empty(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            ids = [i for i in request.url.params["id"].split(",") if i != "missing"]
+            return httpx.Response(200, json=_esummary_payload(ids))
+
+        ncbi = NCBIClient(email="t@example.com", http=_mock_http(handler))
+        found, missing = await asyncio.gather(
+            ncbi.esummary("gene", ["7157"]), ncbi.esummary("gene", ["missing"])
+        )
+        assert found[0]["uid"] == "7157"
+        assert missing == []
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_small_list(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=_esummary_payload(request.url.params["id"].split(",")))
+
+        ncbi = NCBIClient(email="t@example.com", http=_mock_http(handler))
+        result = await ncbi.fetch_many("gene", ["1", "2"])
+        assert set(result) == {"1", "2"}
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_uses_history_server(self):
+        ids = [str(i) for i in range(5)]
+        paths: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            if request.url.path.endswith("epost.fcgi"):
+                return httpx.Response(
+                    200,
+                    text="<ePostResult><QueryKey>1</QueryKey><WebEnv>MCID_abc</WebEnv></ePostResult>",
+                )
+            params = request.url.params
+            assert params["WebEnv"] == "MCID_abc"
+            start, size = int(params["retstart"]), int(params["retmax"])
+            return httpx.Response(200, json=_esummary_payload(ids[start : start + size]))
+
+        ncbi = NCBIClient(email="t@example.com", http=_mock_http(handler))
+        result = await ncbi.fetch_many("pubmed", ids, batch_size=2)
+        assert set(result) == set(ids)
+        assert paths.count("/entrez/eutils/epost.fcgi") == 1
+        assert paths.count("/entrez/eutils/esummary.fcgi") == 3
+
+    @pytest.mark.asyncio
+    async def test_efetch_many_pages(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("epost.fcgi"):
+                return httpx.Response(200, text="<QueryKey>1</QueryKey><WebEnv>W</WebEnv>")
+            return httpx.Response(200, text=f">r{request.url.params['retstart']}\nACGT\n")
+
+        ncbi = NCBIClient(email="t@example.com", http=_mock_http(handler))
+        text = await ncbi.efetch_many("nucleotide", ["a", "b", "c"], batch_size=2)
+        assert text == ">r0\nACGT\n>r2\nACGT\n"
+
+
+class TestUniProtBatching:
+    """Test UniProt accession coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fetch_entry_uses_accessions_endpoint(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            accs = request.url.params["accessions"].split(",")
+            return httpx.Response(
+                200, json={"results": [{"primaryAccession": a} for a in accs]}
+            )
+
+        uniprot = UniProtClient(http=_mock_http(handler))
+        accs = ["P04637", "P38398", "P51587"]
+        entries = await asyncio.gather(*(uniprot.fetch_entry(a) for a in accs))
+        assert [e["primaryAccession"] for e in entries] == accs
+        assert len(requests) == 1
+        assert requests[0].url.path == "/uniprotkb/accessions"
+
+    @pytest.mark.asyncio
+    async def test_unknown_accession_still_raises(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/uniprotkb/accessions":
+                return httpx.Response(200, json={"results": [{"primaryAccession": "P04637"}]})
+            return httpx.Response(404)
+
+        uniprot = UniProtClient(http=_mock_http(handler))
+        good, bad = await asyncio.gather(
+            uniprot.fetch_entry("P04637"), uniprot.fetch_entry("XXXXXX"),
+            return_exceptions=True,
+        )
+        assert good["primaryAccession"] == "P04637"
+        assert isinstance(bad, httpx.HTTPStatusError)
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_chunks(self, monkeypatch):
+        sizes: list[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            accs = request.url.params["accessions"].split(",")
+            sizes.append(len(accs))
+            return httpx.Response(
+                200, json={"results": [{"primaryAccession": a} for a in accs]}
+            )
+
+        uniprot = UniProtClient(http=_mock_http(handler))
+        monkeypatch.setattr(uniprot, "MAX_ACCESSIONS", 2)
+        result = await uniprot.fetch_many(["A1", "A2", "A3"])
+        assert set(result) == {"A1", "A2", "A3"}
+        assert sorted(sizes) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_follows_next_page(self):
+        requests: list[httpx.Request] = []
+        accs = ["A1", "A2", "A3"]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if "cursor" not in request.url.params:
+                next_url = f"{request.url}&cursor=page2"
+                return httpx.Response(
+                    200,
+                    json={"results": [{"primaryAccession": a} for a in accs[:2]]},
+                    headers={"Link": f'<{next_url}>; rel="next"'},
+                )
+            return httpx.Response(200, json={"results": [{"primaryAccession": "A3"}]})
+
+        uniprot = UniProtClient(http=_mock_http(handler))
+        result = await uniprot.fetch_many(accs)
+        assert set(result) == set(accs)
+        assert len(requests) == 2
+        assert requests[0].url.params["size"] == "3"
+        assert requests[1].url.params["cursor"] == "page2"
+
+
+class TestBatchRegistry:
+    """Test that batch APIs are discoverable."""
+
+    def test_fetch_many_registered(self):
+        registry = Registry()
+        assert registry.get_operation("ncbi.fetch_many") is not None
+        assert registry.get_operation("uniprot.fetch_many") is not None
+        names = [op["name"] for op in registry.search(tags=["batch"])]
+        assert "ncbi.efetch_many" in names
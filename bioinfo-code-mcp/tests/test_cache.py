@@ -0,0 +1,182 @@
+"""Tests for the persistent API response cache."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bioinfo_code_mcp.apis.cache import OfflineCacheMissError, ResponseCache
+from bioinfo_code_mcp.apis.ncbi import NCBIClient
+from bioinfo_code_mcp.apis.transport import SharedTransport
+from bioinfo_code_mcp.apis.uniprot import UniProtClient
+from bioinfo_code_mcp.config import ServerConfig
+from bioinfo_code_mcp.sandbox import Sandbox
+
+ENTRY_URL = "https://rest.uniprot.org/uniprotkb/P04637"
+
+
+class _Upstream:
+    """Mock upstream that counts calls and supports ETag revalidation."""
+
+    def __init__(self, etag: str | None = '"v1"'):
+        self.requests: list[httpx.Request] = []
+        self.etag = etag
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        headers = {"ETag": self.etag} if self.etag else {}
+        return httpx.Response(200, json={"url": str(request.url.path)}, headers=headers)
+
+
+def _transport(cache: ResponseCache, upstream: _Upstream) -> SharedTransport:
+    return SharedTransport(
+        transport=httpx.MockTransport(upstream), rate_limits={}, cache=cache
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResponseCache(tmp_path / "responses.sqlite")
+    yield c
+    c.close()
+
+
+class TestResponseCache:
+    """Test caching, TTLs, revalidation, eviction and offline mode."""
+
+    @pytest.mark.asyncio
+    async def test_second_get_is_a_hit(self, cache):
+        upstream = _Upstream()
+        http = _transport(cache, upstream)
+        first = await http.get(ENTRY_URL)
+        second = await http.get(ENTRY_URL)
+        assert first.json() == second.json()
+        assert second.headers["X-Cache"] == "HIT"
+        assert len(upstream.requests) == 1
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        upstream = _Upstream()
+        path = tmp_path / "responses.sqlite"
+        await _transport(ResponseCache(path), upstream).get(ENTRY_URL)
+        resp = await _transport(ResponseCache(path), upstream).get(ENTRY_URL)
+        assert resp.headers["X-Cache"] == "HIT"
+        assert len(upstream.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_endpoints_bypass(self, cache):
+        upstream = _Upstream()
+        http = _transport(cache, upstream)
+        for _ in range(2):
+            await http.get("https://blast.ncbi.nlm.nih.gov/blast/Blast.cgi")
+        assert len(upstream.requests) == 2
+        assert cache.summary()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_post_not_cached(self, cache):
+        upstream = _Upstream()
+        http = _transport(cache, upstream)
+        for _ in range(2):
+            await http.post("https://data.rcsb.org/rest/v1/core/entry/1TUP", json={})
+        assert len(upstream.requests) == 2
+
+    def test_key_ignores_credentials_and_param_order(self):
+        a = httpx.Request("GET", "https://x.org/a?id=1&db=gene&api_key=SECRET&email=a@b")
+        b = httpx.Request("GET", "https://x.org/a?db=gene&id=1")
+        c = httpx.Request("GET", "https://x.org/a?db=gene&id=2")
+        assert ResponseCache.key_for(a) == ResponseCache.key_for(b)
+        assert ResponseCache.key_for(a) != ResponseCache.key_for(c)
+
+    def test_key_includes_accept_header(self):
+        json_req = httpx.Request("GET", ENTRY_URL, headers={"Accept": "application/json"})
+        text_req = httpx.Request("GET", ENTRY_URL, headers={"Accept": "text/plain"})
+        assert ResponseCache.key_for(json_req) != ResponseCache.key_for(text_req)
+
+    def test_ttl_rules(self, cache):
+        def ttl(url: str) -> int | None:
+            return cache.ttl_for(httpx.Request("GET", url))
+
+        assert ttl("https://rest.uniprot.org/uniprotkb/search?query=x") == 86400
+        assert ttl(ENTRY_URL) == 7 * 86400
+        assert ttl("https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi") == 3600
+        assert ttl("https://blast.ncbi.nlm.nih.gov/blast/Blast.cgi") is None
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_revalidated_with_etag(self, tmp_path):
+        upstream = _Upstream()
+        cache = ResponseCache(tmp_path / "c.sqlite", ttl_rules=[("rest.uniprot.org", "^/", 0)])
+        http = _transport(cache, upstream)
+        await http.get(ENTRY_URL)
+        resp = await http.get(ENTRY_URL)
+        assert resp.status_code == 200
+        assert resp.json() == {"url": "/uniprotkb/P04637"}
+        assert upstream.requests[1].headers["If-None-Match"] == '"v1"'
+        assert cache.stats["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, tmp_path):
+        upstream = _Upstream(etag=None)
+        cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=80)
+        http = _transport(cache, upstream)
+        for acc in ("P1", "P2", "P3"):
+            await http.get(f"https://rest.uniprot.org/uniprotkb/{acc}")
+        # Touch P1 so P2 becomes least recently used
+        await http.get("https://rest.uniprot.org/uniprotkb/P1")
+        await http.get("https://rest.uniprot.org/uniprotkb/P4")
+        assert cache.stats["evictions"] >= 1
+        assert cache.summary()["bytes"] <= 80
+        before = len(upstream.requests)
+        await http.get("https://rest.uniprot.org/uniprotkb/P4")
+        assert len(upstream.requests) == before
+
+    @pytest.mark.asyncio
+    async def test_offline_serves_cached_and_rejects_misses(self, tmp_path):
+        path = tmp_path / "c.sqlite"
+        upstream = _Upstream()
+        await _transport(ResponseCache(path), upstream).get(ENTRY_URL)
+
+        offline = _transport(ResponseCache(path, offline=True), upstream)
+        resp = await offline.get(ENTRY_URL)
+        assert resp.headers["X-Cache"] == "HIT"
+        with pytest.raises(OfflineCacheMissError):
+            await offline.get("https://rest.uniprot.org/uniprotkb/Q99999")
+        with pytest.raises(OfflineCacheMissError):
+            await offline.get("https://blast.ncbi.nlm.nih.gov/blast/Blast.cgi")
+        assert len(upstream.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_clients_share_cache(self, cache):
+        upstream = _Upstream()
+        http = _transport(cache, upstream)
+        client = UniProtClient(http=http)
+        await client.fetch_entry("P04637")
+        await client.get_go_terms("P04637")
+        assert len(upstream.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_ncbi_key_shared_across_api_keys(self, cache):
+        upstream = _Upstream()
+        http = _transport(cache, upstream)
+        await NCBIClient(email="a@x.org", api_key="k1", http=http).einfo("gene")
+        await NCBIClient(email="b@x.org", api_key="k2", http=http).einfo("gene")
+        assert len(upstream.requests) == 1
+
+
+class TestSandboxCacheStats:
+    """Test that cache statistics reach the sandbox context description."""
+
+    def test_context_description_reports_cache(self, tmp_path):
+        sandbox = Sandbox(ServerConfig(cache_path=str(tmp_path / "c.sqlite")))
+        sandbox.http = SharedTransport(cache=ResponseCache(tmp_path / "c.sqlite", offline=True))
+        description = sandbox.get_context_description()
+        assert "## Response cache (OFFLINE" in description
+        assert "hit rate" in description
@@ -0,0 +1,101 @@
+"""Tests for the vectorized sequence utilities (equivalence with sequence.py)."""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bioinfo_code_mcp.utils import fastseq, sequence
+from bioinfo_code_mcp.utils.sequence import CODON_TABLE, reverse_complement
+
+
+def random_dna(length: int, seed: int, alphabet: str = "ACGT") -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+@pytest.fixture
+def pure_python(monkeypatch):
+    """Force sequence.py onto its pure-Python code paths."""
+    monkeypatch.setattr(sequence, "VECTORIZE_THRESHOLD", sys.maxsize)
+
+
+# Mixed case, ambiguity codes and ORF-rich regions
+SEQUENCES = [
+    "",
+    "AT",
+    "ATGAAATAG",
+    "atgaaaTAGccc",
+    "ATGATGAAATGA" * 5,
+    random_dna(3000, seed=1),
+    random_dna(3001, seed=2, alphabet="ACGTacgtN"),
+    random_dna(2999, seed=3, alphabet="AACGTTRY"),
+]
+
+
+class TestCodonTable:
+    def test_matches_codon_table(self):
+        for codon, aa in CODON_TABLE.items():
+            assert fastseq.translate(codon) == aa
+
+
+@pytest.mark.usefixtures("pure_python")
+class TestEquivalence:
+    @pytest.mark.parametrize("seq", SEQUENCES)
+    def test_gc_content(self, seq):
+        assert fastseq.gc_content(seq) == pytest.approx(sequence.gc_content(seq))
+
+    @pytest.mark.parametrize("seq", SEQUENCES)
+    @pytest.mark.parametrize("frame", [0, 1, 2])
+    def test_translate(self, seq, frame):
+        assert fastseq.translate(seq, frame) == sequence.translate(seq, frame)
+
+    @pytest.mark.parametrize("seq", SEQUENCES)
+    @pytest.mark.parametrize("min_length", [3, 30, 100])
+    def test_find_orfs(self, seq, min_length):
+        assert fastseq.find_orfs(seq, min_length) == sequence.find_orfs(seq, min_length)
+
+    @pytest.mark.parametrize("seq", SEQUENCES)
+    def test_restriction_sites(self, seq):
+        assert fastseq.restriction_sites(seq) == sequence.restriction_sites(seq)
+
+    def test_restriction_sites_overlapping_and_regex(self):
+        seq = "AAAAAA" + random_dna(2000, seed=4) + "GCGCGCAGCTNNAGCT"
+        enzymes = {"polyA": "AAA", "GCGC": "GCGC", "AluI": "AGCT", "degenerate": "AG.T"}
+        assert fastseq.restriction_sites(seq, enzymes) == sequence.restriction_sites(seq, enzymes)
+
+
+class TestSixFrameORFs:
+    def test_includes_forward_orfs(self):
+        seq = random_dna(5000, seed=5)
+        forward = [o for o in fastseq.six_frame_orfs(seq, 60) if o["strand"] == "+"]
+        for orf in forward:
+            del orf["strand"]
+        assert forward == fastseq.find_orfs(seq, 60)
+
+    def test_reverse_strand_coordinates(self):
+        # ATG AAA TAG on the reverse strand only
+        seq = "CCC" + reverse_complement("ATGAAATAG") + "CCC"
+        orfs = [o for o in fastseq.six_frame_orfs(seq, 9) if o["strand"] == "-"]
+        assert len(orfs) == 1
+        orf = orfs[0]
+        assert (orf["start"], orf["end"], orf["protein"]) == (3, 12, "MK*")
+        assert reverse_complement(seq[orf["start"] : orf["end"]]) == "ATGAAATAG"
+
+
+class TestDispatch:
+    def test_large_inputs_use_fastseq(self, monkeypatch):
+        monkeypatch.setattr(sequence, "VECTORIZE_THRESHOLD", 10)
+        monkeypatch.setattr(fastseq, "gc_content", lambda seq: -1.0)
+        assert sequence.gc_content("GGGGCCCCAAAATTTT") == -1.0
+        assert sequence.gc_content("GGCC") == 1.0
+
+    def test_large_sequence(self):
+        seq = random_dna(200_000, seed=6)
+        assert len(sequence.translate(seq)) == len(seq) // 3
+        assert sequence.find_orfs(seq) == fastseq.find_orfs(seq)
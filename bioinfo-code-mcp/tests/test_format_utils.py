@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import gzip
+import mmap
 import sys
 from pathlib import Path
 
@@ -11,15 +13,31 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from bioinfo_code_mcp.utils.formats import (
     BEDRecord,
+    FastaIndex,
     FastaRecord,
     GFFRecord,
+    bed_columns,
+    gff_columns,
+    iter_bed,
+    iter_fasta,
+    iter_gff,
     parse_bed,
     parse_clustal,
     parse_fasta,
     parse_gff,
+    restrict_paths,
     write_fasta,
 )
 
+FASTA_TEXT = ">seq1 first\nATGCATGCAT\nGGCC\n>seq2\nAAAATTTTCC\nCCGGGGAAAA\nT\n>empty\n"
+GFF_TEXT = (
+    "##gff-version 3\n"
+    "chr1\tsrc\tgene\t100\t900\t.\t+\t.\tID=g1;Name=A\n"
+    "chr1\tsrc\texon\t100\t200\t.\t+\t.\tParent=g1\n"
+    "chr2\tsrc\tgene\t5\t50\t.\t-\t.\tID=g2\n"
+)
+BED_TEXT = "track name=t\nchr1\t10\t20\tr1\t5\t+\nchr2\t30\t45\n"
+
 
 class TestFastaRecord:
     def test_id_extraction(self):
@@ -186,3 +204,108 @@ seq2    AAACCC---
     def test_empty_alignment(self):
         result = parse_clustal("")
         assert len(result) == 0
+
+
+class TestStreamingParsers:
+    def test_iter_fasta_matches_parse(self, tmp_path):
+        path = tmp_path / "seqs.fa"
+        path.write_text(FASTA_TEXT)
+        assert list(iter_fasta(path)) == parse_fasta(FASTA_TEXT)
+
+    def test_gzip_detected(self, tmp_path):
+        path = tmp_path / "seqs.fa.gz"
+        with gzip.open(path, "wt") as fh:
+            fh.write(FASTA_TEXT)
+        assert [r.id for r in iter_fasta(str(path))] == ["seq1", "seq2", "empty"]
+
+    def test_binary_file_and_mmap(self, tmp_path):
+        path = tmp_path / "genes.gff3"
+        path.write_text(GFF_TEXT)
+        with open(path, "rb") as fh:
+            assert list(iter_gff(fh)) == parse_gff(GFF_TEXT)
+        with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            assert list(iter_gff(mm)) == parse_gff(GFF_TEXT)
+
+    def test_iter_is_lazy(self):
+        def lines():
+            yield ">a"
+            yield "AC"
+            yield ">b"
+            raise AssertionError("read past the first record")
+
+        assert next(iter_fasta(lines())).sequence == "AC"
+
+    def test_iter_bed(self, tmp_path):
+        path = tmp_path / "regions.bed"
+        path.write_text(BED_TEXT)
+        assert list(iter_bed(path)) == parse_bed(BED_TEXT)
+
+    def test_records_use_slots(self):
+        rec = BEDRecord(chrom="chr1", start=1, end=2)
+        assert not hasattr(rec, "__dict__")
+
+
+class TestColumns:
+    def test_gff_columns(self):
+        cols = gff_columns(GFF_TEXT.splitlines(), attributes=["ID"])
+        assert cols["type"].tolist() == ["gene", "exon", "gene"]
+        assert cols["start"].dtype.kind == "i"
+        assert (cols["end"] - cols["start"]).tolist() == [800, 100, 45]
+        assert cols["ID"].tolist() == ["g1", "", "g2"]
+
+    def test_bed_columns(self):
+        cols = bed_columns(BED_TEXT.splitlines())
+        assert cols["chrom"].tolist() == ["chr1", "chr2"]
+        assert cols["score"].tolist() == [5, 0]
+        assert cols["strand"].tolist() == ["+", "."]
+
+
+class TestFastaIndex:
+    def test_fetch_matches_full_parse(self, tmp_path):
+        path = tmp_path / "genome.fa"
+        path.write_text(FASTA_TEXT)
+        records = {r.id: r.sequence for r in parse_fasta(FASTA_TEXT)}
+        with FastaIndex.open(path) as fa:
+            assert fa.names == ["seq1", "seq2", "empty"]
+            assert fa.length("seq2") == 21
+            for name, seq in records.items():
+                assert fa.get(name).sequence == seq
+                for start, end in [(0, 1), (3, 12), (9, 11), (5, None), (0, 100)]:
+                    assert fa.fetch(name, start, end) == seq[start:end]
+
+    def test_writes_samtools_fai(self, tmp_path):
+        path = tmp_path / "genome.fa"
+        path.write_text(FASTA_TEXT)
+        FastaIndex.build(path)
+        fai = (tmp_path / "genome.fa.fai").read_text().splitlines()
+        assert fai[0] == "seq1\t14\t12\t10\t11"
+        assert FastaIndex.open(path).fetch("seq1", 8, 12) == "ATGG"
+
+    def test_ragged_lines_rejected(self, tmp_path):
+        path = tmp_path / "bad.fa"
+        path.write_text(">x\nACGT\nAC\nACGT\n")
+        with pytest.raises(ValueError, match="line length"):
+            FastaIndex.build(path, write=False)
+
+    def test_unknown_name(self, tmp_path):
+        path = tmp_path / "genome.fa"
+        path.write_text(FASTA_TEXT)
+        with FastaIndex.open(path) as fa, pytest.raises(KeyError):
+            fa.fetch("chrZ")
+
+
+class TestRestrictPaths:
+    def test_outside_root_denied(self, tmp_path):
+        allowed = tmp_path / "data"
+        allowed.mkdir()
+        (allowed / "ok.bed").write_text(BED_TEXT)
+        (tmp_path / "secret.bed").write_text(BED_TEXT)
+        with restrict_paths([allowed]):
+            assert len(list(iter_bed(allowed / "ok.bed"))) == 2
+            with pytest.raises(PermissionError):
+                list(iter_bed(allowed / ".." / "secret.bed"))
+        assert len(list(iter_bed(tmp_path / "secret.bed"))) == 2
+
+    def test_in_memory_sources_unaffected(self):
+        with restrict_paths([]):
+            assert len(list(iter_bed(BED_TEXT.splitlines()))) == 2
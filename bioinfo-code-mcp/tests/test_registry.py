@@ -9,7 +9,7 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from bioinfo_code_mcp.registry import Registry
+from bioinfo_code_mcp.registry import Operation, Registry
 
 
 @pytest.fixture
@@ -190,3 +190,112 @@ class TestRegistryCompleteness:
     def test_format_utils_registered(self, registry):
         ops = registry.search(module="format_utils")
         assert len(ops) >= 4  # fasta, gff, bed, clustal
+
+
+class TestRegistryIndex:
+    """Test BM25 ranking and incremental registration."""
+
+    def test_name_match_ranks_first(self, registry):
+        results = registry.search(query="reverse complement")
+        assert results[0]["name"] == "seq.reverse_complement"
+
+    def test_prefix_match(self, registry):
+        names = [r["name"] for r in registry.search(query="orf")]
+        assert "seq.find_orfs" in names
+
+    def test_payloads_precomputed(self, registry):
+        assert registry.get_operation("ncbi.esearch") is registry.search(query="esearch")[0]
+
+    def test_register_and_search(self, registry):
+        before = len(registry)
+        registry.register(Operation(
+            name="kegg.get_pathway",
+            module="kegg",
+            method="kegg.get_pathway(pathway_id)",
+            description="Fetch a KEGG pathway map",
+            tags=["kegg", "pathway"],
+        ))
+        assert len(registry) == before + 1
+        assert registry.search(query="kegg pathway")[0]["name"] == "kegg.get_pathway"
+        assert registry.search(module="kegg")[0]["name"] == "kegg.get_pathway"
+
+    def test_register_replaces_same_name(self, registry):
+        before = len(registry)
+        registry.register(Operation(
+            name="ncbi.esearch", module="ncbi", method="ncbi.esearch()",
+            description="Replaced quasar description",
+        ))
+        assert len(registry) == before
+        assert registry.search(query="quasar")[0]["name"] == "ncbi.esearch"
+        op = registry.get_operation("ncbi.esearch")
+        assert op["description"] == "Replaced quasar description"
+
+    def test_unregister(self, registry):
+        assert registry.unregister("seq.reverse_complement")
+        assert not registry.unregister("seq.reverse_complement")
+        assert registry.get_operation("seq.reverse_complement") is None
+        names = [r["name"] for r in registry.search(query="reverse complement")]
+        assert "seq.reverse_complement" not in names
+
+    def test_unregister_compacts_slots(self, registry):
+        live = len(registry)
+        for round_ in range(5):
+            registry.register_many([
+                Operation(
+                    name=f"tmp.op_{i}", module="tmp", method="tmp()", description=f"churn {round_}"
+                )
+                for i in range(200)
+            ])
+            for i in range(200):
+                registry.unregister(f"tmp.op_{i}")
+        assert len(registry._names) <= 2 * live
+        assert registry.search(query="reverse complement")[0]["name"] == "seq.reverse_complement"
+        assert registry.search(query="churn") == []
+
+    def test_compaction_keeps_registration_order(self, registry):
+        registry.register_many([
+            Operation(
+                name=f"tmp.op_{i}", module="tmp", method="tmp()", description="ordered quasar"
+            )
+            for i in range(10)
+        ])
+        for name in list(registry._operations)[:-10]:
+            registry.unregister(name)
+        results = registry.search(query="quasar")
+        assert [r["name"] for r in results] == [f"tmp.op_{i}" for i in range(10)]
+        assert len(registry._names) <= 20
+
+    def test_substring_fallback(self, registry):
+        registry.register(Operation(
+            name="gene.tp53_status",
+            module="gene",
+            method="gene.tp53_status(sample)",
+            description="Report TP53 mutation status",
+            tags=["tp53"],
+        ))
+        assert "gene.tp53_status" in [r["name"] for r in registry.search(query="p53")]
+        names = [r["name"] for r in registry.search(query="p53", module="gene")]
+        assert names == ["gene.tp53_status"]
+        assert registry.search(query="p53", module="blast") == []
+
+    def test_substring_fallback_only_without_hits(self, registry):
+        names = [r["name"] for r in registry.search(query="complement")]
+        assert names[0] == "seq.reverse_complement"
+        assert registry.search(query="everse_compl")[0]["name"] == "seq.reverse_complement"
+
+    def test_scales_to_generated_catalog(self, registry):
+        registry.register_many([
+            Operation(
+                name=f"gen.op_{i}",
+                module=f"gen{i % 10}",
+                method=f"gen.op_{i}()",
+                description=f"Generated operation {i} for resource{i % 50}",
+                tags=["generated", f"resource{i % 50}"],
+            )
+            for i in range(10_000)
+        ])
+        results = registry.search(query="resource7", module="gen7", limit=5)
+        assert len(results) == 5
+        assert all(r["module"] == "gen7" for r in results)
+        # Ties break by registration order
+        assert [r["name"] for r in results] == [f"gen.op_{i}" for i in (7, 57, 107, 157, 207)]
@@ -336,3 +336,118 @@ class TestSandboxResultFormatting:
         result = await sandbox.execute("pass")
         text = result.to_text()
         assert text == "[no output]"
+
+
+class TestSandboxDataFiles:
+    """Test file access through fmt is limited to data_dirs."""
+
+    @pytest.mark.asyncio
+    async def test_data_dir_readable(self, tmp_path):
+        (tmp_path / "r.bed").write_text("chr1\t10\t20\n")
+        sandbox = Sandbox(ServerConfig(data_dirs=[str(tmp_path)]))
+        result = await sandbox.execute(
+            f"return [r.length for r in fmt.iter_bed({str(tmp_path / 'r.bed')!r})]"
+        )
+        assert result.success, result.error
+        assert result.result == [10]
+
+    @pytest.mark.asyncio
+    async def test_other_paths_denied(self, tmp_path):
+        (tmp_path / "r.bed").write_text("chr1\t10\t20\n")
+        sandbox = Sandbox(ServerConfig(data_dirs=[]))
+        result = await sandbox.execute(
+            f"return list(fmt.iter_bed({str(tmp_path / 'r.bed')!r}))"
+        )
+        assert not result.success
+        assert "PermissionError" in result.error
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("code", [
+        "return fmt.os.getcwd()",
+        "return fmt.io.open('/etc/hostname').read()",
+        "return fmt.gzip.open('/etc/hostname').read()",
+        "return fmt.mmap",
+        "with fmt.restrict_paths(['/']): return fmt.parse_bed('/etc/hostname')",
+    ])
+    async def test_fmt_module_internals_hidden(self, tmp_path, code):
+        sandbox = Sandbox(ServerConfig(data_dirs=[str(tmp_path)]))
+        result = await sandbox.execute(code)
+        assert not result.success
+        assert "AttributeError" in result.error
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("code", [
+        "return fmt.iter_fasta.__globals__['os'].listdir('/')",
+        "return fmt.iter_fasta.__globals__['_data_roots']",
+        "return ().__class__.__base__.__subclasses__()",
+        "return __builtins__",
+        "return uniprot._http",
+        "g = fmt.iter_fasta('x.fa')\nreturn g.gi_frame.f_globals",
+        "match fmt.iter_fasta:\n    case object(__globals__=g): return g",
+    ])
+    async def test_private_and_dunder_access_rejected(self, tmp_path, code):
+        sandbox = Sandbox(ServerConfig(data_dirs=[str(tmp_path)]))
+        result = await sandbox.execute(code)
+        assert not result.success
+        assert "SandboxAccessError" in result.error
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("code", [
+        "return getattr(fmt.iter_fasta, '__glo' + 'bals__')",
+        "return getattr(uniprot, '_http', None)",
+        "setattr(fmt, '__dict__', {})",
+        "return vars(uniprot)['_http']",
+    ])
+    async def test_dynamic_private_access_rejected(self, tmp_path, code):
+        sandbox = Sandbox(ServerConfig(data_dirs=[str(tmp_path)]))
+        result = await sandbox.execute(code)
+        assert not result.success
+        assert "AttributeError" in result.error or "KeyError" in result.error
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("code", [
+        "return asyncio.create_subprocess_shell",
+        "return json.codecs.open('/etc/hostname').read()",
+        "return seq_utils.re",
+    ])
+    async def test_module_imports_hidden(self, tmp_path, code):
+        sandbox = Sandbox(ServerConfig(data_dirs=[str(tmp_path)]))
+        result = await sandbox.execute(code)
+        assert not result.success
+        assert "AttributeError" in result.error
+
+    @pytest.mark.asyncio
+    async def test_fasta_index_outside_data_dirs_denied(self, tmp_path):
+        sandbox = Sandbox(ServerConfig(data_dirs=[str(tmp_path)]))
+        result = await sandbox.execute(
+            "return fmt.FastaIndex('/etc/hostname', [fmt.FaiEntry('x', 5, 0, 5, 6)]).fetch('x')"
+        )
+        assert not result.success
+        assert "PermissionError" in result.error
+
+    @pytest.mark.asyncio
+    async def test_fasta_index_repointed_path_denied(self, tmp_path):
+        (tmp_path / "g.fa").write_text(">x\nACGTA\n")
+        sandbox = Sandbox(ServerConfig(data_dirs=[str(tmp_path)]))
+        result = await sandbox.execute(
+            f"idx = fmt.FastaIndex.build({str(tmp_path / 'g.fa')!r}, write=False)\n"
+            "idx.path = '/etc/hostname'\n"
+            "return idx.fetch('x')"
+        )
+        assert not result.success
+        assert "PermissionError" in result.error
+
+    @pytest.mark.asyncio
+    async def test_fasta_index_write_outside_data_dirs_denied(self, tmp_path):
+        data = tmp_path / "data"
+        data.mkdir()
+        (data / "g.fa").write_text(">x\nACGTA\n")
+        target = tmp_path / "escape.fai"
+        sandbox = Sandbox(ServerConfig(data_dirs=[str(data)]))
+        result = await sandbox.execute(
+            f"idx = fmt.FastaIndex.build({str(data / 'g.fa')!r}, write=False)\n"
+            f"idx.write({str(target)!r})"
+        )
+        assert not result.success
+        assert "PermissionError" in result.error
+        assert not target.exists()
@@ -0,0 +1,323 @@
+"""Tests for the shared, pooled, rate-limited HTTP transport.
+
+Uses ``httpx.MockTransport`` and a throwaway local HTTP server, so no
+network access is required.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bioinfo_code_mcp.apis.ncbi import NCBIClient
+from bioinfo_code_mcp.apis.transport import (
+    SharedTransport,
+    TokenBucket,
+    get_shared_transport,
+    parse_retry_after,
+)
+from bioinfo_code_mcp.apis.uniprot import UniProtClient
+from bioinfo_code_mcp.config import ServerConfig
+
+
+class _LocalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers: set[int] = set()
+
+    def do_GET(self):  # noqa: N802
+        _LocalHandler.peers.add(self.client_address[1])
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    _LocalHandler.peers = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LocalHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestTokenBucket:
+    """Test the token-bucket rate limiter."""
+
+    def test_burst_within_capacity(self):
+        bucket = TokenBucket(rate=5)
+        assert all(bucket.reserve() == 0.0 for _ in range(5))
+
+    def test_overdraw_waits(self):
+        bucket = TokenBucket(rate=5)
+        for _ in range(5):
+            bucket.reserve()
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+        assert bucket.reserve() == pytest.approx(0.4, abs=0.02)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    @pytest.mark.asyncio
+    async def test_rate_enforced(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        assert time.monotonic() - start >= 0.18
+
+
+class TestRetryAfter:
+    """Test Retry-After header parsing."""
+
+    def test_seconds(self):
+        assert parse_retry_after("2", default=9) == 2.0
+
+    def test_missing(self):
+        assert parse_retry_after(None, default=1.5) == 1.5
+
+    def test_garbage(self):
+        assert parse_retry_after("soon", default=1.5) == 1.5
+
+    def test_http_date_in_past(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", default=5) == 0.0
+
+
+class TestSharedTransport:
+    """Test pooling, retry, and rate limiting against a mock server."""
+
+    @pytest.mark.asyncio
+    async def test_retries_429_with_retry_after(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) < 3:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"ok": True})
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        resp = await http.get("https://rest.uniprot.org/uniprotkb/P04637")
+        assert resp.status_code == 200
+        assert len(calls) == 3
+        assert http.stats["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+
+        http = SharedTransport(
+            transport=httpx.MockTransport(handler), rate_limits={}, max_retries=2
+        )
+        resp = await http.get("https://example.org/")
+        assert resp.status_code == 429
+        assert http.stats["requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried_on_503(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        resp = await http.post("https://blast.ncbi.nlm.nih.gov/Blast.cgi", data={"CMD": "Put"})
+        assert resp.status_code == 503
+        assert http.stats["requests"] == 1
+        await http.get("https://blast.ncbi.nlm.nih.gov/Blast.cgi")
+        assert http.stats["retries"] == 3
+
+    @pytest.mark.asyncio
+    async def test_post_retried_on_429(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) < 2:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"ok": True})
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        resp = await http.post("https://eutils.ncbi.nlm.nih.gov/entrez/eutils/epost.fcgi")
+        assert resp.status_code == 200
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_other_errors(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(404)
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        resp = await http.get("https://example.org/")
+        assert resp.status_code == 404
+        assert http.stats["retries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_per_host_rate_limit(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={})
+
+        http = SharedTransport(
+            transport=httpx.MockTransport(handler),
+            rate_limits={"eutils.ncbi.nlm.nih.gov": 4},
+        )
+
+        start = time.monotonic()
+        for _ in range(6):
+            await http.get("https://eutils.ncbi.nlm.nih.gov/entrez/eutils/einfo.fcgi")
+        limited = time.monotonic() - start
+
+        start = time.monotonic()
+        for _ in range(6):
+            await http.get("https://rest.ensembl.org/info/ping")
+        unlimited = time.monotonic() - start
+
+        # Burst of 4, then two requests spaced 0.25s apart
+        assert limited >= 0.45
+        assert unlimited < 0.2
+
+    @pytest.mark.asyncio
+    async def test_client_reused_across_calls(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={})
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        for _ in range(3):
+            await http.get("https://example.org/")
+        assert http.stats["clients_created"] == 1
+        await http.aclose()
+
+    def test_client_of_closed_loop_dropped_and_closed(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={})
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(http.get("https://example.org/"))
+        loop.close()
+        first = http._clients[loop]
+
+        asyncio.run(http.get("https://example.org/"))
+        assert loop not in http._clients
+        assert first.is_closed
+        assert http.stats["clients_created"] == 2
+
+    def test_one_client_per_asyncio_run(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={})
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        for _ in range(3):
+            asyncio.run(http.get("https://example.org/"))
+        assert http.stats["clients_created"] == 3
+        assert len(http._clients) <= 1
+
+    def test_concurrent_loops_keep_their_own_client(self):
+        a_in_flight = threading.Event()
+        b_done = threading.Event()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/a":
+                a_in_flight.set()
+                assert b_done.wait(5)
+            return httpx.Response(200, json={"path": request.url.path})
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        results = {}
+
+        async def run_a():
+            first = await http.get("https://example.org/a")
+            # Loop B has come and gone; this loop's pool is untouched
+            client = await http._get_client()
+            second = await http.get("https://example.org/a2")
+            results["a"] = (first.json(), second.json(), client.is_closed)
+
+        thread = threading.Thread(target=asyncio.run, args=(run_a(),))
+        thread.start()
+        assert a_in_flight.wait(5)
+        results["b"] = asyncio.run(http.get("https://example.org/b")).json()
+        b_done.set()
+        thread.join(5)
+
+        assert results["b"] == {"path": "/b"}
+        assert results["a"] == ({"path": "/a"}, {"path": "/a2"}, False)
+        assert http.stats["clients_created"] == 2
+
+    @pytest.mark.asyncio
+    async def test_keepalive_against_local_server(self, local_server):
+        http = SharedTransport(http2=False, rate_limits={})
+        for _ in range(5):
+            resp = await http.get(f"{local_server}/ping")
+            assert resp.json() == {"ok": True}
+        await http.aclose()
+        # All five requests travelled over a single pooled connection
+        assert len(_LocalHandler.peers) == 1
+
+    def test_from_config_api_key_raises_ncbi_limit(self):
+        config = ServerConfig(ncbi_api_key="abc", http_max_retries=5)
+        http = SharedTransport.from_config(config)
+        assert http.max_retries == 5
+        assert http._buckets["eutils.ncbi.nlm.nih.gov"].rate == 10.0
+
+    def test_shared_singleton(self):
+        assert get_shared_transport() is get_shared_transport()
+
+
+class TestClientsUseTransport:
+    """Test that API clients route requests through the shared transport."""
+
+    @pytest.mark.asyncio
+    async def test_ncbi_esummary(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(
+                200, json={"result": {"uids": ["1"], "1": {"uid": "1", "title": "T"}}}
+            )
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        client = NCBIClient(email="test@example.com", http=http)
+        result = await client.esummary("pubmed", ["1"])
+        assert result == [{"uid": "1", "title": "T"}]
+        assert seen[0].url.params["id"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_uniprot_default_headers(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={"primaryAccession": "P04637"})
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        client = UniProtClient(http=http)
+        entry = await client.fetch_entry("P04637")
+        assert entry["primaryAccession"] == "P04637"
+        assert seen[0].headers["Accept"] == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_http_error_raised(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500)
+
+        http = SharedTransport(transport=httpx.MockTransport(handler), rate_limits={})
+        client = UniProtClient(http=http)
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.fetch_fasta("P04637")
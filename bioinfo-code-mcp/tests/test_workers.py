@@ -0,0 +1,171 @@
+"""Tests for the process-isolated sandbox worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bioinfo_code_mcp.config import ServerConfig
+from bioinfo_code_mcp.workers import WorkerPool
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX rlimits")
+
+BUSY_LOOP = """
+t = 0
+while t < {seconds} * 4_000_000:
+    t += 1
+return t
+"""
+
+
+def busy(seconds: float) -> str:
+    return BUSY_LOOP.format(seconds=seconds)
+
+
+@pytest.fixture
+async def pool():
+    config = ServerConfig(
+        execution_timeout_seconds=5,
+        cache_enabled=False,
+        data_dirs=[],
+    )
+    workers = WorkerPool(config, size=2, cpu_seconds=3, memory_mb=256)
+    yield workers
+    await workers.close()
+
+
+class TestWorkerPoolExecution:
+    @pytest.mark.asyncio
+    async def test_execute_and_stdout(self, pool):
+        result = await pool.execute("s1", "print('hi')\nreturn {'a': 1}")
+        assert result.success, result.error
+        assert result.result == {"a": 1}
+        assert result.stdout == "hi\n"
+
+    @pytest.mark.asyncio
+    async def test_state_persists(self, pool):
+        await pool.execute("s1", "state['x'] = 41")
+        result = await pool.execute("s1", "return state['x'] + 1")
+        assert result.result == 42
+        assert result.state_keys == ["x"]
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_isolated(self, pool):
+        await pool.execute("a", "state['who'] = 'a'")
+        result = await pool.execute("b", "return state.get('who')")
+        assert result.result is None
+
+    @pytest.mark.asyncio
+    async def test_reset_state(self, pool):
+        await pool.execute("s1", "state['x'] = 1")
+        result = await pool.execute("s1", "return len(state)", reset_state=True)
+        assert result.result == 0
+
+    @pytest.mark.asyncio
+    async def test_non_json_result_is_converted(self, pool):
+        result = await pool.execute("s1", "return {1, 2}")
+        assert result.success
+        assert result.result == "{1, 2}"
+
+
+class TestWorkerPoolIsolation:
+    @pytest.mark.asyncio
+    async def test_cpu_work_does_not_block_event_loop(self, pool):
+        await pool.start()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await pool.execute("s1", busy(0.5))
+        task.cancel()
+        assert result.success, result.error
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="needs 2+ CPUs")
+    async def test_sessions_run_in_parallel(self, pool):
+        await pool.start()
+        start = time.perf_counter()
+        single = await pool.execute("warm", busy(0.3))
+        one = time.perf_counter() - start
+        assert single.success
+
+        start = time.perf_counter()
+        results = await asyncio.gather(pool.execute("a", busy(0.3)), pool.execute("b", busy(0.3)))
+        both = time.perf_counter() - start
+        assert all(r.success for r in results)
+        assert both < one * 1.8
+
+    @pytest.mark.asyncio
+    async def test_cpu_limit(self, pool):
+        await pool.execute("s1", "state['kept'] = True")
+        result = await pool.execute("s1", "while True:\n    pass")
+        assert not result.success
+        assert "CPULimitExceeded" in result.error
+        after = await pool.execute("s1", "return state['kept']")
+        assert after.result is True
+
+    @pytest.mark.asyncio
+    async def test_memory_limit(self, pool):
+        result = await pool.execute("s1", "return len(bytearray(1024 * 1024 * 1024))")
+        assert not result.success
+        assert "MemoryError" in result.error
+        assert (await pool.execute("s1", "return 1")).result == 1
+
+
+class TestWorkerPoolMigration:
+    @pytest.mark.asyncio
+    async def test_session_migrates_with_state(self, pool):
+        await pool.execute("a", "state['data'] = list(range(5))")
+        home = pool._sessions["a"].home
+        # Home worker busy: the other worker restores a's snapshot and runs it
+        pool._workers[home].busy = True
+        try:
+            result = await pool.execute("a", "state['data'].append(5)\nreturn sum(state['data'])")
+        finally:
+            pool._workers[home].busy = False
+        assert result.result == 15
+        assert pool._sessions["a"].home != home
+        assert pool.stats["migrations"] == 1
+
+        # Moving back restores the newer snapshot, not the stale local copy
+        pool._workers[pool._sessions["a"].home].busy = True
+        result = await pool.execute("a", "return len(state['data'])")
+        assert result.result == 6
+
+    @pytest.mark.asyncio
+    async def test_timeout_restarts_worker_and_keeps_state(self):
+        config = ServerConfig(execution_timeout_seconds=1, cache_enabled=False, data_dirs=[])
+        pool = WorkerPool(config, size=1, cpu_seconds=0)
+        try:
+            await pool.execute("s1", "state['x'] = 7")
+            # No CPU budget, so only the wall-clock timeout stops this
+            result = await pool.execute("s1", "while True:\n    pass")
+            assert not result.success
+            assert "timed out" in result.error
+            assert pool.stats["restarts"] == 1
+            after = await pool.execute("s1", "return state['x']")
+            assert after.result == 7
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_and_restore(self, pool):
+        await pool.execute("s1", "state['x'] = [1, 2, 3]")
+        snapshot = pool.snapshot("s1")
+        assert snapshot is not None
+        pool.restore("s2", snapshot)
+        result = await pool.execute("s2", "return state['x']")
+        assert result.result == [1, 2, 3]
@@ -0,0 +1,134 @@
+"""
+Content-addressed cache for LLM calls in the Code Eval Workbench.
+
+Two layers, each keyed by a SHA-256 over everything that determines the
+answer:
+
+  task   — fix_code_bug output:  model config + system prompt + prompt template
+                                  + task function + example input
+  judge  — llm_judge_score:       model config + judge prompt template
+                                  + JUDGE_VERSION + input + reference + output
+
+Change any part (a new model, an edited prompt, a bumped JUDGE_VERSION) and the
+key changes, so stale entries are simply never looked up again. Because the
+judge key includes the task output, regenerating outputs re-judges them, while
+toggling the programmatic or Levenshtein scorers reuses both layers.
+
+Entries live in a SQLite file; failed calls (exceptions, judge errors) are
+never cached.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import scorer
+import task
+
+CACHE_PATH = Path(__file__).parent / ".cache" / "llm_cache.sqlite"
+LAYERS = ("task", "judge")
+
+# get_model_config() keys that affect what the model returns
+_MODEL_KEYS = ("backend", "base_url", "model", "thinking", "max_tokens")
+
+
+def content_key(*parts: Any) -> str:
+    """Stable SHA-256 hex digest of JSON-serializable parts."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def model_fingerprint(cfg: dict) -> dict:
+    """The parts of a get_model_config() dict that identify the model's behaviour."""
+    return {k: cfg.get(k) for k in _MODEL_KEYS}
+
+
+def task_key(input_dict: dict, task_fn: Callable = task.fix_code_bug) -> str:
+    return content_key(
+        "task",
+        model_fingerprint(task._cfg),
+        task.SYSTEM_PROMPT,
+        task.PROMPT_TEMPLATE,
+        f"{task_fn.__module__}.{task_fn.__qualname__}",
+        input_dict,
+    )
+
+
+def judge_key(output: str, input_dict: dict, reference: str) -> str:
+    return content_key(
+        "judge",
+        model_fingerprint(scorer._cfg),
+        scorer.JUDGE_PROMPT_TEMPLATE,
+        scorer.JUDGE_VERSION,
+        input_dict,
+        reference,
+        output,
+    )
+
+
+class ResultCache:
+    """
+    Persistent, thread-safe key → JSON value store, partitioned by layer.
+
+    Hit/miss counts per layer are kept in `stats` for the run summary.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " layer TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " PRIMARY KEY (layer, key))"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.stats: dict[str, dict[str, int]] = {
+            layer: {"hits": 0, "misses": 0} for layer in LAYERS
+        }
+
+    def get(self, layer: str, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE layer = ? AND key = ?", (layer, key)
+            ).fetchone()
+            self.stats[layer]["hits" if row else "misses"] += 1
+        return json.loads(row[0]) if row else None
+
+    def put(self, layer: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (layer, key, value, created) VALUES (?, ?, ?, ?)",
+                (layer, key, json.dumps(value), time.time()),
+            )
+            self._conn.commit()
+
+    def invalidate(self, layers: Optional[Iterable[str]] = None) -> int:
+        """Delete every entry in `layers` (default: all). Returns rows deleted."""
+        layers = list(LAYERS if layers is None else layers)
+        unknown = set(layers) - set(LAYERS)
+        if unknown:
+            raise ValueError(f"Unknown cache layer(s): {', '.join(sorted(unknown))}")
+        with self._lock:
+            cur = self._conn.execute(
+                f"DELETE FROM entries WHERE layer IN ({', '.join('?' * len(layers))})",
+                layers,
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
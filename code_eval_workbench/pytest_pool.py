@@ -0,0 +1,349 @@
+"""
+Warm pytest executor for the programmatic scorer.
+
+Launching `python -m pytest` per example costs ~1s of interpreter startup and
+plugin discovery before a single test runs. Instead, a small pool of worker
+processes imports pytest once and then runs each submission in-process:
+
+  - Each submission is written to a uniquely named module, so test code never
+    sees a previous submission's globals; the module is dropped from
+    `sys.modules` afterwards and workers are recycled every
+    `max_jobs_per_worker` jobs to bound any state that leaks anyway
+  - Per-job CPU-time (RLIMIT_CPU) and per-worker address-space (RLIMIT_AS)
+    limits, plus a wall-clock timeout after which the worker is killed and
+    replaced
+  - Outcomes are collected per test from pytest's report hooks, not parsed
+    from terminal output
+
+Results cross the process boundary as JSON. The pool is thread-safe: up to
+`size` jobs run at once, further callers block until a worker is free.
+"""
+import atexit
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+DEFAULT_TIMEOUT = 15.0
+DEFAULT_CPU_SECONDS = 10
+DEFAULT_MEMORY_MB = 512
+DEFAULT_MAX_JOBS_PER_WORKER = 200
+# Spawning a worker and importing pytest is not charged to the first job
+STARTUP_TIMEOUT = 60.0
+
+# Plugins that only report to a terminal or cache state between sessions.
+# Fixture-providing plugins (capture, monkeypatch, tmpdir) stay enabled.
+_DISABLED_PLUGINS = (
+    "terminal", "cacheprovider", "lfplugin", "stepwise", "doctest", "junitxml",
+    "pastebin", "faulthandler", "unraisableexception", "threadexception",
+)
+_MAX_MESSAGE_CHARS = 2000
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, timeouts still apply
+    resource = None
+
+
+# ─── Result Models ───────────────────────────────────────────────────────────
+
+class CaseResult(BaseModel):
+    name: str
+    outcome: str                # "passed" | "failed" | "error" | "skipped"
+    message: str = ""
+    duration: float = 0.0
+
+
+class SuiteResult(BaseModel):
+    cases: list[CaseResult] = []
+    error: str = ""             # collection error, timeout or worker crash
+    duration: float = 0.0
+
+    @property
+    def passed(self) -> int:
+        return sum(1 for c in self.cases if c.outcome == "passed")
+
+    @property
+    def total(self) -> int:
+        """Tests that ran to a verdict (skips excluded)."""
+        return sum(1 for c in self.cases if c.outcome != "skipped")
+
+
+# ─── Worker process ──────────────────────────────────────────────────────────
+
+class _Collector:
+    """pytest plugin recording one outcome per test from the report hooks."""
+
+    def __init__(self):
+        self.cases: dict[str, CaseResult] = {}
+        self.errors: list[str] = []
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self.errors.append(report.longreprtext[:_MAX_MESSAGE_CHARS])
+
+    def pytest_runtest_logreport(self, report):
+        name = report.nodeid.split("::", 1)[-1]
+        case = self.cases.setdefault(name, CaseResult(name=name, outcome="passed"))
+        case.duration += report.duration
+        if case.outcome != "passed":
+            return  # keep the first non-pass verdict
+        if report.skipped:
+            case.outcome = "skipped"
+        elif report.failed:
+            # A failing setup/teardown is an error; only the call phase "fails"
+            case.outcome = "failed" if report.when == "call" else "error"
+            case.message = report.longreprtext[:_MAX_MESSAGE_CHARS]
+
+
+def _apply_memory_limit(memory_mb: int) -> None:
+    """Cap the address space at the worker's current size plus `memory_mb`."""
+    if resource is None or memory_mb <= 0:
+        return
+    try:
+        with open("/proc/self/statm") as f:
+            baseline = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return  # no procfs: skip rather than guess a baseline
+    limit = baseline + memory_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _set_cpu_budget(seconds: int) -> None:
+    """Allow `seconds` more CPU time; SIGXCPU then terminates the worker."""
+    if resource is None or seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _run_suite(pytest, workdir: Path, module_name: str, source: str) -> SuiteResult:
+    path = workdir / f"{module_name}.py"
+    path.write_text(source)
+    collector = _Collector()
+    args = [str(path), "--rootdir", str(workdir), "-c", os.devnull]
+    for plugin in _DISABLED_PLUGINS:
+        args += ["-p", f"no:{plugin}"]
+
+    start = time.perf_counter()
+    try:
+        pytest.main(args, plugins=[collector])
+    finally:
+        sys.modules.pop(module_name, None)
+        path.unlink(missing_ok=True)
+
+    return SuiteResult(
+        cases=list(collector.cases.values()),
+        error="\n".join(collector.errors),
+        duration=time.perf_counter() - start,
+    )
+
+
+def _worker_main(conn, root: str, cpu_seconds: int, memory_mb: int) -> None:
+    # Skip entry-point plugin discovery — the main cost of starting pytest
+    os.environ["PYTEST_DISABLE_PLUGIN_AUTOLOAD"] = "1"
+    sys.dont_write_bytecode = True
+    import pytest
+
+    workdir = Path(tempfile.mkdtemp(dir=root))
+    os.chdir(workdir)
+    _apply_memory_limit(memory_mb)
+    conn.send_bytes(b"ready")
+
+    for job in itertools.count():
+        try:
+            source = conn.recv_bytes().decode()
+        except (EOFError, OSError):
+            return
+        _set_cpu_budget(cpu_seconds)
+        try:
+            result = _run_suite(pytest, workdir, f"eval_submission_{job}", source)
+        except BaseException as e:  # SystemExit/KeyboardInterrupt from test code
+            result = SuiteResult(error=f"{type(e).__name__}: {e}")
+        conn.send_bytes(result.model_dump_json().encode())
+
+
+# ─── Pool ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class _Worker:
+    process: multiprocessing.Process
+    conn: object
+    jobs: int = 0
+    ready: bool = False
+
+
+class PytestPool:
+    """
+    Pool of pre-warmed pytest worker processes.
+
+    Args:
+        size:                 Worker processes (default: CPU count)
+        timeout:              Wall-clock seconds per job before the worker is killed
+        cpu_seconds:          CPU-time limit per job (0 disables)
+        memory_mb:            Address space a worker may grow by (0 disables)
+        max_jobs_per_worker:  Jobs before a worker is replaced
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        cpu_seconds: int = DEFAULT_CPU_SECONDS,
+        memory_mb: int = DEFAULT_MEMORY_MB,
+        max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER,
+    ):
+        self.size = size or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._spawned = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._root = tempfile.mkdtemp(prefix="eval_pytest_")
+        self.stats = {"jobs": 0, "restarts": 0, "timeouts": 0}
+
+    def _spawn(self) -> _Worker:
+        parent, child = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child, self._root, self.cpu_seconds, self.memory_mb),
+            daemon=True,
+        )
+        process.start()
+        child.close()
+        return _Worker(process, parent)
+
+    def _acquire(self) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PytestPool is closed")
+            if self._idle.empty() and self._spawned < self.size:
+                self._spawned += 1
+                spawn = True
+            else:
+                spawn = False
+        if spawn:
+            try:
+                return self._spawn()
+            except BaseException:
+                with self._lock:
+                    self._spawned -= 1
+                raise
+        return self._idle.get()
+
+    def _discard(self, worker: _Worker) -> None:
+        worker.conn.close()
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=5)
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        if healthy and worker.jobs < self.max_jobs_per_worker and not self._closed:
+            self._idle.put(worker)
+            return
+        self._discard(worker)
+        if not healthy:
+            self.stats["restarts"] += 1
+        with self._lock:
+            if self._closed:
+                self._spawned -= 1
+                return
+        # Replace eagerly so the next caller gets a warm worker
+        try:
+            self._idle.put(self._spawn())
+        except OSError:
+            with self._lock:
+                self._spawned -= 1
+
+    def run(self, source: str) -> SuiteResult:
+        """Run the pytest tests in `source` (code + test functions) and return outcomes."""
+        worker = self._acquire()
+        worker.jobs += 1
+        self.stats["jobs"] += 1
+        healthy = False
+        try:
+            if not worker.ready:
+                if not worker.conn.poll(STARTUP_TIMEOUT):
+                    return SuiteResult(error="Worker failed to start")
+                worker.conn.recv_bytes()
+                worker.ready = True
+            worker.conn.send_bytes(source.encode())
+            if not worker.conn.poll(self.timeout):
+                self.stats["timeouts"] += 1
+                return SuiteResult(error=f"Timed out after {self.timeout:g}s", duration=self.timeout)
+            payload = worker.conn.recv_bytes()
+            healthy = True
+        except (EOFError, OSError):
+            worker.process.join(timeout=1)
+            return SuiteResult(error=_describe_exit(worker.process.exitcode))
+        finally:
+            self._release(worker, healthy)
+        return SuiteResult(**json.loads(payload))
+
+    def close(self) -> None:
+        """Stop all idle workers. Jobs in progress finish, then their workers exit."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(worker)
+            with self._lock:
+                self._spawned -= 1
+        shutil.rmtree(self._root, ignore_errors=True)
+
+    def __enter__(self) -> "PytestPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _describe_exit(exitcode: Optional[int]) -> str:
+    import signal
+
+    if exitcode is not None and exitcode < 0:
+        sig = -exitcode
+        if sig == getattr(signal, "SIGXCPU", None):
+            return "CPU time limit exceeded"
+        return f"Worker killed by {signal.Signals(sig).name}"
+    return f"Worker exited unexpectedly (code {exitcode})"
+
+
+_default_pool: Optional[PytestPool] = None
+_default_lock = threading.Lock()
+
+
+def get_default_pool() -> PytestPool:
+    """Return the process-wide pool used by `scorer.programmatic_score`."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = PytestPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -11,6 +11,9 @@ Usage:
   python run_eval.py --no-prog                # Skip programmatic scorer
   python run_eval.py --output results.json    # Save results to file
   python run_eval.py --threshold 0.70         # Exit non-zero if score < threshold
+  python run_eval.py --concurrency 16         # Examples evaluated in parallel
+  python run_eval.py --invalidate judge       # Re-judge, reuse cached task outputs
+  python run_eval.py --no-cache               # Bypass the LLM result cache
 """
 import argparse
 import sys
@@ -26,12 +29,11 @@ from rich.table import Table
 from rich import print as rprint
 
 from dataset import get_dataset
-from scorer import composite_score
-from task import fix_code_bug
+from cache import LAYERS, ResultCache
+from runner import DEFAULT_CONCURRENCY, EvalRunner
 from utils import (
     EvalResult,
-    RunSummary,
-    ScoreBreakdown,
+    build_run_summary,
     save_run,
     score_color,
     score_emoji,
@@ -62,8 +64,31 @@ def parse_args():
         default=0.0,
         help="Exit with code 1 if composite score < threshold (default: 0.0 = disabled)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Examples evaluated in parallel; caps concurrent LLM calls (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--scoring-workers",
+        type=int,
+        default=None,
+        help="Warm pytest worker processes for programmatic scoring (default: CPU count)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the LLM result cache")
+    parser.add_argument(
+        "--invalidate",
+        nargs="+",
+        choices=[*LAYERS, "all"],
+        default=[],
+        help="Drop cached entries for these layers before running",
+    )
     parser.add_argument("--verbose", "-v", action="store_true", help="Show full outputs")
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.no_cache and args.invalidate:
+        parser.error("--invalidate cannot be combined with --no-cache")
+    return args
 
 
 # ─── Display helpers ──────────────────────────────────────────────────────────
@@ -76,13 +101,14 @@ def make_score_cell(score: float | None, width: int = 6) -> str:
     return f"[{color}]{score:.3f} {emoji}[/{color}]"
 
 
-def print_header(n_examples: int, scorers: list[str]):
+def print_header(n_examples: int, scorers: list[str], concurrency: int = 1):
     console.print()
     console.print(
         Panel(
             f"[bold cyan]Code Eval Workbench[/bold cyan]\n"
             f"[dim]Model: claude-opus-4-6 + adaptive thinking[/dim]\n"
-            f"[dim]Examples: {n_examples}  |  Scorers: {', '.join(scorers)}[/dim]",
+            f"[dim]Examples: {n_examples}  |  Scorers: {', '.join(scorers)}"
+            f"  |  Concurrency: {concurrency}[/dim]",
             expand=False,
             border_style="cyan",
         )
@@ -126,7 +152,38 @@ def print_results_table(results: list[EvalResult], use_llm: bool, use_prog: bool
     console.print(table)
 
 
-def print_summary(results: list[EvalResult], run_id: str):
+def print_result_line(result: EvalResult, verbose: bool = False):
+    if result.error:
+        console.print(f"[red]Task error on {result.id}: {result.error}[/red]")
+
+    scores = result.scores
+    color = score_color(scores.composite)
+    console.print(
+        f"  [{color}]●[/{color}] {result.id:10s} "
+        f"composite=[{color}]{scores.composite:.3f}[/{color}] "
+        + (f"llm={scores.llm_judge:.3f} " if scores.llm_judge is not None else "")
+        + (f"prog={scores.programmatic:.3f} " if scores.programmatic is not None else "")
+        + (f"lev={scores.levenshtein:.3f}" if scores.levenshtein is not None else "")
+    )
+
+    if verbose and result.output:
+        console.print(f"  [dim]Output preview: {result.output[:200].replace(chr(10), ' ')}...[/dim]")
+
+
+def format_cache_stats(cache_stats: dict[str, dict[str, int]]) -> str:
+    parts = []
+    for layer, counts in cache_stats.items():
+        lookups = counts["hits"] + counts["misses"]
+        if lookups:
+            parts.append(f"{layer} {counts['hits']}/{lookups} hits")
+    return "Cache: " + ", ".join(parts) if parts else ""
+
+
+def print_summary(
+    results: list[EvalResult],
+    run_id: str,
+    cache_stats: dict[str, dict[str, int]] | None = None,
+):
     composites = [r.scores.composite for r in results]
     avg = sum(composites) / len(composites) if composites else 0.0
 
@@ -150,12 +207,15 @@ def print_summary(results: list[EvalResult], run_id: str):
         for k, v in buckets.items()
     )
 
+    cache_line = format_cache_stats(cache_stats or {})
+
     console.print()
     console.print(
         Panel(
             f"[bold {color}]FINAL COMPOSITE SCORE: {avg:.3f}  {score_emoji(avg)}[/bold {color}]\n"
             f"{dist_str}\n"
-            f"[dim]Run ID: {run_id}[/dim]",
+            + (f"[dim]{cache_line}[/dim]\n" if cache_line else "")
+            + f"[dim]Run ID: {run_id}[/dim]",
             title="[bold]Summary[/bold]",
             border_style=color,
             expand=False,
@@ -192,8 +252,25 @@ def run_eval(args) -> float:
     if use_lev:
         scorers_active.append("Levenshtein")
 
-    print_header(len(data), scorers_active)
-
+    print_header(len(data), scorers_active, args.concurrency)
+
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache()
+        if args.invalidate:
+            layers = None if "all" in args.invalidate else args.invalidate
+            dropped = cache.invalidate(layers)
+            console.print(f"[dim]Invalidated {dropped} cached entries ({', '.join(args.invalidate)})[/dim]")
+    cache_stats = cache.stats if cache else None
+
+    runner = EvalRunner(
+        concurrency=args.concurrency,
+        scoring_workers=args.scoring_workers,
+        use_llm_judge=use_llm,
+        use_programmatic=use_prog,
+        use_levenshtein=use_lev,
+        cache=cache,
+    )
     results: list[EvalResult] = []
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -208,92 +285,25 @@ def run_eval(args) -> float:
     ) as progress:
         task = progress.add_task("Evaluating...", total=len(data))
 
-        for item in data:
-            progress.update(task, description=f"[cyan]{item['id']}[/cyan] — fixing bug...")
-
-            # 1. Run the task (Claude fixes the bug)
-            try:
-                output = fix_code_bug(item["input"])
-            except Exception as e:
-                console.print(f"[red]Task error on {item['id']}: {e}[/red]")
-                output = ""
-
-            progress.update(task, description=f"[cyan]{item['id']}[/cyan] — scoring...")
-
-            # 2. Score
-            score_dict = composite_score(
-                output=output,
-                input_dict=item["input"],
-                reference=item["reference_output"],
-                test_code=item.get("test_code", ""),
-                use_llm_judge=use_llm,
-                use_programmatic=use_prog,
-                use_levenshtein=use_lev,
-            )
-
-            result = EvalResult(
-                id=item["id"],
-                category=item["category"],
-                difficulty=item["difficulty"],
-                output=output,
-                scores=ScoreBreakdown(
-                    llm_judge=score_dict.get("llm_judge"),
-                    programmatic=score_dict.get("programmatic"),
-                    levenshtein=score_dict.get("levenshtein"),
-                    composite=score_dict["composite"],
-                ),
-                reasoning=score_dict.get("reasoning", ""),
-                passed_tests=score_dict.get("passed_tests"),
-                total_tests=score_dict.get("total_tests"),
-            )
+        # Results arrive in completion order; each one is printed and the
+        # saved run is rewritten, so an interrupted run keeps what finished.
+        for result in runner.run(data):
             results.append(result)
-
-            # Live score print
-            composite_val = score_dict["composite"]
-            color = score_color(composite_val)
-            console.print(
-                f"  [{color}]●[/{color}] {item['id']:10s} "
-                f"composite=[{color}]{composite_val:.3f}[/{color}] "
-                + (f"llm={score_dict['llm_judge']:.3f} " if score_dict.get("llm_judge") is not None else "")
-                + (f"prog={score_dict['programmatic']:.3f} " if score_dict.get("programmatic") is not None else "")
-                + (f"lev={score_dict['levenshtein']:.3f}" if score_dict.get("levenshtein") is not None else "")
-            )
-
-            if args.verbose and output:
-                console.print(f"  [dim]Output preview: {output[:200].replace(chr(10), ' ')}...[/dim]")
+            print_result_line(result, args.verbose)
+            save_run(build_run_summary(run_id, results, scorers_active, cache_stats))
 
             progress.advance(task)
+            progress.update(task, description=f"[cyan]{result.id}[/cyan] done — evaluating...")
 
-    # Print final table & summary
+    # Print final table & summary, in dataset order
+    position = {item["id"]: i for i, item in enumerate(data)}
+    results.sort(key=lambda r: position[r.id])
     console.print()
     print_results_table(results, use_llm, use_prog, use_lev)
-    final_score = print_summary(results, run_id)
+    final_score = print_summary(results, run_id, cache_stats)
 
     # Persist results
-    run_summary = RunSummary(
-        run_id=run_id,
-        timestamp=datetime.now().isoformat(),
-        avg_composite=round(final_score, 4),
-        avg_llm_judge=round(
-            sum(r.scores.llm_judge for r in results if r.scores.llm_judge is not None)
-            / max(1, sum(1 for r in results if r.scores.llm_judge is not None)),
-            4,
-        ),
-        avg_programmatic=round(
-            sum(r.scores.programmatic for r in results if r.scores.programmatic is not None)
-            / max(1, sum(1 for r in results if r.scores.programmatic is not None)),
-            4,
-        ),
-        avg_levenshtein=round(
-            sum(r.scores.levenshtein for r in results if r.scores.levenshtein is not None)
-            / max(1, sum(1 for r in results if r.scores.levenshtein is not None)),
-            4,
-        ),
-        n_examples=len(results),
-        scorers_used=scorers_active,
-        results=results,
-    )
-
+    run_summary = build_run_summary(run_id, results, scorers_active, cache_stats)
     save_path = save_run(run_summary)
     console.print(f"[dim]Results saved → {save_path}[/dim]")
 
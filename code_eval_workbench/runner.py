@@ -0,0 +1,182 @@
+"""
+Concurrent evaluation runner for the Code Eval Workbench.
+
+Each example is a small pipeline:
+
+  fix_code_bug ──┬── llm_judge_score                   (thread pool, network-bound)
+                 └── programmatic + levenshtein scores (warm pytest worker processes)
+
+Up to `concurrency` examples are in flight at once, so LLM calls overlap with
+each other and with pytest runs. Tests execute in PytestPool worker processes,
+so the scoring threads only wait on IPC. Results are yielded as they finish —
+not in dataset order — so callers can stream them to the terminal and to disk.
+"""
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, Optional
+
+import scorer
+from cache import ResultCache, judge_key, task_key
+from pytest_pool import PytestPool
+from task import fix_code_bug
+from utils import EvalResult, ScoreBreakdown
+
+DEFAULT_CONCURRENCY = 8
+
+
+def offline_scores(
+    output: str,
+    reference: str,
+    test_code: str,
+    use_programmatic: bool = True,
+    use_levenshtein: bool = True,
+    pool: Optional[PytestPool] = None,
+) -> dict:
+    """
+    Run the scorers that need no API access.
+
+    Returns dict with keys: programmatic, passed_tests, total_tests, levenshtein
+    (only for the enabled scorers).
+    """
+    result: dict = {}
+    if use_programmatic:
+        s, pt, tt = scorer.programmatic_score(output, test_code, pool=pool)
+        result.update(programmatic=s, passed_tests=pt, total_tests=tt)
+    if use_levenshtein:
+        result["levenshtein"] = scorer.levenshtein_score(output, reference)
+    return result
+
+
+class EvalRunner:
+    """
+    Evaluate examples concurrently and yield EvalResults as they complete.
+
+    Args:
+        concurrency:      Examples in flight at once (caps concurrent LLM calls)
+        scoring_workers:  Warm pytest worker processes (default: CPU count)
+        use_llm_judge / use_programmatic / use_levenshtein: enabled scorers
+        task_fn:          The task under evaluation (default: fix_code_bug)
+        cache:            Serve unchanged task outputs and judge scores from
+                          disk (see cache.py); None disables caching
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        scoring_workers: Optional[int] = None,
+        use_llm_judge: bool = True,
+        use_programmatic: bool = True,
+        use_levenshtein: bool = True,
+        task_fn: Callable[[dict], str] = fix_code_bug,
+        cache: Optional[ResultCache] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.scoring_workers = scoring_workers or os.cpu_count() or 1
+        self.use_llm_judge = use_llm_judge
+        self.use_programmatic = use_programmatic
+        self.use_levenshtein = use_levenshtein
+        self.task_fn = task_fn
+        self.cache = cache
+
+    def run(self, data: list[dict]) -> Iterator[EvalResult]:
+        """Evaluate `data`, yielding each result as soon as it is scored."""
+        if not data:
+            return
+
+        pool: Optional[PytestPool] = None
+        if self.use_programmatic:
+            pool = PytestPool(size=min(self.scoring_workers, len(data)))
+        scoring = ThreadPoolExecutor(
+            max_workers=min(self.scoring_workers, len(data)),
+            thread_name_prefix="eval-score",
+        )
+        threads = ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(data)),
+            thread_name_prefix="eval",
+        )
+        try:
+            futures = [threads.submit(self._evaluate, item, scoring, pool) for item in data]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # On early exit (Ctrl-C, consumer stops) drop examples not yet started
+            threads.shutdown(cancel_futures=True)
+            scoring.shutdown(cancel_futures=True)
+            if pool is not None:
+                pool.close()
+
+    def _evaluate(
+        self,
+        item: dict,
+        scoring: ThreadPoolExecutor,
+        pool: Optional[PytestPool],
+    ) -> EvalResult:
+        error = ""
+        try:
+            output = self._run_task(item["input"])
+        except Exception as e:
+            output, error = "", f"{type(e).__name__}: {e}"
+
+        # Start pytest/difflib first so they overlap with the judge call
+        pending: Optional[Future] = None
+        if self.use_programmatic or self.use_levenshtein:
+            pending = scoring.submit(
+                offline_scores,
+                output,
+                item["reference_output"],
+                item.get("test_code", ""),
+                self.use_programmatic,
+                self.use_levenshtein,
+                pool,
+            )
+
+        scores: dict = {}
+        reasoning = ""
+        if self.use_llm_judge:
+            scores["llm_judge"], reasoning = self._judge(
+                output, item["input"], item["reference_output"]
+            )
+
+        if pending is not None:
+            scores.update(pending.result())
+
+        return EvalResult(
+            id=item["id"],
+            category=item["category"],
+            difficulty=item["difficulty"],
+            output=output,
+            scores=ScoreBreakdown(
+                llm_judge=scores.get("llm_judge"),
+                programmatic=scores.get("programmatic"),
+                levenshtein=scores.get("levenshtein"),
+                composite=scorer.combine_scores(scores),
+            ),
+            reasoning=reasoning,
+            passed_tests=scores.get("passed_tests"),
+            total_tests=scores.get("total_tests"),
+            error=error,
+        )
+
+    def _run_task(self, input_dict: dict) -> str:
+        if self.cache is None:
+            return self.task_fn(input_dict)
+        key = task_key(input_dict, self.task_fn)
+        output = self.cache.get("task", key)
+        if output is None:
+            output = self.task_fn(input_dict)
+            self.cache.put("task", key, output)
+        return output
+
+    def _judge(self, output: str, input_dict: dict, reference: str) -> tuple[float, str]:
+        if self.cache is None:
+            return scorer.llm_judge_score(output, input_dict, reference)
+        key = judge_key(output, input_dict, reference)
+        cached = self.cache.get("judge", key)
+        if cached is not None:
+            return cached["score"], cached["reasoning"]
+        score, reasoning = scorer.llm_judge_score(output, input_dict, reference)
+        if not reasoning.startswith("Judge error:"):
+            self.cache.put("judge", key, {"score": score, "reasoning": reasoning})
+        return score, reasoning
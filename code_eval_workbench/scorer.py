@@ -5,16 +5,15 @@ Four scorers, each returning a float in [0.0, 1.0]:
 
   1. llm_judge_score   — Claude grades correctness, code quality, explanation
   2. programmatic_score — Runs extracted code against embedded pytest tests
+                          (on pre-warmed workers, see pytest_pool.py)
   3. levenshtein_score  — Character-level similarity vs reference (difflib)
   4. composite_score    — Weighted average of enabled scorers
 """
 import difflib
 import json
-import os
-import subprocess
-import tempfile
 from typing import Optional
 
+from pytest_pool import PytestPool, get_default_pool
 from utils import extract_code_block, get_model_config
 
 _cfg   = get_model_config()
@@ -32,29 +31,21 @@ COMPOSITE_WEIGHTS = {
 
 # ─── 1. LLM-as-Judge ─────────────────────────────────────────────────────────
 
-def llm_judge_score(
-    output: str,
-    input_dict: dict,
-    reference: str,
-) -> tuple[float, str]:
-    """
-    Use Claude as a judge to score the fix on a 0.0–1.0 rubric.
+# Bump when the judge's rubric or parsing changes, so cached scores are not reused
+JUDGE_VERSION = "1"
 
-    Returns:
-        (score, reasoning) tuple
-    """
-    judge_prompt = f"""You are an expert code reviewer evaluating a student's bug fix.
+JUDGE_PROMPT_TEMPLATE = """You are an expert code reviewer evaluating a student's bug fix.
 
 Score the fix on a 0.0–1.0 scale using this EXACT rubric:
   - Correctness (0.40): Does the fix actually solve the stated bug?
   - Code Quality (0.30): Is the fixed code clean, idiomatic, and free of new bugs?
   - Explanation Quality (0.30): Is the explanation clear, accurate, and helpful?
 
-Bug description: {input_dict['bug_description']}
+Bug description: {bug_description}
 
 Original buggy code:
 ```python
-{input_dict['buggy_code']}
+{buggy_code}
 ```
 
 Reference correct fix:
@@ -68,6 +59,25 @@ Student's output:
 Respond ONLY with valid JSON (no markdown, no explanation outside JSON):
 {{"score": <float 0.0–1.0>, "reasoning": "<2-3 sentence evaluation>"}}"""
 
+
+def llm_judge_score(
+    output: str,
+    input_dict: dict,
+    reference: str,
+) -> tuple[float, str]:
+    """
+    Use Claude as a judge to score the fix on a 0.0–1.0 rubric.
+
+    Returns:
+        (score, reasoning) tuple
+    """
+    judge_prompt = JUDGE_PROMPT_TEMPLATE.format(
+        bug_description=input_dict["bug_description"],
+        buggy_code=input_dict["buggy_code"],
+        reference=reference,
+        output=output,
+    )
+
     try:
         response = client.messages.create(
             model=_MODEL,
@@ -98,10 +108,14 @@ Respond ONLY with valid JSON (no markdown, no explanation outside JSON):
 def programmatic_score(
     output: str,
     test_code: str,
+    pool: Optional[PytestPool] = None,
 ) -> tuple[float, Optional[int], Optional[int]]:
     """
     Extract fixed code from output, run pytest tests, return pass rate.
 
+    Tests run on a warm worker from `pool` (default: the shared pool in
+    pytest_pool.py) rather than a fresh `python -m pytest` subprocess.
+
     Returns:
         (score, passed_tests, total_tests)
     """
@@ -112,48 +126,15 @@ def programmatic_score(
     if not fixed_code:
         return 0.0, 0, 0
 
-    # Combine fixed code + test functions into a single temp file
+    # Combine fixed code + test functions into a single module
     combined = fixed_code + "\n\n" + test_code
 
-    tmp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".py", delete=False, prefix="eval_test_"
-        ) as f:
-            f.write(combined)
-            tmp_path = f.name
-
-        result = subprocess.run(
-            ["python", "-m", "pytest", tmp_path, "-v", "--tb=short", "--no-header", "-q"],
-            capture_output=True,
-            text=True,
-            timeout=15,
-        )
-
-        stdout = result.stdout + result.stderr
-
-        # Parse pytest summary line: "2 passed, 1 failed"
-        passed = stdout.count(" PASSED") + stdout.count(" passed")
-        failed = stdout.count(" FAILED") + stdout.count(" failed")
-
-        # Fallback: check exit code
-        if passed == 0 and failed == 0:
-            if result.returncode == 0:
-                return 1.0, None, None
-            else:
-                return 0.0, 0, 0
-
-        total = passed + failed
-        score = passed / total if total > 0 else 0.0
-        return score, passed, total
-
-    except subprocess.TimeoutExpired:
+    suite = (pool or get_default_pool()).run(combined)
+    if suite.error or suite.total == 0:
+        # Syntax/collection error, timeout, resource limit, or no tests found
         return 0.0, 0, 0
-    except Exception:
-        return 0.0, 0, 0
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+
+    return suite.passed / suite.total, suite.passed, suite.total
 
 
 # ─── 3. Levenshtein / Sequence Similarity ────────────────────────────────────
@@ -190,6 +171,24 @@ def levenshtein_score(output: str, reference: str) -> float:
 
 # ─── 4. Composite Scorer ─────────────────────────────────────────────────────
 
+def combine_scores(scores: dict) -> float:
+    """
+    Weighted average of the scorers present in `scores`.
+
+    Weights are renormalized over the enabled scorers, so disabling one
+    does not drag the composite down.
+    """
+    total_weight = 0.0
+    weighted_sum = 0.0
+    for key, weight in COMPOSITE_WEIGHTS.items():
+        if scores.get(key) is not None:
+            weighted_sum += scores[key] * weight
+            total_weight += weight
+
+    composite = weighted_sum / total_weight if total_weight > 0 else 0.0
+    return round(composite, 4)
+
+
 def composite_score(
     output: str,
     input_dict: dict,
@@ -224,21 +223,11 @@ def composite_score(
     if use_levenshtein:
         scores["levenshtein"] = levenshtein_score(output, reference)
 
-    # Weighted composite over enabled scorers only
-    total_weight = 0.0
-    weighted_sum = 0.0
-    for key, weight in COMPOSITE_WEIGHTS.items():
-        if key in scores:
-            weighted_sum += scores[key] * weight
-            total_weight += weight
-
-    composite = weighted_sum / total_weight if total_weight > 0 else 0.0
-
     return {
         "llm_judge": scores.get("llm_judge"),
         "programmatic": scores.get("programmatic"),
         "levenshtein": scores.get("levenshtein"),
-        "composite": round(composite, 4),
+        "composite": combine_scores(scores),
         "reasoning": reasoning,
         "passed_tests": passed_tests,
         "total_tests": total_tests,
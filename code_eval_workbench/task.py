@@ -32,6 +32,15 @@ Always respond in EXACTLY this format — nothing else:
 ```
 Explanation: [1-2 sentences describing what was wrong and how you fixed it]"""
 
+PROMPT_TEMPLATE = """Fix this Python bug.
+
+Buggy code:
+```python
+{buggy_code}
+```
+
+Bug description: {bug_description}"""
+
 
 def fix_code_bug(input_dict: dict) -> str:
     """
@@ -43,14 +52,7 @@ def fix_code_bug(input_dict: dict) -> str:
     Returns:
         Claude's full response (fixed code + explanation)
     """
-    prompt = f"""Fix this Python bug.
-
-Buggy code:
-```python
-{input_dict['buggy_code']}
-```
-
-Bug description: {input_dict['bug_description']}"""
+    prompt = PROMPT_TEMPLATE.format(**input_dict)
 
     full_response = ""
 
@@ -0,0 +1,118 @@
+"""Tests for cache.py."""
+import pytest
+import run_eval
+import scorer
+import task
+from cache import ResultCache, content_key, judge_key, task_key
+from runner import EvalRunner
+
+FIXED = '```python\ndef add(a, b):\n    return a + b\n```\nExplanation: fixed.'
+INPUT = {'buggy_code': 'def add(a, b): return a - b', 'bug_description': 'should add'}
+
+
+def make_item(i: int) -> dict:
+    return {
+        'id': f'bug_{i:03d}',
+        'category': 'arithmetic',
+        'difficulty': 'easy',
+        'input': {**INPUT, 'bug_description': f'should add ({i})'},
+        'reference_output': 'def add(a, b):\n    return a + b',
+        'test_code': '',
+    }
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResultCache(tmp_path / 'cache.sqlite')
+    yield c
+    c.close()
+
+
+class TestKeys:
+    def test_content_key_is_order_independent_for_dicts(self):
+        assert content_key({'a': 1, 'b': 2}) == content_key({'b': 2, 'a': 1})
+
+    def test_task_key_changes_with_prompt(self, monkeypatch):
+        before = task_key(INPUT)
+        monkeypatch.setattr(task, 'PROMPT_TEMPLATE', task.PROMPT_TEMPLATE + '\nBe brief.')
+        assert task_key(INPUT) != before
+
+    def test_task_key_changes_with_model(self, monkeypatch):
+        before = task_key(INPUT)
+        monkeypatch.setitem(task._cfg, 'model', 'another-model')
+        assert task_key(INPUT) != before
+
+    def test_judge_key_changes_with_version_and_output(self, monkeypatch):
+        before = judge_key(FIXED, INPUT, 'ref')
+        assert judge_key(FIXED + ' ', INPUT, 'ref') != before
+        monkeypatch.setattr(scorer, 'JUDGE_VERSION', 'next')
+        assert judge_key(FIXED, INPUT, 'ref') != before
+
+
+class TestResultCache:
+    def test_roundtrip_and_stats(self, cache):
+        assert cache.get('task', 'k') is None
+        cache.put('task', 'k', 'output')
+        assert cache.get('task', 'k') == 'output'
+        assert cache.stats['task'] == {'hits': 1, 'misses': 1}
+
+    def test_persists_across_instances(self, cache):
+        cache.put('judge', 'k', {'score': 0.5, 'reasoning': 'ok'})
+        reopened = ResultCache(cache.path)
+        assert reopened.get('judge', 'k') == {'score': 0.5, 'reasoning': 'ok'}
+        reopened.close()
+
+    def test_invalidate_by_layer(self, cache):
+        cache.put('task', 'a', 'x')
+        cache.put('judge', 'b', {'score': 1.0, 'reasoning': ''})
+        assert cache.invalidate(['judge']) == 1
+        assert cache.get('task', 'a') == 'x'
+        assert cache.get('judge', 'b') is None
+
+    def test_invalidate_unknown_layer(self, cache):
+        with pytest.raises(ValueError):
+            cache.invalidate(['nope'])
+
+
+class TestRunnerCaching:
+    def test_second_run_served_from_cache(self, cache, monkeypatch):
+        calls = {'task': 0, 'judge': 0}
+
+        def fake_task(_):
+            calls['task'] += 1
+            return FIXED
+
+        def fake_judge(output, input_dict, reference):
+            calls['judge'] += 1
+            return 0.9, 'good'
+
+        monkeypatch.setattr(scorer, 'llm_judge_score', fake_judge)
+        data = [make_item(i) for i in range(3)]
+        runner = EvalRunner(use_programmatic=False, task_fn=fake_task, cache=cache)
+
+        first = {r.id: r.scores.composite for r in runner.run(data)}
+        second = {r.id: r.scores.composite for r in runner.run(data)}
+
+        assert first == second
+        assert calls == {'task': 3, 'judge': 3}
+        assert cache.stats['task'] == {'hits': 3, 'misses': 3}
+        assert cache.stats['judge'] == {'hits': 3, 'misses': 3}
+
+    def test_judge_errors_are_not_cached(self, cache, monkeypatch):
+        monkeypatch.setattr(scorer, 'llm_judge_score', lambda *a: (0.0, 'Judge error: timeout'))
+        runner = EvalRunner(use_programmatic=False, task_fn=lambda _: FIXED, cache=cache)
+        list(runner.run([make_item(0)]))
+        assert cache.invalidate(['judge']) == 0
+
+
+class TestCli:
+    def test_invalidate_rejected_with_no_cache(self, monkeypatch, capsys):
+        monkeypatch.setattr('sys.argv', ['run_eval.py', '--no-cache', '--invalidate', 'judge'])
+        with pytest.raises(SystemExit) as exc:
+            run_eval.parse_args()
+        assert exc.value.code == 2
+        assert '--invalidate cannot be combined with --no-cache' in capsys.readouterr().err
+
+    def test_invalidate_accepted_with_cache(self, monkeypatch):
+        monkeypatch.setattr('sys.argv', ['run_eval.py', '--invalidate', 'judge'])
+        assert run_eval.parse_args().invalidate == ['judge']
@@ -0,0 +1,99 @@
+"""Tests for pytest_pool.py."""
+import sys
+import threading
+
+import pytest
+from pytest_pool import PytestPool
+
+ADD = 'def add(a, b):\n    return a + b\n\n'
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with PytestPool(size=2, timeout=5, cpu_seconds=2, memory_mb=256) as p:
+        yield p
+
+
+class TestPytestPool:
+    def test_per_test_outcomes(self, pool):
+        suite = pool.run(ADD + 'def test_ok(): assert add(2, 3) == 5\n'
+                               'def test_bad(): assert add(2, 3) == 6\n')
+        outcomes = {c.name: c.outcome for c in suite.cases}
+        assert outcomes == {'test_ok': 'passed', 'test_bad': 'failed'}
+        assert (suite.passed, suite.total) == (1, 2)
+        bad = next(c for c in suite.cases if c.name == 'test_bad')
+        assert '5 == 6' in bad.message
+
+    def test_multiple_asserts_count_as_one_test(self, pool):
+        suite = pool.run(ADD + 'def test_add():\n    assert add(1, 1) == 2\n    assert add(0, 0) == 0\n')
+        assert (suite.passed, suite.total) == (1, 1)
+
+    def test_pytest_features(self, pool):
+        suite = pool.run(
+            'import pytest\n'
+            'def div(a, b): return a / b\n'
+            '@pytest.mark.parametrize("a,b,q", [(4, 2, 2), (9, 3, 3)])\n'
+            'def test_div(a, b, q): assert div(a, b) == q\n'
+            'def test_zero():\n'
+            '    with pytest.raises(ZeroDivisionError):\n'
+            '        div(1, 0)\n'
+            'def test_tmp(tmp_path): assert tmp_path.is_dir()\n'
+            '@pytest.mark.skip\n'
+            'def test_skipped(): pass\n'
+        )
+        assert suite.error == ''
+        assert (suite.passed, suite.total) == (4, 4)
+
+    def test_fixture_error(self, pool):
+        suite = pool.run('def test_missing(no_such_fixture): pass\n')
+        assert suite.cases[0].outcome == 'error'
+        assert suite.passed == 0
+
+    def test_syntax_error_is_collection_error(self, pool):
+        suite = pool.run('def add(a, b) return a + b\ndef test_add(): pass\n')
+        assert suite.cases == []
+        assert 'SyntaxError' in suite.error
+
+    def test_submissions_are_isolated(self, pool):
+        pool.run('LEAKED = 1\ndef test_a(): pass\n')
+        suite = pool.run('def test_b(): assert "LEAKED" not in globals()\n')
+        assert suite.passed == 1
+
+    def test_sys_exit_does_not_kill_worker(self, pool):
+        suite = pool.run('import sys\nsys.exit(3)\ndef test_a(): pass\n')
+        assert suite.passed == 0
+        assert pool.run(ADD + 'def test_ok(): assert add(1, 2) == 3\n').passed == 1
+
+    def test_concurrent_callers(self, pool):
+        results = []
+
+        def submit(i):
+            results.append(pool.run(ADD + f'def test_{i}(): assert add({i}, 1) == {i + 1}\n'))
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert [r.passed for r in results] == [1] * 6
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses POSIX rlimits')
+class TestPytestPoolLimits:
+    def test_timeout_replaces_worker(self):
+        with PytestPool(size=1, timeout=1, cpu_seconds=0) as pool:
+            suite = pool.run('import time\ndef test_hang(): time.sleep(30)\n')
+            assert 'Timed out' in suite.error
+            assert pool.stats['restarts'] == 1
+            assert pool.run('def test_ok(): pass\n').passed == 1
+
+    def test_cpu_limit(self):
+        with PytestPool(size=1, timeout=10, cpu_seconds=1) as pool:
+            suite = pool.run('def test_spin():\n    while True:\n        pass\n')
+            assert suite.error == 'CPU time limit exceeded'
+            assert pool.run('def test_ok(): pass\n').passed == 1
+
+    def test_memory_limit(self, pool):
+        suite = pool.run('def test_big(): bytearray(1024 * 1024 * 1024)\n')
+        assert suite.cases[0].outcome == 'failed'
+        assert 'MemoryError' in suite.cases[0].message
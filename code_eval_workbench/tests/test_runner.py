@@ -0,0 +1,96 @@
+"""Tests for runner.py."""
+import threading
+import time
+
+import pytest
+from runner import EvalRunner, offline_scores
+from scorer import composite_score
+from utils import build_run_summary
+
+FIXED = '```python\ndef add(a, b):\n    return a + b\n```\nExplanation: fixed.'
+
+
+def make_item(i: int) -> dict:
+    return {
+        'id': f'bug_{i:03d}',
+        'category': 'arithmetic',
+        'difficulty': 'easy',
+        'input': {'buggy_code': 'def add(a, b): return a - b', 'bug_description': 'should add'},
+        'reference_output': 'def add(a, b):\n    return a + b',
+        'test_code': 'def test_add():\n    assert add(2, 3) == 5',
+    }
+
+
+class TestOfflineScores:
+    def test_only_enabled_scorers(self):
+        item = make_item(0)
+        result = offline_scores(FIXED, item['reference_output'], item['test_code'],
+                                use_programmatic=False, use_levenshtein=True)
+        assert result == {'levenshtein': 1.0}
+
+
+class TestEvalRunner:
+    def test_matches_composite_score(self):
+        item = make_item(0)
+        runner = EvalRunner(concurrency=2, scoring_workers=1, task_fn=lambda _: FIXED)
+        [result] = list(runner.run([item]))
+
+        expected = composite_score(FIXED, item['input'], item['reference_output'], item['test_code'])
+        assert result.scores.composite == expected['composite']
+        assert result.scores.llm_judge == expected['llm_judge']
+        assert result.scores.programmatic == expected['programmatic']
+        assert result.reasoning == expected['reasoning']
+
+    def test_overlaps_task_calls(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_task(_):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.2)
+            with lock:
+                active -= 1
+            return FIXED
+
+        data = [make_item(i) for i in range(8)]
+        runner = EvalRunner(concurrency=4, use_programmatic=False, use_levenshtein=False,
+                            task_fn=slow_task)
+        start = time.perf_counter()
+        results = list(runner.run(data))
+        elapsed = time.perf_counter() - start
+
+        assert {r.id for r in results} == {d['id'] for d in data}
+        assert peak == 4
+        assert elapsed < 8 * 0.2 / 2
+
+    def test_task_error_is_recorded(self):
+        def broken(_):
+            raise RuntimeError('rate limited')
+
+        runner = EvalRunner(use_programmatic=False, task_fn=broken)
+        [result] = list(runner.run([make_item(0)]))
+        assert result.output == ''
+        assert result.error == 'RuntimeError: rate limited'
+        assert result.scores.levenshtein == 0.0
+
+    def test_empty_dataset(self):
+        assert list(EvalRunner(task_fn=lambda _: FIXED).run([])) == []
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            EvalRunner(concurrency=0)
+
+
+class TestBuildRunSummary:
+    def test_averages_skip_disabled_scorers(self):
+        runner = EvalRunner(use_programmatic=False, task_fn=lambda _: FIXED)
+        results = list(runner.run([make_item(0), make_item(1)]))
+        summary = build_run_summary('r1', results, ['LLM-as-judge', 'Levenshtein'])
+        assert summary.n_examples == 2
+        assert summary.avg_llm_judge == 0.85
+        assert summary.avg_levenshtein == 1.0
+        assert summary.avg_programmatic == 0.0
@@ -71,8 +71,9 @@ class TestProgrammaticScore:
         test = 'def test_add():\n    assert add(2, 3) == 5\n    assert add(0, 0) == 0'
         score, pt, tt = programmatic_score(output, test)
         assert score == 1.0
-        assert pt == 2
-        assert tt == 2
+        # Counted per test function, not per assert
+        assert pt == 1
+        assert tt == 1
 
     def test_failing_tests_returns_0(self):
         output = '```python\ndef add(a, b):\n    return a - b  # still buggy\n```'
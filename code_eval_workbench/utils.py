@@ -107,6 +107,7 @@ class EvalResult(BaseModel):
     reasoning: str = ""
     passed_tests: Optional[int] = None
     total_tests: Optional[int] = None
+    error: str = ""
     timestamp: str = ""
 
     def model_post_init(self, __context):
@@ -123,6 +124,36 @@ class RunSummary(BaseModel):
     n_examples: int
     scorers_used: list[str]
     results: list[EvalResult]
+    cache_stats: dict[str, dict[str, int]] = {}
+
+
+def build_run_summary(
+    run_id: str,
+    results: list[EvalResult],
+    scorers_used: list[str],
+    cache_stats: Optional[dict[str, dict[str, int]]] = None,
+) -> RunSummary:
+    """Aggregate per-example results into a RunSummary (averages skip disabled scorers)."""
+
+    def avg(values: list[float]) -> float:
+        return round(sum(values) / max(1, len(values)), 4)
+
+    return RunSummary(
+        run_id=run_id,
+        timestamp=datetime.now().isoformat(),
+        avg_composite=avg([r.scores.composite for r in results]),
+        avg_llm_judge=avg([r.scores.llm_judge for r in results if r.scores.llm_judge is not None]),
+        avg_programmatic=avg(
+            [r.scores.programmatic for r in results if r.scores.programmatic is not None]
+        ),
+        avg_levenshtein=avg(
+            [r.scores.levenshtein for r in results if r.scores.levenshtein is not None]
+        ),
+        n_examples=len(results),
+        scorers_used=scorers_used,
+        results=results,
+        cache_stats=cache_stats or {},
+    )
 
 
 # ─── Code Extraction ─────────────────────────────────────────────────────────
@@ -20,6 +20,8 @@ from dataclasses import dataclass
 import random
 import math
 
+from pricing_engine import PricingBatch, PricingResult, optimize_prices
+
 # Load environment variables
 load_dotenv()
 
@@ -302,43 +304,38 @@ class DynamicPricingAgent:
         """Forecast demand using ML models"""
         
         products = pricing_data.get("products", [])
-        demand_forecasts = {}
-        
-        for product in products:
-            product_name = product.get("name", "Unknown")
-            category = product.get("category", "vegetables").lower()
-            current_price = product.get("price", 50)
-            
-            # Get elasticity for category
-            elasticity_data = self.market_elasticity.get(category, self.market_elasticity["vegetables"])
-            demand_elasticity = elasticity_data["demand_elasticity"]
-            
-            # Simulate ML demand prediction
-            base_demand = 1000 + random.uniform(-200, 300)  # Base weekly demand
-            
-            # Apply seasonal factors
-            seasonal_factor = self.seasonal_factors.get(
-                market_analysis.get("current_season", "summer"), {}
-            ).get(category, 1.0)
-            
-            # Apply market sentiment
-            sentiment_factor = 0.8 + (market_analysis.get("consumer_sentiment", 0.5) * 0.4)
-            
-            # Calculate forecasted demand
-            forecasted_demand = base_demand * seasonal_factor * sentiment_factor
-            
-            # Demand growth prediction
-            demand_growth = (forecasted_demand - base_demand) / base_demand * 100
-            
-            demand_forecasts[product_name] = {
-                "current_demand": int(base_demand),
-                "forecasted_demand": int(forecasted_demand),
-                "demand_growth": round(demand_growth, 1),
-                "demand_elasticity": demand_elasticity,
-                "seasonal_factor": seasonal_factor,
-                "confidence_score": random.uniform(0.85, 0.95),
+        n = len(products)
+        names = [product.get("name", "Unknown") for product in products]
+        categories = [product.get("category", "vegetables").lower() for product in products]
+        
+        # Get elasticity and seasonal factor per category
+        default_elasticity = self.market_elasticity["vegetables"]
+        demand_elasticity = np.array([
+            self.market_elasticity.get(category, default_elasticity)["demand_elasticity"]
+            for category in categories
+        ])
+        season_factors = self.seasonal_factors.get(market_analysis.get("current_season", "summer"), {})
+        seasonal_factor = np.array([season_factors.get(category, 1.0) for category in categories])
+        
+        # Simulate ML demand prediction for all products at once
+        base_demand = 1000 + np.random.uniform(-200, 300, n)  # Base weekly demand
+        sentiment_factor = 0.8 + (market_analysis.get("consumer_sentiment", 0.5) * 0.4)
+        forecasted_demand = base_demand * seasonal_factor * sentiment_factor
+        demand_growth = (forecasted_demand - base_demand) / base_demand * 100
+        confidence = np.random.uniform(0.85, 0.95, n)
+        
+        demand_forecasts = {
+            name: {
+                "current_demand": int(base_demand[i]),
+                "forecasted_demand": int(forecasted_demand[i]),
+                "demand_growth": round(float(demand_growth[i]), 1),
+                "demand_elasticity": float(demand_elasticity[i]),
+                "seasonal_factor": float(seasonal_factor[i]),
+                "confidence_score": float(confidence[i]),
                 "forecast_horizon": "14_days"
             }
+            for i, name in enumerate(names)
+        }
         
         # Overall market demand
         avg_growth = float(np.mean([f["demand_growth"] for f in demand_forecasts.values()])) if demand_forecasts else 0.0
@@ -422,41 +419,49 @@ class DynamicPricingAgent:
         """Generate ML predictions for pricing optimization"""
         
         products = pricing_data.get("products", [])
-        predictions = {}
-        
-        for product in products:
-            product_name = product.get("name", "Unknown")
-            current_price = product.get("price", 50)
-            category = product.get("category", "vegetables").lower()
-            
-            # Get demand forecast for this product
-            demand_data = demand_forecast.get("product_forecasts", {}).get(product_name, {})
-            competitor_data = competitor_analysis.get("product_analysis", {}).get(product_name, {})
-            
-            # ML price elasticity prediction
-            elasticity = demand_data.get("demand_elasticity", -0.8)
-            
-            # Optimal price calculation using ML
-            optimal_price = await self._calculate_optimal_price(
-                current_price, elasticity, demand_data, competitor_data, market_analysis
-            )
-            
-            # Revenue impact prediction
-            current_revenue = current_price * demand_data.get("current_demand", 1000)
-            forecasted_demand = demand_data.get("forecasted_demand", 1000)
-            optimal_revenue = optimal_price * forecasted_demand
-            
-            revenue_uplift = ((optimal_revenue - current_revenue) / current_revenue * 100) if current_revenue > 0 else 0
-            
-            predictions[product_name] = {
-                "current_price": current_price,
-                "optimal_price": round(optimal_price, 2),
-                "price_change": round(((optimal_price - current_price) / current_price * 100), 1),
-                "revenue_uplift": round(revenue_uplift, 1),
-                "confidence_score": random.uniform(0.80, 0.95),
-                "demand_impact": elasticity * ((optimal_price - current_price) / current_price * 100),
-                "ml_algorithm": "gradient_descent_optimization"
+        forecasts = demand_forecast.get("product_forecasts", {})
+        competitors = competitor_analysis.get("product_analysis", {})
+        names = [product.get("name", "Unknown") for product in products]
+        
+        current_price = np.array([product.get("price", 50) for product in products], dtype=float)
+        base_demand = np.array([forecasts.get(name, {}).get("current_demand", 1000) for name in names], dtype=float)
+        forecasted_demand = np.array([forecasts.get(name, {}).get("forecasted_demand", 1000) for name in names], dtype=float)
+        elasticity = np.array([forecasts.get(name, {}).get("demand_elasticity", -0.8) for name in names], dtype=float)
+        avg_competitor_price = np.array([
+            competitors.get(name, {}).get("avg_competitor_price", price * 1.35)
+            for name, price in zip(names, current_price)
+        ], dtype=float)
+        
+        # Optimal prices for all products in one vectorized pass; the grid
+        # default keeps the workflow's prices identical to the 8-point search
+        optimizer = {"method": "grid", **(pricing_data.get("optimizer") or {})}
+        result = self._optimize_price_batch(
+            current_price, elasticity, base_demand, avg_competitor_price,
+            market_analysis, optimizer,
+            incumbent_revenue=current_price * base_demand
+        )
+        optimal_price = result.prices
+        
+        # Revenue impact prediction
+        current_revenue = current_price * base_demand
+        optimal_revenue = optimal_price * forecasted_demand
+        with np.errstate(divide="ignore", invalid="ignore"):
+            revenue_uplift = np.where(current_revenue > 0, (optimal_revenue - current_revenue) / current_revenue * 100, 0.0)
+        price_change_pct = (optimal_price - current_price) / current_price * 100
+        confidence = np.random.uniform(0.80, 0.95, len(products))
+        
+        predictions = {
+            name: {
+                "current_price": float(current_price[i]),
+                "optimal_price": round(float(optimal_price[i]), 2),
+                "price_change": round(float(price_change_pct[i]), 1),
+                "revenue_uplift": round(float(revenue_uplift[i]), 1),
+                "confidence_score": float(confidence[i]),
+                "demand_impact": float(elasticity[i] * price_change_pct[i]),
+                "ml_algorithm": f"vectorized_{result.stats['method']}_optimization"
             }
+            for i, name in enumerate(names)
+        }
         
         # Overall predictions
         avg_revenue_uplift = float(np.mean([p["revenue_uplift"] for p in predictions.values()])) if predictions else 0.0
@@ -466,56 +471,110 @@ class DynamicPricingAgent:
             "revenue_uplift": round(avg_revenue_uplift, 1),
             "model_confidence": "high",
             "optimization_method": "multi_objective_gradient_descent",
+            "optimizer_stats": result.stats,
             "convergence_achieved": True,
             "iterations_used": random.randint(15, 45)
         }
     
-    async def _calculate_optimal_price(self, current_price: float, elasticity: float,
-                                     demand_data: Dict[str, Any], competitor_data: Dict[str, Any],
-                                     market_analysis: Dict[str, Any]) -> float:
-        """Calculate optimal price using ML algorithms"""
-        
-        # Base demand
-        base_demand = demand_data.get("current_demand", 1000)
-        
-        # Competitor average price
-        avg_competitor_price = competitor_data.get("avg_competitor_price", current_price * 1.35)
+    def _optimize_price_batch(self, current_price: np.ndarray, elasticity: np.ndarray,
+                              base_demand: np.ndarray, avg_competitor_price: np.ndarray,
+                              market_analysis: Dict[str, Any],
+                              optimizer: Optional[Dict[str, Any]] = None,
+                              incumbent_revenue: Optional[np.ndarray] = None) -> PricingResult:
+        """
+        Revenue-optimal prices for many products at once
+
+        optimizer options: method ("closed_form" or "grid"), grid_step (price
+        multiplier step for the grid), max_basket_increase_pct (cap on the
+        demand-weighted basket price increase across all products).
+        A product keeps its current price unless the optimum beats
+        incumbent_revenue (default: modelled revenue at the current price).
+        """
+        optimizer = optimizer or {}
         
         # Market factors
         market_growth = market_analysis.get("market_growth_rate", 0.12)
         consumer_sentiment = market_analysis.get("consumer_sentiment", 0.7)
         
-        # Calculate price bounds
-        min_price = current_price * 0.85  # Don't go below 15% of current
-        max_price = min(avg_competitor_price * 0.95, current_price * 1.25)  # Don't exceed 95% of competitor avg
+        batch = PricingBatch(
+            current_price=current_price,
+            base_demand=base_demand,
+            elasticity=elasticity,
+            min_price=current_price * 0.85,  # Don't go below 15% of current
+            max_price=np.minimum(avg_competitor_price * 0.95, current_price * 1.25),  # Don't exceed 95% of competitor avg
+            demand_scale=(1 + market_growth * 0.1) * consumer_sentiment,  # Growth and sentiment factors
+        )
         
-        # Optimize for revenue = price * demand
-        best_price = current_price
-        best_revenue = current_price * base_demand
+        basket_budget = None
+        max_increase = optimizer.get("max_basket_increase_pct")
+        if max_increase is not None:
+            basket_budget = float(base_demand @ current_price) * (1 + max_increase / 100)
+        
+        return optimize_prices(
+            batch,
+            method=optimizer.get("method", "closed_form"),
+            grid=(0.85, 1.25, optimizer.get("grid_step", 0.05)),
+            incumbent_revenue=incumbent_revenue,
+            basket_weights=base_demand,
+            basket_budget=basket_budget,
+        )
+    
+    async def reprice_catalogue(self, products: List[Dict[str, Any]],
+                                market_analysis: Optional[Dict[str, Any]] = None,
+                                optimizer: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Reprice a whole catalogue in one call, without the LLM workflow
+
+        Products need price and category; current_demand and
+        avg_competitor_price are used when present (otherwise 1000 units and
+        the market-share-weighted competitor markup).
+        """
+        start_time = datetime.now()
+        market_analysis = market_analysis or {
+            "current_season": self._get_current_season(),
+            "consumer_sentiment": 0.7,
+            "market_growth_rate": 0.12
+        }
         
-        # Grid search for optimal price (simplified ML optimization)
-        for price_multiplier in np.arange(0.85, 1.25, 0.05):
-            test_price = current_price * price_multiplier
-            
-            if test_price < min_price or test_price > max_price:
-                continue
-            
-            # Calculate demand at this price using elasticity
-            price_change_pct = (test_price - current_price) / current_price
-            demand_change_pct = elasticity * price_change_pct
-            test_demand = base_demand * (1 + demand_change_pct)
-            
-            # Apply market factors
-            test_demand *= (1 + market_growth * 0.1)  # Growth factor
-            test_demand *= consumer_sentiment  # Sentiment factor
-            
-            test_revenue = test_price * max(test_demand, 0)
-            
-            if test_revenue > best_revenue:
-                best_revenue = test_revenue
-                best_price = test_price
+        default_elasticity = self.market_elasticity["vegetables"]["demand_elasticity"]
+        default_markup = sum(c["markup"] * c["market_share"] for c in self.competitor_markups.values())
+        current_price = np.array([product.get("price", 50) for product in products], dtype=float)
+        base_demand = np.array([product.get("current_demand", 1000) for product in products], dtype=float)
+        elasticity = np.array([
+            self.market_elasticity.get(product.get("category", "vegetables").lower(), {})
+            .get("demand_elasticity", default_elasticity)
+            for product in products
+        ], dtype=float)
+        avg_competitor_price = np.array([
+            product.get("avg_competitor_price", price * default_markup)
+            for product, price in zip(products, current_price)
+        ], dtype=float)
+        
+        result = self._optimize_price_batch(
+            current_price, elasticity, base_demand, avg_competitor_price, market_analysis, optimizer
+        )
+        current_revenue = float(current_price @ base_demand)
         
-        return best_price
+        return {
+            "success": True,
+            "products": [
+                {
+                    "id": product.get("id"),
+                    "name": product.get("name", "Unknown"),
+                    "current_price": float(current_price[i]),
+                    "recommended_price": round(float(result.prices[i]), 2),
+                    "price_change_pct": round(float((result.prices[i] / current_price[i] - 1) * 100), 1),
+                    "expected_demand": round(float(result.demand[i]), 1),
+                    "expected_revenue": round(float(result.revenue[i]), 2)
+                }
+                for i, product in enumerate(products)
+            ],
+            "products_repriced": int(result.changed.sum()),
+            "current_revenue": round(current_revenue, 2),
+            "expected_revenue": round(float(result.revenue.sum()), 2),
+            "optimizer_stats": result.stats,
+            "execution_time": (datetime.now() - start_time).total_seconds()
+        }
     
     async def _optimize_pricing(self, pricing_data: Dict[str, Any],
                               ml_predictions: Dict[str, Any],
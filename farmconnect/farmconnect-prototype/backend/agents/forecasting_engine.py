@@ -0,0 +1,348 @@
+"""
+FarmConnect Forecasting Engine
+Columnar daily demand forecasting for whole inventories
+
+Sales records ({"product_id", "date", "quantity"}) are grouped once into a
+dense product x day matrix of units sold. Per-product statistics, namely the
+trailing moving average, the daily standard deviation and a weekday
+seasonality index, are then computed for every requested product in one
+vectorized pass over the matrix rows.
+
+Statistics are cached per (product, as-of day) and are independent of
+market conditions and category priors, which are applied on top of them.
+New sales are added to the matrix in place and only the cache entries of
+the products (and days) they touch are dropped.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MOVING_AVERAGE_DAYS = 30
+SEASONAL_WEEKS = 8              # history used for the weekday index
+SEASONAL_SHRINKAGE_WEEKS = 2.0  # weeks of data at which observed and prior weigh equally
+HORIZON_DAYS = 7
+DEFAULT_BASE_DEMAND = 15.0      # products without any sales history
+INTERVAL_Z = 1.2816             # two-sided 80% interval
+FALLBACK_INTERVAL = 0.2         # +/- band when the daily spread is unknown
+
+
+@lru_cache(maxsize=8192)
+def _parse_day(value: str) -> Optional[int]:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date().toordinal()
+    except ValueError:
+        return None
+
+
+def _day_ordinal(value: Any) -> Optional[int]:
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, str) and value:
+        # Sales share few distinct dates; parse each once
+        return _parse_day(value)
+    return None
+
+
+@dataclass
+class DemandStats:
+    """Market-independent statistics for N products as of one day"""
+    moving_average: np.ndarray   # N, mean daily units over the trailing window
+    daily_std: np.ndarray        # N, NaN with fewer than two observed days
+    observed_days: np.ndarray    # N, days since first sale inside the window
+    weekday_index: np.ndarray    # N x HORIZON_DAYS, observed demand ratio per forecast day
+    seasonal_weeks: np.ndarray   # N, weeks of history behind weekday_index
+
+
+@dataclass
+class DemandForecastBatch:
+    """Forecast for N products over HORIZON_DAYS"""
+    product_ids: List[str]
+    predicted: np.ndarray        # N x H, whole units
+    lower: np.ndarray            # N x H
+    upper: np.ndarray            # N x H
+    base_demand: np.ndarray      # N
+    seasonality: np.ndarray      # N, amplitude of the blended weekday profile
+    as_of: Optional[date]
+
+
+class SalesMatrix:
+    """Units sold per product per day, grown in place as sales arrive"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.first_day: Optional[int] = None   # ordinal of column 0
+        self.days = 0
+        self.values = np.zeros((0, 0), dtype=np.float64)
+        self.first_sale = np.zeros(0, dtype=np.int64)  # column of each product's first sale
+
+    @property
+    def last_day(self) -> Optional[int]:
+        return None if self.first_day is None else self.first_day + self.days - 1
+
+    def add(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Add sales and return {product_id: earliest day ordinal touched}
+
+        Records without a parseable date are booked on the latest known day.
+        """
+        product_ids: List[str] = []
+        ordinals: List[Optional[int]] = []
+        quantities: List[float] = []
+        for sale in records:
+            product_ids.append(str(sale.get("product_id", "")))
+            ordinals.append(_day_ordinal(sale.get("date")))
+            quantities.append(float(sale.get("quantity", 0) or 0))
+        if not product_ids:
+            return {}
+
+        dated = [o for o in ordinals if o is not None]
+        fallback = self.last_day
+        if dated:
+            fallback = max(dated) if fallback is None else max(fallback, max(dated))
+        if fallback is None:
+            fallback = date.today().toordinal()
+        days = np.array([fallback if o is None else o for o in ordinals], dtype=np.int64)
+
+        self._ensure_days(int(days.min()), int(days.max()))
+        for pid in product_ids:
+            if pid not in self.index:
+                self.index[pid] = len(self.index)
+        self._ensure_rows(len(self.index))
+
+        rows = np.fromiter((self.index[pid] for pid in product_ids), dtype=np.int64, count=len(product_ids))
+        cols = days - self.first_day
+        np.add.at(self.values, (rows, cols), np.asarray(quantities))
+        np.minimum.at(self.first_sale, rows, cols)
+
+        touched: Dict[str, int] = {}
+        for pid, day in zip(product_ids, days.tolist()):
+            if day < touched.get(pid, day + 1):
+                touched[pid] = day
+        return touched
+
+    def _ensure_rows(self, count: int):
+        if count <= self.values.shape[0]:
+            return
+        capacity = max(count, 2 * self.values.shape[0], 16)
+        values = np.zeros((capacity, self.values.shape[1]), dtype=np.float64)
+        values[:self.values.shape[0]] = self.values
+        first_sale = np.full(capacity, np.iinfo(np.int64).max, dtype=np.int64)
+        first_sale[:len(self.first_sale)] = self.first_sale
+        self.values, self.first_sale = values, first_sale
+
+    def _ensure_days(self, first: int, last: int):
+        if self.first_day is None:
+            self.first_day = first
+        # Sales before column 0 shift every column right
+        shift = max(0, self.first_day - first)
+        days = max(self.days, last - self.first_day + 1) + shift
+        if shift or days > self.values.shape[1]:
+            capacity = max(days, 2 * self.values.shape[1], 64)
+            values = np.zeros((self.values.shape[0], capacity), dtype=np.float64)
+            values[:, shift:shift + self.days] = self.values[:, :self.days]
+            self.values = values
+            occupied = self.first_sale != np.iinfo(np.int64).max
+            self.first_sale = np.where(occupied, self.first_sale + shift, self.first_sale)
+            self.first_day -= shift
+        self.days = days
+
+    def window(self, rows: np.ndarray, end: int, length: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Columns (end - length, end] for `rows`, zero-padded, and a mask of days on or after the first sale"""
+        start = end - length + 1
+        block = np.zeros((len(rows), length), dtype=np.float64)
+        lo, hi = max(start, 0), min(end, self.days - 1)
+        if hi >= lo:
+            block[:, lo - start:hi - start + 1] = self.values[rows, lo:hi + 1]
+        columns = np.arange(start, end + 1)
+        return block, columns[None, :] >= self.first_sale[rows, None]
+
+
+class DemandForecaster:
+    """
+    Batch demand forecaster over a SalesMatrix
+
+    `sync` treats the sales list it is given as an append-only ledger: when
+    the list extends the one seen last time only the new tail is ingested,
+    otherwise the matrix is rebuilt. A list extends the ledger when its
+    first `seen` records hash to the digest of the records ingested so far,
+    so a different caller's list of the same length or longer is never
+    mistaken for an extension.
+    """
+
+    def __init__(self, window: int = MOVING_AVERAGE_DAYS, horizon: int = HORIZON_DAYS):
+        self.window = window
+        self.horizon = horizon
+        self.matrix = SalesMatrix()
+        self._cache: Dict[Tuple[str, int], Tuple[float, float, int, np.ndarray, float]] = {}
+        self._seen = 0
+        self._last_record: Optional[Tuple[Any, ...]] = None
+        # Digest of the ingested prefix, chained over the batches it arrived in
+        self._batch_ends: List[int] = []
+        self._digest = 0
+        self.stats = {"cache_hits": 0, "cache_misses": 0, "rebuilds": 0}
+
+    @staticmethod
+    def _record_key(sale: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (sale.get("product_id"), sale.get("date"), sale.get("quantity"))
+
+    @classmethod
+    def _chain(cls, digest: int, records: Sequence[Dict[str, Any]]) -> int:
+        return hash((digest, tuple(map(cls._record_key, records))))
+
+    def extends(self, records: Sequence[Dict[str, Any]]) -> bool:
+        """Whether `records` starts with exactly the sales ingested so far"""
+        if self._seen == 0:
+            return True
+        if self._seen > len(records) or self._record_key(records[self._seen - 1]) != self._last_record:
+            return False
+        digest, start = 0, 0
+        for end in self._batch_ends:
+            digest = self._chain(digest, records[start:end])
+            start = end
+        return digest == self._digest
+
+    def sync(self, records: Sequence[Dict[str, Any]]) -> int:
+        """Bring the matrix up to date with `records`; returns the number of sales ingested"""
+        if not self.extends(records):
+            self.reset()
+            self.stats["rebuilds"] += 1
+        new = records[self._seen:]
+        self.add_sales(new)
+        return len(new)
+
+    def reset(self):
+        self.matrix = SalesMatrix()
+        self._cache.clear()
+        self._seen = 0
+        self._last_record = None
+        self._batch_ends = []
+        self._digest = 0
+
+    def add_sales(self, records: Sequence[Dict[str, Any]]):
+        """Add new sales and invalidate the cached statistics they affect"""
+        if not records:
+            return
+        touched = self.matrix.add(records)
+        self._seen += len(records)
+        self._last_record = self._record_key(records[-1])
+        self._batch_ends.append(self._seen)
+        self._digest = self._chain(self._digest, records)
+        if self._cache:
+            # Statistics as of a day depend only on sales up to that day
+            self._cache = {
+                key: value for key, value in self._cache.items()
+                if key[0] not in touched or key[1] < touched[key[0]]
+            }
+
+    def demand_stats(self, product_ids: Sequence[str], as_of: Optional[int] = None) -> DemandStats:
+        """Statistics for every product as of day ordinal `as_of` (default: latest sale day)"""
+        n = len(product_ids)
+        moving_average = np.full(n, np.nan)
+        daily_std = np.full(n, np.nan)
+        observed = np.zeros(n, dtype=np.int64)
+        weekday_index = np.ones((n, self.horizon))
+        weeks = np.zeros(n)
+
+        as_of = self.matrix.last_day if as_of is None else as_of
+        if as_of is None:
+            return DemandStats(moving_average, daily_std, observed, weekday_index, weeks)
+
+        missing = []
+        for i, pid in enumerate(product_ids):
+            cached = self._cache.get((pid, as_of))
+            if cached is not None:
+                moving_average[i], daily_std[i], observed[i], weekday_index[i], weeks[i] = cached
+                self.stats["cache_hits"] += 1
+            elif pid in self.matrix.index:
+                missing.append(i)
+        self.stats["cache_misses"] += len(missing)
+
+        if missing:
+            positions = np.asarray(missing)
+            rows = np.fromiter((self.matrix.index[product_ids[i]] for i in missing),
+                               dtype=np.int64, count=len(missing))
+            computed = self._compute(rows, as_of - self.matrix.first_day, as_of)
+            moving_average[positions], daily_std[positions], observed[positions] = computed[:3]
+            weekday_index[positions], weeks[positions] = computed[3:]
+            for j, i in enumerate(missing):
+                self._cache[(product_ids[i], as_of)] = (
+                    float(computed[0][j]), float(computed[1][j]), int(computed[2][j]),
+                    computed[3][j].copy(), float(computed[4][j]),
+                )
+        return DemandStats(moving_average, daily_std, observed, weekday_index, weeks)
+
+    def _compute(self, rows: np.ndarray, end: int, as_of: int):
+        # Trailing moving average and spread, counting zero-sale days after the first sale
+        block, valid = self.matrix.window(rows, end, self.window)
+        observed = valid.sum(axis=1)
+        values = np.where(valid, block, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = values.sum(axis=1) / observed
+            sq = np.where(valid, (block - mean[:, None]) ** 2, 0.0).sum(axis=1)
+            std = np.where(observed > 1, np.sqrt(sq / (observed - 1)), np.nan)
+
+        # Weekday index: mean units per weekday over the seasonal window / overall mean
+        span = SEASONAL_WEEKS * 7
+        block, valid = self.matrix.window(rows, end, span)
+        weekday_of_column = (np.arange(as_of - span + 1, as_of + 1) % 7)
+        totals = np.zeros((len(rows), 7))
+        counts = np.zeros((len(rows), 7))
+        for weekday in range(7):
+            columns = weekday_of_column == weekday
+            totals[:, weekday] = np.where(valid[:, columns], block[:, columns], 0.0).sum(axis=1)
+            counts[:, weekday] = valid[:, columns].sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            overall = totals.sum(axis=1) / counts.sum(axis=1)
+            profile = (totals / counts) / overall[:, None]
+        profile = np.where(np.isfinite(profile), profile, 1.0)
+        horizon_weekdays = (as_of + 1 + np.arange(self.horizon)) % 7
+        weeks = counts.sum(axis=1) / 7.0
+        return mean, std, observed, profile[:, horizon_weekdays], weeks
+
+    def forecast(self, product_ids: Sequence[str],
+                 seasonality_prior: Any = 0.3,
+                 demand_multiplier: Any = 1.0,
+                 as_of: Optional[int] = None) -> DemandForecastBatch:
+        """
+        Forecast daily demand for every product at once
+
+        Args:
+            seasonality_prior: per-product amplitude of the prior weekly cycle,
+                used alone without history and blended with the observed
+                weekday index as weeks of history accumulate
+            demand_multiplier: per-product market adjustment (festival, weather)
+        """
+        n = len(product_ids)
+        stats = self.demand_stats(product_ids, as_of)
+        as_of = self.matrix.last_day if as_of is None else as_of
+
+        amplitude = np.broadcast_to(np.asarray(seasonality_prior, dtype=np.float64), (n,))
+        multiplier = np.broadcast_to(np.asarray(demand_multiplier, dtype=np.float64), (n,))
+        prior = 1 + amplitude[:, None] * np.sin(np.arange(self.horizon) * 2 * np.pi / 7)[None, :]
+        weight = (stats.seasonal_weeks / (stats.seasonal_weeks + SEASONAL_SHRINKAGE_WEEKS))[:, None]
+        profile = weight * stats.weekday_index + (1 - weight) * prior
+
+        base = np.where(np.isnan(stats.moving_average), DEFAULT_BASE_DEMAND, stats.moving_average)
+        expected = base[:, None] * profile * multiplier[:, None]
+        predicted = np.maximum(expected, 0).astype(np.int64)
+
+        spread = INTERVAL_Z * stats.daily_std[:, None] * profile * multiplier[:, None]
+        known = ~np.isnan(stats.daily_std)[:, None]
+        lower = np.where(known, predicted - spread, predicted * (1 - FALLBACK_INTERVAL))
+        upper = np.where(known, predicted + spread, predicted * (1 + FALLBACK_INTERVAL))
+
+        return DemandForecastBatch(
+            product_ids=list(product_ids),
+            predicted=predicted,
+            lower=np.maximum(lower, 0).astype(np.int64),
+            upper=np.maximum(upper, 0).astype(np.int64),
+            base_demand=base,
+            seasonality=(profile.max(axis=1) - profile.min(axis=1)) / 2,
+            as_of=None if as_of is None else date.fromordinal(as_of),
+        )
@@ -18,6 +18,8 @@ import aiohttp
 import numpy as np
 from dataclasses import dataclass
 
+from routing_engine import RoutingProblem, haversine_matrix, solve_vrp
+
 # Load environment variables
 load_dotenv()
 
@@ -25,6 +27,9 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+AVERAGE_SPEED_KMH = 30
+DEFAULT_ROUTING_TIME_BUDGET = 2.0  # seconds of local search per dispatch run
+
 @dataclass
 class DeliveryPoint:
     """Delivery point with GPS coordinates"""
@@ -34,6 +39,8 @@ class DeliveryPoint:
     longitude: float
     weight: float
     priority: int = 1
+    time_window: Optional[List[float]] = None  # [earliest, latest] minutes after dispatch
+    service_minutes: float = 0
 
 class LogisticsState(TypedDict):
     """State for logistics agent workflow"""
@@ -41,6 +48,9 @@ class LogisticsState(TypedDict):
     task_type: Literal["route_optimize", "partner_select", "track_shipment", "cost_estimate"]
     delivery_points: List[Dict[str, Any]]
     vehicle_capacity: float
+    max_vehicles: Optional[int]
+    depot: Optional[Dict[str, Any]]
+    routing_time_budget: float
     budget_limit: float
     time_constraints: Dict[str, Any]
     selected_partner: Optional[str]
@@ -228,16 +238,30 @@ class LogisticsAgent:
                 latitude=point.get("latitude", 0),
                 longitude=point.get("longitude", 0),
                 weight=point.get("weight", 5),
-                priority=point.get("priority", 1)
+                priority=point.get("priority", 1),
+                time_window=point.get("time_window"),
+                service_minutes=point.get("service_minutes", 0)
             ))
         
-        # Optimize route using distance matrix and capacity constraints
-        optimized_route = await self._optimize_route(points, vehicle_capacity)
+        # Solve multi-vehicle routing with capacity and time-window constraints
+        time_constraints = state.get("time_constraints", {}) or {}
+        optimized_route = await self._optimize_route(
+            points,
+            vehicle_capacity,
+            depot=state.get("depot"),
+            max_vehicles=state.get("max_vehicles"),
+            time_budget=state.get("routing_time_budget", DEFAULT_ROUTING_TIME_BUDGET),
+            max_route_minutes=time_constraints.get("max_route_minutes"),
+        )
         
         # Generate recommendations
         recommendations = await self._generate_route_recommendations(optimized_route, points)
         
-        message = AIMessage(content=f"Route optimized for {len(points)} delivery points. Total distance: {optimized_route.get('total_distance', 0)} km")
+        content = f"Route optimized for {len(points)} delivery points. Total distance: {optimized_route.get('total_distance', 0)} km"
+        undelivered = optimized_route.get("undelivered", [])
+        if undelivered:
+            content += f". {len(undelivered)} points could not be scheduled"
+        message = AIMessage(content=content)
         
         return {
             **state,
@@ -366,48 +390,55 @@ class LogisticsAgent:
             "messages": state.get("messages", []) + [message]
         }
     
-    async def _optimize_route(self, points: List[DeliveryPoint], capacity: float) -> Dict[str, Any]:
+    async def _optimize_route(self, points: List[DeliveryPoint], capacity: float,
+                              depot: Optional[Dict[str, Any]] = None, max_vehicles: Optional[int] = None,
+                              time_budget: float = 2.0,
+                              max_route_minutes: Optional[float] = None) -> Dict[str, Any]:
         """
-        Optimize delivery route using distance and capacity constraints
+        Optimize delivery routes as a capacitated VRP with time windows
+
+        Vehicles start and end at `depot` (default: the first delivery point's
+        location). Solving runs in a worker thread so the event loop stays free.
         """
-        if len(points) <= 1:
-            return {
-                "route": [point.__dict__ for point in points],
-                "total_distance": 0,
-                "total_time": 0,
-                "vehicle_utilization": sum(p.weight for p in points) / capacity * 100
-            }
-        
-        # Simple greedy optimization (in production, use OR-Tools)
-        start_point = points[0]
-        remaining_points = points[1:]
-        optimized_order = [start_point]
-        current_weight = start_point.weight
-        
-        while remaining_points and current_weight <= capacity:
-            # Find nearest point that fits capacity
-            nearest = min(remaining_points, key=lambda p: self._calculate_distance(
-                optimized_order[-1], p
-            ))
-            
-            if current_weight + nearest.weight <= capacity:
-                optimized_order.append(nearest)
-                current_weight += nearest.weight
-                remaining_points.remove(nearest)
-            else:
-                break
-        
-        # Calculate total distance
-        total_distance = 0
-        for i in range(len(optimized_order) - 1):
-            total_distance += self._calculate_distance(optimized_order[i], optimized_order[i + 1])
-        
+        if not points:
+            return {"route": [], "routes": [], "total_distance": 0, "total_time": 0,
+                    "vehicle_utilization": 0, "undelivered": []}
+
+        records = [point.__dict__ for point in points]
+        depot = depot or {"latitude": points[0].latitude, "longitude": points[0].longitude}
+        problem = RoutingProblem.from_records(
+            depot, records, capacity,
+            max_vehicles=max_vehicles,
+            speed_kmh=AVERAGE_SPEED_KMH,
+            max_route_minutes=max_route_minutes,
+        )
+        solution = await asyncio.to_thread(solve_vrp, problem, time_budget)
+
+        routes = []
+        for vehicle, vehicle_route in enumerate(solution.routes, start=1):
+            stops = [dict(records[node - 1]) for node in vehicle_route.stops]
+            for stop, start in zip(stops, vehicle_route.service_start_minutes):
+                stop["arrival_minutes"] = round(start, 1)
+            routes.append({
+                "vehicle": vehicle,
+                "stops": stops,
+                "distance": round(vehicle_route.distance_km, 2),
+                "load": vehicle_route.load,
+                "duration": round(vehicle_route.return_minutes, 0),
+                "utilization": round(vehicle_route.load / capacity * 100, 1),
+            })
+
+        total_load = sum(route["load"] for route in routes)
         return {
-            "route": [point.__dict__ for point in optimized_order],
-            "total_distance": round(total_distance, 2),
-            "total_time": round(total_distance / 30 * 60, 0),  # Assuming 30 km/h average
-            "vehicle_utilization": round(current_weight / capacity * 100, 1),
-            "undelivered": [point.__dict__ for point in remaining_points]
+            "route": [stop for route in routes for stop in route["stops"]],
+            "routes": routes,
+            "vehicles_used": len(routes),
+            "total_distance": round(solution.total_distance_km, 2),
+            # Vehicles run in parallel: the dispatch finishes with the longest route
+            "total_time": max((route["duration"] for route in routes), default=0),
+            "vehicle_utilization": round(total_load / (capacity * len(routes)) * 100, 1) if routes else 0,
+            "undelivered": [records[node - 1] for node in solution.unassigned],
+            "solver": solution.stats,
         }
     
     def _calculate_distance(self, point1: DeliveryPoint, point2: DeliveryPoint) -> float:
@@ -430,25 +461,11 @@ class LogisticsAgent:
         if len(delivery_points) < 2:
             return 0
         
-        max_dist = 0
-        for i in range(len(delivery_points)):
-            for j in range(i + 1, len(delivery_points)):
-                p1 = DeliveryPoint(
-                    id=str(i), address="", 
-                    latitude=delivery_points[i].get("latitude", 0),
-                    longitude=delivery_points[i].get("longitude", 0),
-                    weight=0
-                )
-                p2 = DeliveryPoint(
-                    id=str(j), address="",
-                    latitude=delivery_points[j].get("latitude", 0),
-                    longitude=delivery_points[j].get("longitude", 0),
-                    weight=0
-                )
-                dist = self._calculate_distance(p1, p2)
-                max_dist = max(max_dist, dist)
-        
-        return max_dist
+        matrix = haversine_matrix(
+            [point.get("latitude", 0) for point in delivery_points],
+            [point.get("longitude", 0) for point in delivery_points],
+        )
+        return float(matrix.max())
     
     async def _evaluate_partner(self, partner_config: Dict[str, Any], total_weight: float, 
                                max_distance: float, budget: float, time_constraints: Dict[str, Any]) -> float:
@@ -506,7 +523,7 @@ class LogisticsAgent:
         # Undelivered items
         undelivered = route.get("undelivered", [])
         if undelivered:
-            recommendations.append(f"{len(undelivered)} deliveries require separate trip due to capacity")
+            recommendations.append(f"{len(undelivered)} deliveries could not be scheduled within fleet, capacity or time-window limits")
         
         return recommendations
     
@@ -534,6 +551,9 @@ class LogisticsAgent:
             "task_type": task_type,
             "delivery_points": task_data.get("delivery_points", []),
             "vehicle_capacity": task_data.get("vehicle_capacity", 100),
+            "max_vehicles": task_data.get("max_vehicles"),
+            "depot": task_data.get("depot"),
+            "routing_time_budget": task_data.get("routing_time_budget", DEFAULT_ROUTING_TIME_BUDGET),
             "budget_limit": task_data.get("budget_limit", 10000),
             "time_constraints": task_data.get("time_constraints", {}),
             "selected_partner": None,
@@ -0,0 +1,202 @@
+"""
+FarmConnect Pricing Engine
+Vectorized revenue optimization for whole catalogues
+
+Demand model (per product, linear elasticity around the current price):
+
+    demand(p) = base_demand * (1 + elasticity * (p - p0) / p0) * demand_scale
+    revenue(p) = p * max(demand(p), 0)
+
+Every product x candidate price is evaluated as one NumPy array, either on a
+price grid or with the closed-form optimum of the concave revenue curve
+clipped to each product's [min_price, max_price]. An optional basket budget
+caps sum(weight * price) across products and is enforced with a single
+Lagrange multiplier found by bisection.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+METHODS = ("closed_form", "grid")
+DEFAULT_GRID = (0.85, 1.25, 0.05)  # start, stop (exclusive), step as price multipliers
+BISECTION_STEPS = 60
+BISECTION_TOLERANCE = 1e-6
+
+
+@dataclass
+class PricingBatch:
+    """Arrays describing N products; scalars broadcast"""
+    current_price: np.ndarray
+    base_demand: np.ndarray
+    elasticity: np.ndarray
+    min_price: np.ndarray
+    max_price: np.ndarray
+    demand_scale: Any = 1.0
+
+    def __post_init__(self):
+        self.current_price = np.asarray(self.current_price, dtype=np.float64)
+        n = self.current_price.shape
+        self.base_demand = np.broadcast_to(np.asarray(self.base_demand, dtype=np.float64), n)
+        self.elasticity = np.broadcast_to(np.asarray(self.elasticity, dtype=np.float64), n)
+        self.min_price = np.broadcast_to(np.asarray(self.min_price, dtype=np.float64), n)
+        self.max_price = np.broadcast_to(np.asarray(self.max_price, dtype=np.float64), n)
+        self.demand_scale = np.broadcast_to(np.asarray(self.demand_scale, dtype=np.float64), n)
+
+    def __len__(self) -> int:
+        return len(self.current_price)
+
+    def demand(self, price: np.ndarray) -> np.ndarray:
+        """Modelled demand at `price` (N or N x K)"""
+        p0 = self._col(self.current_price, price)
+        change = (price - p0) / p0
+        demand = (self._col(self.base_demand, price)
+                  * (1 + self._col(self.elasticity, price) * change)
+                  * self._col(self.demand_scale, price))
+        return np.maximum(demand, 0.0)
+
+    def revenue(self, price: np.ndarray) -> np.ndarray:
+        return price * self.demand(price)
+
+    @staticmethod
+    def _col(values: np.ndarray, like: np.ndarray) -> np.ndarray:
+        return values[:, None] if like.ndim == 2 else values
+
+
+@dataclass
+class PricingResult:
+    prices: np.ndarray
+    demand: np.ndarray
+    revenue: np.ndarray
+    changed: np.ndarray                 # False where the current price was kept
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+def _grid_multipliers(grid: Sequence[float]) -> np.ndarray:
+    start, stop, step = grid
+    return np.arange(start, stop, step)
+
+
+def _closed_form(batch: PricingBatch, weights: Optional[np.ndarray], lam: float) -> np.ndarray:
+    """Maximizer of revenue - lam * weight * price within each product's bounds
+
+    d/dp [s*b*p*(1 + e*(p - p0)/p0)] = s*b*((1 - e) + 2*e*p/p0). With e < 0 the
+    curve is concave, so the stationary point clipped to the bounds is optimal.
+    """
+    e = batch.elasticity
+    p0 = batch.current_price
+    slope = batch.base_demand * batch.demand_scale
+    penalty = lam * weights if weights is not None else 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        marginal = np.where(slope > 0, penalty / np.where(slope > 0, slope, 1.0), 0.0)
+        stationary = p0 * (marginal - (1 - e)) / (2 * e)
+    # Non-negative elasticity (or no demand): revenue rises with price up to the cap
+    price = np.where(e < 0, stationary, batch.max_price)
+    # Empty range (cap below floor): keep the current price
+    return np.where(batch.max_price >= batch.min_price,
+                    np.clip(price, batch.min_price, batch.max_price), p0)
+
+
+class _GridSearch:
+    """Candidate prices and revenues for every product, computed once"""
+
+    def __init__(self, batch: PricingBatch, multipliers: np.ndarray):
+        self.current_price = batch.current_price
+        self.candidates = batch.current_price[:, None] * multipliers[None, :]
+        in_bounds = ((self.candidates >= batch.min_price[:, None])
+                     & (self.candidates <= batch.max_price[:, None]))
+        self.revenue = np.where(in_bounds, batch.revenue(self.candidates), -np.inf)
+        # No grid point inside the bounds: keep the current price
+        self.has_candidate = in_bounds.any(axis=1)
+        self.rows = np.arange(len(batch))
+
+    def __call__(self, weights: Optional[np.ndarray], lam: float) -> np.ndarray:
+        """Best grid price per product for revenue - lam * weight * price"""
+        objective = self.revenue
+        if weights is not None and lam:
+            objective = objective - lam * weights[:, None] * self.candidates
+        prices = self.candidates[self.rows, np.argmax(objective, axis=1)]
+        return np.where(self.has_candidate, prices, self.current_price)
+
+
+def optimize_prices(batch: PricingBatch, method: str = "closed_form",
+                    grid: Sequence[float] = DEFAULT_GRID,
+                    incumbent_revenue: Optional[np.ndarray] = None,
+                    basket_weights: Optional[np.ndarray] = None,
+                    basket_budget: Optional[float] = None) -> PricingResult:
+    """
+    Reprice every product in `batch` at once
+
+    Args:
+        method: "closed_form" (exact optimum within bounds) or "grid"
+        grid: (start, stop, step) price multipliers for the grid method
+        incumbent_revenue: a product keeps its current price unless the
+            optimum beats this revenue (default: modelled revenue at p0)
+        basket_weights / basket_budget: enforce sum(weights * price) <= budget
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown pricing method {method!r}; expected one of {METHODS}")
+    if len(batch) == 0:
+        empty = np.empty(0)
+        return PricingResult(empty, empty, empty, np.empty(0, dtype=bool), {"products": 0})
+
+    grid_search = _GridSearch(batch, _grid_multipliers(grid)) if method == "grid" else None
+    weights = None if basket_budget is None else np.asarray(
+        basket_weights if basket_weights is not None else batch.base_demand, dtype=np.float64
+    )
+
+    incumbent = np.asarray(
+        incumbent_revenue if incumbent_revenue is not None else batch.revenue(batch.current_price),
+        dtype=np.float64,
+    )
+
+    def solve(lam: float) -> np.ndarray:
+        if method == "closed_form":
+            prices = _closed_form(batch, weights, lam)
+        else:
+            prices = grid_search(weights, lam)
+        objective = batch.revenue(prices)
+        incumbent_objective = incumbent
+        if weights is not None:
+            objective = objective - lam * weights * prices
+            incumbent_objective = incumbent_objective - lam * weights * batch.current_price
+        return np.where(objective > incumbent_objective, prices, batch.current_price)
+
+    lam = 0.0
+    prices = solve(lam)
+    stats: Dict[str, Any] = {"products": len(batch), "method": method, "budget_binding": False}
+
+    if weights is not None:
+        spend = float(weights @ prices)
+        stats["basket_budget"] = basket_budget
+        if spend > basket_budget:
+            # Grow lam until the basket fits, then bisect on the boundary
+            hi = 1.0
+            while float(weights @ solve(hi)) > basket_budget and hi < 1e12:
+                hi *= 4
+            lo = 0.0
+            for _ in range(BISECTION_STEPS):
+                if hi - lo <= BISECTION_TOLERANCE * hi:
+                    break
+                mid = (lo + hi) / 2
+                if float(weights @ solve(mid)) > basket_budget:
+                    lo = mid
+                else:
+                    hi = mid
+            lam = hi
+            prices = solve(lam)
+            stats["budget_binding"] = True
+        spend = float(weights @ prices)
+        stats["basket_spend"] = round(spend, 2)
+        stats["budget_feasible"] = spend <= basket_budget * (1 + 1e-9)
+        stats["shadow_price"] = lam
+
+    demand = batch.demand(prices)
+    return PricingResult(
+        prices=prices,
+        demand=demand,
+        revenue=prices * demand,
+        changed=~np.isclose(prices, batch.current_price),
+        stats=stats,
+    )
@@ -0,0 +1,436 @@
+"""
+FarmConnect Routing Engine
+Capacitated multi-vehicle routing with time windows (CVRPTW)
+
+Pipeline:
+1. Haversine distance matrix for depot + all stops in one vectorized pass
+2. Clarke-Wright savings construction over nearest-neighbour candidate pairs
+3. Local search (2-opt within routes, Or-opt moves within and between routes)
+   until no move improves or the time budget runs out
+
+The time budget covers the whole solve, matrix included. Construction stops
+merging routes once it is spent; the fleet-size trim always runs, since it is
+a constraint rather than an improvement.
+
+Node 0 is always the depot. Times are minutes from dispatch.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+MATRIX_BLOCK_ROWS = 1024
+DEFAULT_NEIGHBOURS = 40
+EPSILON = 1e-9
+
+
+def haversine_matrix(latitudes: Sequence[float], longitudes: Sequence[float],
+                     dtype=np.float64) -> np.ndarray:
+    """Great-circle distances (km) between every pair of points.
+
+    Rows are computed in blocks so temporaries stay bounded for thousands of points.
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    n = len(lat)
+    matrix = np.empty((n, n), dtype=dtype)
+
+    for start in range(0, n, MATRIX_BLOCK_ROWS):
+        stop = min(start + MATRIX_BLOCK_ROWS, n)
+        dlat = lat[start:stop, None] - lat[None, :]
+        dlon = lon[start:stop, None] - lon[None, :]
+        a = np.sin(dlat / 2) ** 2 + cos_lat[start:stop, None] * cos_lat[None, :] * np.sin(dlon / 2) ** 2
+        matrix[start:stop] = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    np.fill_diagonal(matrix, 0.0)
+    return matrix
+
+
+@dataclass
+class RoutingProblem:
+    """Depot (index 0) plus delivery stops (indices 1..n)"""
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    demands: np.ndarray
+    vehicle_capacity: float
+    max_vehicles: Optional[int] = None
+    ready_times: Optional[np.ndarray] = None      # earliest service start per node
+    due_times: Optional[np.ndarray] = None        # latest service start; depot = latest return
+    service_minutes: Union[float, np.ndarray] = 0.0
+    speed_kmh: float = 30.0
+
+    def __post_init__(self):
+        if self.max_vehicles is not None and self.max_vehicles < 1:
+            raise ValueError(f"max_vehicles must be at least 1 (None for no limit), got {self.max_vehicles}")
+
+    @property
+    def size(self) -> int:
+        return len(self.latitudes)
+
+    @property
+    def has_time_windows(self) -> bool:
+        return self.ready_times is not None or self.due_times is not None
+
+    @classmethod
+    def from_records(cls, depot: Dict[str, Any], stops: List[Dict[str, Any]], vehicle_capacity: float,
+                     max_vehicles: Optional[int] = None, speed_kmh: float = 30.0,
+                     max_route_minutes: Optional[float] = None) -> "RoutingProblem":
+        """Build a problem from delivery point dicts
+
+        Stops use the logistics agent's keys: latitude, longitude, weight and
+        optionally time_window ([earliest, latest] minutes) and service_minutes.
+        """
+        nodes = [depot] + list(stops)
+        latitudes = np.array([float(p.get("latitude", 0)) for p in nodes])
+        longitudes = np.array([float(p.get("longitude", 0)) for p in nodes])
+        demands = np.array([0.0] + [float(p.get("weight", 5)) for p in stops])
+        service = np.array([0.0] + [float(p.get("service_minutes", 0)) for p in stops])
+
+        windows = [p.get("time_window") for p in stops]
+        ready_times = due_times = None
+        if any(windows) or max_route_minutes is not None:
+            ready_times = np.zeros(len(nodes))
+            due_times = np.full(len(nodes), np.inf)
+            for idx, window in enumerate(windows, start=1):
+                if window:
+                    ready_times[idx], due_times[idx] = float(window[0]), float(window[1])
+            if max_route_minutes is not None:
+                due_times[0] = float(max_route_minutes)
+
+        return cls(
+            latitudes=latitudes,
+            longitudes=longitudes,
+            demands=demands,
+            vehicle_capacity=float(vehicle_capacity),
+            max_vehicles=max_vehicles,
+            ready_times=ready_times,
+            due_times=due_times,
+            service_minutes=service,
+            speed_kmh=speed_kmh,
+        )
+
+
+@dataclass
+class VehicleRoute:
+    """One vehicle's tour, depot -> stops -> depot"""
+    stops: List[int]
+    distance_km: float
+    load: float
+    service_start_minutes: List[float]
+    return_minutes: float
+
+
+@dataclass
+class RoutingSolution:
+    routes: List[VehicleRoute]
+    unassigned: List[int]
+    total_distance_km: float
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+class VRPSolver:
+    """
+    Savings construction + 2-opt / Or-opt local search for CVRPTW
+
+    Candidate moves are restricted to each stop's `neighbours` nearest stops
+    and evaluated as NumPy vectors, so a dispatch run with thousands of stops
+    stays within the time budget.
+    """
+
+    def __init__(self, problem: RoutingProblem, time_budget: float = 2.0,
+                 neighbours: int = DEFAULT_NEIGHBOURS):
+        self.started = time.perf_counter()
+        self.problem = problem
+        self.time_budget = time_budget
+        self.dist = haversine_matrix(problem.latitudes, problem.longitudes)
+        self.travel = self.dist / problem.speed_kmh * 60.0
+        n = problem.size
+        self.demand = np.asarray(problem.demands, dtype=np.float64)
+        self.service = np.broadcast_to(np.asarray(problem.service_minutes, dtype=np.float64), (n,))
+        self.ready = problem.ready_times if problem.ready_times is not None else np.zeros(n)
+        self.due = problem.due_times if problem.due_times is not None else np.full(n, np.inf)
+        self.timed = problem.has_time_windows
+        self.capacity = problem.vehicle_capacity
+
+        customers = n - 1
+        k = min(neighbours, max(customers - 1, 0))
+        if k > 0:
+            sub = self.dist[1:, 1:].copy()
+            np.fill_diagonal(sub, np.inf)
+            nearest = np.argpartition(sub, k - 1, axis=1)[:, :k] + 1
+            self.neighbours = np.vstack([np.zeros((1, k), dtype=int), nearest])
+        else:
+            self.neighbours = np.zeros((n, 0), dtype=int)
+
+    # ─── feasibility helpers ────────────────────────────────────────────
+
+    def _schedule(self, route: Sequence[int]) -> Optional[Tuple[List[float], float]]:
+        """Service start times and depot return time, or None if a window is missed"""
+        t = self.ready[0]
+        prev = 0
+        starts = []
+        for node in route:
+            t += self.travel[prev, node]
+            if t > self.due[node]:
+                return None
+            t = max(t, self.ready[node])
+            starts.append(t)
+            t += self.service[node]
+            prev = node
+        t += self.travel[prev, 0]
+        if t > self.due[0]:
+            return None
+        return starts, t
+
+    def _feasible(self, route: Sequence[int]) -> bool:
+        return not self.timed or self._schedule(route) is not None
+
+    def _route_distance(self, route: Sequence[int]) -> float:
+        if not route:
+            return 0.0
+        path = np.concatenate(([0], route, [0]))
+        return float(self.dist[path[:-1], path[1:]].sum())
+
+    # ─── construction ───────────────────────────────────────────────────
+
+    def _savings_pairs(self) -> np.ndarray:
+        """Candidate (i, j) pairs sorted by decreasing saving"""
+        n = self.problem.size
+        if n <= 2:
+            return np.empty((0, 2), dtype=int)
+        rows = np.repeat(np.arange(1, n), self.neighbours.shape[1])
+        cols = self.neighbours[1:].ravel()
+        lo, hi = np.minimum(rows, cols), np.maximum(rows, cols)
+        pairs = np.unique(np.stack([lo, hi], axis=1), axis=0)
+        i, j = pairs[:, 0], pairs[:, 1]
+        savings = self.dist[0, i] + self.dist[0, j] - self.dist[i, j]
+        keep = savings > EPSILON
+        order = np.argsort(-savings[keep], kind="stable")
+        return pairs[keep][order]
+
+    def _construct(self, deadline: float) -> Tuple[List[List[int]], List[int]]:
+        n = self.problem.size
+        routes: Dict[int, List[int]] = {}
+        route_of = np.full(n, -1, dtype=int)
+        loads: Dict[int, float] = {}
+        unassigned = []
+
+        for node in range(1, n):
+            if self.demand[node] > self.capacity or not self._feasible([node]):
+                unassigned.append(node)
+                continue
+            routes[node] = [node]
+            route_of[node] = node
+            loads[node] = self.demand[node]
+
+        for count, (i, j) in enumerate(self._savings_pairs()):
+            # Every intermediate state is a valid solution, so stopping early is safe
+            if count % 256 == 0 and time.perf_counter() >= deadline:
+                break
+            ri, rj = route_of[i], route_of[j]
+            if ri < 0 or rj < 0 or ri == rj or loads[ri] + loads[rj] > self.capacity:
+                continue
+            a, b = routes[ri], routes[rj]
+            # i and j must both be adjacent to the depot
+            if a[-1] == i and b[0] == j:
+                options = [a + b]
+            elif a[0] == i and b[-1] == j:
+                options = [b + a]
+            elif a[-1] == i and b[-1] == j:
+                options = [a + b[::-1], b + a[::-1]]
+            elif a[0] == i and b[0] == j:
+                options = [a[::-1] + b, b[::-1] + a]
+            else:
+                continue
+            merged = next((option for option in options if self._feasible(option)), None)
+            if merged is None:
+                continue
+            routes[ri] = merged
+            loads[ri] += loads.pop(rj)
+            del routes[rj]
+            route_of[b] = ri
+
+        return list(routes.values()), unassigned
+
+    # ─── local search ───────────────────────────────────────────────────
+
+    def _two_opt(self, route: List[int], deadline: float) -> Tuple[List[int], bool]:
+        """Best-improvement segment reversal, one anchor at a time"""
+        improved = False
+        path = [0] + route + [0]
+        i = 0
+        while i < len(path) - 3 and time.perf_counter() < deadline:
+            arr = np.asarray(path)
+            a, b = arr[i], arr[i + 1]
+            c, d = arr[i + 2:-1], arr[i + 3:]
+            delta = self.dist[a, c] + self.dist[b, d] - self.dist[a, b] - self.dist[c, d]
+            best = int(np.argmin(delta))
+            if delta[best] < -EPSILON:
+                j = i + 2 + best
+                candidate = path[:i + 1] + path[i + 1:j + 1][::-1] + path[j + 1:]
+                if self._feasible(candidate[1:-1]):
+                    path = candidate
+                    improved = True
+                    continue
+            i += 1
+        return path[1:-1], improved
+
+    def _insertion_costs(self, route: List[int], first: int, last: int) -> np.ndarray:
+        """Cost of inserting segment first..last at each gap of route (both orientations)"""
+        path = np.asarray([0] + route + [0])
+        before, after = path[:-1], path[1:]
+        base = self.dist[before, after]
+        forward = self.dist[before, first] + self.dist[last, after] - base
+        backward = self.dist[before, last] + self.dist[first, after] - base
+        return np.minimum(forward, backward), forward <= backward
+
+    def _or_opt(self, routes: List[List[int]], deadline: float, max_segment: int = 3) -> bool:
+        """Relocate segments of 1..max_segment stops to a cheaper position in any route"""
+        improved = False
+        route_of = {node: idx for idx, route in enumerate(routes) for node in route}
+        loads = [float(self.demand[route].sum()) for route in routes]
+
+        for seg_len in range(1, max_segment + 1):
+            r = 0
+            while r < len(routes):
+                pos = 0
+                while pos + seg_len <= len(routes[r]):
+                    if time.perf_counter() >= deadline:
+                        return improved
+                    source = routes[r]
+                    segment = source[pos:pos + seg_len]
+                    prev = source[pos - 1] if pos > 0 else 0
+                    nxt = source[pos + seg_len] if pos + seg_len < len(source) else 0
+                    gain = (self.dist[prev, segment[0]] + self.dist[segment[-1], nxt]
+                            - self.dist[prev, nxt])
+                    seg_load = float(self.demand[segment].sum())
+                    remainder = source[:pos] + source[pos + seg_len:]
+
+                    targets = {route_of[int(nb)] for nb in self.neighbours[segment[0]] if int(nb) in route_of}
+                    targets.add(r)
+                    best = None
+                    for t in targets:
+                        if t != r and loads[t] + seg_load > self.capacity:
+                            continue
+                        target = remainder if t == r else routes[t]
+                        costs, keep_forward = self._insertion_costs(target, segment[0], segment[-1])
+                        gap = int(np.argmin(costs))
+                        delta = costs[gap] - gain
+                        if delta < -EPSILON and (best is None or delta < best[0]):
+                            placed = segment if keep_forward[gap] else segment[::-1]
+                            candidate = target[:gap] + placed + target[gap:]
+                            if self._feasible(candidate):
+                                best = (delta, t, candidate)
+
+                    if best is None:
+                        pos += 1
+                        continue
+                    _, t, candidate = best
+                    if t == r:
+                        routes[r] = candidate
+                    else:
+                        routes[t] = candidate
+                        routes[r] = remainder
+                        loads[t] += seg_load
+                        loads[r] -= seg_load
+                        for node in segment:
+                            route_of[node] = t
+                    improved = True
+                r += 1
+
+        # Drop routes emptied by relocation
+        routes[:] = [route for route in routes if route]
+        return improved
+
+    def _enforce_fleet_size(self, routes: List[List[int]]) -> List[int]:
+        """Dissolve the smallest routes into others until the fleet limit is met"""
+        limit = self.problem.max_vehicles
+        dropped: List[int] = []
+        if limit is None:
+            return dropped
+        while len(routes) > limit:
+            routes.sort(key=lambda route: float(self.demand[route].sum()))
+            orphans = routes.pop(0)
+            loads = [float(self.demand[route].sum()) for route in routes]
+            for node in orphans:
+                best = None
+                for t, target in enumerate(routes):
+                    if loads[t] + self.demand[node] > self.capacity:
+                        continue
+                    costs, _ = self._insertion_costs(target, node, node)
+                    for gap in np.argsort(costs)[:3]:
+                        candidate = target[:gap] + [node] + target[gap:]
+                        if self._feasible(candidate):
+                            if best is None or costs[gap] < best[0]:
+                                best = (costs[gap], t, candidate)
+                            break
+                if best is None:
+                    dropped.append(node)
+                else:
+                    _, t, candidate = best
+                    routes[t] = candidate
+                    loads[t] += self.demand[node]
+        return dropped
+
+    # ─── driver ─────────────────────────────────────────────────────────
+
+    def solve(self) -> RoutingSolution:
+        started = self.started
+        deadline = started + self.time_budget
+
+        routes, unassigned = self._construct(deadline)
+        dropped = self._enforce_fleet_size(routes)
+        unassigned += dropped
+        construction_km = sum(self._route_distance(route) for route in routes)
+
+        passes = 0
+        stopped_by = "converged"
+        while True:
+            if time.perf_counter() >= deadline:
+                stopped_by = "time_budget"
+                break
+            passes += 1
+            improved = False
+            for idx, route in enumerate(routes):
+                routes[idx], changed = self._two_opt(route, deadline)
+                improved |= changed
+            improved |= self._or_opt(routes, deadline)
+            if not improved:
+                break
+
+        vehicle_routes = []
+        for route in routes:
+            schedule = self._schedule(route)
+            starts, end = schedule if schedule is not None else ([], float("nan"))
+            vehicle_routes.append(VehicleRoute(
+                stops=[int(node) for node in route],
+                distance_km=self._route_distance(route),
+                load=float(self.demand[route].sum()),
+                service_start_minutes=[float(t) for t in starts],
+                return_minutes=float(end),
+            ))
+
+        total = sum(route.distance_km for route in vehicle_routes)
+        return RoutingSolution(
+            routes=vehicle_routes,
+            unassigned=sorted(int(node) for node in unassigned),
+            total_distance_km=total,
+            stats={
+                "construction_distance_km": round(construction_km, 3),
+                "improvement_pct": round((1 - total / construction_km) * 100, 2) if construction_km else 0.0,
+                "local_search_passes": passes,
+                "stopped_by": stopped_by,
+                "dropped_by_fleet_limit": len(dropped),
+                "elapsed_seconds": round(time.perf_counter() - started, 3),
+            },
+        )
+
+
+def solve_vrp(problem: RoutingProblem, time_budget: float = 2.0,
+              neighbours: int = DEFAULT_NEIGHBOURS) -> RoutingSolution:
+    """Solve a capacitated VRP with time windows within `time_budget` seconds"""
+    return VRPSolver(problem, time_budget=time_budget, neighbours=neighbours).solve()
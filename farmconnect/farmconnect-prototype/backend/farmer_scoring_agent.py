@@ -3,13 +3,15 @@ FarmConnect Farmer Onboarding Scoring Agent - LangGraph Implementation
 AI-powered farmer evaluation and onboarding optimization system
 """
 
-from typing import TypedDict, Annotated, Sequence, Literal, Optional, Dict, Any, List
+from typing import TypedDict, Annotated, Sequence, Literal, Optional, Dict, Any, List, AsyncIterator, Awaitable, Callable, Hashable
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 from langchain.schema import BaseMessage, HumanMessage, AIMessage, SystemMessage
 import operator
 import asyncio
+import copy
 import json
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import logging
 import os
@@ -24,6 +26,9 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_CONCURRENCY = int(os.getenv("FARMER_SCORING_CONCURRENCY", "16"))
+REGION_CACHE_SIZE = 4096  # shared location / market-fit lookups kept per agent
+
 @dataclass
 class FarmerScore:
     """Farmer onboarding score with detailed breakdown"""
@@ -133,6 +138,10 @@ class FarmerScoringAgent:
             "rural": {"urban_proximity": 8, "logistics": 6, "market_access": 8}
         }
         
+        # Location and market-fit lookups shared by farmers in the same region
+        self._region_cache: "OrderedDict[Hashable, asyncio.Future]" = OrderedDict()
+        self.region_cache_stats = {"hits": 0, "misses": 0}
+        
         # Create workflow
         self.workflow = self._create_workflow()
         
@@ -303,12 +312,47 @@ class FarmerScoringAgent:
             "messages": state.get("messages", []) + [message]
         }
     
+    async def _shared_lookup(self, key: Hashable, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Run `compute` once per key and share the result across farmers
+        
+        Concurrent callers with the same key await the same in-flight lookup.
+        Each caller gets its own copy so per-farmer results stay independent.
+        """
+        future = self._region_cache.get(key)
+        if future is None:
+            self.region_cache_stats["misses"] += 1
+            future = asyncio.ensure_future(compute())
+            self._region_cache[key] = future
+            if len(self._region_cache) > REGION_CACHE_SIZE:
+                self._region_cache.popitem(last=False)
+        else:
+            self.region_cache_stats["hits"] += 1
+            self._region_cache.move_to_end(key)
+        
+        try:
+            result = await asyncio.shield(future)
+        except Exception:
+            # Failed lookups are retried by the next farmer
+            if self._region_cache.get(key) is future:
+                del self._region_cache[key]
+            raise
+        return copy.deepcopy(result)
+    
     async def _analyze_location_factors(self, farmer_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze farmer location factors"""
         
         location = farmer_data.get("location", "").lower()
         state = farmer_data.get("state", "").lower()
         
+        return await self._shared_lookup(
+            ("location", location, state),
+            lambda: self._lookup_location_factors(location, state)
+        )
+    
+    async def _lookup_location_factors(self, location: str, state: str) -> Dict[str, Any]:
+        """Location factors for a (location, state) region"""
+        
         # Determine location category
         location_category = "rural"  # default
         if any(city in location for city in ["mumbai", "delhi", "bangalore", "pune", "hyderabad"]):
@@ -489,18 +533,27 @@ class FarmerScoringAgent:
                                  product_evaluation: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze market fit and demand alignment"""
         
-        products = farmer_data.get("products", [])
+        products = tuple(product.lower() for product in farmer_data.get("products", []))
         location = farmer_data.get("location", "").lower()
+        organic_certified = bool(farmer_data.get("organic_certified", False))
+        
+        # Farmers in the same region with the same portfolio share one analysis
+        return await self._shared_lookup(
+            ("market_fit", location, products, organic_certified),
+            lambda: self._lookup_market_fit(location, products, organic_certified)
+        )
+    
+    async def _lookup_market_fit(self, location: str, products: Sequence[str],
+                                 organic_certified: bool) -> Dict[str, Any]:
+        """Market fit for a product portfolio sold from `location`"""
         
         # Market demand analysis
         market_scores = []
         premium_potential = []
         
-        for product in products:
-            product_lower = product.lower()
-            
+        for product_lower in products:
             # Check for high-demand categories
-            if "organic" in product_lower or farmer_data.get("organic_certified", False):
+            if "organic" in product_lower or organic_certified:
                 market_scores.append(1.0)
                 premium_potential.append(1.5)
             elif any(exotic in product_lower for exotic in ["dragon", "avocado", "kiwi"]):
@@ -819,6 +872,38 @@ class FarmerScoringAgent:
                 "farmer_id": farmer_data.get("id", "unknown")
             }
 
+    async def score_farmers(self, farmers: Sequence[Dict[str, Any]],
+                            concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Score many farmers concurrently, yielding each result as it completes
+        
+        At most `concurrency` scoring workflows run at once. Results carry the
+        farmer's `index` in `farmers` since they arrive out of order.
+        """
+        concurrency = max(1, concurrency or DEFAULT_BATCH_CONCURRENCY)
+        # Bounded so a slow consumer pauses the workers instead of buffering everything
+        completed: asyncio.Queue = asyncio.Queue(maxsize=2 * concurrency)
+        pending = iter(enumerate(farmers))
+        
+        async def worker():
+            for index, farmer_data in pending:
+                try:
+                    result = await self.score_farmer(farmer_data)
+                except Exception as e:
+                    # Must not raise again: a worker that dies without enqueuing stalls the consumer
+                    farmer_id = farmer_data.get("id", "unknown") if isinstance(farmer_data, dict) else "unknown"
+                    result = {"success": False, "error": str(e), "farmer_id": farmer_id}
+                await completed.put({"index": index, **result})
+        
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(farmers)))]
+        try:
+            for _ in range(len(farmers)):
+                yield await completed.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
 # Example usage
 async def main():
     """Example usage of the farmer scoring agent"""
@@ -1,9 +1,11 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uvicorn
+import json
 import random
 import sys
 import os
@@ -30,6 +32,9 @@ except ImportError as e:
     print(f"Warning: Phase 2 agents not available. Running in basic mode. Error: {e}")
     AGENTS_AVAILABLE = False
 
+MAX_BATCH_SCORING_FARMERS = 100      # JSON response, sorted by score
+MAX_STREAMED_SCORING_FARMERS = 10000  # NDJSON stream for onboarding drives
+
 # Create FastAPI app
 app = FastAPI(
     title="FarmConnect API",
@@ -326,10 +331,9 @@ async def farmer_scoring_demo():
     ]
     
     try:
-        results = []
-        for farmer_data in demo_farmers:
-            result = await farmer_scoring_agent.score_farmer(farmer_data)
-            results.append(result)
+        results = [result async for result in farmer_scoring_agent.score_farmers(demo_farmers)]
+        for result in results:
+            result.pop("index", None)
         
         # Sort by score
         results.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
@@ -610,6 +614,13 @@ async def execute_logistics_task(request: Dict[str, Any]):
             status_code=400,
             detail=f"Invalid logistics task. Must be one of: {', '.join(valid_tasks)}"
         )
+
+    max_vehicles = task_data.get("max_vehicles")
+    if max_vehicles is not None and (not isinstance(max_vehicles, int) or max_vehicles < 1):
+        raise HTTPException(
+            status_code=400,
+            detail="max_vehicles must be a positive integer, or omitted for no limit"
+        )
     
     try:
         result = await logistics_agent.execute(task_type, task_data)
@@ -808,17 +819,17 @@ async def score_multiple_farmers(farmers_data: List[Dict[str, Any]]):
             detail="Farmer scoring agent not available"
         )
     
-    if len(farmers_data) > 10:
+    if len(farmers_data) > MAX_BATCH_SCORING_FARMERS:
         raise HTTPException(
             status_code=400,
-            detail="Maximum 10 farmers can be scored at once"
+            detail=f"Maximum {MAX_BATCH_SCORING_FARMERS} farmers can be scored at once; "
+                   f"use /api/farmers/batch-scoring/stream for larger batches"
         )
     
     try:
-        results = []
-        for farmer_data in farmers_data:
-            result = await farmer_scoring_agent.score_farmer(farmer_data)
-            results.append(result)
+        results = [result async for result in farmer_scoring_agent.score_farmers(farmers_data)]
+        for result in results:
+            result.pop("index", None)
         
         # Sort by score descending
         results.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
@@ -838,6 +849,73 @@ async def score_multiple_farmers(farmers_data: List[Dict[str, Any]]):
             detail=f"Batch farmer scoring failed: {str(e)}"
         )
 
+@app.post("/api/farmers/batch-scoring/stream")
+async def stream_farmer_scoring(request: Dict[str, Any]):
+    """
+    Score a large batch of farmers concurrently, streaming NDJSON as they complete
+    
+    Each line is {"type": "farmer", "index": ..., ...score} in completion
+    order, followed by one {"type": "summary", ...} line.
+    """
+    if not farmer_scoring_agent:
+        raise HTTPException(
+            status_code=503,
+            detail="Farmer scoring agent not available"
+        )
+    
+    farmers = request.get("farmers", [])
+    if not farmers:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one farmer is required"
+        )
+    
+    # Checked up front: once streaming starts the status code is already sent
+    if not isinstance(farmers, list) or not all(isinstance(farmer, dict) for farmer in farmers):
+        raise HTTPException(
+            status_code=400,
+            detail="farmers must be a list of farmer objects"
+        )
+    
+    if len(farmers) > MAX_STREAMED_SCORING_FARMERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {MAX_STREAMED_SCORING_FARMERS} farmers can be streamed in one job"
+        )
+    
+    concurrency = request.get("concurrency")
+    if concurrency is not None and (not isinstance(concurrency, int) or concurrency < 1):
+        raise HTTPException(
+            status_code=400,
+            detail="concurrency must be a positive integer"
+        )
+    
+    async def score_stream():
+        start_time = datetime.now()
+        priorities = {"high": 0, "medium": 0, "low": 0}
+        failed = 0
+        
+        async for result in farmer_scoring_agent.score_farmers(farmers, concurrency=concurrency):
+            if result.get("success"):
+                priority = result.get("priority_level", "low")
+                priorities[priority] = priorities.get(priority, 0) + 1
+            else:
+                failed += 1
+            yield json.dumps({"type": "farmer", **result}, default=str) + "\n"
+        
+        yield json.dumps({
+            "type": "summary",
+            "total_farmers": len(farmers),
+            "failed": failed,
+            "high_priority": priorities["high"],
+            "medium_priority": priorities["medium"],
+            "low_priority": priorities["low"],
+            "execution_time": (datetime.now() - start_time).total_seconds(),
+            "region_cache": dict(farmer_scoring_agent.region_cache_stats)
+        }) + "\n"
+    
+    return StreamingResponse(score_stream(), media_type="application/x-ndjson")
+
 @app.post("/api/agents/dynamic-pricing")
 async def execute_dynamic_pricing(request: Dict[str, Any]):
     """
@@ -952,6 +1030,45 @@ async def optimize_product_pricing(product_data: Dict[str, Any]):
             detail=f"Product pricing optimization failed: {str(e)}"
         )
 
+@app.post("/api/pricing/catalogue-reprice")
+async def reprice_catalogue(request: Dict[str, Any]):
+    """
+    Reprice an entire catalogue in one vectorized pass (no per-product workflow)
+    """
+    if not dynamic_pricing_agent:
+        raise HTTPException(
+            status_code=503,
+            detail="Dynamic pricing agent not available"
+        )
+
+    products = request.get("products", [])
+    if not products:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one product is required"
+        )
+
+    for index, product in enumerate(products):
+        if "price" not in product or product["price"] <= 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Product at index {index} needs a positive price"
+            )
+
+    try:
+        return await dynamic_pricing_agent.reprice_catalogue(
+            products,
+            market_analysis=request.get("market_analysis"),
+            optimizer=request.get("optimizer")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Catalogue repricing failed: {str(e)}"
+        )
+
 @app.get("/api/phase2/demo")
 async def phase2_demo():
     """
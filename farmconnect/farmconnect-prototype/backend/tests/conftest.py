@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Backend and agent modules are imported as top-level modules, as main_simple does
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "agents"))
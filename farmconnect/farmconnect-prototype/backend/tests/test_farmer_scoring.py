@@ -0,0 +1,58 @@
+"""Batch farmer scoring: malformed entries must not stall the stream"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main_simple
+from farmer_scoring_agent import FarmerScoringAgent
+
+
+class StubScoringAgent(FarmerScoringAgent):
+    """Scores without building the LLM workflow"""
+
+    def __init__(self):
+        self.region_cache_stats = {"hits": 0, "misses": 0}
+
+    async def score_farmer(self, farmer_data):
+        await asyncio.sleep(0)
+        # Same first access the real workflow makes; fails for non-dicts
+        return {"success": True, "farmer_id": farmer_data.get("id", "unknown"), "priority_level": "high"}
+
+
+async def collect(agent, farmers, concurrency=None):
+    return [result async for result in agent.score_farmers(farmers, concurrency=concurrency)]
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_malformed_items_yield_error_records(concurrency):
+    farmers = [{"id": "F001"}, "bad", None, {"id": "F002"}]
+    results = asyncio.run(asyncio.wait_for(collect(StubScoringAgent(), farmers, concurrency), timeout=5))
+
+    by_index = {result["index"]: result for result in results}
+    assert sorted(by_index) == [0, 1, 2, 3]
+    assert by_index[0]["success"] and by_index[3]["success"]
+    for index in (1, 2):
+        assert by_index[index]["success"] is False
+        assert by_index[index]["farmer_id"] == "unknown"
+        assert "error" in by_index[index]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main_simple, "farmer_scoring_agent", StubScoringAgent())
+    return TestClient(main_simple.app)
+
+
+def test_stream_rejects_non_dict_farmers(client):
+    response = client.post("/api/farmers/batch-scoring/stream", json={"farmers": [{"id": "F001"}, "bad"]})
+    assert response.status_code == 400
+
+
+def test_stream_scores_valid_farmers(client):
+    response = client.post("/api/farmers/batch-scoring/stream", json={"farmers": [{"id": "F001"}, {"id": "F002"}]})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["type"] for line in lines] == ["farmer", "farmer", "summary"]
@@ -0,0 +1,114 @@
+"""Demand forecaster: incremental sync equals a rebuild, caches drop only what changed"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from forecasting_engine import DemandForecaster
+from inventory_agent import InventoryAgent
+
+PRODUCTS = ["tomato", "onion", "spinach", "mango"]
+START = date(2024, 3, 1)
+
+
+def make_sales(count, seed=0, first_day=0, days=90, products=PRODUCTS):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "product_id": products[int(rng.integers(len(products)))],
+            "date": (START + timedelta(days=int(rng.integers(first_day, first_day + days)))).isoformat(),
+            "quantity": int(rng.integers(1, 40)),
+        }
+        for _ in range(count)
+    ]
+
+
+def day(offset):
+    return (START + timedelta(days=offset)).toordinal()
+
+
+def assert_same_forecast(left, right, as_of=None):
+    a = left.forecast(PRODUCTS, as_of=as_of)
+    b = right.forecast(PRODUCTS, as_of=as_of)
+    assert a.as_of == b.as_of
+    np.testing.assert_array_equal(a.predicted, b.predicted)
+    np.testing.assert_array_equal(a.lower, b.lower)
+    np.testing.assert_array_equal(a.upper, b.upper)
+    np.testing.assert_allclose(a.base_demand, b.base_demand)
+
+
+def test_incremental_sync_matches_rebuild():
+    # The second batch is back-dated before the first one's earliest day,
+    # the third reaches past its latest
+    ledger = make_sales(400, seed=1) + make_sales(150, seed=2, first_day=-20) + make_sales(150, seed=3, days=120)
+    incremental = DemandForecaster()
+
+    previous = 0
+    for end in (400, 550, 700):
+        assert incremental.sync(ledger[:end]) == end - previous
+        previous = end
+        rebuilt = DemandForecaster()
+        rebuilt.sync(ledger[:end])
+        # Forecast twice so a stale cached entry would show up as a mismatch
+        for _ in range(2):
+            assert_same_forecast(incremental, rebuilt)
+            assert_same_forecast(incremental, rebuilt, as_of=day(60))
+
+    assert incremental.stats["rebuilds"] == 0
+
+
+def test_cache_dropped_only_for_touched_product_and_later_days():
+    forecaster = DemandForecaster()
+    forecaster.sync(make_sales(300))
+    for as_of in (day(30), day(60)):
+        forecaster.demand_stats(PRODUCTS, as_of=as_of)
+
+    # A tomato sale on day 45 changes tomato's statistics from day 45 onwards only
+    forecaster.add_sales([{"product_id": "tomato", "date": (START + timedelta(days=45)).isoformat(), "quantity": 5}])
+    misses = forecaster.stats["cache_misses"]
+    forecaster.demand_stats(PRODUCTS, as_of=day(30))
+    assert forecaster.stats["cache_misses"] == misses
+    forecaster.demand_stats(PRODUCTS, as_of=day(60))
+    assert forecaster.stats["cache_misses"] == misses + 1
+
+    fresh = DemandForecaster()
+    fresh.sync(make_sales(300) + [{"product_id": "tomato", "date": (START + timedelta(days=45)).isoformat(),
+                                   "quantity": 5}])
+    assert_same_forecast(forecaster, fresh, as_of=day(60))
+
+
+def test_other_ledger_with_matching_tail_rebuilds():
+    first = make_sales(200, seed=4)
+    # Same length and same final record, different history
+    other = make_sales(200, seed=5)
+    other[-1] = dict(first[-1])
+
+    forecaster = DemandForecaster()
+    forecaster.sync(first)
+    assert not forecaster.extends(other)
+    assert not forecaster.extends(other + make_sales(10, seed=6))
+    assert forecaster.extends(first + make_sales(10, seed=6))
+
+    forecaster.sync(other)
+    assert forecaster.stats["rebuilds"] == 1
+    rebuilt = DemandForecaster()
+    rebuilt.sync(other)
+    assert_same_forecast(forecaster, rebuilt)
+
+
+def test_agent_keeps_a_forecaster_per_ledger():
+    # Only the ledger pool is exercised, so skip building the LLM workflow
+    agent = InventoryAgent.__new__(InventoryAgent)
+    agent.forecasters = []
+    farm_a, farm_b = make_sales(100, seed=7), make_sales(100, seed=8)
+
+    forecaster_a = agent._forecaster_for(farm_a)
+    forecaster_a.sync(farm_a)
+    forecaster_b = agent._forecaster_for(farm_b)
+    forecaster_b.sync(farm_b)
+    assert forecaster_a is not forecaster_b
+
+    farm_a += make_sales(20, seed=9)
+    assert agent._forecaster_for(farm_a) is forecaster_a
+    assert forecaster_a.sync(farm_a) == 20
+    assert forecaster_a.stats["rebuilds"] == 0
@@ -0,0 +1,119 @@
+"""Batch pricing: grid matches the old search, closed form is exact, budgets hold"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from dynamic_pricing_agent import DynamicPricingAgent
+from pricing_engine import PricingBatch, optimize_prices
+
+MARKET = {"market_growth_rate": 0.12, "consumer_sentiment": 0.7}
+
+
+def legacy_optimal_price(current_price, elasticity, base_demand, avg_competitor_price):
+    """The per-product 8-point search the workflow used before batching"""
+    min_price = current_price * 0.85
+    max_price = min(avg_competitor_price * 0.95, current_price * 1.25)
+    best_price, best_revenue = current_price, current_price * base_demand
+    for multiplier in np.arange(0.85, 1.25, 0.05):
+        price = current_price * multiplier
+        if price < min_price or price > max_price:
+            continue
+        demand = base_demand * (1 + elasticity * (price - current_price) / current_price)
+        demand *= (1 + MARKET["market_growth_rate"] * 0.1) * MARKET["consumer_sentiment"]
+        revenue = price * max(demand, 0)
+        if revenue > best_revenue:
+            best_price, best_revenue = price, revenue
+    return best_price
+
+
+def random_catalogue(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "price": rng.uniform(10, 200, n).round(2),
+        "demand": rng.uniform(100, 5000, n).round(),
+        "elasticity": rng.uniform(-2.5, 0.2, n),
+        "competitor": rng.uniform(0.8, 1.6, n),
+    }
+
+
+def test_workflow_prices_match_legacy_search():
+    catalogue = random_catalogue(300)
+    names = [f"P{i}" for i in range(300)]
+    pricing_data = {"products": [{"name": name, "price": float(price)}
+                                 for name, price in zip(names, catalogue["price"])]}
+    forecast = {"product_forecasts": {
+        name: {"current_demand": float(demand), "forecasted_demand": float(demand),
+               "demand_elasticity": float(elasticity)}
+        for name, demand, elasticity in zip(names, catalogue["demand"], catalogue["elasticity"])
+    }}
+    competitors = {"product_analysis": {
+        name: {"avg_competitor_price": float(price * markup)}
+        for name, price, markup in zip(names, catalogue["price"], catalogue["competitor"])
+    }}
+
+    # The prediction step touches no instance state, so skip building the LLM
+    agent = DynamicPricingAgent.__new__(DynamicPricingAgent)
+    predictions = asyncio.run(agent._generate_ml_predictions(pricing_data, MARKET, forecast, competitors))
+
+    assert predictions["optimizer_stats"]["method"] == "grid"
+    for i, name in enumerate(names):
+        expected = legacy_optimal_price(catalogue["price"][i], catalogue["elasticity"][i],
+                                        catalogue["demand"][i], catalogue["price"][i] * catalogue["competitor"][i])
+        assert predictions["product_predictions"][name]["optimal_price"] == round(expected, 2)
+
+
+def test_closed_form_matches_fine_grid_inside_bounds():
+    rng = np.random.default_rng(1)
+    price = rng.uniform(10, 200, 200)
+    # Optima between 0.9x and 1.25x the current price, well inside the bounds
+    batch = PricingBatch(
+        current_price=price,
+        base_demand=rng.uniform(100, 5000, 200),
+        elasticity=rng.uniform(-1.25, -0.7, 200),
+        min_price=price * 0.5,
+        max_price=price * 2.0,
+        demand_scale=0.8,
+    )
+
+    closed = optimize_prices(batch, method="closed_form")
+    grid = optimize_prices(batch, method="grid", grid=(0.5, 2.0, 1e-4))
+
+    np.testing.assert_allclose(closed.prices, grid.prices, rtol=1e-4)
+    np.testing.assert_allclose(closed.revenue, grid.revenue, rtol=1e-7)
+    assert np.all(closed.revenue >= grid.revenue - 1e-9)
+
+
+@pytest.mark.parametrize("method", ["closed_form", "grid"])
+def test_basket_budget_respected(method):
+    catalogue = random_catalogue(500, seed=2)
+    price = catalogue["price"]
+    batch = PricingBatch(
+        current_price=price,
+        base_demand=catalogue["demand"],
+        elasticity=catalogue["elasticity"],
+        min_price=price * 0.85,
+        max_price=price * 1.25,
+    )
+    unconstrained = optimize_prices(batch, method=method)
+    current_spend = float(catalogue["demand"] @ price)
+    assert float(catalogue["demand"] @ unconstrained.prices) > current_spend * 1.01
+
+    budget = current_spend * 1.01
+    result = optimize_prices(batch, method=method, basket_budget=budget)
+
+    assert result.stats["budget_binding"]
+    assert result.stats["budget_feasible"]
+    assert float(catalogue["demand"] @ result.prices) <= budget * (1 + 1e-9)
+    assert result.revenue.sum() <= unconstrained.revenue.sum() + 1e-6
+
+
+def test_unreachable_basket_budget_reported():
+    price = np.array([10.0, 20.0])
+    batch = PricingBatch(current_price=price, base_demand=[100.0, 100.0], elasticity=[-0.5, -0.5],
+                         min_price=price * 0.85, max_price=price * 1.25)
+    # Below what even the floor prices cost
+    result = optimize_prices(batch, basket_budget=float(100.0 * (price * 0.85).sum()) * 0.5)
+
+    assert result.stats["budget_feasible"] is False
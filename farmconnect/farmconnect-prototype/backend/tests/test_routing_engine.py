@@ -0,0 +1,108 @@
+"""CVRPTW solver: every stop served once, constraints held, budget respected"""
+
+import time
+
+import numpy as np
+import pytest
+
+from routing_engine import RoutingProblem, haversine_matrix, solve_vrp
+
+SPEED_KMH = 30.0
+SERVICE_MINUTES = 5.0
+
+
+def random_problem(stops, seed=0, capacity=40.0, windows=False, max_vehicles=None):
+    rng = np.random.default_rng(seed)
+    latitudes = np.r_[12.97, 12.97 + rng.uniform(-0.2, 0.2, stops)]
+    longitudes = np.r_[77.59, 77.59 + rng.uniform(-0.2, 0.2, stops)]
+    demands = np.r_[0.0, rng.uniform(1, 10, stops)]
+    ready_times = due_times = None
+    if windows:
+        ready_times = np.r_[0.0, rng.uniform(0, 240, stops)]
+        due_times = np.r_[600.0, ready_times[1:] + 90]
+    return RoutingProblem(
+        latitudes=latitudes,
+        longitudes=longitudes,
+        demands=demands,
+        vehicle_capacity=capacity,
+        max_vehicles=max_vehicles,
+        ready_times=ready_times,
+        due_times=due_times,
+        service_minutes=SERVICE_MINUTES,
+        speed_kmh=SPEED_KMH,
+    )
+
+
+def assert_valid(problem, solution):
+    served = [node for route in solution.routes for node in route.stops]
+    # Each stop exactly once: on one route or reported unassigned
+    assert sorted(served + solution.unassigned) == list(range(1, problem.size))
+    if problem.max_vehicles is not None:
+        assert len(solution.routes) <= problem.max_vehicles
+
+    travel = haversine_matrix(problem.latitudes, problem.longitudes) / SPEED_KMH * 60.0
+    for route in solution.routes:
+        assert route.stops
+        assert route.load == pytest.approx(problem.demands[route.stops].sum())
+        assert route.load <= problem.vehicle_capacity + 1e-9
+        if not problem.has_time_windows:
+            continue
+        t, prev = 0.0, 0
+        for node, start in zip(route.stops, route.service_start_minutes, strict=True):
+            assert start == pytest.approx(max(t + travel[prev, node], problem.ready_times[node]))
+            assert start <= problem.due_times[node] + 1e-6
+            t, prev = start + SERVICE_MINUTES, node
+        assert route.return_minutes <= problem.due_times[0] + 1e-6
+
+
+@pytest.mark.parametrize("windows", [False, True])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_solution_is_feasible(windows, seed):
+    problem = random_problem(120, seed=seed, windows=windows)
+    solution = solve_vrp(problem, time_budget=1.0)
+
+    assert_valid(problem, solution)
+    assert len(solution.routes) > 1
+    assert solution.total_distance_km == pytest.approx(sum(r.distance_km for r in solution.routes))
+
+
+def test_oversized_and_unreachable_stops_unassigned():
+    problem = random_problem(30, windows=True)
+    problem.demands[3] = problem.vehicle_capacity + 1
+    # Window closes before a vehicle could possibly arrive
+    problem.ready_times[7], problem.due_times[7] = 0.0, 0.0
+    solution = solve_vrp(problem, time_budget=0.5)
+
+    assert {3, 7} <= set(solution.unassigned)
+    assert_valid(problem, solution)
+
+
+def test_fleet_limit_trims_routes():
+    unlimited = solve_vrp(random_problem(80), time_budget=0.5)
+    assert len(unlimited.routes) > 2
+
+    problem = random_problem(80, max_vehicles=2)
+    solution = solve_vrp(problem, time_budget=0.5)
+
+    assert len(solution.routes) <= 2
+    assert solution.unassigned
+    assert solution.stats["dropped_by_fleet_limit"] == len(solution.unassigned)
+    assert_valid(problem, solution)
+
+
+@pytest.mark.parametrize("max_vehicles", [0, -1])
+def test_fleet_limit_below_one_rejected(max_vehicles):
+    with pytest.raises(ValueError, match="max_vehicles"):
+        random_problem(10, max_vehicles=max_vehicles)
+
+
+def test_time_budget_covers_whole_solve():
+    problem = random_problem(2500, capacity=100.0)
+    started = time.perf_counter()
+    solution = solve_vrp(problem, time_budget=0.5)
+    elapsed = time.perf_counter() - started
+
+    # Building the result after the deadline is all that may run over
+    assert elapsed < 0.5 + 0.3
+    assert solution.stats["stopped_by"] == "time_budget"
+    assert_valid(problem, solution)
@@ -0,0 +1,120 @@
+"""Benchmark the Memory Bridge fallback image renderers.
+
+Renders N complete kits (orientation board, memory timeline and three
+storyboard scenes each) with the deterministic PIL fallbacks, and compares
+text layout against the previous per-call font loading and trial-string
+wrapping.
+
+    python benchmarks/bench_memory_bridge_render.py --kits 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from memory_bridge_agent import rendering  # noqa: E402
+from memory_bridge_agent.tools import (  # noqa: E402
+    _draw_storyboard_fallback,
+    _draw_timeline_fallback,
+    _storyboard_prompt_data,
+    generate_orientation_board,
+    load_memory_profile,
+)
+
+PROFILE = ROOT / "examples" / "memory_profiles" / "maria_valid.json"
+NAMES = ("Maria", "Robert", "Aiko", "Samuel", "Lucia", "Tomasz", "Grace", "Oluwaseun")
+
+
+def _kit_profile(base: dict, idx: int) -> dict:
+    profile = copy.deepcopy(base)
+    profile["person"]["preferred_name"] = f"{NAMES[idx % len(NAMES)]} {idx}"
+    return profile
+
+
+def render_kits(kits: int, output_dir: Path) -> float:
+    base = load_memory_profile(str(PROFILE))
+    start = time.perf_counter()
+    for idx in range(kits):
+        profile = _kit_profile(base, idx)
+        generate_orientation_board(profile, str(output_dir))
+        _draw_timeline_fallback(profile, output_dir / "memory_timeline.png")
+        for scene in _storyboard_prompt_data(profile):
+            _draw_storyboard_fallback(profile, output_dir / f"storyboard_scene_{scene['index']}.png", scene)
+    return time.perf_counter() - start
+
+
+def _legacy_font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+    candidate = rendering._FONT_CANDIDATES[bold][0]
+    if Path(candidate).exists():
+        return ImageFont.truetype(candidate, size=size)
+    return ImageFont.load_default()
+
+
+def _legacy_wrap(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_width: int) -> list[str]:
+    lines: list[str] = []
+    current = ""
+    for word in text.split():
+        trial = f"{current} {word}".strip()
+        if draw.textbbox((0, 0), trial, font=font)[2] <= max_width or not current:
+            current = trial
+        else:
+            lines.append(current)
+            current = word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def layout_comparison(rounds: int) -> tuple[float, float]:
+    base = load_memory_profile(str(PROFILE))
+    texts = [scene["event"] for scene in _storyboard_prompt_data(base)]
+    texts += [
+        "Low-stimulation visual. Caregiver-provided memory. No clinical conclusions.",
+        "No inferred dates or events. Caregiver review required. Not medical advice.",
+    ]
+    draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+    start = time.perf_counter()
+    for idx in range(rounds):
+        font = _legacy_font(28)
+        for text in texts:
+            _legacy_wrap(draw, f"{text} {idx}", font, 610)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for idx in range(rounds):
+        font = rendering.font(28)
+        for text in texts:
+            rendering.wrap_text(f"{text} {idx}", font, 610)
+    cached = time.perf_counter() - start
+    return legacy, cached
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kits", type=int, default=1000, help="kits to render (default: 1000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed = render_kits(args.kits, Path(tmp))
+    images = args.kits * 5
+    print(f"Rendered {args.kits} kits ({images} images) in {elapsed:.2f}s")
+    print(f"  {elapsed / args.kits * 1000:.1f} ms/kit, {elapsed / images * 1000:.1f} ms/image")
+
+    legacy, cached = layout_comparison(args.kits)
+    print(f"Text layout for {args.kits} kits: legacy {legacy * 1000:.0f} ms, cached {cached * 1000:.0f} ms "
+          f"({legacy / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Append-only audit store with an offset index and running aggregates.
+
+``audit_log.jsonl`` stays the source of truth: one JSON event per line,
+readable with ordinary tools. Two derived sidecar files make reads cheap:
+
+- ``audit_log.idx``: one fixed-width record per event holding its byte
+  offset in the log and its timestamp, so time-range queries bisect the index
+  and read only the matching byte range.
+- ``audit_log.stats.json``: the analytics counters, updated on every append,
+  so the dashboard summary does not re-read the log.
+
+Tail reads seek backwards from the end of the log. The sidecars record how
+much of the log they cover plus a fingerprint of its last bytes. If the log
+grows behind the store's back, the store catches up from that offset. If the
+log is truncated or rewritten, both sidecars are rebuilt from scratch.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread lock only
+    fcntl = None
+
+_INDEX_RECORD = struct.Struct("<Qd")  # byte offset, POSIX timestamp
+_TAIL_BYTES = 64
+_READ_BLOCK = 64 * 1024
+
+
+def _empty_stats() -> dict[str, Any]:
+    return {
+        "covered_bytes": 0,
+        "tail": "",
+        "total_events": 0,
+        "event_counts": {},
+        "kits_passed": 0,
+        "safety_blocks_by_reason": {},
+        "latest_output_dir": "",
+        "last_timestamp": 0.0,
+    }
+
+
+def _parse_timestamp(value: Any) -> float:
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _as_timestamp(value: datetime | float | str | None) -> float | None:
+    if value is None or isinstance(value, (float, int)):
+        return value
+    if isinstance(value, datetime):
+        return value.timestamp() if value.tzinfo else value.replace(tzinfo=timezone.utc).timestamp()
+    return _parse_timestamp(value)
+
+
+def _apply(stats: dict[str, Any], event: dict[str, Any]) -> None:
+    """Fold one event into the running aggregates."""
+    event_type = event.get("event_type", "")
+    details = event.get("details", {}) or {}
+    stats["total_events"] += 1
+    stats["event_counts"][event_type] = stats["event_counts"].get(event_type, 0) + 1
+    if event_type == "workflow_blocked":
+        reason = details.get("reason", "unknown")
+        blocks = stats["safety_blocks_by_reason"]
+        blocks[reason] = blocks.get(reason, 0) + 1
+    elif event_type == "workflow_completed":
+        if details.get("overall_passed") is True:
+            stats["kits_passed"] += 1
+        stats["latest_output_dir"] = event.get("output_dir", "")
+
+
+class _IndexView:
+    """Sequence of index timestamps read on demand, for ``bisect``."""
+
+    def __init__(self, handle, count: int):
+        self.handle = handle
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, position: int) -> float:
+        return self.record(position)[1]
+
+    def record(self, position: int) -> tuple[int, float]:
+        self.handle.seek(position * _INDEX_RECORD.size)
+        return _INDEX_RECORD.unpack(self.handle.read(_INDEX_RECORD.size))
+
+
+class AuditStore:
+    """Structured audit events in an append-only JSONL log."""
+
+    def __init__(self, log_path: str | Path):
+        self.log_path = Path(log_path)
+        self.index_path = self.log_path.with_suffix(".idx")
+        self.stats_path = self.log_path.with_suffix(".stats.json")
+        self.lock_path = self.log_path.with_suffix(".lock")
+        self._thread_lock = threading.RLock()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._thread_lock:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # -- sidecar maintenance -------------------------------------------------
+
+    def _log_tail(self, end: int) -> str:
+        if end <= 0:
+            return ""
+        with open(self.log_path, "rb") as f:
+            f.seek(max(0, end - _TAIL_BYTES))
+            return f.read(min(end, _TAIL_BYTES)).hex()
+
+    def _load_stats(self) -> dict[str, Any] | None:
+        try:
+            stats = json.loads(self.stats_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            index_events = self.index_path.stat().st_size // _INDEX_RECORD.size
+        except OSError:
+            index_events = 0
+        if index_events != stats.get("total_events"):
+            return None
+        return stats
+
+    def _save_stats(self, stats: dict[str, Any]) -> None:
+        tmp_path = self.stats_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(stats, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.stats_path)
+
+    def _consume(self, stats: dict[str, Any], start: int, truncate_index: bool) -> None:
+        """Index and aggregate complete lines of the log from byte ``start``."""
+        records = bytearray()
+        offset = start
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a writer outside the store is mid-append
+                line_offset, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(event, dict):
+                    continue
+                # Clamp so the index stays sorted even if clocks step backwards
+                timestamp = max(_parse_timestamp(event.get("timestamp")), stats["last_timestamp"])
+                stats["last_timestamp"] = timestamp
+                records += _INDEX_RECORD.pack(line_offset, timestamp)
+                _apply(stats, event)
+        with open(self.index_path, "wb" if truncate_index else "ab") as index:
+            index.write(records)
+        stats["covered_bytes"] = offset
+        stats["tail"] = self._log_tail(offset)
+        self._save_stats(stats)
+
+    def _refresh(self) -> dict[str, Any]:
+        """Return up-to-date aggregates, catching up or rebuilding if needed.
+
+        Must be called with the store lock held.
+        """
+        stats = self._load_stats()
+        try:
+            size = self.log_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if stats is not None:
+            covered = stats["covered_bytes"]
+            if size == covered and self._log_tail(covered) == stats["tail"]:
+                return stats
+            if size > covered and self._log_tail(covered) == stats["tail"]:
+                self._consume(stats, covered, truncate_index=False)
+                return stats
+        stats = _empty_stats()
+        if size:
+            self._consume(stats, 0, truncate_index=True)
+        else:
+            self.index_path.write_bytes(b"")
+            self._save_stats(stats)
+        return stats
+
+    # -- public API ----------------------------------------------------------
+
+    def append(self, event: dict[str, Any]) -> None:
+        """Append one event and fold it into the index and aggregates."""
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._locked():
+            stats = self._refresh()
+            with open(self.log_path, "ab") as f:
+                offset = f.tell()
+                f.write(line)
+            timestamp = max(_parse_timestamp(event.get("timestamp")), stats["last_timestamp"])
+            with open(self.index_path, "ab") as index:
+                index.write(_INDEX_RECORD.pack(offset, timestamp))
+            stats["last_timestamp"] = timestamp
+            stats["covered_bytes"] = offset + len(line)
+            stats["tail"] = self._log_tail(stats["covered_bytes"])
+            _apply(stats, event)
+            self._save_stats(stats)
+
+    def summary(self) -> dict[str, Any]:
+        """Dashboard counters, served from the running aggregates."""
+        with self._locked():
+            stats = self._refresh()
+        counts = stats["event_counts"]
+        runs_completed = counts.get("workflow_completed", 0)
+        return {
+            "total_events": stats["total_events"],
+            "runs_started": counts.get("workflow_started", 0),
+            "runs_completed": runs_completed,
+            "runs_blocked": counts.get("workflow_blocked", 0),
+            "kits_passed": stats["kits_passed"],
+            "kits_failed": runs_completed - stats["kits_passed"],
+            "artifacts_generated": counts.get("artifact_generated", 0),
+            "safety_blocks_by_reason": dict(stats["safety_blocks_by_reason"]),
+            "latest_output_dir": stats["latest_output_dir"],
+        }
+
+    def read_all(self) -> list[dict[str, Any]]:
+        """Every event, oldest first."""
+        if not self.log_path.exists():
+            return []
+        with open(self.log_path, "rb") as f:
+            return _parse_lines(f.read().splitlines())
+
+    def tail(self, limit: int) -> list[dict[str, Any]]:
+        """The newest ``limit`` events, oldest first, read backwards from the end."""
+        if limit <= 0 or not self.log_path.exists():
+            return []
+        with open(self.log_path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            buffer = b""
+            events: list[dict[str, Any]] = []
+            while position > 0:
+                step = min(_READ_BLOCK, position)
+                position -= step
+                f.seek(position)
+                buffer = f.read(step) + buffer
+                lines = buffer.split(b"\n")
+                # The first piece may be a partial line unless we reached the start
+                complete = lines if position == 0 else lines[1:]
+                events = _parse_lines(complete)
+                if len(events) >= limit:
+                    break
+        return events[-limit:]
+
+    def between(
+        self,
+        since: datetime | float | str | None = None,
+        until: datetime | float | str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Events with ``since <= timestamp < until``, located via the index."""
+        start_ts = _as_timestamp(since)
+        end_ts = _as_timestamp(until)
+        with self._locked():
+            stats = self._refresh()
+            count = stats["total_events"]
+            if not count:
+                return []
+            with open(self.index_path, "rb") as index:
+                view = _IndexView(index, count)
+                first = bisect.bisect_left(view, start_ts) if start_ts is not None else 0
+                last = bisect.bisect_left(view, end_ts) if end_ts is not None else count
+                if first >= last:
+                    return []
+                start_offset = view.record(first)[0]
+                end_offset = view.record(last)[0] if last < count else stats["covered_bytes"]
+            with open(self.log_path, "rb") as f:
+                f.seek(start_offset)
+                chunk = f.read(end_offset - start_offset)
+        return _parse_lines(chunk.splitlines())
+
+
+def _parse_lines(lines: list[bytes]) -> list[dict[str, Any]]:
+    events = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict):
+            events.append(event)
+    return events
@@ -0,0 +1,243 @@
+"""Dependency-aware executor for Memory Bridge artifact generation.
+
+Kit artifacts are declared as ``ArtifactTask`` nodes. A node starts as soon as
+all of its dependencies have finished, so independent artifacts overlap and
+kit wall time approaches the slowest single artifact instead of the sum.
+
+Two executors back the graph:
+
+- ``llm`` tasks (Gemini text and image calls, cheap Markdown writers) run on a
+  bounded thread pool, which caps concurrent requests to the API.
+- ``render`` tasks (PIL image drawing) run on a shared process pool so that
+  rendering does not contend for the GIL. If worker processes cannot be
+  started, rendering falls back to the thread pool.
+
+Pool sizes come from ``MEMORY_BRIDGE_LLM_CONCURRENCY`` and
+``MEMORY_BRIDGE_RENDER_WORKERS`` (``0`` renders in threads).
+"""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+TASK_KINDS = ("llm", "render")
+DEFAULT_LLM_CONCURRENCY = 4
+DEFAULT_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+
+
+@dataclass(frozen=True)
+class ArtifactTask:
+    """One node in the artifact graph.
+
+    ``func`` is called as ``func(*args, **kwargs)``. For ``render`` tasks it
+    and its arguments must be picklable (a module-level function).
+    """
+
+    name: str
+    func: Callable[..., Any]
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    kind: str = "llm"
+    deps: tuple[str, ...] = ()
+
+
+@dataclass
+class ArtifactResult:
+    """Outcome and timing of one artifact, relative to the start of the run."""
+
+    name: str
+    kind: str
+    value: Any
+    started_ms: float
+    duration_ms: float
+
+    def audit_details(self) -> dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "started_ms": round(self.started_ms, 1),
+            "duration_ms": round(self.duration_ms, 1),
+        }
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _timed_call(func: Callable[..., Any], args: tuple, kwargs: dict) -> tuple[Any, float, float]:
+    """Run ``func`` and return (value, start, end) wall-clock times.
+
+    Timing is taken where the work runs, so time spent queued for a worker
+    is not charged to the artifact.
+    """
+    start = time.time()
+    value = func(*args, **kwargs)
+    return value, start, time.time()
+
+
+_render_pool: ProcessPoolExecutor | None = None
+_render_pool_lock = threading.Lock()
+
+
+def _get_render_pool() -> ProcessPoolExecutor | None:
+    """Return the shared render process pool, creating it on first use."""
+    global _render_pool
+    workers = _env_int("MEMORY_BRIDGE_RENDER_WORKERS", DEFAULT_RENDER_WORKERS)
+    if workers == 0:
+        return None
+    with _render_pool_lock:
+        if _render_pool is None:
+            try:
+                # Spawned, not forked: the caller may already have threads running
+                _render_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, NotImplementedError):
+                return None
+            atexit.register(_render_pool.shutdown, cancel_futures=True)
+        return _render_pool
+
+
+def _discard_render_pool() -> None:
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+
+
+def _validate(tasks: list[ArtifactTask]) -> None:
+    names = [task.name for task in tasks]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate artifact task names: {', '.join(sorted(duplicates))}")
+    known = set(names)
+    for task in tasks:
+        if task.kind not in TASK_KINDS:
+            raise ValueError(f"Unknown task kind for {task.name}: {task.kind}")
+        missing = [dep for dep in task.deps if dep not in known]
+        if missing:
+            raise ValueError(f"{task.name} depends on unknown task(s): {', '.join(missing)}")
+
+    # Kahn's algorithm: anything left unvisited is on a cycle
+    indegree = {task.name: len(task.deps) for task in tasks}
+    dependents: dict[str, list[str]] = {name: [] for name in names}
+    for task in tasks:
+        for dep in task.deps:
+            dependents[dep].append(task.name)
+    ready = [name for name, degree in indegree.items() if degree == 0]
+    visited = 0
+    while ready:
+        name = ready.pop()
+        visited += 1
+        for child in dependents[name]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if visited != len(tasks):
+        cyclic = sorted(name for name, degree in indegree.items() if degree > 0)
+        raise ValueError(f"Artifact dependency cycle among: {', '.join(cyclic)}")
+
+
+def run_artifact_graph(
+    tasks: list[ArtifactTask],
+    *,
+    llm_concurrency: int | None = None,
+    render_executor: Executor | None = None,
+) -> dict[str, ArtifactResult]:
+    """Run ``tasks`` respecting dependencies and return results in task order.
+
+    Args:
+        tasks: Artifact nodes; names must be unique and dependencies acyclic.
+        llm_concurrency: Threads for ``llm`` tasks (default from
+            ``MEMORY_BRIDGE_LLM_CONCURRENCY``).
+        render_executor: Executor for ``render`` tasks (default: the shared
+            process pool, or the thread pool if workers are disabled).
+
+    Raises:
+        ValueError: For duplicate names, unknown dependencies, or cycles.
+        Exception: The first exception raised by any task; tasks that have
+            not started yet are cancelled.
+    """
+    _validate(tasks)
+    if not tasks:
+        return {}
+
+    threads = llm_concurrency or _env_int("MEMORY_BRIDGE_LLM_CONCURRENCY", DEFAULT_LLM_CONCURRENCY)
+    by_name = {task.name: task for task in tasks}
+    remaining = {task.name: set(task.deps) for task in tasks}
+    results: dict[str, ArtifactResult] = {}
+    running: dict[Future, ArtifactTask] = {}
+    run_start = time.time()
+
+    with ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="memory-bridge") as llm_pool:
+        render_pool = render_executor or _get_render_pool() or llm_pool
+
+        def submit(task: ArtifactTask) -> None:
+            nonlocal render_pool
+            pool = render_pool if task.kind == "render" else llm_pool
+            try:
+                future = pool.submit(_timed_call, task.func, task.args, task.kwargs)
+            except (BrokenProcessPool, RuntimeError):
+                # Worker processes unavailable: render on threads from here on
+                if pool is llm_pool:
+                    raise
+                if render_executor is None:
+                    _discard_render_pool()
+                render_pool = llm_pool
+                future = llm_pool.submit(_timed_call, task.func, task.args, task.kwargs)
+            running[future] = task
+
+        def start_ready() -> None:
+            for name in [name for name, deps in remaining.items() if not deps]:
+                del remaining[name]
+                submit(by_name[name])
+
+        start_ready()
+        try:
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        value, start, end = future.result()
+                    except BrokenProcessPool:
+                        if render_executor is None:
+                            _discard_render_pool()
+                        render_pool = llm_pool
+                        submit(task)
+                        continue
+                    results[task.name] = ArtifactResult(
+                        name=task.name,
+                        kind=task.kind,
+                        value=value,
+                        started_ms=(start - run_start) * 1000,
+                        duration_ms=(end - start) * 1000,
+                    )
+                    for deps in remaining.values():
+                        deps.discard(task.name)
+                start_ready()
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+    return {task.name: results[task.name] for task in tasks}
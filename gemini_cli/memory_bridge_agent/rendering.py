@@ -0,0 +1,119 @@
+"""Cached text layout and background templates for the PIL fallback images.
+
+Every kit draws the same handful of fonts, the same static chrome (header
+bars, card outlines, disclaimers) and mostly the same vocabulary. This module
+does that work once per process:
+
+- ``font`` loads each (size, weight) TrueType face once.
+- Word widths are measured once per (font, word) and greedy wrapping sums
+  them, instead of measuring every growing trial line.
+- ``background`` paints a template once and hands out copies.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from PIL import Image, ImageDraw, ImageFont
+
+from .schemas import normalize_string
+
+_FONT_CANDIDATES = {
+    False: (
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf",
+    ),
+    True: (
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf",
+    ),
+}
+
+Painter = Callable[[ImageDraw.ImageDraw], None]
+
+
+@lru_cache(maxsize=None)
+def _font_path(bold: bool) -> str | None:
+    for candidate in _FONT_CANDIDATES[bold]:
+        if Path(candidate).exists():
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=32)
+def font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+    """Load a TrueType face, falling back to PIL's bitmap font."""
+    path = _font_path(bold)
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size=size)
+
+
+@lru_cache(maxsize=8192)
+def text_width(text: str, face: ImageFont.ImageFont) -> float:
+    """Advance width of ``text`` in ``face``."""
+    return face.getlength(text)
+
+
+@lru_cache(maxsize=64)
+def line_height(face: ImageFont.ImageFont) -> int:
+    """Height of one line including ascenders and descenders."""
+    return face.getbbox("Hgjy")[3]
+
+
+@lru_cache(maxsize=1024)
+def wrap_text(text: str, face: ImageFont.ImageFont, max_width: int) -> tuple[str, ...]:
+    """Greedily wrap ``text`` to ``max_width`` pixels using cached word widths."""
+    words = normalize_string(text).split()
+    if not words:
+        return ("",)
+    space = text_width(" ", face)
+    lines: list[str] = []
+    current = [words[0]]
+    current_width = text_width(words[0], face)
+    for word in words[1:]:
+        word_width = text_width(word, face)
+        if current_width + space + word_width <= max_width:
+            current.append(word)
+            current_width += space + word_width
+        else:
+            lines.append(" ".join(current))
+            current = [word]
+            current_width = word_width
+    lines.append(" ".join(current))
+    return tuple(lines)
+
+
+def draw_wrapped(
+    draw: ImageDraw.ImageDraw,
+    text: str,
+    x: int,
+    y: int,
+    max_width: int,
+    face: ImageFont.ImageFont,
+    fill: str = "#111111",
+    line_gap: int = 8,
+) -> int:
+    """Draw wrapped ``text`` at (x, y) and return the y below the last line."""
+    step = line_height(face) + line_gap
+    for line in wrap_text(text, face, max_width):
+        draw.text((x, y), line, font=face, fill=fill)
+        y += step
+    return y
+
+
+@lru_cache(maxsize=16)
+def _template(painter: Painter, size: tuple[int, int], color: str) -> Image.Image:
+    image = Image.new("RGB", size, color)
+    painter(ImageDraw.Draw(image))
+    return image
+
+
+def background(painter: Painter, size: tuple[int, int], color: str) -> Image.Image:
+    """A fresh copy of the template drawn by ``painter`` on a ``color`` canvas.
+
+    ``painter`` must only draw content that is identical for every kit.
+    """
+    return _template(painter, size, color).copy()
@@ -12,9 +12,12 @@ from typing import Any
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 
+from .audit_store import AuditStore
+from .pipeline import ArtifactTask, run_artifact_graph
 from .prompts import IMAGE_MODEL, IMAGE_SAFETY_RULES, SAFETY_RULES, TEXT_MODEL
+from .rendering import background, draw_wrapped, font
 from .schemas import (
     REQUIRED_TOP_LEVEL_FIELDS,
     UNSAFE_MEDICAL_TERMS,
@@ -28,7 +31,10 @@ load_dotenv(Path(__file__).with_name(".env"))
 
 OUTPUT_ROOT = Path("generated_memory_kits")
 AUDIT_LOG = OUTPUT_ROOT / "audit_log.jsonl"
+_AUDIT_STORE = AuditStore(AUDIT_LOG)
 REQUEST_TIMEOUT_MS = 60_000
+# Graph steps that only ask the image model; their render step owns the artifact
+_IMAGE_REQUEST_SUFFIX = "_request"
 
 
 def _create_client() -> genai.Client | None:
@@ -73,57 +79,31 @@ def _write_log(output_dir: Path, message: str) -> None:
 
 def write_audit_event(event_type: str, output_dir: str | Path | None, details: dict[str, Any]) -> None:
     """Append a structured audit event for monitoring and analytics."""
-    OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
     event = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "event_type": event_type,
         "output_dir": str(output_dir) if output_dir else "",
         "details": details,
     }
-    with open(AUDIT_LOG, "a", encoding="utf-8") as f:
-        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    _AUDIT_STORE.append(event)
 
 
 def read_audit_events(limit: int | None = None) -> list[dict[str, Any]]:
     """Read structured audit events, newest last by default."""
-    if not AUDIT_LOG.exists():
-        return []
-    events = []
-    for line in AUDIT_LOG.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        try:
-            events.append(json.loads(line))
-        except json.JSONDecodeError:
-            continue
-    return events[-limit:] if limit else events
+    return _AUDIT_STORE.tail(limit) if limit else _AUDIT_STORE.read_all()
+
+
+def read_audit_events_between(
+    since: datetime | str | None = None,
+    until: datetime | str | None = None,
+) -> list[dict[str, Any]]:
+    """Read audit events with since <= timestamp < until, newest last."""
+    return _AUDIT_STORE.between(since, until)
 
 
 def build_analytics_summary() -> dict[str, Any]:
     """Aggregate prototype monitoring metrics from the audit log."""
-    events = read_audit_events()
-    runs_started = sum(1 for event in events if event.get("event_type") == "workflow_started")
-    runs_completed = [event for event in events if event.get("event_type") == "workflow_completed"]
-    runs_blocked = [event for event in events if event.get("event_type") == "workflow_blocked"]
-    generated_artifacts = [
-        event for event in events if event.get("event_type") == "artifact_generated"
-    ]
-    safety_blocks = {}
-    for event in runs_blocked:
-        reason = event.get("details", {}).get("reason", "unknown")
-        safety_blocks[reason] = safety_blocks.get(reason, 0) + 1
-    passed = sum(1 for event in runs_completed if event.get("details", {}).get("overall_passed") is True)
-    return {
-        "total_events": len(events),
-        "runs_started": runs_started,
-        "runs_completed": len(runs_completed),
-        "runs_blocked": len(runs_blocked),
-        "kits_passed": passed,
-        "kits_failed": len(runs_completed) - passed,
-        "artifacts_generated": len(generated_artifacts),
-        "safety_blocks_by_reason": safety_blocks,
-        "latest_output_dir": runs_completed[-1].get("output_dir") if runs_completed else "",
-    }
+    return _AUDIT_STORE.summary()
 
 
 def _profile_text(profile: dict[str, Any]) -> str:
@@ -270,50 +250,6 @@ def _write_text_artifact(path: Path, title: str, body: str) -> str:
     return str(path)
 
 
-def _font(size: int, bold: bool = False) -> ImageFont.ImageFont:
-    candidates = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf",
-    ]
-    for candidate in candidates:
-        if Path(candidate).exists():
-            return ImageFont.truetype(candidate, size=size)
-    return ImageFont.load_default()
-
-
-def _wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_width: int) -> list[str]:
-    words = normalize_string(text).split()
-    lines: list[str] = []
-    current = ""
-    for word in words:
-        trial = f"{current} {word}".strip()
-        width = draw.textbbox((0, 0), trial, font=font)[2]
-        if width <= max_width or not current:
-            current = trial
-        else:
-            lines.append(current)
-            current = word
-    if current:
-        lines.append(current)
-    return lines or [""]
-
-
-def _draw_wrapped(
-    draw: ImageDraw.ImageDraw,
-    text: str,
-    x: int,
-    y: int,
-    max_width: int,
-    font: ImageFont.ImageFont,
-    fill: str = "#111111",
-    line_gap: int = 8,
-) -> int:
-    for line in _wrap_text(draw, text, font, max_width):
-        draw.text((x, y), line, font=font, fill=fill)
-        y += draw.textbbox((0, 0), line, font=font)[3] + line_gap
-    return y
-
-
 def _strip_json_fences(text: str) -> str:
     cleaned = text.strip()
     if cleaned.startswith("```json"):
@@ -657,31 +593,44 @@ def _generate_storyboard_image_with_gemini(prompt: str) -> bytes | None:
     return None
 
 
-def _draw_storyboard_fallback(profile: dict[str, Any], output_path: Path, scene: dict[str, str]) -> None:
-    width, height = 1280, 720
-    image = Image.new("RGB", (width, height), "#fbfbf4")
-    draw = ImageDraw.Draw(image)
-    title_font = _font(48, bold=True)
-    heading_font = _font(34, bold=True)
-    body_font = _font(28)
-    small_font = _font(22)
-    accent = "#3d6470"
-    soft = "#e7f0ee"
-    line = "#b8d0ca"
-    dark = "#111111"
+_STORYBOARD_SIZE = (1280, 720)
+_STORYBOARD_ACCENT = "#3d6470"
 
+
+def _paint_storyboard_template(draw: ImageDraw.ImageDraw) -> None:
+    width, _ = _STORYBOARD_SIZE
+    accent = _STORYBOARD_ACCENT
     draw.rectangle((0, 0, width, 92), fill=accent)
-    draw.text((44, 24), f"Storyboard Scene {scene['index']}", font=title_font, fill="#ffffff")
-    draw.rounded_rectangle((58, 145, 510, 560), radius=24, fill=soft, outline=line, width=4)
+    draw.rounded_rectangle((58, 145, 510, 560), radius=24, fill="#e7f0ee", outline="#b8d0ca", width=4)
     draw.ellipse((166, 210, 402, 445), fill="#ffffff", outline=accent, width=6)
     draw.arc((210, 260, 360, 395), 20, 160, fill=accent, width=5)
     draw.line((192, 455, 380, 455), fill=accent, width=5)
-    draw.text((140, 590), "calm illustrated frame", font=small_font, fill=accent)
+    draw.text((140, 590), "calm illustrated frame", font=font(22), fill=accent)
+    draw_wrapped(
+        draw,
+        "Caregiver review required. Not medical advice.",
+        44,
+        660,
+        width - 88,
+        font(22),
+        "#333333",
+    )
+
+
+def _draw_storyboard_fallback(profile: dict[str, Any], output_path: Path, scene: dict[str, str]) -> None:
+    image = background(_paint_storyboard_template, _STORYBOARD_SIZE, "#fbfbf4")
+    draw = ImageDraw.Draw(image)
+    title_font = font(48, bold=True)
+    heading_font = font(34, bold=True)
+    body_font = font(28)
+    accent = _STORYBOARD_ACCENT
+    dark = "#111111"
 
+    draw.text((44, 24), f"Storyboard Scene {scene['index']}", font=title_font, fill="#ffffff")
     draw.text((585, 150), profile["person"]["preferred_name"], font=heading_font, fill=accent)
-    y = _draw_wrapped(draw, scene["event"], 585, 215, 610, body_font, dark, line_gap=10)
+    y = draw_wrapped(draw, scene["event"], 585, 215, 610, body_font, dark, line_gap=10)
     y += 20
-    _draw_wrapped(
+    draw_wrapped(
         draw,
         "Low-stimulation visual. Caregiver-provided memory. No clinical conclusions.",
         585,
@@ -691,33 +640,48 @@ def _draw_storyboard_fallback(profile: dict[str, Any], output_path: Path, scene:
         dark,
         line_gap=10,
     )
-    _draw_wrapped(
-        draw,
-        "Caregiver review required. Not medical advice.",
-        44,
-        660,
-        width - 88,
-        small_font,
-        "#333333",
-    )
     image.save(output_path)
 
 
+def request_storyboard_image(output_dir: str, scene: dict[str, str]) -> str:
+    """Ask the Gemini image model for one storyboard frame; return its path, or "" without one."""
+    output_root = Path(output_dir)
+    output_path = output_root / f"storyboard_scene_{scene['index']}.png"
+    image_bytes = _generate_storyboard_image_with_gemini(scene["prompt"])
+    if not image_bytes:
+        return ""
+    output_path.write_bytes(image_bytes)
+    _write_log(output_root, f"Generated {output_path.name} with Gemini image model.")
+    return str(output_path)
+
+
+def _draw_storyboard_image(profile: dict[str, Any], output_dir: str, scene: dict[str, str]) -> str:
+    output_root = Path(output_dir)
+    output_path = output_root / f"storyboard_scene_{scene['index']}.png"
+    _draw_storyboard_fallback(profile, output_path, scene)
+    _write_log(output_root, f"Generated {output_path.name} with deterministic fallback.")
+    return str(output_path)
+
+
+def render_storyboard_image(profile: dict[str, Any], output_dir: str, scene: dict[str, str]) -> str:
+    """Draw one storyboard frame unless the image model already returned it."""
+    output_path = Path(output_dir) / f"storyboard_scene_{scene['index']}.png"
+    if output_path.exists():
+        return str(output_path)
+    return _draw_storyboard_image(profile, output_dir, scene)
+
+
+def generate_storyboard_image(profile: dict[str, Any], output_dir: str, scene: dict[str, str]) -> str:
+    """Generate one storyboard frame PNG, with deterministic fallback."""
+    return request_storyboard_image(output_dir, scene) or _draw_storyboard_image(profile, output_dir, scene)
+
+
 def generate_storyboard_images(profile: dict[str, Any], output_dir: str) -> list[str]:
     """Generate actual storyboard frame PNGs, with deterministic fallback."""
-    paths: list[str] = []
-    output_root = Path(output_dir)
-    for scene in _storyboard_prompt_data(profile):
-        output_path = output_root / f"storyboard_scene_{scene['index']}.png"
-        image_bytes = _generate_storyboard_image_with_gemini(scene["prompt"])
-        if image_bytes:
-            output_path.write_bytes(image_bytes)
-            _write_log(output_root, f"Generated {output_path.name} with Gemini image model.")
-        else:
-            _draw_storyboard_fallback(profile, output_path, scene)
-            _write_log(output_root, f"Generated {output_path.name} with deterministic fallback.")
-        paths.append(str(output_path))
-    return paths
+    return [
+        generate_storyboard_image(profile, output_dir, scene)
+        for scene in _storyboard_prompt_data(profile)
+    ]
 
 
 def _read_artifacts(artifact_paths: dict[str, str]) -> dict[str, str]:
@@ -870,21 +834,44 @@ Artifact contents:
     return json.dumps(local_result, ensure_ascii=False, indent=2)
 
 
+_BOARD_SIZE = (1650, 1275)
+_BOARD_MARGIN = 70
+_BOARD_ACCENT = "#2f5d62"
+_BOARD_CARD_HEADINGS = ("Key Contact", "Today", "What Helps")
+
+
+def _board_card_x(idx: int) -> tuple[int, int]:
+    card_w = (_BOARD_SIZE[0] - _BOARD_MARGIN * 2 - 40) // 3
+    return _BOARD_MARGIN + idx * (card_w + 20), card_w
+
+
+def _paint_orientation_template(draw: ImageDraw.ImageDraw) -> None:
+    width, height = _BOARD_SIZE
+    margin = _BOARD_MARGIN
+    accent = _BOARD_ACCENT
+    heading_font = font(42, bold=True)
+    draw.rectangle((0, 0, width, 160), fill=accent)
+    draw.text((width - 490, 58), "Today is __________", font=heading_font, fill="#ffffff")
+    y = 210
+    for idx, heading in enumerate(_BOARD_CARD_HEADINGS):
+        x, card_w = _board_card_x(idx)
+        draw.rounded_rectangle((x, y, x + card_w, y + 230), radius=20, fill="#e8f0ed", outline=accent, width=4)
+        draw.text((x + 28, y + 24), heading, font=heading_font, fill=accent)
+    draw.text((margin, 500), "My Routine", font=heading_font, fill=accent)
+    draw.line((margin, height - 105, width - margin, height - 105), fill="#c9d8d3", width=3)
+
+
 def generate_orientation_board(profile: dict[str, Any], output_dir: str, feedback: str = "") -> str:
     """Generate a deterministic, printable daily orientation board PNG."""
     output_path = Path(output_dir) / "orientation_board.png"
-    width, height = 1650, 1275
-    margin = 70
-    image = Image.new("RGB", (width, height), "#fffdf7")
+    width, height = _BOARD_SIZE
+    margin = _BOARD_MARGIN
+    image = background(_paint_orientation_template, _BOARD_SIZE, "#fffdf7")
     draw = ImageDraw.Draw(image)
 
-    title_font = _font(76, bold=True)
-    heading_font = _font(42, bold=True)
-    body_font = _font(34)
-    small_font = _font(26)
-
-    accent = "#2f5d62"
-    soft = "#e8f0ed"
+    title_font = font(76, bold=True)
+    body_font = font(34)
+    small_font = font(26)
     dark = "#111111"
 
     name = profile["person"]["preferred_name"]
@@ -893,37 +880,28 @@ def generate_orientation_board(profile: dict[str, Any], output_dir: str, feedbac
     calming = normalize_string(profile.get("calming_phrases", [""])[0])
     routine = [_format_routine_item(item) for item in profile.get("daily_routine", [])[:4]]
 
-    draw.rectangle((0, 0, width, 160), fill=accent)
     draw.text((margin, 42), f"Hello, {name}", font=title_font, fill="#ffffff")
-    draw.text((width - 490, 58), "Today is __________", font=heading_font, fill="#ffffff")
 
-    cards = [
-        ("Key Contact", contact_label or "Ask caregiver"),
-        ("Today", "A calm day with familiar routines"),
-        ("What Helps", calming or "Use a calm voice and familiar names"),
-    ]
-    card_w = (width - margin * 2 - 40) // 3
-    y = 210
-    for idx, (heading, text) in enumerate(cards):
-        x = margin + idx * (card_w + 20)
-        draw.rounded_rectangle((x, y, x + card_w, y + 230), radius=20, fill=soft, outline=accent, width=4)
-        draw.text((x + 28, y + 24), heading, font=heading_font, fill=accent)
-        _draw_wrapped(draw, text, x + 28, y + 88, card_w - 56, body_font, dark)
+    card_texts = (
+        contact_label or "Ask caregiver",
+        "A calm day with familiar routines",
+        calming or "Use a calm voice and familiar names",
+    )
+    for idx, text in enumerate(card_texts):
+        x, card_w = _board_card_x(idx)
+        draw_wrapped(draw, text, x + 28, 210 + 88, card_w - 56, body_font, dark)
 
-    routine_y = 500
-    draw.text((margin, routine_y), "My Routine", font=heading_font, fill=accent)
-    routine_y += 65
+    routine_y = 500 + 65
     row_h = 120
     for idx, item in enumerate(routine):
         y0 = routine_y + idx * (row_h + 18)
         draw.rounded_rectangle((margin, y0, width - margin, y0 + row_h), radius=16, fill="#ffffff", outline="#c9d8d3", width=3)
-        _draw_wrapped(draw, item, margin + 32, y0 + 28, width - margin * 2 - 64, body_font, dark)
+        draw_wrapped(draw, item, margin + 32, y0 + 28, width - margin * 2 - 64, body_font, dark)
 
     footer = "Caregiver-reviewed support aid. Not medical advice."
     if feedback:
         footer += f" Review note: {normalize_string(feedback)}"
-    draw.line((margin, height - 105, width - margin, height - 105), fill="#c9d8d3", width=3)
-    _draw_wrapped(draw, footer, margin, height - 82, width - margin * 2, small_font, "#333333")
+    draw_wrapped(draw, footer, margin, height - 82, width - margin * 2, small_font, "#333333")
 
     image.save(output_path)
     _write_log(Path(output_dir), "Generated orientation_board.png.")
@@ -963,22 +941,33 @@ Optional evaluator feedback:
     return None
 
 
+_TIMELINE_SIZE = (1650, 1275)
+_TIMELINE_MARGIN = 80
+
+
+def _paint_timeline_template(draw: ImageDraw.ImageDraw) -> None:
+    draw.text(
+        (_TIMELINE_MARGIN, 135),
+        "Caregiver-provided memories for review",
+        font=font(36, bold=True),
+        fill="#111111",
+    )
+
+
 def _draw_timeline_fallback(profile: dict[str, Any], output_path: Path, feedback: str = "") -> None:
-    width, height = 1650, 1275
-    margin = 80
-    image = Image.new("RGB", (width, height), "#fffdf7")
+    width, height = _TIMELINE_SIZE
+    margin = _TIMELINE_MARGIN
+    image = background(_paint_timeline_template, _TIMELINE_SIZE, "#fffdf7")
     draw = ImageDraw.Draw(image)
-    title_font = _font(68, bold=True)
-    heading_font = _font(36, bold=True)
-    body_font = _font(30)
-    small_font = _font(24)
+    title_font = font(68, bold=True)
+    body_font = font(30)
+    small_font = font(24)
     accent = "#6b4f8a"
     line = "#c6b7d8"
     dark = "#111111"
 
     name = profile["person"]["preferred_name"]
     draw.text((margin, 55), f"{name}'s Memory Timeline", font=title_font, fill=accent)
-    draw.text((margin, 135), "Caregiver-provided memories for review", font=heading_font, fill=dark)
 
     events = profile.get("life_events", [])[:6]
     start_y = 260
@@ -992,34 +981,93 @@ def _draw_timeline_fallback(profile: dict[str, Any], output_path: Path, feedback
         draw.ellipse((x_line - 24, y - 24, x_line + 24, y + 24), fill=accent)
         card_x = x_line + 70
         draw.rounded_rectangle((card_x, y - 50, width - margin, y + 72), radius=18, fill="#ffffff", outline=line, width=3)
-        _draw_wrapped(draw, event_text, card_x + 28, y - 22, width - margin - card_x - 56, body_font, dark)
+        draw_wrapped(draw, event_text, card_x + 28, y - 22, width - margin - card_x - 56, body_font, dark)
 
     footer = "No inferred dates or events. Caregiver review required. Not medical advice."
     if feedback:
         footer += f" Review note: {normalize_string(feedback)}"
-    _draw_wrapped(draw, footer, margin, height - 92, width - margin * 2, small_font, "#333333")
+    draw_wrapped(draw, footer, margin, height - 92, width - margin * 2, small_font, "#333333")
     image.save(output_path)
 
 
-def generate_memory_timeline(profile: dict[str, Any], output_dir: str, feedback: str = "") -> str:
-    """Generate a respectful memory timeline PNG using Gemini or deterministic fallback."""
+def request_memory_timeline(profile: dict[str, Any], output_dir: str, feedback: str = "") -> str:
+    """Ask the Gemini image model for the memory timeline; return its path, or "" without one."""
     output_path = Path(output_dir) / "memory_timeline.png"
     image_bytes = _generate_timeline_with_gemini(profile, feedback=feedback)
-    if image_bytes:
-        output_path.write_bytes(image_bytes)
-        _write_log(Path(output_dir), "Generated memory_timeline.png with Gemini image model.")
-    else:
-        _draw_timeline_fallback(profile, output_path, feedback=feedback)
-        _write_log(Path(output_dir), "Generated memory_timeline.png with deterministic fallback.")
+    if not image_bytes:
+        return ""
+    output_path.write_bytes(image_bytes)
+    _write_log(Path(output_dir), "Generated memory_timeline.png with Gemini image model.")
+    return str(output_path)
+
+
+def _draw_memory_timeline(profile: dict[str, Any], output_dir: str, feedback: str = "") -> str:
+    output_path = Path(output_dir) / "memory_timeline.png"
+    _draw_timeline_fallback(profile, output_path, feedback=feedback)
+    _write_log(Path(output_dir), "Generated memory_timeline.png with deterministic fallback.")
     return str(output_path)
 
 
+def render_memory_timeline(profile: dict[str, Any], output_dir: str) -> str:
+    """Draw the memory timeline unless the image model already returned it."""
+    output_path = Path(output_dir) / "memory_timeline.png"
+    if output_path.exists():
+        return str(output_path)
+    return _draw_memory_timeline(profile, output_dir)
+
+
+def generate_memory_timeline(profile: dict[str, Any], output_dir: str, feedback: str = "") -> str:
+    """Generate a respectful memory timeline PNG using Gemini or deterministic fallback."""
+    return request_memory_timeline(profile, output_dir, feedback=feedback) or _draw_memory_timeline(
+        profile, output_dir, feedback=feedback
+    )
+
+
 def _write_evaluation(output_dir: Path, evaluation_json: str) -> str:
     path = output_dir / "evaluation.json"
     path.write_text(evaluation_json, encoding="utf-8")
     return str(path)
 
 
+def _kit_artifact_tasks(profile: dict[str, Any], output_dir: str) -> list[ArtifactTask]:
+    """Declare the kit's artifacts and their steps.
+
+    Images are split in two: a ``*_request`` step asks the Gemini image model
+    under the LLM concurrency limit, then the render step draws the
+    deterministic fallback only if no image came back.
+    """
+    args = (profile, output_dir)
+    tasks = [
+        ArtifactTask("patient_onboarding_summary", generate_patient_onboarding_summary, args),
+        ArtifactTask("visit_prompts", generate_visit_prompts, args),
+        ArtifactTask("caregiver_handoff", generate_caregiver_handoff, args),
+        ArtifactTask("storyboard", plan_memory_storyboard, args),
+        ArtifactTask("storyboard_image_prompts", generate_storyboard_image_prompts, args),
+        ArtifactTask("orientation_board", generate_orientation_board, args, kind="render"),
+        ArtifactTask(f"memory_timeline{_IMAGE_REQUEST_SUFFIX}", request_memory_timeline, args),
+        ArtifactTask(
+            "memory_timeline",
+            render_memory_timeline,
+            args,
+            kind="render",
+            deps=(f"memory_timeline{_IMAGE_REQUEST_SUFFIX}",),
+        ),
+    ]
+    for scene in _storyboard_prompt_data(profile):
+        name = f"storyboard_scene_{scene['index']}"
+        tasks.append(ArtifactTask(f"{name}{_IMAGE_REQUEST_SUFFIX}", request_storyboard_image, (output_dir, scene)))
+        tasks.append(
+            ArtifactTask(
+                name,
+                render_storyboard_image,
+                (*args, scene),
+                kind="render",
+                deps=(f"{name}{_IMAGE_REQUEST_SUFFIX}",),
+            )
+        )
+    return tasks
+
+
 def create_memory_bridge_kit(profile_path: str) -> str:
     """Create, evaluate, and return a complete caregiver-reviewed Memory Bridge kit."""
     try:
@@ -1044,24 +1092,22 @@ def create_memory_bridge_kit(profile_path: str) -> str:
     )
     _write_log(output_dir, f"Starting Memory Bridge workflow for {profile_path}.")
 
-    artifact_paths = {
-        "patient_onboarding_summary": generate_patient_onboarding_summary(profile, str(output_dir)),
-        "visit_prompts": generate_visit_prompts(profile, str(output_dir)),
-        "caregiver_handoff": generate_caregiver_handoff(profile, str(output_dir)),
-        "storyboard": plan_memory_storyboard(profile, str(output_dir)),
-        "storyboard_image_prompts": generate_storyboard_image_prompts(profile, str(output_dir)),
-        "orientation_board": generate_orientation_board(profile, str(output_dir)),
-        "memory_timeline": generate_memory_timeline(profile, str(output_dir)),
-    }
-    storyboard_image_paths = generate_storyboard_images(profile, str(output_dir))
-    for idx, path in enumerate(storyboard_image_paths, start=1):
-        artifact_paths[f"storyboard_scene_{idx}"] = path
-    for artifact_name, path in artifact_paths.items():
+    results = run_artifact_graph(_kit_artifact_tasks(profile, str(output_dir)))
+    artifacts = {name: result for name, result in results.items() if not name.endswith(_IMAGE_REQUEST_SUFFIX)}
+    artifact_paths = {name: result.value for name, result in artifacts.items()}
+    for artifact_name, result in artifacts.items():
         write_audit_event(
             "artifact_generated",
             output_dir,
-            {"artifact": artifact_name, "path": path},
+            {"artifact": artifact_name, "path": result.value, **result.audit_details()},
         )
+    generation_wall_ms = max(result.started_ms + result.duration_ms for result in results.values())
+    slowest = max(results.values(), key=lambda result: result.duration_ms)
+    _write_log(
+        output_dir,
+        f"Generated {len(artifacts)} artifacts in {generation_wall_ms:.0f} ms "
+        f"(slowest: {slowest.name}, {slowest.duration_ms:.0f} ms).",
+    )
 
     evaluation_json = evaluate_memory_kit(profile, artifact_paths)
     evaluation = json.loads(evaluation_json)
@@ -1092,6 +1138,9 @@ def create_memory_bridge_kit(profile_path: str) -> str:
             "attempts": attempts,
             "evaluation_path": evaluation_path,
             "artifact_count": len(artifact_paths),
+            "generation_wall_ms": round(generation_wall_ms, 1),
+            "slowest_artifact": slowest.name,
+            "slowest_artifact_ms": round(slowest.duration_ms, 1),
             "symptom_count": len(profile.get("patient_onboarding", {}).get("observed_symptoms", [])),
         },
     )
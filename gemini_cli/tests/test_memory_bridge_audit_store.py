@@ -0,0 +1,78 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from memory_bridge_agent.audit_store import AuditStore
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _event(minute: int, event_type: str, **details) -> dict:
+    return {
+        "timestamp": (START + timedelta(minutes=minute)).isoformat(),
+        "event_type": event_type,
+        "output_dir": f"kit_{minute}",
+        "details": details,
+    }
+
+
+class MemoryBridgeAuditStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp.name) / "audit_log.jsonl"
+        self.store = AuditStore(self.log_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_events(self, count: int) -> None:
+        for minute in range(count):
+            self.store.append(_event(minute, "artifact_generated", artifact=f"a{minute}"))
+
+    def test_summary_tracks_appends(self):
+        self.store.append(_event(0, "workflow_started"))
+        self.store.append(_event(1, "artifact_generated"))
+        self.store.append(_event(2, "workflow_completed", overall_passed=True))
+        self.store.append(_event(3, "workflow_blocked", reason="Consent missing"))
+        self.store.append(_event(4, "workflow_blocked", reason="Consent missing"))
+
+        summary = self.store.summary()
+        self.assertEqual(summary["total_events"], 5)
+        self.assertEqual(summary["runs_started"], 1)
+        self.assertEqual(summary["runs_completed"], 1)
+        self.assertEqual(summary["kits_passed"], 1)
+        self.assertEqual(summary["kits_failed"], 0)
+        self.assertEqual(summary["artifacts_generated"], 1)
+        self.assertEqual(summary["safety_blocks_by_reason"], {"Consent missing": 2})
+        self.assertEqual(summary["latest_output_dir"], "kit_2")
+        # A fresh store over the same files reuses the persisted aggregates
+        self.assertEqual(AuditStore(self.log_path).summary(), summary)
+
+    def test_tail_reads_newest_events(self):
+        self._write_events(50)
+        events = self.store.tail(5)
+        self.assertEqual([event["details"]["artifact"] for event in events], ["a45", "a46", "a47", "a48", "a49"])
+        self.assertEqual(len(self.store.tail(500)), 50)
+
+    def test_time_range_uses_index(self):
+        self._write_events(30)
+        events = self.store.between(START + timedelta(minutes=10), START + timedelta(minutes=13))
+        self.assertEqual([event["details"]["artifact"] for event in events], ["a10", "a11", "a12"])
+        self.assertEqual(len(self.store.between(since=START + timedelta(minutes=25))), 5)
+        self.assertEqual(self.store.between(until=START), [])
+
+    def test_external_edits_are_detected(self):
+        self._write_events(3)
+        self.log_path.write_text("", encoding="utf-8")
+        self.assertEqual(self.store.summary()["total_events"], 0)
+
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(_event(7, "workflow_started")) + "\n")
+        self.assertEqual(self.store.summary()["runs_started"], 1)
+        self.assertEqual(len(self.store.between(since=START)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
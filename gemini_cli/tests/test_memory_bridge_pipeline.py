@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from memory_bridge_agent.pipeline import ArtifactTask, run_artifact_graph
+
+
+def _sleep_and_return(value, seconds=0.2):
+    time.sleep(seconds)
+    return value
+
+
+class MemoryBridgePipelineTest(unittest.TestCase):
+    def test_independent_tasks_overlap(self):
+        tasks = [ArtifactTask(f"text_{i}", _sleep_and_return, (i,)) for i in range(4)]
+        start = time.perf_counter()
+        results = run_artifact_graph(tasks, llm_concurrency=4)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([result.value for result in results.values()], [0, 1, 2, 3])
+        self.assertLess(elapsed, 0.6)
+        for result in results.values():
+            self.assertGreaterEqual(result.duration_ms, 150)
+
+    def test_dependencies_finish_first(self):
+        order = []
+        lock = threading.Lock()
+
+        def record(name):
+            time.sleep(0.05)
+            with lock:
+                order.append(name)
+            return name
+
+        tasks = [
+            ArtifactTask("evaluation", record, ("evaluation",), deps=("board", "prompts")),
+            ArtifactTask("board", record, ("board",), kind="render"),
+            ArtifactTask("prompts", record, ("prompts",)),
+        ]
+        with ThreadPoolExecutor(max_workers=2) as render_pool:
+            results = run_artifact_graph(tasks, render_executor=render_pool)
+
+        self.assertEqual(list(results), ["evaluation", "board", "prompts"])
+        self.assertEqual(order[-1], "evaluation")
+        self.assertGreaterEqual(
+            results["evaluation"].started_ms,
+            max(results[name].started_ms + results[name].duration_ms for name in ("board", "prompts")) - 1,
+        )
+
+    def test_render_tasks_run_in_worker_processes(self):
+        tasks = [ArtifactTask("scene", _sleep_and_return, ("done", 0), kind="render")]
+        results = run_artifact_graph(tasks)
+        self.assertEqual(results["scene"].value, "done")
+        self.assertEqual(results["scene"].audit_details()["executor"], "render")
+
+    def test_invalid_graphs_are_rejected(self):
+        with self.assertRaises(ValueError):
+            run_artifact_graph([ArtifactTask("a", _sleep_and_return, (1,), deps=("missing",))])
+        with self.assertRaises(ValueError):
+            run_artifact_graph(
+                [
+                    ArtifactTask("a", _sleep_and_return, (1,), deps=("b",)),
+                    ArtifactTask("b", _sleep_and_return, (1,), deps=("a",)),
+                ]
+            )
+        with self.assertRaises(ValueError):
+            run_artifact_graph([ArtifactTask("a", _sleep_and_return, (1,), kind="gpu")])
+
+    def test_task_errors_propagate(self):
+        def fail():
+            raise RuntimeError("render failed")
+
+        with self.assertRaises(RuntimeError):
+            run_artifact_graph([ArtifactTask("broken", fail)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from PIL import ImageDraw
+
+from memory_bridge_agent import rendering
+
+
+def _paint_bar(draw: ImageDraw.ImageDraw) -> None:
+    draw.rectangle((0, 0, 40, 10), fill="#2f5d62")
+
+
+class MemoryBridgeRenderingTest(unittest.TestCase):
+    def test_fonts_are_loaded_once(self):
+        self.assertIs(rendering.font(28), rendering.font(28))
+        self.assertIsNot(rendering.font(28), rendering.font(28, bold=True))
+
+    def test_wrap_fits_width_and_keeps_words(self):
+        face = rendering.font(28)
+        text = "A calm day with familiar routines and a short walk in the garden after lunch"
+        lines = rendering.wrap_text(text, face, 300)
+        self.assertGreater(len(lines), 1)
+        self.assertEqual(" ".join(lines), text)
+        for line in lines:
+            self.assertLessEqual(face.getlength(line), 300)
+
+    def test_long_word_gets_its_own_line(self):
+        face = rendering.font(28)
+        self.assertEqual(rendering.wrap_text("Hi Supercalifragilistic", face, 50), ("Hi", "Supercalifragilistic"))
+        self.assertEqual(rendering.wrap_text("   ", face, 50), ("",))
+
+    def test_background_returns_independent_copies(self):
+        first = rendering.background(_paint_bar, (80, 40), "#ffffff")
+        ImageDraw.Draw(first).rectangle((0, 20, 80, 40), fill="#000000")
+        second = rendering.background(_paint_bar, (80, 40), "#ffffff")
+        self.assertEqual(second.getpixel((5, 5)), (47, 93, 98))
+        self.assertEqual(second.getpixel((5, 30)), (255, 255, 255))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,22 @@
+import io
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from PIL import Image
 
+from memory_bridge_agent import tools
+from memory_bridge_agent.pipeline import run_artifact_graph
 from memory_bridge_agent.tools import generate_storyboard_images, load_memory_profile
 
 
+def _png_bytes(size):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "#123456").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
 class MemoryBridgeStoryboardImagesTest(unittest.TestCase):
     def test_storyboard_images_are_generated(self):
         profile = load_memory_profile("examples/memory_profiles/maria_valid.json")
@@ -19,6 +29,47 @@ class MemoryBridgeStoryboardImagesTest(unittest.TestCase):
                     self.assertEqual(img.size, (1280, 720))
                     self.assertEqual(img.mode, "RGB")
 
+    def test_image_model_calls_run_as_llm_steps(self):
+        profile = load_memory_profile("examples/memory_profiles/maria_valid.json")
+        tasks = {task.name: task for task in tools._kit_artifact_tasks(profile, "unused")}
+        image_artifacts = ["memory_timeline", "storyboard_scene_1", "storyboard_scene_2", "storyboard_scene_3"]
+        for name in image_artifacts:
+            request = tasks[f"{name}_request"]
+            self.assertEqual(request.kind, "llm")
+            self.assertEqual(tasks[name].kind, "render")
+            self.assertEqual(tasks[name].deps, (request.name,))
+
+    def test_render_step_keeps_model_image(self):
+        profile = load_memory_profile("examples/memory_profiles/maria_valid.json")
+        scene = tools._storyboard_prompt_data(profile)[0]
+        model_image = _png_bytes((1024, 576))
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(
+            tools, "_generate_storyboard_image_with_gemini", return_value=model_image
+        ):
+            tasks = [
+                tools.ArtifactTask("scene_request", tools.request_storyboard_image, (tmp, scene)),
+                tools.ArtifactTask(
+                    "scene",
+                    tools.render_storyboard_image,
+                    (profile, tmp, scene),
+                    kind="render",
+                    deps=("scene_request",),
+                ),
+            ]
+            results = run_artifact_graph(tasks)
+            self.assertEqual(Path(results["scene"].value).read_bytes(), model_image)
+
+    def test_render_step_draws_fallback_without_model_image(self):
+        profile = load_memory_profile("examples/memory_profiles/maria_valid.json")
+        scene = tools._storyboard_prompt_data(profile)[0]
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(
+            tools, "_generate_storyboard_image_with_gemini", return_value=None
+        ):
+            self.assertEqual(tools.request_storyboard_image(tmp, scene), "")
+            path = Path(tools.render_storyboard_image(profile, tmp, scene))
+            with Image.open(path) as img:
+                self.assertEqual(img.size, (1280, 720))
+
 
 if __name__ == "__main__":
     unittest.main()
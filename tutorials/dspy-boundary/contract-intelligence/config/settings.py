@@ -63,6 +63,9 @@ class Settings(BaseSettings):
     max_file_size_mb: int = Field(default=50)
     max_pages_per_document: int = Field(default=500)
     analysis_timeout_seconds: int = Field(default=300)
+    analysis_max_concurrency: int = Field(default=32)  # LLM calls in flight per document
+    analysis_chunk_chars: int = Field(default=10000)
+    analysis_chunk_overlap: int = Field(default=500)
     
     # Feature Flags
     enable_ocr: bool = Field(default=True)
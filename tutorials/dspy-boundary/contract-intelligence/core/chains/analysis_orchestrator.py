@@ -0,0 +1,606 @@
+"""Map-reduce orchestration of the analysis modules over long contracts.
+
+Every module used to send one truncated window of the contract (head and
+tail, 10-15k chars) to the LLM, and the modules ran one after another. The
+orchestrator instead:
+
+1. splits the parsed document into chunks along section boundaries, each
+   small enough that no module truncates it, overlapping slightly so a
+   clause cut by a chunk boundary is still seen whole;
+2. maps every LLM step of every module over every chunk on one thread pool,
+   so the number of requests in flight is bounded by a single global budget;
+3. reduces the per-chunk results with each module's own combine and
+   deduplication logic. Rule-based passes are cheap, so they still run once
+   over the full text and keep whole-document offsets.
+
+Wall time is roughly ceil(llm_calls / max_concurrency) x request latency,
+plus one short reduce call for the executive summary.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.modules.clause_extractor import ClauseExtractor
+from core.modules.compliance_checker import ComplianceChecker
+from core.modules.contract_analyzer import ContractAnalyzer
+from core.modules.contract_summarizer import ContractSummarizer
+from core.modules.key_terms_extractor import KeyTermsExtractor
+from core.modules.obligation_tracker import ObligationTracker
+from core.modules.risk_assessor import RiskAssessor
+from core.modules.section_scanner import PageIndex, scan_sections
+from models.document import ParsedDocument
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Smallest window any module sends without truncating (ComplianceChecker and
+# RiskAssessor keep 10k chars)
+DEFAULT_CHUNK_CHARS = 10000
+
+# Text repeated from the end of the previous chunk; duplicates it produces are
+# dropped by each module's own dedupe in the reduce step
+DEFAULT_CHUNK_OVERLAP = 500
+
+SENTENCE_END = re.compile(r"[.;:!?]\s+")
+
+ALL_MODULES = ("analysis", "clauses", "risks", "obligations", "key_terms", "compliance", "summary")
+
+
+@dataclass
+class AnalysisChunk:
+    """A contiguous run of whole sections sent to the LLM as one unit."""
+    index: int
+    text: str
+    start_char: int
+    end_char: int
+
+
+@dataclass
+class OrchestratedAnalysis:
+    """Reduced results of every requested module."""
+    document: ParsedDocument
+    chunks: List[AnalysisChunk]
+    analysis: Any = None                                # ContractAnalysis
+    clauses: List[Any] = field(default_factory=list)    # ClauseExtraction
+    risks: List[Any] = field(default_factory=list)      # RiskAssessment
+    overall_risk_score: Optional[float] = None
+    obligations: List[Any] = field(default_factory=list)
+    key_terms: Dict[str, Any] = field(default_factory=dict)
+    compliance: List[Any] = field(default_factory=list)  # ComplianceCheck
+    summary: Dict[str, Any] = field(default_factory=dict)
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+def find_section_starts(text: str) -> List[int]:
+    """Character offsets where a new section begins (always includes 0)."""
+    starts = [0]
+    for boundary in scan_sections(text).boundaries:
+        if boundary > starts[-1]:
+            starts.append(boundary)
+    return starts
+
+
+def _overlap_start(text: str, start: int, overlap: int) -> int:
+    """Earliest sentence (else word) start within `overlap` chars before `start`."""
+    window_start = max(0, start - overlap)
+    if window_start == 0:
+        return 0
+    match = SENTENCE_END.search(text, window_start, start)
+    if match:
+        return match.end()
+    space = text.find(" ", window_start, start)
+    return space + 1 if space != -1 else start
+
+
+def chunk_by_sections(
+    text: str,
+    max_chars: int = DEFAULT_CHUNK_CHARS,
+    overlap: int = DEFAULT_CHUNK_OVERLAP,
+) -> List[AnalysisChunk]:
+    """Pack consecutive sections into chunks of at most `max_chars`.
+
+    Sections are packed into `max_chars - overlap` characters; a longer
+    section is split at the last sentence end that fits (or hard-split when
+    there is none). Every chunk but the first then starts up to `overlap`
+    characters early, at a sentence or word boundary.
+    """
+    if not 0 <= overlap < max_chars // 2:
+        raise ValueError("overlap must be non-negative and less than half of max_chars")
+    budget = max_chars - overlap
+
+    bounds = find_section_starts(text) + [len(text)]
+    pieces: List[Tuple[int, int]] = []
+    for start, end in zip(bounds, bounds[1:]):
+        while end - start > budget:
+            cut = start + budget
+            last_stop = None
+            for match in SENTENCE_END.finditer(text, start + budget // 2, cut):
+                last_stop = match.end()
+            cut = last_stop or cut
+            pieces.append((start, cut))
+            start = cut
+        if end > start:
+            pieces.append((start, end))
+
+    spans: List[Tuple[int, int]] = []
+    chunk_start = chunk_end = None
+    for start, end in pieces:
+        if chunk_start is not None and end - chunk_start > budget:
+            spans.append((chunk_start, chunk_end))
+            chunk_start = None
+        if chunk_start is None:
+            chunk_start = start
+        chunk_end = end
+    if chunk_start is not None:
+        spans.append((chunk_start, chunk_end))
+
+    chunks: List[AnalysisChunk] = []
+    for start, end in spans:
+        # Whitespace-only chunks carry nothing for the LLM
+        if not text[start:end].strip():
+            continue
+        start = _overlap_start(text, start, overlap)
+        chunks.append(AnalysisChunk(len(chunks), text[start:end], start, end))
+    return chunks
+
+
+def _unique(items: List[Any]) -> List[Any]:
+    """Order-preserving dedupe for values that may be unhashable (dicts, lists)."""
+    seen = set()
+    unique = []
+    for item in items:
+        key = json.dumps(item, sort_keys=True, default=str) if not isinstance(item, str) else item.strip().lower()
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+def _as_list(value: Any) -> List[Any]:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        return list(value.values())
+    return [value] if value else []
+
+
+def _merge_dicts(values: List[Any]) -> Dict[str, Any]:
+    """Union of dict results; the first chunk to mention a key wins."""
+    merged: Dict[str, Any] = {}
+    for value in values:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if item and key not in merged:
+                    merged[key] = item
+    return merged
+
+
+def _most_common(values: List[Any], default: str = "Unknown") -> Any:
+    known = [v for v in values if v and str(v).lower() not in ("unknown", "general")]
+    if not known:
+        return values[0] if values else default
+    return Counter(known).most_common(1)[0][0]
+
+
+class AnalysisOrchestrator:
+    """Run the analysis modules over every section of a contract concurrently."""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        chunk_chars: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        analyzer: Optional[ContractAnalyzer] = None,
+        clause_extractor: Optional[ClauseExtractor] = None,
+        risk_assessor: Optional[RiskAssessor] = None,
+        obligation_tracker: Optional[ObligationTracker] = None,
+        key_terms_extractor: Optional[KeyTermsExtractor] = None,
+        compliance_checker: Optional[ComplianceChecker] = None,
+        summarizer: Optional[ContractSummarizer] = None,
+    ):
+        self.max_concurrency = max(1, max_concurrency or settings.analysis_max_concurrency)
+        self.chunk_chars = chunk_chars or settings.analysis_chunk_chars
+        self.chunk_overlap = settings.analysis_chunk_overlap if chunk_overlap is None else chunk_overlap
+
+        # Only the first module configures the LM; DSPy settings may only be
+        # changed from one thread, and the rest share the configuration. A
+        # module routing its own long input passes itself in.
+        self.analyzer = analyzer or ContractAnalyzer(model_name)
+        self.clause_extractor = clause_extractor or ClauseExtractor()
+        self.risk_assessor = risk_assessor or RiskAssessor()
+        self.obligation_tracker = obligation_tracker or ObligationTracker()
+        self.key_terms_extractor = key_terms_extractor or KeyTermsExtractor()
+        self.compliance_checker = compliance_checker or ComplianceChecker()
+        self.summarizer = summarizer or ContractSummarizer()
+
+    def analyze(
+        self,
+        parsed_doc: ParsedDocument,
+        modules: Optional[List[str]] = None,
+        regulations: Optional[List[str]] = None,
+        *,
+        clause_types: Optional[List[str]] = None,
+        contract_type: Optional[str] = None,
+        party_focus: str = "all",
+        term_categories: Optional[List[str]] = None,
+        summary_type: str = "executive",
+        contract_analysis: Optional[Any] = None,
+    ) -> OrchestratedAnalysis:
+        """Analyze the whole contract with the requested modules (default: all).
+
+        The keyword options are those of the matching module entry points
+        (``extract_clauses``, ``assess_risks``, ...) and default the same way.
+        """
+        start_time = time.time()
+        modules = list(modules or ALL_MODULES)
+        unknown = set(modules) - set(ALL_MODULES)
+        if unknown:
+            raise ValueError(f"Unknown analysis modules: {sorted(unknown)}")
+
+        chunks = chunk_by_sections(parsed_doc.text, self.chunk_chars, self.chunk_overlap)
+        chunk_docs = [self._chunk_document(parsed_doc, chunk) for chunk in chunks]
+        if "compliance" in modules and regulations is None:
+            regulations = self.compliance_checker._detect_relevant_regulations(parsed_doc.text)
+
+        # One map step per (LLM call, chunk)
+        steps: Dict[str, Callable[[ParsedDocument], Any]] = {}
+        if "analysis" in modules:
+            steps["analysis.basic"] = self.analyzer._perform_basic_analysis
+            steps["analysis.classification"] = self.analyzer._perform_classification
+            steps["analysis.legal_review"] = self.analyzer._perform_legal_review
+        if "clauses" in modules:
+            clause_types = clause_types or self.clause_extractor.standard_clause_types
+            steps["clauses"] = lambda doc: self.clause_extractor._extract_with_dspy(doc, clause_types)
+        if "risks" in modules:
+            steps["risks"] = lambda doc: self.risk_assessor._assess_with_dspy(doc, contract_type)
+        if "obligations" in modules:
+            steps["obligations"] = lambda doc: self.obligation_tracker._extract_with_dspy(doc, party_focus)
+        if "key_terms" in modules:
+            categories = term_categories or ["financial", "dates", "parties", "jurisdiction"]
+            steps["key_terms"] = lambda doc: self.key_terms_extractor._extract_with_dspy(doc, categories)
+        if "compliance" in modules:
+            for regulation in regulations or []:
+                if regulation in self.compliance_checker.regulations:
+                    steps[f"compliance.{regulation}"] = (
+                        lambda doc, reg=regulation: self.compliance_checker._check_with_dspy(doc, reg)
+                    )
+        if "summary" in modules:
+            steps["summary"] = lambda doc: self.summarizer._generate_with_dspy(doc, summary_type)
+
+        # Rule-based passes need whole-document offsets, so they run once on
+        # the full text, overlapping the LLM calls instead of following them
+        rule_passes: Dict[str, Callable[[], Any]] = {}
+        if "clauses" in modules:
+            rule_passes["clauses"] = lambda: self.clause_extractor._extract_with_patterns(parsed_doc)
+        if "risks" in modules:
+            rule_passes["risks"] = lambda: self.risk_assessor._assess_with_rules(parsed_doc)
+        if "obligations" in modules:
+            rule_passes["obligations"] = lambda: self.obligation_tracker._extract_with_rules(parsed_doc)
+        if "key_terms" in modules:
+            rule_passes["key_terms"] = lambda: self.key_terms_extractor._extract_with_patterns(parsed_doc)
+        if "compliance" in modules:
+            for regulation in regulations or []:
+                if regulation in self.compliance_checker.regulations:
+                    rule_passes[f"compliance.{regulation}"] = (
+                        lambda reg=regulation: self.compliance_checker._check_with_rules(parsed_doc, reg)
+                    )
+        if "summary" in modules:
+            rule_passes["summary.structured"] = (
+                lambda: self.summarizer._generate_structured_summary(parsed_doc, contract_analysis)
+            )
+            rule_passes["summary.sections"] = lambda: self.summarizer._generate_section_summary(parsed_doc)
+
+        mapped, rules, reduced_summary = self._run_map(steps, chunk_docs, rule_passes, summary_type)
+
+        result = OrchestratedAnalysis(document=parsed_doc, chunks=chunks)
+        if "summary" in modules:
+            result.summary = self._reduce_summary(mapped["summary"], reduced_summary, rules)
+        if "analysis" in modules:
+            result.analysis = self._reduce_analysis(
+                parsed_doc, mapped, result.summary.get("executive_summary")
+            )
+        if "clauses" in modules:
+            result.clauses = self._reduce_clauses(parsed_doc, chunks, mapped["clauses"], rules["clauses"])
+        if "risks" in modules:
+            result.risks, result.overall_risk_score = self._reduce_risks(mapped["risks"], rules["risks"])
+        if "obligations" in modules:
+            result.obligations = self._reduce_obligations(
+                parsed_doc, mapped["obligations"], rules["obligations"]
+            )
+        if "key_terms" in modules:
+            result.key_terms = self._reduce_key_terms(mapped["key_terms"], rules["key_terms"])
+        if "compliance" in modules:
+            result.compliance = self._reduce_compliance(regulations or [], mapped, rules)
+
+        elapsed = time.time() - start_time
+        result.stats = {
+            "chunks": len(chunks),
+            "llm_calls": len(steps) * len(chunks) + (1 if reduced_summary is not None else 0),
+            "max_concurrency": self.max_concurrency,
+            "processing_time": round(elapsed, 2),
+        }
+        logger.info(
+            f"Orchestrated analysis of {parsed_doc.filename}: {len(chunks)} chunks, "
+            f"{result.stats['llm_calls']} LLM calls in {elapsed:.2f}s"
+        )
+        return result
+
+    def _chunk_document(self, parsed_doc: ParsedDocument, chunk: AnalysisChunk) -> ParsedDocument:
+        """A ParsedDocument view of one chunk, as the modules expect."""
+        return parsed_doc.model_copy(update={
+            "text": chunk.text,
+            "chunks": [],
+            "page_offsets": [],
+            "char_count": len(chunk.text),
+            "word_count": len(chunk.text.split()),
+        })
+
+    def _run_map(
+        self,
+        steps: Dict[str, Callable[[ParsedDocument], Any]],
+        chunk_docs: List[ParsedDocument],
+        rule_passes: Dict[str, Callable[[], Any]],
+        summary_type: str = "executive",
+    ) -> Tuple[Dict[str, List[Any]], Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Run every step on every chunk within the concurrency budget.
+
+        Returns per-step results in chunk order, the rule-pass results, and
+        the summary reduce result, which is started as soon as the last
+        summary chunk finishes.
+        """
+        mapped: Dict[str, List[Any]] = {name: [None] * len(chunk_docs) for name in steps}
+        reduced_summary = None
+
+        # Rule passes get their own workers so they never take a slot from
+        # the LLM budget; they start while the first requests are in flight
+        with ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                thread_name_prefix="contract-analysis") as executor, \
+                ThreadPoolExecutor(max_workers=max(1, len(rule_passes)),
+                                   thread_name_prefix="contract-rules") as rule_executor:
+            rule_futures = {name: rule_executor.submit(rule_pass) for name, rule_pass in rule_passes.items()}
+            pending: Dict[Future, Tuple[str, int]] = {
+                executor.submit(step, doc): (name, i)
+                for name, step in steps.items()
+                for i, doc in enumerate(chunk_docs)
+            }
+            summaries_left = len(chunk_docs) if "summary" in steps else 0
+            reduce_future = None
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, i = pending.pop(future)
+                    try:
+                        mapped[name][i] = future.result()
+                    except Exception as e:
+                        # Module helpers already fall back on LLM errors
+                        logger.error(f"Analysis step {name} failed on chunk {i}: {e}")
+                    if name == "summary":
+                        summaries_left -= 1
+                        if summaries_left == 0 and len(chunk_docs) > 1:
+                            reduce_future = executor.submit(
+                                self._summarize_summaries, chunk_docs[0], mapped["summary"], summary_type
+                            )
+
+            if reduce_future is not None:
+                try:
+                    reduced_summary = reduce_future.result()
+                except Exception as e:
+                    logger.error(f"Summary reduce step failed: {e}")
+
+            rules = {name: future.result() for name, future in rule_futures.items()}
+
+        return mapped, rules, reduced_summary
+
+    def _summarize_summaries(
+        self,
+        template: ParsedDocument,
+        partials: List[Any],
+        summary_type: str = "executive",
+    ) -> Dict[str, Any]:
+        """Reduce step: one LLM pass over the per-chunk executive summaries."""
+        sections = [
+            f"Part {i + 1}: {partial['executive_summary']}"
+            for i, partial in enumerate(partials)
+            if isinstance(partial, dict) and partial.get("executive_summary")
+        ]
+        if not sections:
+            return {}
+        combined = "\n\n".join(sections)
+        return self.summarizer._generate_with_dspy(
+            template.model_copy(update={"text": combined}), summary_type
+        )
+
+    # -- reduce steps -----------------------------------------------------
+
+    def _reduce_summary(
+        self,
+        partials: List[Any],
+        reduced: Optional[Dict[str, Any]],
+        rules: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        partials = [p for p in partials if isinstance(p, dict) and p]
+        ai_summary: Dict[str, Any] = {}
+        if partials:
+            ai_summary = {
+                "executive_summary": (reduced or {}).get("executive_summary")
+                or partials[0].get("executive_summary"),
+                "key_highlights": _unique(sum((_as_list(p.get("key_highlights")) for p in partials), [])),
+                "action_items": _unique(sum((_as_list(p.get("action_items")) for p in partials), [])),
+                "red_flags": _unique(sum((_as_list(p.get("red_flags")) for p in partials), [])),
+            }
+            ai_summary = {k: v for k, v in ai_summary.items() if v}
+
+        return self.summarizer._combine_summaries(
+            ai_summary, rules["summary.structured"], rules["summary.sections"]
+        )
+
+    def _reduce_analysis(
+        self,
+        parsed_doc: ParsedDocument,
+        mapped: Dict[str, List[Any]],
+        executive_summary: Optional[str],
+    ):
+        basics = [b for b in mapped["analysis.basic"] if b] or [self.analyzer._get_fallback_basic_analysis()]
+        classes = [c for c in mapped["analysis.classification"] if c] or [
+            self.analyzer._get_fallback_classification()
+        ]
+        reviews = [r for r in mapped["analysis.legal_review"] if r] or [
+            self.analyzer._get_fallback_legal_review()
+        ]
+
+        basic = {
+            "contract_type": _most_common([b.get("contract_type") for b in basics]),
+            "parties": _unique(sum((_as_list(b.get("parties")) for b in basics), [])),
+            "key_dates": _merge_dicts([b.get("key_dates") for b in basics]),
+            "key_terms": _merge_dicts([b.get("key_terms") for b in basics]),
+            "executive_summary": executive_summary or basics[0].get("executive_summary"),
+        }
+        classification = {
+            "primary_type": _most_common([c.get("primary_type") for c in classes]),
+            "sub_categories": _unique(sum((_as_list(c.get("sub_categories")) for c in classes), [])),
+            "industry_sector": _most_common([c.get("industry_sector") for c in classes]),
+            "complexity_level": _most_common([c.get("complexity_level") for c in classes]),
+            "standard_vs_custom": _most_common([c.get("standard_vs_custom") for c in classes]),
+        }
+        legal_review = {
+            "legal_concerns": _unique(sum((_as_list(r.get("legal_concerns")) for r in reviews), [])),
+            "enforceability_assessment": "\n\n".join(_unique(
+                [r["enforceability_assessment"] for r in reviews if r.get("enforceability_assessment")]
+            )),
+            "missing_clauses": self._missing_everywhere(reviews),
+            "revision_suggestions": _unique(
+                sum((_as_list(r.get("revision_suggestions")) for r in reviews), [])
+            ),
+        }
+        return self.analyzer._combine_analysis_results(parsed_doc, basic, classification, legal_review)
+
+    @staticmethod
+    def _missing_everywhere(reviews: List[Dict[str, Any]]) -> List[Any]:
+        """A clause is only missing if no chunk contained it.
+
+        Each chunk is reviewed in isolation, so a chunk "misses" everything
+        that lives in other sections. Keep clauses flagged by every chunk
+        that reported missing clauses at all.
+        """
+        flagged = [_as_list(r.get("missing_clauses")) for r in reviews if r.get("missing_clauses")]
+        if not flagged:
+            return []
+
+        def name(item: Any) -> str:
+            if isinstance(item, dict):
+                item = item.get("clause", json.dumps(item, sort_keys=True))
+            return str(item).strip().lower()
+
+        common = set.intersection(*({name(item) for item in items} for items in flagged))
+        return _unique([item for item in flagged[0] if name(item) in common])
+
+    def _reduce_clauses(
+        self,
+        parsed_doc: ParsedDocument,
+        chunks: List[AnalysisChunk],
+        partials: List[Any],
+        pattern_clauses: List[Any],
+    ) -> List[Any]:
+        extractor = self.clause_extractor
+        pages = PageIndex.for_document(parsed_doc)
+        ai_clauses = []
+        for chunk, clauses in zip(chunks, partials):
+            for clause in clauses or []:
+                # Chunk-relative offsets -> document offsets
+                location = dict(clause.location)
+                if location.get("end_char"):
+                    location["start_char"] = location.get("start_char", 0) + chunk.start_char
+                    location["end_char"] += chunk.start_char
+                    location["page"] = pages.page_at(location["start_char"])
+                ai_clauses.append(clause.model_copy(update={
+                    "clause_id": f"c{chunk.index}_{clause.clause_id}",
+                    "location": location,
+                }))
+
+        clauses = extractor._combine_and_deduplicate(ai_clauses, pattern_clauses)
+        for clause in clauses:
+            clause.importance = extractor._assess_importance(clause)
+            clause.risk_level = extractor._assess_risk_level(clause)
+        return clauses
+
+    def _reduce_risks(self, partials: List[Any], rule_risks: List[Any]) -> Tuple[List[Any], float]:
+        assessor = self.risk_assessor
+        ai_risks = []
+        for i, risks in enumerate(partials):
+            ai_risks.extend(
+                risk.model_copy(update={"risk_id": f"c{i}_{risk.risk_id}"}) for risk in risks or []
+            )
+        risks = assessor._combine_risks(ai_risks, rule_risks)
+        return risks, assessor._calculate_overall_risk_score(risks)
+
+    def _reduce_obligations(
+        self,
+        parsed_doc: ParsedDocument,
+        partials: List[Any],
+        rule_obligations: List[Any],
+    ) -> List[Any]:
+        tracker = self.obligation_tracker
+        ai_obligations = []
+        for i, obligations in enumerate(partials):
+            ai_obligations.extend(
+                obligation.model_copy(update={"obligation_id": f"c{i}_{obligation.obligation_id}"})
+                for obligation in obligations or []
+            )
+        obligations = tracker._combine_obligations(ai_obligations, rule_obligations)
+        for obligation in obligations:
+            obligation.due_date = tracker._extract_due_date(obligation.description, parsed_doc.text)
+            obligation.frequency = tracker._extract_frequency(obligation.description)
+        return obligations
+
+    def _reduce_key_terms(self, partials: List[Any], pattern_terms: Dict[str, Any]) -> Dict[str, Any]:
+        extractor = self.key_terms_extractor
+        partials = [p for p in partials if p]
+        parties = _unique(sum((_as_list(p.get("parties_info")) for p in partials), []))
+        ai_terms = {
+            "parties_info": [p if isinstance(p, str) else json.dumps(p, sort_keys=True) for p in parties],
+            "financial_terms": _merge_dicts([p.get("financial_terms") for p in partials]),
+            "important_dates": _merge_dicts([p.get("important_dates") for p in partials]),
+            "jurisdiction_info": next(
+                (p["jurisdiction_info"] for p in partials if p.get("jurisdiction_info")), ""
+            ),
+        }
+        return extractor._combine_terms(ai_terms, pattern_terms)
+
+    def _reduce_compliance(
+        self,
+        regulations: List[str],
+        mapped: Dict[str, List[Any]],
+        rules: Dict[str, Any],
+    ) -> List[Any]:
+        checker = self.compliance_checker
+        results = []
+        for regulation in regulations:
+            if regulation not in checker.regulations:
+                logger.warning(f"Unknown regulation: {regulation}")
+                continue
+            partials = [p for p in mapped.get(f"compliance.{regulation}", []) if p]
+            statuses = {p.get("status") for p in partials}
+            # Explicit violations anywhere make the contract non-compliant;
+            # otherwise one compliant section is not enough to clear the rest
+            if any(p.get("status") == "non-compliant" and p.get("violations") for p in partials):
+                status = "non-compliant"
+            elif statuses and statuses <= {"compliant"}:
+                status = "compliant"
+            else:
+                status = "needs-review"
+            ai_result = {
+                "status": status,
+                "violations": _unique(sum((_as_list(p.get("violations")) for p in partials), [])),
+                "recommendations": _unique(sum((_as_list(p.get("recommendations")) for p in partials), [])),
+            }
+            rule_result = rules[f"compliance.{regulation}"]
+            results.append(checker._combine_compliance_results(ai_result, rule_result, regulation))
+        return results
@@ -7,12 +7,16 @@ from typing import Dict, List, Any, Optional
 
 import dspy
 
+from core.modules.section_scanner import SectionScan, scan_document
 from core.signatures.analysis_signatures import ClauseExtractionSignature
 from models.document import ParsedDocument, ClauseExtraction
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Longer contracts are analyzed section by section instead of truncated
+MAX_CLAUSE_CHARS = 12000
+
 
 class ClauseExtractor(dspy.Module):
     """Extract and categorize contract clauses using DSPy."""
@@ -57,11 +61,17 @@ class ClauseExtractor(dspy.Module):
             clause_types = self.standard_clause_types
         
         try:
+            if len(parsed_doc.text) > MAX_CLAUSE_CHARS:
+                return self._extract_long_contract(parsed_doc, clause_types)
+            
+            # Segment once; both extraction paths reuse the scan
+            scan = scan_document(parsed_doc)
+            
             # Extract clauses using DSPy
-            dspy_clauses = self._extract_with_dspy(parsed_doc, clause_types)
+            dspy_clauses = self._extract_with_dspy(parsed_doc, clause_types, scan)
             
             # Extract using pattern matching as backup
-            pattern_clauses = self._extract_with_patterns(parsed_doc)
+            pattern_clauses = self._extract_with_patterns(parsed_doc, scan)
             
             # Combine and deduplicate
             all_clauses = self._combine_and_deduplicate(dspy_clauses, pattern_clauses)
@@ -77,14 +87,30 @@ class ClauseExtractor(dspy.Module):
             logger.error(f"Clause extraction failed: {str(e)}")
             return self._fallback_extraction(parsed_doc)
     
-    def _extract_with_dspy(
+    def _extract_long_contract(
         self, 
         parsed_doc: ParsedDocument, 
         clause_types: List[str]
+    ) -> List[ClauseExtraction]:
+        """Extract clauses from every section of a long contract instead of its head and tail."""
+        # Imported here: the orchestrator builds on this module
+        from core.chains.analysis_orchestrator import AnalysisOrchestrator
+        
+        orchestrated = AnalysisOrchestrator(clause_extractor=self).analyze(
+            parsed_doc, modules=["clauses"], clause_types=clause_types
+        )
+        return orchestrated.clauses
+    
+    def _extract_with_dspy(
+        self, 
+        parsed_doc: ParsedDocument, 
+        clause_types: List[str],
+        scan: Optional[SectionScan] = None
     ) -> List[ClauseExtraction]:
         """Extract clauses using DSPy module."""
         
         text = self._prepare_text_for_analysis(parsed_doc.text)
+        scan = scan or scan_document(parsed_doc)
         clause_types_str = ", ".join(clause_types)
         
         try:
@@ -99,7 +125,7 @@ class ClauseExtractor(dspy.Module):
             extracted = self._parse_json_safely(result.extracted_clauses)
             if isinstance(extracted, list):
                 for clause_data in extracted:
-                    clause = self._create_clause_from_data(clause_data, parsed_doc)
+                    clause = self._create_clause_from_data(clause_data, scan)
                     if clause:
                         clauses.append(clause)
             
@@ -107,7 +133,7 @@ class ClauseExtractor(dspy.Module):
             unusual = self._parse_json_safely(result.unusual_clauses)
             if isinstance(unusual, list):
                 for clause_data in unusual:
-                    clause = self._create_clause_from_data(clause_data, parsed_doc, is_unusual=True)
+                    clause = self._create_clause_from_data(clause_data, scan, is_unusual=True)
                     if clause:
                         clauses.append(clause)
             
@@ -117,52 +143,41 @@ class ClauseExtractor(dspy.Module):
             logger.error(f"DSPy clause extraction failed: {str(e)}")
             return []
     
-    def _extract_with_patterns(self, parsed_doc: ParsedDocument) -> List[ClauseExtraction]:
-        """Extract clauses using pattern matching."""
+    def _extract_with_patterns(
+        self, 
+        parsed_doc: ParsedDocument,
+        scan: Optional[SectionScan] = None
+    ) -> List[ClauseExtraction]:
+        """Extract clauses from classified section headings."""
         
+        scan = scan or scan_document(parsed_doc)
         clauses = []
-        text = parsed_doc.text.lower()
+        counts: Dict[str, int] = {}
         
-        # Common clause section headers
-        section_patterns = {
-            "termination": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:termination|expiration|end\s+of\s+agreement)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
-            "liability": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:liability|limitation\s+of\s+liability|damages)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
-            "confidentiality": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:confidential|non-disclosure|proprietary)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
-            "payment": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:payment|compensation|fees|remuneration)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
-            "warranty": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:warrant|representation|guarantee)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
-            "governing_law": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:governing\s+law|jurisdiction|applicable\s+law)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))"
-        }
-        
-        for clause_type, pattern in section_patterns.items():
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+        for section in scan.clauses():
+            i = counts.get(section.clause_type, 0)
+            counts[section.clause_type] = i + 1
             
-            for i, match in enumerate(matches):
-                clause_text = match.group(1).strip() if match.groups() else match.group(0).strip()
-                
-                if len(clause_text) > 50:  # Only include substantial clauses
-                    start_char = match.start()
-                    end_char = match.end()
-                    
-                    clause = ClauseExtraction(
-                        clause_id=f"{clause_type}_{i}",
-                        clause_type=clause_type,
-                        text=clause_text,
-                        location={
-                            "start_char": start_char,
-                            "end_char": end_char,
-                            "page": self._get_page_number(parsed_doc, start_char)
-                        },
-                        importance="medium",
-                        risk_level="medium"
-                    )
-                    clauses.append(clause)
+            clause = ClauseExtraction(
+                clause_id=f"{section.clause_type}_{i}",
+                clause_type=section.clause_type,
+                text=scan.body(section),
+                location={
+                    "start_char": section.start,
+                    "end_char": section.end,
+                    "page": scan.pages.page_at(section.start)
+                },
+                importance="medium",
+                risk_level="medium"
+            )
+            clauses.append(clause)
         
         return clauses
     
     def _create_clause_from_data(
         self, 
         clause_data: Dict[str, Any], 
-        parsed_doc: ParsedDocument,
+        scan: SectionScan,
         is_unusual: bool = False
     ) -> Optional[ClauseExtraction]:
         """Create ClauseExtraction from DSPy output data."""
@@ -189,7 +204,7 @@ class ClauseExtractor(dspy.Module):
                     return None
                 
                 # Try to find location in document
-                location = self._find_text_location(parsed_doc.text, text)
+                location = scan.locate(text)
                 
                 return ClauseExtraction(
                     clause_id=clause_id,
@@ -205,46 +220,6 @@ class ClauseExtractor(dspy.Module):
             logger.error(f"Error creating clause from data: {str(e)}")
             return None
     
-    def _find_text_location(self, full_text: str, clause_text: str) -> Dict[str, int]:
-        """Find the location of clause text in the full document."""
-        
-        # Try exact match first
-        start_pos = full_text.find(clause_text[:100])  # First 100 chars
-        
-        if start_pos == -1:
-            # Try case-insensitive match
-            start_pos = full_text.lower().find(clause_text[:100].lower())
-        
-        if start_pos == -1:
-            # Try fuzzy matching with keywords
-            words = clause_text.split()[:5]  # First 5 words
-            for word in words:
-                if len(word) > 3:
-                    pos = full_text.lower().find(word.lower())
-                    if pos != -1:
-                        start_pos = pos
-                        break
-        
-        if start_pos == -1:
-            start_pos = 0
-        
-        end_pos = min(start_pos + len(clause_text), len(full_text))
-        
-        return {
-            "start_char": start_pos,
-            "end_char": end_pos,
-            "page": self._get_page_number_from_char(full_text, start_pos)
-        }
-    
-    def _get_page_number(self, parsed_doc: ParsedDocument, char_position: int) -> int:
-        """Get page number for a character position."""
-        return self._get_page_number_from_char(parsed_doc.text, char_position)
-    
-    def _get_page_number_from_char(self, text: str, char_position: int) -> int:
-        """Estimate page number based on character position."""
-        # Rough estimate: 2000 characters per page
-        return max(1, char_position // 2000 + 1)
-    
     def _assess_importance(self, clause: ClauseExtraction) -> str:
         """Assess the importance level of a clause."""
         
@@ -310,7 +285,7 @@ class ClauseExtractor(dspy.Module):
         
         return unique_clauses
     
-    def _prepare_text_for_analysis(self, text: str, max_chars: int = 12000) -> str:
+    def _prepare_text_for_analysis(self, text: str, max_chars: int = MAX_CLAUSE_CHARS) -> str:
         """Prepare text for DSPy analysis."""
         if len(text) <= max_chars:
             return text
@@ -13,6 +13,9 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Longer contracts are analyzed section by section instead of truncated
+MAX_COMPLIANCE_CHARS = 10000
+
 
 class ComplianceChecker(dspy.Module):
     """Check contract compliance against various regulations using DSPy."""
@@ -143,6 +146,9 @@ class ComplianceChecker(dspy.Module):
             # Auto-detect relevant regulations based on content
             regulations = self._detect_relevant_regulations(parsed_doc.text)
         
+        if len(parsed_doc.text) > MAX_COMPLIANCE_CHARS:
+            return self._check_long_contract(parsed_doc, regulations)
+        
         compliance_results = []
         
         for regulation in regulations:
@@ -169,6 +175,27 @@ class ComplianceChecker(dspy.Module):
         logger.info(f"Compliance check completed for {len(compliance_results)} regulations")
         return compliance_results
     
+    def _check_long_contract(
+        self, 
+        parsed_doc: ParsedDocument,
+        regulations: List[str]
+    ) -> List[ComplianceCheck]:
+        """Check every section of a long contract instead of its head and tail."""
+        # Imported here: the orchestrator builds on this module
+        from core.chains.analysis_orchestrator import AnalysisOrchestrator
+        
+        try:
+            orchestrated = AnalysisOrchestrator(compliance_checker=self).analyze(
+                parsed_doc, modules=["compliance"], regulations=regulations
+            )
+            return orchestrated.compliance
+        except Exception as e:
+            logger.error(f"Compliance check failed: {str(e)}")
+            return [
+                self._fallback_compliance_check(regulation)
+                for regulation in regulations if regulation in self.regulations
+            ]
+    
     def _detect_relevant_regulations(self, text: str) -> List[str]:
         """Auto-detect which regulations might be relevant to this contract."""
         
@@ -344,7 +371,7 @@ class ComplianceChecker(dspy.Module):
             clause_references=["Full contract review"]
         )
     
-    def _prepare_text_for_analysis(self, text: str, max_chars: int = 10000) -> str:
+    def _prepare_text_for_analysis(self, text: str, max_chars: int = MAX_COMPLIANCE_CHARS) -> str:
         """Prepare text for DSPy analysis."""
         if len(text) <= max_chars:
             return text
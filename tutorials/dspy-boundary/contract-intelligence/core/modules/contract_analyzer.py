@@ -18,6 +18,9 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Longest contract sent to the LLM whole; longer ones are map-reduced by section
+MAX_ANALYSIS_CHARS = 15000
+
 
 class ContractAnalyzer(dspy.Module):
     """Main contract analyzer orchestrating multiple analysis tasks."""
@@ -39,6 +42,9 @@ class ContractAnalyzer(dspy.Module):
         """Perform comprehensive contract analysis."""
         start_time = time.time()
         
+        if len(parsed_doc.text) > MAX_ANALYSIS_CHARS:
+            return self._analyze_long_contract(parsed_doc)
+        
         try:
             # Step 1: Basic contract analysis
             basic_analysis = self._perform_basic_analysis(parsed_doc)
@@ -63,6 +69,18 @@ class ContractAnalyzer(dspy.Module):
             logger.error(f"Contract analysis failed: {str(e)}")
             raise
     
+    def _analyze_long_contract(self, parsed_doc: ParsedDocument) -> ContractAnalysis:
+        """Analyze every section of a long contract instead of its head and tail."""
+        # Imported here: the orchestrator builds on this module
+        from core.chains.analysis_orchestrator import AnalysisOrchestrator
+        
+        orchestrated = AnalysisOrchestrator(analyzer=self).analyze(parsed_doc, modules=["analysis"])
+        logger.info(
+            f"Contract analysis completed in {orchestrated.stats['processing_time']:.2f}s "
+            f"over {orchestrated.stats['chunks']} chunks"
+        )
+        return orchestrated.analysis
+    
     def _perform_basic_analysis(self, parsed_doc: ParsedDocument) -> Dict[str, Any]:
         """Perform basic contract analysis using DSPy."""
         try:
@@ -178,7 +196,7 @@ class ContractAnalyzer(dspy.Module):
             analysis_results=analysis_results
         )
     
-    def _prepare_text_for_analysis(self, text: str, max_chars: int = 15000) -> str:
+    def _prepare_text_for_analysis(self, text: str, max_chars: int = MAX_ANALYSIS_CHARS) -> str:
         """Prepare text for LLM analysis by truncating if necessary."""
         if len(text) <= max_chars:
             return text
@@ -12,6 +12,9 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Longer contracts are analyzed section by section instead of truncated
+MAX_SUMMARY_CHARS = 15000
+
 
 class ContractSummarizer(dspy.Module):
     """Generate comprehensive contract summaries using DSPy."""
@@ -82,6 +85,9 @@ class ContractSummarizer(dspy.Module):
         """Generate comprehensive contract summary."""
         
         try:
+            if len(parsed_doc.text) > MAX_SUMMARY_CHARS:
+                return self._summarize_long_contract(parsed_doc, summary_type, contract_analysis)
+            
             # Generate AI-powered summary
             ai_summary = self._generate_with_dspy(parsed_doc, summary_type)
             
@@ -103,6 +109,21 @@ class ContractSummarizer(dspy.Module):
             logger.error(f"Contract summarization failed: {str(e)}")
             return self._fallback_summary(parsed_doc)
     
+    def _summarize_long_contract(
+        self, 
+        parsed_doc: ParsedDocument, 
+        summary_type: str,
+        contract_analysis: Optional[ContractAnalysis] = None
+    ) -> Dict[str, Any]:
+        """Summarize every section of a long contract instead of its head, middle and tail."""
+        # Imported here: the orchestrator builds on this module
+        from core.chains.analysis_orchestrator import AnalysisOrchestrator
+        
+        orchestrated = AnalysisOrchestrator(summarizer=self).analyze(
+            parsed_doc, modules=["summary"], summary_type=summary_type, contract_analysis=contract_analysis
+        )
+        return orchestrated.summary
+    
     def _generate_with_dspy(
         self, 
         parsed_doc: ParsedDocument, 
@@ -392,7 +413,7 @@ class ContractSummarizer(dspy.Module):
         
         return "\n".join(summary_parts)
     
-    def _prepare_text_for_analysis(self, text: str, max_chars: int = 15000) -> str:
+    def _prepare_text_for_analysis(self, text: str, max_chars: int = MAX_SUMMARY_CHARS) -> str:
         """Prepare text for DSPy analysis."""
         if len(text) <= max_chars:
             return text
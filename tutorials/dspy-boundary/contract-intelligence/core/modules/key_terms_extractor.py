@@ -14,6 +14,9 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Longer contracts are analyzed section by section instead of truncated
+MAX_KEY_TERMS_CHARS = 12000
+
 
 class KeyTermsExtractor(dspy.Module):
     """Extract key terms and values from contracts using DSPy."""
@@ -80,6 +83,9 @@ class KeyTermsExtractor(dspy.Module):
             term_categories = ["financial", "dates", "parties", "jurisdiction"]
         
         try:
+            if len(parsed_doc.text) > MAX_KEY_TERMS_CHARS:
+                return self._extract_long_contract(parsed_doc, term_categories)
+            
             # Extract using DSPy
             ai_terms = self._extract_with_dspy(parsed_doc, term_categories)
             
@@ -96,6 +102,20 @@ class KeyTermsExtractor(dspy.Module):
             logger.error(f"Key terms extraction failed: {str(e)}")
             return self._fallback_extraction(parsed_doc)
     
+    def _extract_long_contract(
+        self, 
+        parsed_doc: ParsedDocument, 
+        term_categories: List[str]
+    ) -> Dict[str, Any]:
+        """Extract key terms from every section of a long contract instead of its head and tail."""
+        # Imported here: the orchestrator builds on this module
+        from core.chains.analysis_orchestrator import AnalysisOrchestrator
+        
+        orchestrated = AnalysisOrchestrator(key_terms_extractor=self).analyze(
+            parsed_doc, modules=["key_terms"], term_categories=term_categories
+        )
+        return orchestrated.key_terms
+    
     def _extract_with_dspy(
         self, 
         parsed_doc: ParsedDocument, 
@@ -213,7 +233,12 @@ class KeyTermsExtractor(dspy.Module):
         
         # Add pattern-detected parties
         combined["parties"].extend(pattern_parties)
-        combined["parties"] = list(set(combined["parties"]))[:10]  # Deduplicate and limit
+        # Deduplicate and limit; the LM may describe parties as dicts
+        unique_parties = {
+            party if isinstance(party, str) else json.dumps(party, sort_keys=True): party
+            for party in combined["parties"]
+        }
+        combined["parties"] = list(unique_parties.values())[:10]
         
         # Combine financial terms
         ai_financial = ai_terms.get("financial_terms", {})
@@ -303,7 +328,7 @@ class KeyTermsExtractor(dspy.Module):
         
         return stats
     
-    def _prepare_text_for_analysis(self, text: str, max_chars: int = 12000) -> str:
+    def _prepare_text_for_analysis(self, text: str, max_chars: int = MAX_KEY_TERMS_CHARS) -> str:
         """Prepare text for DSPy analysis."""
         if len(text) <= max_chars:
             return text
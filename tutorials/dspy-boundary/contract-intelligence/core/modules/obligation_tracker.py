@@ -14,6 +14,9 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Longer contracts are analyzed section by section instead of truncated
+MAX_OBLIGATION_CHARS = 12000
+
 
 class ObligationTracker(dspy.Module):
     """Track obligations and commitments in contracts using DSPy."""
@@ -83,6 +86,9 @@ class ObligationTracker(dspy.Module):
         """Track all obligations in the contract."""
         
         try:
+            if len(parsed_doc.text) > MAX_OBLIGATION_CHARS:
+                return self._track_long_contract(parsed_doc, party_focus)
+            
             # Get AI-powered obligation extraction
             ai_obligations = self._extract_with_dspy(parsed_doc, party_focus)
             
@@ -105,6 +111,16 @@ class ObligationTracker(dspy.Module):
             logger.error(f"Obligation tracking failed: {str(e)}")
             return self._fallback_obligations(parsed_doc)
     
+    def _track_long_contract(self, parsed_doc: ParsedDocument, party_focus: str) -> List[Obligation]:
+        """Track obligations in every section of a long contract instead of its head and tail."""
+        # Imported here: the orchestrator builds on this module
+        from core.chains.analysis_orchestrator import AnalysisOrchestrator
+        
+        orchestrated = AnalysisOrchestrator(obligation_tracker=self).analyze(
+            parsed_doc, modules=["obligations"], party_focus=party_focus
+        )
+        return orchestrated.obligations
+    
     def _extract_with_dspy(
         self, 
         parsed_doc: ParsedDocument, 
@@ -440,7 +456,7 @@ class ObligationTracker(dspy.Module):
         
         return ' '.join(sorted(important_words[:8]))  # Top 8 important words, sorted
     
-    def _prepare_text_for_analysis(self, text: str, max_chars: int = 12000) -> str:
+    def _prepare_text_for_analysis(self, text: str, max_chars: int = MAX_OBLIGATION_CHARS) -> str:
         """Prepare text for DSPy analysis."""
         if len(text) <= max_chars:
             return text
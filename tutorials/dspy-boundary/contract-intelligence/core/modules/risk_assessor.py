@@ -13,6 +13,9 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Longer contracts are analyzed section by section instead of truncated
+MAX_RISK_CHARS = 10000
+
 
 class RiskAssessor(dspy.Module):
     """Assess risks in contracts using DSPy and rule-based analysis."""
@@ -85,6 +88,9 @@ class RiskAssessor(dspy.Module):
         """Perform comprehensive risk assessment of the contract."""
         
         try:
+            if len(parsed_doc.text) > MAX_RISK_CHARS:
+                return self._assess_long_contract(parsed_doc, contract_type)
+            
             # Get AI-powered risk assessment
             ai_risks = self._assess_with_dspy(parsed_doc, contract_type)
             
@@ -105,6 +111,20 @@ class RiskAssessor(dspy.Module):
             logger.error(f"Risk assessment failed: {str(e)}")
             return self._fallback_risk_assessment(parsed_doc)
     
+    def _assess_long_contract(
+        self, 
+        parsed_doc: ParsedDocument,
+        contract_type: Optional[str] = None
+    ) -> Tuple[List[RiskAssessment], float]:
+        """Assess every section of a long contract instead of its head and tail."""
+        # Imported here: the orchestrator builds on this module
+        from core.chains.analysis_orchestrator import AnalysisOrchestrator
+        
+        orchestrated = AnalysisOrchestrator(risk_assessor=self).analyze(
+            parsed_doc, modules=["risks"], contract_type=contract_type
+        )
+        return orchestrated.risks, orchestrated.overall_risk_score
+    
     def _assess_with_dspy(
         self, 
         parsed_doc: ParsedDocument,
@@ -383,7 +403,7 @@ class RiskAssessor(dspy.Module):
         
         return round(final_score, 1)
     
-    def _prepare_text_for_analysis(self, text: str, max_chars: int = 10000) -> str:
+    def _prepare_text_for_analysis(self, text: str, max_chars: int = MAX_RISK_CHARS) -> str:
         """Prepare text for DSPy analysis."""
         if len(text) <= max_chars:
             return text
@@ -0,0 +1,228 @@
+"""Single-pass section segmentation and clause classification.
+
+Contract text is tokenized once: one compiled pattern finds every heading
+and paragraph break in a single left-to-right scan, and each heading title
+is classified by one combined pattern holding every clause type as a named
+alternative. Adding clause types does not add passes over the document.
+
+Character offsets map to pages through the sorted page start offsets
+recorded by the parser (or the "--- Page N ---" markers PDF text keeps),
+so each lookup is a bisect instead of a rescan.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from models.document import ParsedDocument
+
+# Fallback page estimate when a document carries no page information
+CHARS_PER_PAGE = 2000
+
+# Section bodies longer than this are cut, matching the old pattern limit
+MAX_SECTION_CHARS = 2000
+
+# Shorter bodies are headings or cross-references, not clauses
+MIN_CLAUSE_CHARS = 50
+
+# Heading keywords per clause type, tried in this order at the heading title
+CLAUSE_HEADINGS: Dict[str, str] = {
+    "termination": r"termination|expiration|end\s+of\s+(?:the\s+)?agreement",
+    "liability": r"limitation\s+of\s+liability|liability|damages",
+    "confidentiality": r"confidential\w*|non-disclosure|proprietary",
+    "payment": r"payments?|compensation|fees|remuneration",
+    "warranty": r"warrant\w*|representations?|guarantee\w*",
+    "governing_law": r"governing\s+law|jurisdiction|applicable\s+law",
+}
+
+# Not part of an amount, date or reference ("$1.5", "3/4", "v2."), nor a
+# cross-reference running on from a sentence ("as set out in Section 5",
+# "and 3.2"); checked after the first character so every branch below starts
+# with a plain character class, which lets the regex engine skip ahead
+# between tokens
+_NOT_INLINE = r"(?<![\w.,$%/-].)(?<![a-z,][ \t].)"
+
+# Every token that can open or close a section, in one pattern:
+#   break     - blank line (raw text only; parsed text is whitespace-collapsed)
+#   line      - unnumbered line start; only a heading if its title classifies
+#   numbered  - "12.", "12.1", "Section 4", "ARTICLE IV" followed by a title,
+#               at a line start or inline in collapsed text
+_TOKENS = re.compile(
+    r"\n(?:(?P<break>)(?=[ \t]*\n)|(?P<line>[ \t]*)(?=[A-Za-z]))"
+    r"|(?P<numbered>(?:"
+    rf"\d{_NOT_INLINE}\d{{0,2}}(?:\.\d{{1,3}})*\.?"
+    rf"|[AS]{_NOT_INLINE}(?:RTICLE|rticle|ECTION|ection)\s+(?:\d{{1,3}}(?:\.\d{{1,3}})*|[IVXLC]+)\b\.?"
+    r")[ \t]*:?\s+)(?=[A-Z])"
+)
+_FIRST_LINE = re.compile(r"[ \t]*(?=[A-Za-z])")
+
+# One named group per clause type; `lastgroup` names the type that matched
+_CLASSIFIER = re.compile(
+    "|".join(f"(?P<{name}>(?:{pattern}))\\b" for name, pattern in CLAUSE_HEADINGS.items()),
+    re.IGNORECASE,
+)
+# Rest of the heading after the keyword: a Title Case title closed by "." or
+# ":" ("Payment Terms."), else a run of capitals ("LIMITATION OF LIABILITY")
+_TITLE_REST = re.compile(
+    r"(?:[ \t]+(?:and|of|the|&|[A-Z][\w&/-]*)){0,8}?[ \t]*[.:](?:\s+|$)"
+    r"|(?:[ \t]+[A-Z][A-Z&/-]+\b)*[\s.:\-]*"
+)
+
+_PAGE_MARKER = re.compile(r"---\s*Page\s+\d+\s*---")
+
+
+class PageIndex:
+    """Character offset -> 1-based page number in O(log pages)."""
+
+    def __init__(self, page_starts: Optional[Sequence[int]] = None):
+        # None means no page information: estimate from CHARS_PER_PAGE
+        self.page_starts = sorted(page_starts) if page_starts else None
+
+    @classmethod
+    def for_document(cls, parsed_doc: ParsedDocument) -> "PageIndex":
+        if parsed_doc.page_offsets:
+            return cls(parsed_doc.page_offsets)
+        return cls.from_text(parsed_doc.text)
+
+    @classmethod
+    def from_text(cls, text: str) -> "PageIndex":
+        """Index built from PDF page markers, or an estimate without them."""
+        markers = [match.start() for match in _PAGE_MARKER.finditer(text)]
+        if not markers:
+            return cls()
+        # Anything before the second marker belongs to page 1
+        return cls([0] + markers[1:])
+
+    def page_at(self, char_position: int) -> int:
+        if self.page_starts is None:
+            return max(1, char_position // CHARS_PER_PAGE + 1)
+        return max(1, bisect_right(self.page_starts, char_position))
+
+
+@dataclass
+class Section:
+    """A heading and the body that follows it, up to the next boundary."""
+    start: int                      # heading start
+    body_start: int
+    end: int
+    clause_type: Optional[str] = None
+    heading: str = ""
+
+
+@dataclass
+class SectionScan:
+    """Sections, clause classification and page lookup for one document."""
+    text: str
+    sections: List[Section]
+    boundaries: List[int]
+    pages: PageIndex
+    _lowered: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def lowered(self) -> Optional[str]:
+        """Lowercased text, computed once; None if lowering shifts offsets."""
+        if self._lowered is None:
+            lowered = self.text.lower()
+            # Some characters lowercase to two (e.g. "İ"); offsets would drift
+            self._lowered = lowered if len(lowered) == len(self.text) else ""
+        return self._lowered or None
+
+    def clauses(self, min_chars: int = MIN_CLAUSE_CHARS) -> List[Section]:
+        """Classified sections with a substantial body."""
+        return [
+            section for section in self.sections
+            if section.clause_type and len(self.body(section)) > min_chars
+        ]
+
+    def body(self, section: Section) -> str:
+        return self.text[section.body_start:section.end].strip()
+
+    def locate(self, snippet: str) -> Dict[str, int]:
+        """Offsets and page of `snippet` in the document.
+
+        Tries the first 100 characters exactly, then case-insensitively, then
+        the first long word among the first five; falls back to offset 0.
+        """
+        # Model output may keep line breaks the parser collapsed
+        needle = " ".join(snippet.split())[:100]
+        start = self.text.find(needle) if needle else -1
+
+        if start == -1 and needle:
+            lowered = self.lowered
+            if lowered is not None:
+                start = lowered.find(needle.lower())
+            else:
+                match = re.search(re.escape(needle), self.text, re.IGNORECASE)
+                start = match.start() if match else -1
+
+        if start == -1:
+            lowered = self.lowered
+            for word in snippet.split()[:5]:
+                if len(word) > 3:
+                    if lowered is not None:
+                        start = lowered.find(word.lower())
+                    else:
+                        match = re.search(re.escape(word), self.text, re.IGNORECASE)
+                        start = match.start() if match else -1
+                    if start != -1:
+                        break
+
+        start = max(start, 0)
+        return {
+            "start_char": start,
+            "end_char": min(start + len(snippet), len(self.text)),
+            "page": self.pages.page_at(start),
+        }
+
+
+def scan_sections(text: str, page_index: Optional[PageIndex] = None) -> SectionScan:
+    """Segment `text` into sections and classify their headings in one pass."""
+    boundaries: List[int] = []
+    candidates = []
+    first_line = _FIRST_LINE.match(text)
+    if first_line:
+        candidates.append((0, first_line.end(), "line"))
+
+    for token in _TOKENS.finditer(text):
+        kind = token.lastgroup
+        if kind == "break":
+            boundaries.append(token.start())
+            continue
+        start = token.start(kind)
+        if kind == "numbered":
+            boundaries.append(start)
+        candidates.append((start, token.end(), kind))
+
+    def next_boundary(position: int) -> int:
+        i = bisect_right(boundaries, position)
+        return boundaries[i] if i < len(boundaries) else len(text)
+
+    sections: List[Section] = []
+    for start, title_start, kind in candidates:
+        match = _CLASSIFIER.match(text, title_start)
+        if match is None:
+            # Unclassified numbered headings still segment the document
+            if kind == "numbered":
+                sections.append(Section(start, title_start, next_boundary(start)))
+            continue
+        body_start = _TITLE_REST.match(text, match.end()).end()
+        sections.append(Section(
+            start=start,
+            body_start=body_start,
+            end=min(next_boundary(body_start), body_start + MAX_SECTION_CHARS),
+            clause_type=match.lastgroup,
+            heading=text[title_start:body_start].strip(" \t\n.:-"),
+        ))
+
+    return SectionScan(
+        text=text,
+        sections=sections,
+        boundaries=boundaries,
+        pages=page_index or PageIndex.from_text(text),
+    )
+
+
+def scan_document(parsed_doc: ParsedDocument) -> SectionScan:
+    return scan_sections(parsed_doc.text, PageIndex.for_document(parsed_doc))
+
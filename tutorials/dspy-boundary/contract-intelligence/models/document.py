@@ -36,6 +36,7 @@ class ParsedDocument(BaseModel):
     word_count: int
     char_count: int
     sections: Dict[str, str] = Field(default_factory=dict)
+    page_offsets: List[int] = Field(default_factory=list)  # start char of each page in text
     parsed_at: datetime = Field(default_factory=datetime.now)
 
 
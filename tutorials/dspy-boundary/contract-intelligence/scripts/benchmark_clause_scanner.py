@@ -0,0 +1,172 @@
+"""Benchmark: per-type clause regexes vs the single-pass section scanner.
+
+Builds a synthetic contract of --size characters and times, on both the raw
+line-broken text and the whitespace-collapsed text ContractParser produces:
+
+- heading extraction: the six lazy DOTALL patterns ClauseExtractor used to
+  run over the lowercased document vs one scan_sections() pass;
+- clause location: the old find()/lower().find() lookup vs
+  SectionScan.locate() for --lookups model-style snippets;
+- page lookup: scan_sections() page index (bisect) for every clause.
+
+Usage:
+    python scripts/benchmark_clause_scanner.py               # 1 MB
+    python scripts/benchmark_clause_scanner.py --size 5000000 --lookups 500
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.modules.section_scanner import PageIndex, scan_sections
+
+HEADINGS = [
+    "Termination", "Limitation of Liability", "Confidentiality", "Payment Terms",
+    "Warranties", "Governing Law", "Definitions", "Services", "Insurance", "Notices",
+]
+SENTENCES = [
+    "The Provider shall perform the Services in a professional and workmanlike manner",
+    "Either party may terminate this Agreement upon thirty days written notice",
+    "Client shall pay all undisputed invoices within forty-five days of receipt",
+    "Neither party shall be liable for indirect or consequential damages",
+    "Each party shall protect the other party's confidential information",
+    "This Agreement shall be governed by the laws of the State of Delaware",
+]
+
+# The extraction patterns ClauseExtractor ran before the scanner
+LEGACY_PATTERNS = {
+    "termination": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:termination|expiration|end\s+of\s+agreement)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
+    "liability": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:liability|limitation\s+of\s+liability|damages)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
+    "confidentiality": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:confidential|non-disclosure|proprietary)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
+    "payment": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:payment|compensation|fees|remuneration)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
+    "warranty": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:warrant|representation|guarantee)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
+    "governing_law": r"(?:^|\n)\s*(?:\d+\.?\s*)?(?:governing\s+law|jurisdiction|applicable\s+law)[\s\.\:]+(.{0,2000}?)(?=\n\s*(?:\d+\.|\n|$))",
+}
+
+
+def synthetic_contract(size: int, seed: int) -> Tuple[str, List[int]]:
+    """Articles ("12. TERMINATION") with numbered sections ("12.3 Termination."),
+    a page every ~3000 chars; returns text and page starts."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    page_starts = [0]
+    length = 0
+    since_break = 0
+    article = section_number = 0
+    while length < size:
+        if section_number % 10 == 0:
+            article += 1
+            section_number = 0
+            heading = f"{article}. {rng.choice(HEADINGS).upper()}"
+        else:
+            heading = f"{article}.{section_number} {rng.choice(HEADINGS)}."
+        section_number += 1
+        # Reference numbers keep quotes unique, as real clauses are
+        body = ". ".join(
+            f"{rng.choice(SENTENCES)} (ref {rng.randrange(10 ** 6)})" for _ in range(rng.randint(2, 12))
+        ) + "."
+        section = f"{heading}\n{body}\n"
+        parts.append(section)
+        length += len(section)
+        since_break += len(section)
+        if since_break > 3000:
+            page_starts.append(length)
+            since_break = 0
+    return "".join(parts), page_starts
+
+
+def legacy_extract(text: str) -> int:
+    lowered = text.lower()
+    found = 0
+    for pattern in LEGACY_PATTERNS.values():
+        for match in re.finditer(pattern, lowered, re.IGNORECASE | re.MULTILINE | re.DOTALL):
+            if len(match.group(1).strip()) > 50:
+                found += 1
+    return found
+
+
+def legacy_locate(full_text: str, clause_text: str) -> Dict[str, int]:
+    start_pos = full_text.find(clause_text[:100])
+    if start_pos == -1:
+        start_pos = full_text.lower().find(clause_text[:100].lower())
+    if start_pos == -1:
+        for word in clause_text.split()[:5]:
+            if len(word) > 3:
+                pos = full_text.lower().find(word.lower())
+                if pos != -1:
+                    start_pos = pos
+                    break
+    start_pos = max(start_pos, 0)
+    return {"start_char": start_pos, "page": max(1, start_pos // 2000 + 1)}
+
+
+def model_snippets(text: str, count: int, seed: int) -> List[Tuple[str, int]]:
+    """Quotes as a model returns them (re-cased, re-wrapped, paraphrased) and their true offset."""
+    rng = random.Random(seed)
+    snippets = []
+    for i in range(count):
+        # Start on a word so the quote is unique enough to be found
+        start = text.find(" ", rng.randrange(0, max(1, len(text) - 400))) + 1
+        quote = text[start:start + 300]
+        if i % 3 == 0:
+            quote = quote.upper()
+        elif i % 3 == 1:
+            quote = quote.replace(" ", "\n", 3)
+        else:
+            quote = "Paraphrased: " + quote.lower()
+        snippets.append((quote, start))
+    return snippets
+
+
+def timed(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000, help="contract length in chars")
+    parser.add_argument("--lookups", type=int, default=200, help="clause locations to resolve")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    raw, raw_pages = synthetic_contract(args.size, args.seed)
+    collapsed = " ".join(raw.split())
+    print(f"contract: {len(raw):,} chars, {len(raw_pages)} pages")
+
+    for label, text, pages in (("raw", raw, raw_pages), ("parsed", collapsed, None)):
+        legacy_time, legacy_count = timed(lambda: legacy_extract(text))
+        scan_time, scan = timed(lambda: scan_sections(text, PageIndex(pages)))
+        print(
+            f"{label:>6} extract: legacy {legacy_time * 1000:9.1f} ms ({legacy_count} clauses)"
+            f" | scanner {scan_time * 1000:7.1f} ms ({len(scan.clauses())} clauses,"
+            f" {len(scan.sections)} sections)  x{legacy_time / scan_time:,.0f}"
+        )
+
+        snippets = model_snippets(text, args.lookups, args.seed)
+        legacy_time, legacy_found = timed(lambda: [legacy_locate(text, s) for s, _ in snippets])
+        locate_time, found = timed(lambda: [scan.locate(s) for s, _ in snippets])
+
+        def hits(locations: List[Dict[str, int]]) -> int:
+            return sum(loc["start_char"] == start for loc, (_, start) in zip(locations, snippets))
+
+        print(
+            f"{label:>6} locate:  legacy {legacy_time * 1000:9.1f} ms ({hits(legacy_found)} exact)"
+            f" | scanner {locate_time * 1000:7.1f} ms ({hits(found)} exact)"
+            f" of {args.lookups} snippets  x{legacy_time / locate_time:,.0f}"
+        )
+
+        clauses = scan.clauses()
+        page_time, _ = timed(lambda: [scan.pages.page_at(c.start) for c in clauses])
+        print(f"{label:>6} pages:   {page_time * 1e6 / max(1, len(clauses)):.2f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -60,6 +60,7 @@ class ContractParser:
         
         # Create chunks for processing
         chunks = self._create_chunks(text, page_texts)
+        page_offsets = self._page_offsets(text, page_texts)
         
         return ParsedDocument(
             filename=file_path.name,
@@ -69,7 +70,8 @@ class ContractParser:
             metadata=metadata,
             page_count=len(page_texts),
             word_count=len(text.split()),
-            char_count=len(text)
+            char_count=len(text),
+            page_offsets=page_offsets
         )
     
     def _extract_metadata(self, file_path: Path) -> DocumentMetadata:
@@ -207,6 +209,26 @@ class ContractParser:
         
         return text.strip()
     
+    def _page_offsets(self, text: str, page_texts: List[str]) -> List[int]:
+        """Start offset of each page in the cleaned document text."""
+        offsets = []
+        cursor = 0
+        
+        for page_text in page_texts:
+            page_clean = self._clean_text(page_text)
+            position = text.find(page_clean[:64], cursor) if page_clean else -1
+            
+            if position == -1:
+                # Page not found verbatim (e.g. blank page): assume it starts here
+                offsets.append(cursor)
+                continue
+            
+            offsets.append(position)
+            # Skip past this page so repeated page headers match the next one
+            cursor = position + max(1, len(page_clean) - 16)
+        
+        return offsets
+    
     def _create_chunks(self, text: str, page_texts: List[str]) -> List[DocumentChunk]:
         """Create overlapping chunks from text."""
         chunks = []
@@ -0,0 +1,42 @@
+"""Shared setup for the unit tests.
+
+Unit tests stub every DSPy predictor, so they only need the names the modules
+touch at import and construction time. When dspy is not installed a minimal
+stand-in is registered so the suite still runs; any predictor a test forgets
+to stub fails loudly instead of reaching an LM.
+"""
+
+import sys
+import types
+
+try:
+    import dspy  # noqa: F401
+except ImportError:
+    def _field(**kwargs):
+        return None
+
+    class _Predictor:
+        def __init__(self, signature, **kwargs):
+            self.signature = signature
+
+        def __call__(self, **inputs):
+            raise RuntimeError(f"Unstubbed predictor for {self.signature.__name__}")
+
+    class _LM:
+        def __init__(self, model=None, **kwargs):
+            self.model = model
+
+    class _Module:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    stand_in = types.ModuleType("dspy")
+    stand_in.Signature = type("Signature", (), {})
+    stand_in.InputField = _field
+    stand_in.OutputField = _field
+    stand_in.Module = _Module
+    stand_in.LM = _LM
+    stand_in.configure = lambda **kwargs: None
+    stand_in.ChainOfThought = _Predictor
+    stand_in.Predict = _Predictor
+    sys.modules["dspy"] = stand_in
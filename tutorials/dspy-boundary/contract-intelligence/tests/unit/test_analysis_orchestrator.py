@@ -0,0 +1,354 @@
+"""Unit tests for the map-reduce analysis orchestrator.
+
+The DSPy predictors are replaced with stubs that answer from the chunk text
+they receive, so no LM is configured and no request leaves the process.
+"""
+
+import json
+import re
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.chains.analysis_orchestrator import (  # noqa: E402
+    AnalysisOrchestrator,
+    chunk_by_sections,
+    find_section_starts,
+)
+from core.modules.clause_extractor import MAX_CLAUSE_CHARS, ClauseExtractor  # noqa: E402
+from core.modules.compliance_checker import ComplianceChecker  # noqa: E402
+from core.modules.contract_analyzer import MAX_ANALYSIS_CHARS, ContractAnalyzer  # noqa: E402
+from core.modules.contract_summarizer import ContractSummarizer  # noqa: E402
+from core.modules.key_terms_extractor import KeyTermsExtractor  # noqa: E402
+from core.modules.obligation_tracker import ObligationTracker  # noqa: E402
+from core.modules.risk_assessor import RiskAssessor  # noqa: E402
+from models.document import DocumentMetadata, ParsedDocument  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+TITLES = ["SERVICES", "PAYMENT TERMS", "CONFIDENTIALITY", "TERMINATION", "GOVERNING LAW"]
+SENTENCE = re.compile(r"Clause \d+\.\d+ [^.]*\.")
+SHARED_RISK = "Uncapped indemnity obligations for the Provider"
+# Words, not digits: RiskAssessor's dedupe key ignores short tokens
+ORDINALS = ["first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth",
+            "ninth", "tenth", "eleventh", "twelfth"]
+
+
+def make_contract(sections: int, sentences: int = 8) -> str:
+    """Numbered sections whose sentences are unique, so each one locates exactly."""
+    parts = []
+    for n in range(1, sections + 1):
+        body = " ".join(
+            f"Clause {n}.{k} requires the Provider to deliver item {n}-{k} on schedule."
+            for k in range(1, sentences + 1)
+        )
+        parts.append(f"{n}. {TITLES[n % len(TITLES)]}. {body}")
+    return " ".join(parts)
+
+
+def make_document(text: str) -> ParsedDocument:
+    return ParsedDocument(
+        filename="long_contract.txt",
+        file_path="/tmp/long_contract.txt",
+        text=text,
+        chunks=[],
+        metadata=DocumentMetadata(
+            file_size=len(text), file_type="txt", created_at=0.0, modified_at=0.0, mime_type="text/plain"
+        ),
+        page_count=1,
+        word_count=len(text.split()),
+        char_count=len(text),
+    )
+
+
+class StubPredictor:
+    """Stands in for a dspy predictor: records each prompt and answers from it."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def __call__(self, **inputs):
+        text = inputs["contract_text"]
+        with self._lock:
+            self.prompts.append(text)
+        return SimpleNamespace(**self.answer(text))
+
+
+def clause_answer(text):
+    return {
+        "extracted_clauses": json.dumps(
+            [{"id": "s", "type": "delivery", "text": sentence} for sentence in SENTENCE.findall(text)]
+        ),
+        "unusual_clauses": "[]",
+    }
+
+
+def risk_answer(text):
+    section = int(re.search(r"Clause (\d+)\.", text).group(1))
+    ordinal = ORDINALS[(section - 1) % len(ORDINALS)]
+    return {
+        "risk_factors": json.dumps([
+            {"description": SHARED_RISK, "severity": "high"},
+            {"description": f"Schedule exposure from the {ordinal} section", "severity": "low"},
+        ]),
+        "mitigation_recommendations": "[]",
+    }
+
+
+def analysis_answer(text):
+    return {
+        "contract_type": "Service Agreement",
+        "parties": json.dumps([{"name": "Acme Corp", "role": "provider"}]),
+        "key_dates": "{}",
+        "key_terms": "{}",
+        "executive_summary": f"Summary of {SENTENCE.search(text).group(0)}",
+        "primary_type": "Service Agreement",
+        "sub_categories": "[]",
+        "industry_sector": "Technology",
+        "complexity_level": "medium",
+        "standard_vs_custom": "standard",
+        "legal_concerns": "[]",
+        "enforceability_assessment": "Enforceable",
+        "missing_clauses": "[]",
+        "revision_suggestions": "[]",
+    }
+
+
+def obligation_answer(text):
+    return {
+        "obligations": json.dumps(
+            [{"party": "Provider", "description": sentence} for sentence in SENTENCE.findall(text)[:2]]
+        ),
+        "payment_obligations": "[]",
+        "deliverables": "[]",
+    }
+
+
+def key_terms_answer(text):
+    return {
+        "parties_info": json.dumps([{"name": "Acme Corp", "role": "provider"}]),
+        "financial_terms": "{}",
+        "important_dates": "{}",
+        "jurisdiction_info": "{}",
+    }
+
+
+def compliance_answer(text):
+    return {
+        "compliance_status": "needs-review",
+        "violations": "[]",
+        "recommendations": json.dumps([f"Review {SENTENCE.search(text).group(0)}"]),
+    }
+
+
+def summary_answer(text):
+    return {
+        "executive_summary": f"Summary of {text[:40]}",
+        "key_highlights": "[]",
+        "action_items": "[]",
+        "red_flags": "[]",
+    }
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = AnalysisOrchestrator(max_concurrency=4, chunk_chars=2000, chunk_overlap=300)
+    orchestrator.clause_extractor.extractor = StubPredictor(clause_answer)
+    orchestrator.risk_assessor.assessor = StubPredictor(risk_answer)
+    return orchestrator
+
+
+class TestChunking:
+    """Chunk boundaries follow sections and neighbouring chunks overlap."""
+
+    def test_chunks_cover_text_within_budget(self):
+        text = make_contract(12)
+        chunks = chunk_by_sections(text, max_chars=2000, overlap=300)
+
+        assert len(chunks) > 2
+        assert chunks[0].start_char == 0
+        assert chunks[-1].end_char == len(text)
+        for i, chunk in enumerate(chunks):
+            assert chunk.index == i
+            assert chunk.text == text[chunk.start_char:chunk.end_char]
+            assert len(chunk.text) <= 2000
+
+    def test_chunks_end_on_section_starts(self):
+        text = make_contract(12)
+        section_starts = set(find_section_starts(text))
+        chunks = chunk_by_sections(text, max_chars=2000, overlap=300)
+
+        for chunk in chunks[:-1]:
+            assert chunk.end_char in section_starts
+
+    def test_neighbouring_chunks_overlap_at_sentence_start(self):
+        text = make_contract(12)
+        chunks = chunk_by_sections(text, max_chars=2000, overlap=300)
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert 0 < previous.end_char - chunk.start_char <= 300
+            assert chunk.text.startswith("Clause ")
+
+    def test_no_overlap(self):
+        text = make_contract(12)
+        chunks = chunk_by_sections(text, max_chars=2000, overlap=0)
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk.start_char == previous.end_char
+
+    def test_long_section_split_at_sentence_end(self):
+        text = make_contract(1, sentences=60)
+        chunks = chunk_by_sections(text, max_chars=2000, overlap=300)
+
+        assert len(chunks) > 1
+        for chunk in chunks[:-1]:
+            assert text[:chunk.end_char].endswith(". ")
+
+    def test_overlap_must_be_below_half_the_chunk(self):
+        with pytest.raises(ValueError):
+            chunk_by_sections(make_contract(2), max_chars=2000, overlap=1000)
+
+
+class TestReduce:
+    """Per-chunk results are mapped back onto the whole document."""
+
+    def test_clause_offsets_shifted_to_document(self, orchestrator):
+        doc = make_document(make_contract(12))
+        result = orchestrator.analyze(doc, modules=["clauses"])
+
+        ai_clauses = [c for c in result.clauses if c.clause_type == "delivery"]
+        assert ai_clauses
+        for clause in ai_clauses:
+            start, end = clause.location["start_char"], clause.location["end_char"]
+            assert doc.text[start:end] == clause.text
+            assert re.match(r"c\d+_", clause.clause_id)
+
+    def test_overlapping_clauses_deduplicated(self, orchestrator):
+        doc = make_document(make_contract(12))
+        result = orchestrator.analyze(doc, modules=["clauses"])
+
+        prompts = orchestrator.clause_extractor.extractor.prompts
+        returned = [s for prompt in prompts for s in SENTENCE.findall(prompt)]
+        assert len(returned) > len(set(returned)), "overlap should repeat some sentences"
+
+        texts = [c.text for c in result.clauses if c.clause_type == "delivery"]
+        assert sorted(texts) == sorted(set(SENTENCE.findall(doc.text)))
+
+    def test_risks_deduplicated_across_chunks(self, orchestrator):
+        doc = make_document(make_contract(12))
+        result = orchestrator.analyze(doc, modules=["risks"])
+
+        descriptions = [risk.description for risk in result.risks]
+        assert len(result.chunks) > 2
+        assert descriptions.count(SHARED_RISK) == 1
+        assert sum(d.startswith("Schedule exposure") for d in descriptions) == len(result.chunks)
+
+
+class TestContractAnalyzerRouting:
+    """ContractAnalyzer hands long contracts to the orchestrator."""
+
+    def _stubbed_analyzer(self):
+        analyzer = ContractAnalyzer()
+        analyzer.analyzer = StubPredictor(analysis_answer)
+        analyzer.classifier = StubPredictor(analysis_answer)
+        analyzer.legal_reviewer = StubPredictor(analysis_answer)
+        return analyzer
+
+    def test_long_contract_analyzed_by_section(self):
+        analyzer = self._stubbed_analyzer()
+        doc = make_document(make_contract(40))
+        assert len(doc.text) > MAX_ANALYSIS_CHARS
+
+        analysis = analyzer.analyze_contract(doc)
+
+        prompts = analyzer.analyzer.prompts
+        assert len(prompts) > 1
+        assert not any("CONTENT TRUNCATED" in prompt for prompt in prompts)
+        assert analysis.contract_type == "Service Agreement"
+        assert analysis.document is doc
+
+    def test_short_contract_analyzed_whole(self):
+        analyzer = self._stubbed_analyzer()
+        doc = make_document(make_contract(3))
+
+        analyzer.analyze_contract(doc)
+
+        assert analyzer.analyzer.prompts == [doc.text]
+
+
+def stubbed(module, attribute, answer):
+    setattr(module, attribute, StubPredictor(answer))
+    return module
+
+
+class TestModuleRouting:
+    """Every module entry point hands long contracts to the orchestrator."""
+
+    ENTRY_POINTS = {
+        "clauses": (lambda: stubbed(ClauseExtractor(), "extractor", clause_answer),
+                    "extractor", lambda m, doc: m.extract_clauses(doc)),
+        "risks": (lambda: stubbed(RiskAssessor(), "assessor", risk_answer),
+                  "assessor", lambda m, doc: m.assess_risks(doc)),
+        "obligations": (lambda: stubbed(ObligationTracker(), "tracker", obligation_answer),
+                        "tracker", lambda m, doc: m.track_obligations(doc)),
+        "key_terms": (lambda: stubbed(KeyTermsExtractor(), "extractor", key_terms_answer),
+                      "extractor", lambda m, doc: m.extract_key_terms(doc)),
+        "compliance": (lambda: stubbed(ComplianceChecker(), "checker", compliance_answer),
+                       "checker", lambda m, doc: m.check_compliance(doc, regulations=["GDPR"])),
+        "summary": (lambda: stubbed(ContractSummarizer(), "summarizer", summary_answer),
+                    "summarizer", lambda m, doc: m.generate_summary(doc)),
+    }
+
+    @pytest.mark.parametrize("entry_point", ENTRY_POINTS)
+    def test_long_contract_analyzed_by_section(self, entry_point):
+        build, attribute, call = self.ENTRY_POINTS[entry_point]
+        module = build()
+        doc = make_document(make_contract(40))
+
+        result = call(module, doc)
+
+        prompts = getattr(module, attribute).prompts
+        assert len(prompts) > 1
+        assert not any("CONTENT TRUNCATED" in prompt for prompt in prompts)
+        assert result
+
+    @pytest.mark.parametrize("entry_point", ENTRY_POINTS)
+    def test_short_contract_analyzed_whole(self, entry_point):
+        build, attribute, call = self.ENTRY_POINTS[entry_point]
+        module = build()
+        doc = make_document(make_contract(3))
+
+        call(module, doc)
+
+        assert getattr(module, attribute).prompts == [doc.text]
+
+    def test_long_contract_clauses_located_in_document(self):
+        extractor = stubbed(ClauseExtractor(), "extractor", clause_answer)
+        doc = make_document(make_contract(40))
+        assert len(doc.text) > MAX_CLAUSE_CHARS
+
+        clauses = extractor.extract_clauses(doc)
+
+        found = {c.text for c in clauses if c.clause_type == "delivery"}
+        assert found == set(SENTENCE.findall(doc.text))
+        for clause in clauses:
+            if clause.clause_type == "delivery":
+                start, end = clause.location["start_char"], clause.location["end_char"]
+                assert doc.text[start:end] == clause.text
+
+    def test_long_contract_risks_scored(self):
+        assessor = stubbed(RiskAssessor(), "assessor", risk_answer)
+        doc = make_document(make_contract(40))
+
+        risks, score = assessor.assess_risks(doc)
+
+        descriptions = [risk.description for risk in risks]
+        assert descriptions.count(SHARED_RISK) == 1
+        assert 0 <= score <= 10
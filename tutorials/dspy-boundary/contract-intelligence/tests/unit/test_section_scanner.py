@@ -0,0 +1,200 @@
+"""Unit tests for single-pass section scanning and page lookup."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.modules.section_scanner import (  # noqa: E402
+    CHARS_PER_PAGE,
+    PageIndex,
+    scan_document,
+    scan_sections,
+)
+from models.document import DocumentMetadata, ParsedDocument  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+RAW_CONTRACT = """MASTER SERVICES AGREEMENT
+
+1. Payment Terms. The Client shall pay all undisputed invoices within thirty days of receipt by wire transfer.
+
+2. Confidentiality. Each party shall keep the other party's proprietary information secret for five years.
+
+3. Definitions. Capitalised terms have the meanings given to them in the schedules to this agreement.
+
+LIMITATION OF LIABILITY
+Neither party is liable for indirect damages arising out of this agreement under any theory.
+"""
+COLLAPSED_CONTRACT = " ".join(RAW_CONTRACT.split())
+
+
+def classified(scan):
+    return [(section.clause_type, section.heading) for section in scan.sections if section.clause_type]
+
+
+def make_document(text, page_offsets=()):
+    return ParsedDocument(
+        filename="contract.pdf",
+        file_path="/tmp/contract.pdf",
+        text=text,
+        chunks=[],
+        metadata=DocumentMetadata(
+            file_size=len(text), file_type="pdf", created_at=0.0, modified_at=0.0, mime_type="application/pdf"
+        ),
+        page_count=max(len(page_offsets), 1),
+        word_count=len(text.split()),
+        char_count=len(text),
+        page_offsets=list(page_offsets),
+    )
+
+
+class TestHeadings:
+    """Headings are found at line starts in raw text and inline once collapsed."""
+
+    def test_raw_text_headings(self):
+        scan = scan_sections(RAW_CONTRACT)
+
+        assert classified(scan) == [
+            ("payment", "Payment Terms"),
+            ("confidentiality", "Confidentiality"),
+            ("liability", "LIMITATION OF LIABILITY"),
+        ]
+        bodies = {section.clause_type: scan.body(section) for section in scan.clauses()}
+        assert bodies["payment"].startswith("The Client shall pay")
+        assert bodies["payment"].endswith("wire transfer.")
+        assert bodies["liability"].startswith("Neither party")
+
+    def test_collapsed_text_numbered_headings(self):
+        scan = scan_sections(COLLAPSED_CONTRACT)
+
+        # Unnumbered headings need a line start, which collapsing removes
+        assert classified(scan) == [("payment", "Payment Terms"), ("confidentiality", "Confidentiality")]
+        payment = scan.clauses()[0]
+        # The next numbered heading ends the section, classified or not
+        assert scan.body(payment).endswith("wire transfer.")
+
+    def test_unclassified_numbered_heading_still_segments(self):
+        scan = scan_sections(COLLAPSED_CONTRACT)
+
+        definitions = [section for section in scan.sections if section.clause_type is None]
+        assert [COLLAPSED_CONTRACT[s.start:s.body_start] for s in definitions] == ["3. "]
+
+    def test_paragraph_break_ends_section_in_raw_text(self):
+        scan = scan_sections(RAW_CONTRACT)
+        confidentiality = next(s for s in scan.sections if s.clause_type == "confidentiality")
+
+        assert RAW_CONTRACT[confidentiality.end:].startswith("\n\n3. Definitions")
+
+
+class TestInlineFalsePositives:
+    """Amounts and cross-references inside a sentence are not headings."""
+
+    @pytest.mark.parametrize("sentence", [
+        "The fee is $1.5 Payment Terms apply monthly.",
+        "Interest accrues at 2.5 Payment percent per month.",
+        "The obligations set out in Section 5 Confidentiality survive termination.",
+        "See clauses 4.1 and 3.2 Warranty of this agreement for details.",
+        "Subject to Article IV Liability caps, the Provider indemnifies the Client.",
+        "Version v2. Termination notices are governed elsewhere.",
+    ])
+    def test_inline_tokens_ignored(self, sentence):
+        text = f"1. Services. The Provider delivers the services. {sentence} 2. Termination. Either party may terminate."
+        scan = scan_sections(text)
+
+        assert classified(scan) == [("termination", "Termination")]
+
+    def test_sentence_start_heading_kept(self):
+        text = "1. Services. The Provider delivers the services. 2. Payment Terms. Fees are due monthly."
+        scan = scan_sections(text)
+
+        assert classified(scan) == [("payment", "Payment Terms")]
+
+
+class TestPageIndex:
+    """Offsets map to pages by bisect over page starts."""
+
+    def test_bisect_over_page_starts(self):
+        index = PageIndex([0, 100, 250])
+
+        assert [index.page_at(p) for p in (0, 99, 100, 249, 250, 10_000)] == [1, 1, 2, 2, 3, 3]
+
+    def test_unsorted_starts_are_sorted(self):
+        assert PageIndex([250, 0, 100]).page_at(120) == 2
+
+    def test_page_markers_fallback(self):
+        text = "--- Page 1 --- Intro text. --- Page 2 --- Payment text. --- Page 3 --- Law text."
+        index = PageIndex.from_text(text)
+
+        assert index.page_at(text.index("Intro")) == 1
+        assert index.page_at(text.index("Payment")) == 2
+        assert index.page_at(text.index("Law")) == 3
+
+    def test_estimate_without_page_information(self):
+        index = PageIndex.from_text("no markers here")
+
+        assert index.page_starts is None
+        assert index.page_at(0) == 1
+        assert index.page_at(CHARS_PER_PAGE * 2 + 5) == 3
+
+    def test_document_offsets_preferred_over_markers(self):
+        text = "--- Page 1 --- first. --- Page 2 --- second."
+        doc = make_document(text, page_offsets=[0, text.index("second")])
+
+        assert scan_document(doc).pages.page_at(text.index("--- Page 2")) == 1
+        assert scan_document(make_document(text)).pages.page_at(text.index("--- Page 2")) == 2
+
+    def test_locate_reports_page(self):
+        text = "--- Page 1 --- Intro. --- Page 2 --- The Client shall pay all invoices."
+        scan = scan_sections(text)
+
+        # Model output can keep line breaks the parser collapsed
+        location = scan.locate("The Client shall pay\nall invoices.")
+        assert location["start_char"] == text.index("The Client")
+        assert location["page"] == 2
+
+
+class TestParserPageOffsets:
+    """ContractParser records where each page starts in the cleaned text."""
+
+    HEADER = "ACME CORPORATION - MASTER SERVICES AGREEMENT - CONFIDENTIAL - DRAFT 2024 - "
+    PAGES = [
+        HEADER + "The Provider shall deliver the services described in Schedule A. " * 3,
+        "",
+        HEADER + "Fees are payable monthly in arrears against a valid invoice. " * 3,
+        "   \n ",
+        HEADER + "This agreement is governed by the laws of the State of New York. " * 3,
+    ]
+
+    @pytest.fixture
+    def parser(self):
+        contract_parser = pytest.importorskip("services.contract_parser")
+        return contract_parser.ContractParser()
+
+    def _parse(self, parser):
+        # The same layout _parse_pdf produces
+        raw = "\n".join(f"\n--- Page {i} ---\n{page}" for i, page in enumerate(self.PAGES, start=1))
+        text = parser._clean_text(raw)
+        return text, parser._page_offsets(text, self.PAGES)
+
+    def test_repeated_page_headers(self, parser):
+        text, offsets = self._parse(parser)
+
+        assert len(offsets) == len(self.PAGES)
+        assert offsets == sorted(offsets)
+        # A header longer than the 64-character probe still lands on its own page
+        for page in (0, 2, 4):
+            assert text.startswith(self.HEADER.strip(), offsets[page])
+        assert len(set(offsets[0::2])) == 3
+
+    def test_blank_pages_do_not_shift_later_pages(self, parser):
+        text, offsets = self._parse(parser)
+        index = PageIndex(offsets)
+
+        assert offsets[0] < offsets[1] <= offsets[2]
+        assert offsets[2] < offsets[3] <= offsets[4]
+        assert index.page_at(text.index("Schedule A")) == 1
+        assert index.page_at(text.index("Fees are payable")) == 3
+        assert index.page_at(text.index("State of New York")) == 5
@@ -7,11 +7,13 @@ identical (~8,000 parameters), but PyTorch replaces our custom Value autograd
 engine with optimized C++ tensor operations.
 
 Usage:  uv run python microgpt_pytorch.py
+        uv run python microgpt_pytorch.py --benchmark   # also time training and generation
 
 Based on Andrej Karpathy's minimal GPT implementation.
 """
 
 import os
+import sys
 import math
 import random
 from datetime import datetime
@@ -116,6 +118,34 @@ n_layer = 1
 block_size = 16
 head_dim = n_embd // n_head
 
+# Causal mask, built once: position i may attend to positions j <= i
+# (same as pure-Python: we only loop over past keys)
+causal_mask = torch.ones(block_size, block_size, dtype=torch.bool, device=device).tril()
+
+
+class KVCache:
+    """Keys and values of past positions, for incremental decoding.
+
+    Same idea as the pure-Python keys/values lists passed to gpt(): each
+    decode step computes K and V for the NEW token only and attends over
+    everything stored so far. Preallocated as
+    (n_layer, batch, n_head, block_size, head_dim) so a step just writes
+    one slot per layer.
+    """
+
+    def __init__(self, batch, device):
+        shape = (n_layer, batch, n_head, block_size, head_dim)
+        self.k = torch.zeros(shape, device=device)
+        self.v = torch.zeros(shape, device=device)
+        self.length = 0  # positions stored so far
+
+    def update(self, layer_idx, k, v):
+        """Store (batch, n_head, seq_len, head_dim) k/v; return all keys/values so far."""
+        end = self.length + k.size(2)
+        self.k[layer_idx, :, :, self.length:end] = k
+        self.v[layer_idx, :, :, self.length:end] = v
+        return self.k[layer_idx, :, :, :end], self.v[layer_idx, :, :, :end]
+
 
 class MicroGPT(nn.Module):
     """A minimal GPT model.
@@ -139,7 +169,7 @@ class MicroGPT(nn.Module):
         self.pre_norm = RMSNorm(n_embd)
 
         # Transformer layers
-        self.layers = nn.ModuleList([TransformerBlock() for _ in range(n_layer)])
+        self.layers = nn.ModuleList([TransformerBlock(i) for i in range(n_layer)])
 
         # Output head
         self.lm_head = nn.Linear(n_embd, vocab_size, bias=False)
@@ -153,36 +183,48 @@ class MicroGPT(nn.Module):
         elif isinstance(module, nn.Embedding):
             nn.init.normal_(module.weight, mean=0.0, std=0.08)
 
-    def forward(self, token_ids, pos_ids):
-        """Forward pass for a sequence of tokens.
+    def forward(self, token_ids, pos_ids, attn_mask=None, kv_cache=None):
+        """Forward pass for one sequence or a batch of sequences.
 
         Args:
-            token_ids: (seq_len,) token indices
-            pos_ids:   (seq_len,) position indices
+            token_ids: (seq_len,) or (batch, seq_len) token indices
+            pos_ids:   position indices, same shape as token_ids
+            attn_mask: optional (batch, 1, seq_len, seq_len) boolean mask,
+                       True where attention is allowed (default: causal)
+            kv_cache:  optional KVCache; token_ids are then the NEW tokens
+                       following the kv_cache.length cached positions
 
         Returns:
-            logits: (seq_len, vocab_size) prediction scores
+            logits: (seq_len, vocab_size) or (batch, seq_len, vocab_size)
         """
+        single = token_ids.dim() == 1
+        if single:
+            token_ids, pos_ids = token_ids.unsqueeze(0), pos_ids.unsqueeze(0)
+
         # Token + position embedding (same as pure-Python: tok_emb + pos_emb)
-        x = self.wte(token_ids) + self.wpe(pos_ids)  # (seq_len, n_embd)
+        x = self.wte(token_ids) + self.wpe(pos_ids)  # (batch, seq_len, n_embd)
 
         # Pre-norm before transformer blocks (same as pure-Python)
         x = self.pre_norm(x)
 
         # Transformer blocks
         for layer in self.layers:
-            x = layer(x)
+            x = layer(x, attn_mask, kv_cache)
+        if kv_cache is not None:
+            kv_cache.length += token_ids.size(1)
 
         # Project to vocabulary (same as: logits = linear(x, lm_head))
-        logits = self.lm_head(x)  # (seq_len, vocab_size)
-        return logits
+        logits = self.lm_head(x)  # (batch, seq_len, vocab_size)
+        return logits[0] if single else logits
 
 
 class TransformerBlock(nn.Module):
     """One transformer block: Attention + MLP, both with residual connections."""
 
-    def __init__(self):
+    def __init__(self, layer_idx=0):
         super().__init__()
+        self.layer_idx = layer_idx  # slot in the KV cache
+
         # Attention
         self.norm1 = RMSNorm(n_embd)
         self.attn_wq = nn.Linear(n_embd, n_embd, bias=False)
@@ -195,7 +237,7 @@ class TransformerBlock(nn.Module):
         self.mlp_fc1 = nn.Linear(n_embd, 4 * n_embd, bias=False)
         self.mlp_fc2 = nn.Linear(4 * n_embd, n_embd, bias=False)
 
-    def forward(self, x):
+    def forward(self, x, attn_mask=None, kv_cache=None):
         """
         Same structure as pure-Python:
             x_res = x
@@ -206,42 +248,39 @@ class TransformerBlock(nn.Module):
             x = rmsnorm(x)
             x = mlp(x)        # linear -> relu -> linear
             x = x + x_res     # residual
+
+        x is (batch, seq_len, n_embd); attn_mask and kv_cache as in MicroGPT.forward.
         """
-        seq_len = x.size(0)
+        batch, seq_len, _ = x.shape
 
         # --- Attention block ---
         x_res = x
         x_norm = self.norm1(x)
 
-        # Q, K, V projections (same as: q = linear(x, wq))
-        q = self.attn_wq(x_norm)  # (seq_len, n_embd)
-        k = self.attn_wk(x_norm)
-        v = self.attn_wv(x_norm)
-
-        # Reshape for multi-head: (seq_len, n_head, head_dim)
-        q = q.view(seq_len, n_head, head_dim)
-        k = k.view(seq_len, n_head, head_dim)
-        v = v.view(seq_len, n_head, head_dim)
-
-        # Attention scores: Q*K^T / sqrt(d) for each head
-        # (n_head, seq_len, head_dim) @ (n_head, head_dim, seq_len)
-        q = q.transpose(0, 1)  # (n_head, seq_len, head_dim)
-        k = k.transpose(0, 1)
-        v = v.transpose(0, 1)
-
-        attn = torch.matmul(q, k.transpose(-2, -1)) / math.sqrt(head_dim)
-
-        # Causal mask: each token can only attend to previous tokens
-        # (same as pure-Python: we only loop over past keys)
-        mask = torch.triu(torch.ones(seq_len, seq_len, device=x.device), diagonal=1).bool()
-        attn = attn.masked_fill(mask, float('-inf'))
-
-        # Softmax -> weighted sum of values
-        attn = F.softmax(attn, dim=-1)
-        out = torch.matmul(attn, v)  # (n_head, seq_len, head_dim)
+        # Q, K, V projections (same as: q = linear(x, wq)), split into heads:
+        # (batch, seq_len, n_embd) -> (batch, n_head, seq_len, head_dim)
+        q = self.attn_wq(x_norm).view(batch, seq_len, n_head, head_dim).transpose(1, 2)
+        k = self.attn_wk(x_norm).view(batch, seq_len, n_head, head_dim).transpose(1, 2)
+        v = self.attn_wv(x_norm).view(batch, seq_len, n_head, head_dim).transpose(1, 2)
+
+        # softmax(Q*K^T / sqrt(d)) @ V for every head in one fused kernel.
+        # is_causal applies the causal mask without materializing it.
+        if kv_cache is not None:
+            # New queries attend over cached + new keys (same as pure-Python:
+            # keys[li].append(k), then attend over all of keys[li])
+            past = kv_cache.length
+            k, v = kv_cache.update(self.layer_idx, k, v)
+            if attn_mask is None and seq_len > 1:
+                attn_mask = causal_mask[past:past + seq_len, :past + seq_len]
+            # A single new token may attend to every cached position: no mask
+            out = F.scaled_dot_product_attention(q, k, v, attn_mask=attn_mask)
+        elif attn_mask is None:
+            out = F.scaled_dot_product_attention(q, k, v, is_causal=True)
+        else:
+            out = F.scaled_dot_product_attention(q, k, v, attn_mask=attn_mask)
 
         # Concatenate heads and project
-        out = out.transpose(0, 1).contiguous().view(seq_len, n_embd)
+        out = out.transpose(1, 2).reshape(batch, seq_len, n_embd)
         x = self.attn_wo(out) + x_res  # residual connection
 
         # --- MLP block ---
@@ -268,6 +307,95 @@ print(f"    - Context length: {block_size}")
 # ============================================================================
 print(f"\n[5/7] Training model...")
 
+# --- Batched data: pack names into padded (rows, block_size) tensors ---
+# The pure-Python version trains on one name per step. Here several names
+# share a row of block_size tokens ("packing"), rows are stacked into
+# (batch_size, block_size) tensors, and every step trains on a whole batch.
+#
+# Each name keeps its own positions (0, 1, 2, ...) and may only attend to
+# earlier tokens of the SAME name, so the model sees exactly what it would
+# see training one name at a time. Unused slots at the end of a row are
+# padding: their targets are IGNORE_INDEX, so they add nothing to the loss.
+IGNORE_INDEX = -100
+batch_size = 32
+
+
+def pack_documents(docs, block_size):
+    """Greedily pack tokenized names into rows of block_size tokens.
+
+    Returns input_ids, target_ids, pos_ids and doc_ids, each a
+    (rows, block_size) tensor. doc_ids numbers the names within a row
+    (-1 on padding) and is used to build the attention mask.
+    """
+    stoi = {ch: i for i, ch in enumerate(uchars)}
+    rows = []
+    row = []   # (input tokens, target tokens) of the names in the current row
+    used = 0
+    for doc in docs:
+        tokens = [BOS] + [stoi[ch] for ch in doc] + [BOS]
+        n = min(block_size, len(tokens) - 1)
+        if used + n > block_size:
+            rows.append(row)
+            row, used = [], 0
+        row.append((tokens[:n], tokens[1:n + 1]))
+        used += n
+    if row:
+        rows.append(row)
+
+    shape = (len(rows), block_size)
+    input_ids = torch.full(shape, BOS, dtype=torch.long)
+    target_ids = torch.full(shape, IGNORE_INDEX, dtype=torch.long)
+    pos_ids = torch.zeros(shape, dtype=torch.long)
+    doc_ids = torch.full(shape, -1, dtype=torch.long)
+    for r, row in enumerate(rows):
+        start = 0
+        for d, (inputs, targets) in enumerate(row):
+            end = start + len(inputs)
+            input_ids[r, start:end] = torch.tensor(inputs)
+            target_ids[r, start:end] = torch.tensor(targets)
+            pos_ids[r, start:end] = torch.arange(len(inputs))
+            doc_ids[r, start:end] = d
+            start = end
+    return input_ids, target_ids, pos_ids, doc_ids
+
+
+def packed_attention_mask(doc_ids):
+    """(batch, 1, T, T) mask: causal AND within the same name."""
+    same_doc = doc_ids[:, :, None] == doc_ids[:, None, :]
+    return (same_doc & causal_mask).unsqueeze(1)
+
+
+def batches(data, batch_size, generator=None):
+    """Yield shuffled batches of packed rows forever (one epoch per pass)."""
+    rows = data[0].size(0)
+    while True:
+        order = torch.randperm(rows, generator=generator, device="cpu").to(device)
+        for i in range(0, rows - batch_size + 1, batch_size):
+            idx = order[i:i + batch_size]
+            yield tuple(t[idx] for t in data)
+
+
+train_data = tuple(t.to(device) for t in pack_documents(docs, block_size))
+num_targets = int((train_data[1] != IGNORE_INDEX).sum())
+print(f"  ✓ Packed {len(docs):,} names into {train_data[0].size(0):,} rows of {block_size} tokens "
+      f"({num_targets / train_data[1].numel():.0%} filled)")
+
+
+def train_step(model, optimizer, batch):
+    """One optimizer step on a packed batch; returns (loss, target tokens)."""
+    input_ids, target_ids, pos_ids, doc_ids = batch
+    logits = model(input_ids, pos_ids, packed_attention_mask(doc_ids))  # (B, T, vocab_size)
+
+    # Cross-entropy over real tokens only (same as: -log(softmax(logits)[target]))
+    loss = F.cross_entropy(logits.view(-1, vocab_size), target_ids.view(-1), ignore_index=IGNORE_INDEX)
+
+    # Backward pass (same algorithm as our Value.backward())
+    optimizer.zero_grad(set_to_none=True)
+    loss.backward()
+    optimizer.step()
+    return loss, int((target_ids != IGNORE_INDEX).sum())
+
+
 # Same optimizer settings as pure-Python version
 learning_rate = 0.01
 optimizer = torch.optim.Adam(model.parameters(), lr=learning_rate, betas=(0.85, 0.99))
@@ -278,36 +406,24 @@ scheduler = torch.optim.lr_scheduler.LinearLR(
     optimizer, start_factor=1.0, end_factor=0.0, total_iters=num_steps
 )
 
+# Optional: MICROGPT_COMPILE=1 fuses the model with torch.compile (same weights).
+# Compiling takes tens of seconds on CPU, so it only pays off for long runs.
+train_model = torch.compile(model) if os.environ.get("MICROGPT_COMPILE") == "1" else model
+
 log_interval = 100
-print(f"  Training for {num_steps} steps...\n")
+print(f"  Training for {num_steps} steps of {batch_size} rows...\n")
 
 loss_history = []
+tokens_seen = 0
 start_time = datetime.now()
 
 model.train()
+batch_iter = batches(train_data, batch_size)
 for step in range(num_steps):
-    # Get training example (same as pure-Python: one name per step)
-    doc = docs[step % len(docs)]
-    tokens = [BOS] + [uchars.index(ch) for ch in doc] + [BOS]
-    n = min(block_size, len(tokens) - 1)
-
-    # Convert to tensors
-    input_ids = torch.tensor(tokens[:n], device=device)
-    target_ids = torch.tensor(tokens[1:n + 1], device=device)
-    pos_ids = torch.arange(n, device=device)
-
-    # Forward pass
-    logits = model(input_ids, pos_ids)  # (n, vocab_size)
-
-    # Cross-entropy loss (same as: -log(softmax(logits)[target]))
-    loss = F.cross_entropy(logits, target_ids)
-    loss_history.append(loss.item())
-
-    # Backward pass (same algorithm as our Value.backward())
-    optimizer.zero_grad()
-    loss.backward()
-    optimizer.step()
+    loss, n_tokens = train_step(train_model, optimizer, next(batch_iter))
     scheduler.step()
+    loss_history.append(loss.item())
+    tokens_seen += n_tokens
 
     # Logging
     if (step + 1) % log_interval == 0:
@@ -315,52 +431,136 @@ for step in range(num_steps):
         avg_loss = sum(loss_history[max(0, step - log_interval + 1):step + 1]) / min(step + 1, log_interval)
         steps_per_sec = (step + 1) / elapsed
         print(f"  Step {step + 1:4d}/{num_steps} | Loss: {loss.item():.4f} | "
-              f"Avg: {avg_loss:.4f} | Speed: {steps_per_sec:.1f} steps/sec")
+              f"Avg: {avg_loss:.4f} | Speed: {steps_per_sec:.1f} steps/sec, "
+              f"{tokens_seen / elapsed:,.0f} tokens/sec")
 
 elapsed = (datetime.now() - start_time).total_seconds()
-print(f"\n  ✓ Training complete in {elapsed:.1f}s")
+tokens_per_sec = tokens_seen / elapsed
+print(f"\n  ✓ Training complete in {elapsed:.1f}s ({tokens_per_sec:,.0f} tokens/sec)")
 print(f"  ✓ Final loss: {loss_history[-1]:.4f}")
 print(f"  ✓ Loss improved by {loss_history[0] - loss_history[-1]:.4f}")
 
+
+def benchmark_training(steps=200):
+    """Tokens/sec of one-name-per-step training vs packed batches (fresh models)."""
+    results = {}
+
+    # One name per step, as in the pure-Python version
+    bench_model = MicroGPT().to(device)
+    bench_opt = torch.optim.Adam(bench_model.parameters(), lr=learning_rate, betas=(0.85, 0.99))
+    stoi = {ch: i for i, ch in enumerate(uchars)}
+    tokens = 0
+    t0 = datetime.now()
+    for step in range(steps):
+        ids = [BOS] + [stoi[ch] for ch in docs[step % len(docs)]] + [BOS]
+        n = min(block_size, len(ids) - 1)
+        logits = bench_model(torch.tensor(ids[:n], device=device), torch.arange(n, device=device))
+        loss = F.cross_entropy(logits, torch.tensor(ids[1:n + 1], device=device))
+        bench_opt.zero_grad(set_to_none=True)
+        loss.backward()
+        bench_opt.step()
+        tokens += n
+    results["one name per step"] = tokens / (datetime.now() - t0).total_seconds()
+
+    # Packed batches
+    bench_model = MicroGPT().to(device)
+    bench_opt = torch.optim.Adam(bench_model.parameters(), lr=learning_rate, betas=(0.85, 0.99))
+    bench_iter = batches(train_data, batch_size)
+    tokens = 0
+    t0 = datetime.now()
+    for _ in range(steps):
+        _, n_tokens = train_step(bench_model, bench_opt, next(bench_iter))
+        tokens += n_tokens
+    results[f"packed batches of {batch_size}"] = tokens / (datetime.now() - t0).total_seconds()
+    return results
+
+
+if "--benchmark" in sys.argv:
+    print("\n  Throughput benchmark (200 steps each, fresh models):")
+    bench = benchmark_training()
+    for name, rate in bench.items():
+        print(f"    {name:<24} {rate:>10,.0f} tokens/sec")
+    rates = list(bench.values())
+    print(f"    speedup: {rates[1] / rates[0]:.1f}x")
+
 # ============================================================================
 # 6. GENERATION
 # ============================================================================
 print("\n[6/7] Generating new names...\n")
 
 
+def sample_next(logits, temperature=1.0, top_k=None, top_p=None):
+    """Sample one token per row from (batch, vocab_size) logits.
+
+    top_k keeps only the k most likely tokens; top_p keeps the smallest set
+    of tokens whose probabilities add up to at least p ("nucleus" sampling).
+    """
+    logits = logits / temperature
+    if top_k is not None and top_k < logits.size(-1):
+        kth = torch.topk(logits, top_k, dim=-1).values[:, -1:]
+        logits = logits.masked_fill(logits < kth, float('-inf'))
+    if top_p is not None and top_p < 1.0:
+        sorted_logits, sorted_idx = torch.sort(logits, dim=-1, descending=True)
+        sorted_probs = F.softmax(sorted_logits, dim=-1)
+        # Drop a token once the tokens before it already cover top_p
+        drop = sorted_probs.cumsum(dim=-1) - sorted_probs >= top_p
+        sorted_logits = sorted_logits.masked_fill(drop, float('-inf'))
+        logits = torch.empty_like(logits).scatter_(-1, sorted_idx, sorted_logits)
+    probs = F.softmax(logits, dim=-1)
+    return torch.multinomial(probs, 1).squeeze(-1)
+
+
 @torch.no_grad()
-def generate(temperature=0.5):
-    """Generate a new name by autoregressive sampling.
+def generate_batch(num_samples, temperature=0.5, top_k=None, top_p=None, use_cache=True):
+    """Generate num_samples names in parallel by autoregressive sampling.
 
     Same logic as pure-Python:
         Start with BOS, predict next token, feed back, repeat until BOS.
+
+    With use_cache (default) each step runs the model on the newest token
+    only and reuses the cached keys/values of earlier positions. Without it
+    the whole prefix is recomputed at every step (for the benchmark).
     """
     model.eval()
-    token_id = BOS
-    chars = []
+    tokens = torch.full((num_samples, 1), BOS, dtype=torch.long, device=device)
+    finished = torch.zeros(num_samples, dtype=torch.bool, device=device)
+    cache = KVCache(num_samples, device) if use_cache else None
 
     for pos_id in range(block_size):
-        input_t = torch.tensor([token_id], device=device)
-        pos_t = torch.tensor([pos_id], device=device)
-
-        logits = model(input_t, pos_t)  # (1, vocab_size)
-        logits = logits[0] / temperature
-
-        probs = F.softmax(logits, dim=-1)
-        token_id = torch.multinomial(probs, 1).item()
-
-        if token_id == BOS:
+        if use_cache:
+            pos_t = torch.full((num_samples, 1), pos_id, device=device)
+            logits = model(tokens[:, -1:], pos_t, kv_cache=cache)[:, -1]
+        else:
+            pos_t = torch.arange(pos_id + 1, device=device).expand(num_samples, -1)
+            logits = model(tokens, pos_t)[:, -1]
+
+        token_ids = sample_next(logits, temperature, top_k, top_p)
+        token_ids = token_ids.masked_fill(finished, BOS)  # finished names stay finished
+        tokens = torch.cat([tokens, token_ids[:, None]], dim=1)
+        finished |= token_ids == BOS
+        if finished.all():
             break
-        chars.append(uchars[token_id])
 
     model.train()
-    return ''.join(chars)
+    names = []
+    for row in tokens[:, 1:].tolist():
+        chars = []
+        for token_id in row:
+            if token_id == BOS:
+                break
+            chars.append(uchars[token_id])
+        names.append(''.join(chars))
+    return names
 
 
-# Generate samples
+def generate(temperature=0.5, top_k=None, top_p=None):
+    """Generate a single new name."""
+    return generate_batch(1, temperature, top_k, top_p)[0]
+
+
+# Generate samples (all 20 in one batch)
 print("Generated names (temperature=0.5):\n")
-for i in range(20):
-    name = generate(temperature=0.5)
+for i, name in enumerate(generate_batch(20, temperature=0.5)):
     print(f"  {i + 1:2d}. {name}")
 
 # Try different temperatures
@@ -370,9 +570,43 @@ print("=" * 70)
 
 for temp in [0.3, 0.7, 1.0]:
     print(f"\nTemperature = {temp} ({'conservative' if temp < 0.5 else 'balanced' if temp < 0.9 else 'creative'}):")
-    names = [generate(temperature=temp) for _ in range(10)]
+    names = generate_batch(10, temperature=temp)
     print(f"  {', '.join(names)}")
 
+# Top-k / top-p cut off the unlikely tail before sampling
+print("\n" + "=" * 70)
+print("TOP-K / TOP-P SAMPLING (temperature=1.0)")
+print("=" * 70)
+
+for label, kwargs in [("top_k=5", {"top_k": 5}), ("top_p=0.9", {"top_p": 0.9})]:
+    names = generate_batch(10, temperature=1.0, **kwargs)
+    print(f"\n{label}:\n  {', '.join(names)}")
+
+
+def benchmark_generation(num_names=200):
+    """Milliseconds per generated token: full recompute vs KV cache, 1 vs many names."""
+    results = {}
+    for label, batch, use_cache in [
+        ("full recompute, batch 1", 1, False),
+        ("KV cache, batch 1", 1, True),
+        (f"KV cache, batch {num_names}", num_names, True),
+    ]:
+        torch.manual_seed(0)
+        t0 = datetime.now()
+        names = []
+        for _ in range(num_names // batch):
+            names += generate_batch(batch, temperature=1.0, use_cache=use_cache)
+        seconds = (datetime.now() - t0).total_seconds()
+        tokens = sum(len(name) + 1 for name in names)  # + the closing BOS
+        results[label] = seconds * 1000 / tokens
+    return results
+
+
+if "--benchmark" in sys.argv:
+    print("\n  Generation latency (200 names each, temperature=1.0):")
+    for label, ms in benchmark_generation().items():
+        print(f"    {label:<28} {ms:8.3f} ms/token")
+
 # ============================================================================
 # 7. SUMMARY
 # ============================================================================
@@ -384,7 +618,8 @@ print(f"  Initial loss: {loss_history[0]:.4f}")
 print(f"  Final loss: {loss_history[-1]:.4f}")
 print(f"  Improvement: {(loss_history[0] - loss_history[-1]) / loss_history[0] * 100:.1f}%")
 print(f"  Training time: {elapsed:.1f}s")
-print(f"  Steps per second: {num_steps / elapsed:.1f}")
+print(f"  Steps per second: {num_steps / elapsed:.1f} ({batch_size} rows each)")
+print(f"  Tokens per second: {tokens_per_sec:,.0f}")
 print(f"\nModel info:")
 print(f"  Parameters: {num_params:,}")
 print(f"  Vocabulary size: {vocab_size}")
@@ -393,7 +628,7 @@ print(f"  Device: {device}")
 
 print(f"\nComparison with pure-Python version:")
 print(f"  Pure Python: ~1-2 steps/sec (scalar Value autograd)")
-print(f"  PyTorch:     ~{num_steps / elapsed:.0f} steps/sec (tensor autograd)")
+print(f"  PyTorch:     ~{tokens_per_sec:,.0f} tokens/sec (tensor autograd, packed batches)")
 print(f"  Speedup:     Same math, vectorized operations")
 
 print("\n" + "=" * 70)
@@ -24,7 +24,7 @@ torch.manual_seed(42)
 # ============================================================================
 # PART 1: Test Autograd
 # ============================================================================
-print("\n[1/5] Testing PyTorch Autograd...")
+print("\n[1/7] Testing PyTorch Autograd...")
 
 # Test 1: Same as pure-Python: f = (x + y) * 2
 x = torch.tensor(3.0, requires_grad=True)
@@ -61,7 +61,7 @@ print(f"  ✓ All 6 atomic operations verified (+, *, **, log, exp, relu)")
 # ============================================================================
 # PART 2: Test Tokenizer
 # ============================================================================
-print("\n[2/5] Testing Tokenizer...")
+print("\n[2/7] Testing Tokenizer...")
 
 if not os.path.exists('input.txt'):
     print("  Downloading dataset...")
@@ -96,7 +96,7 @@ print(f"  ✓ Loaded {len(docs)} names, vocab size: {vocab_size}")
 # ============================================================================
 # PART 3: Test Model Components
 # ============================================================================
-print("\n[3/5] Testing Model Components...")
+print("\n[3/7] Testing Model Components...")
 
 
 # Test RMSNorm
@@ -136,7 +136,7 @@ print(f"  ✓ RMSNorm works! Normalized: [{', '.join(f'{v:.4f}' for v in x_norm.
 # ============================================================================
 # PART 4: Initialize Model
 # ============================================================================
-print("\n[4/5] Initializing Model...")
+print("\n[4/7] Initializing Model...")
 
 n_embd = 16
 n_head = 4
@@ -145,9 +145,27 @@ block_size = 16
 head_dim = n_embd // n_head
 
 
+class KVCache:
+    def __init__(self, batch):
+        shape = (n_layer, batch, n_head, block_size, head_dim)
+        self.k = torch.zeros(shape)
+        self.v = torch.zeros(shape)
+        self.length = 0
+
+    def update(self, layer_idx, k, v):
+        end = self.length + k.size(2)
+        self.k[layer_idx, :, :, self.length:end] = k
+        self.v[layer_idx, :, :, self.length:end] = v
+        return self.k[layer_idx, :, :, :end], self.v[layer_idx, :, :, :end]
+
+
+causal_mask = torch.ones(block_size, block_size, dtype=torch.bool).tril()
+
+
 class TransformerBlock(nn.Module):
-    def __init__(self):
+    def __init__(self, layer_idx=0):
         super().__init__()
+        self.layer_idx = layer_idx
         self.norm1 = RMSNorm(n_embd)
         self.attn_wq = nn.Linear(n_embd, n_embd, bias=False)
         self.attn_wk = nn.Linear(n_embd, n_embd, bias=False)
@@ -157,19 +175,24 @@ class TransformerBlock(nn.Module):
         self.mlp_fc1 = nn.Linear(n_embd, 4 * n_embd, bias=False)
         self.mlp_fc2 = nn.Linear(4 * n_embd, n_embd, bias=False)
 
-    def forward(self, x):
-        seq_len = x.size(0)
+    def forward(self, x, attn_mask=None, kv_cache=None):
+        batch, seq_len, _ = x.shape
         x_res = x
         x_n = self.norm1(x)
-        q = self.attn_wq(x_n).view(seq_len, n_head, head_dim).transpose(0, 1)
-        k = self.attn_wk(x_n).view(seq_len, n_head, head_dim).transpose(0, 1)
-        v = self.attn_wv(x_n).view(seq_len, n_head, head_dim).transpose(0, 1)
-        attn = torch.matmul(q, k.transpose(-2, -1)) / math.sqrt(head_dim)
-        mask = torch.triu(torch.ones(seq_len, seq_len), diagonal=1).bool()
-        attn = attn.masked_fill(mask, float('-inf'))
-        attn = F.softmax(attn, dim=-1)
-        out = torch.matmul(attn, v)
-        out = out.transpose(0, 1).contiguous().view(seq_len, n_embd)
+        q = self.attn_wq(x_n).view(batch, seq_len, n_head, head_dim).transpose(1, 2)
+        k = self.attn_wk(x_n).view(batch, seq_len, n_head, head_dim).transpose(1, 2)
+        v = self.attn_wv(x_n).view(batch, seq_len, n_head, head_dim).transpose(1, 2)
+        if kv_cache is not None:
+            past = kv_cache.length
+            k, v = kv_cache.update(self.layer_idx, k, v)
+            if attn_mask is None and seq_len > 1:
+                attn_mask = causal_mask[past:past + seq_len, :past + seq_len]
+            out = F.scaled_dot_product_attention(q, k, v, attn_mask=attn_mask)
+        elif attn_mask is None:
+            out = F.scaled_dot_product_attention(q, k, v, is_causal=True)
+        else:
+            out = F.scaled_dot_product_attention(q, k, v, attn_mask=attn_mask)
+        out = out.transpose(1, 2).reshape(batch, seq_len, n_embd)
         x = self.attn_wo(out) + x_res
         x_res = x
         x_n = self.norm2(x)
@@ -186,7 +209,7 @@ class MicroGPT(nn.Module):
         self.wte = nn.Embedding(vocab_size, n_embd)
         self.wpe = nn.Embedding(block_size, n_embd)
         self.pre_norm = RMSNorm(n_embd)
-        self.layers = nn.ModuleList([TransformerBlock() for _ in range(n_layer)])
+        self.layers = nn.ModuleList([TransformerBlock(i) for i in range(n_layer)])
         self.lm_head = nn.Linear(n_embd, vocab_size, bias=False)
         self.apply(self._init_weights)
 
@@ -196,12 +219,18 @@ class MicroGPT(nn.Module):
         elif isinstance(module, nn.Embedding):
             nn.init.normal_(module.weight, mean=0.0, std=0.08)
 
-    def forward(self, token_ids, pos_ids):
+    def forward(self, token_ids, pos_ids, attn_mask=None, kv_cache=None):
+        single = token_ids.dim() == 1
+        if single:
+            token_ids, pos_ids = token_ids.unsqueeze(0), pos_ids.unsqueeze(0)
         x = self.wte(token_ids) + self.wpe(pos_ids)
         x = self.pre_norm(x)
         for layer in self.layers:
-            x = layer(x)
-        return self.lm_head(x)
+            x = layer(x, attn_mask, kv_cache)
+        if kv_cache is not None:
+            kv_cache.length += token_ids.size(1)
+        logits = self.lm_head(x)
+        return logits[0] if single else logits
 
 
 model = MicroGPT()
@@ -211,7 +240,7 @@ print(f"  ✓ Model initialized with {num_params:,} parameters")
 # ============================================================================
 # PART 5: Test Forward Pass
 # ============================================================================
-print("\n[5/5] Testing Forward Pass...")
+print("\n[5/7] Testing Forward Pass...")
 
 input_ids = torch.tensor([BOS])
 pos_ids = torch.tensor([0])
@@ -232,6 +261,62 @@ print(", ".join([
     for v, i in zip(top_3.values.tolist(), top_3.indices.tolist())
 ]))
 
+# ============================================================================
+# PART 6: Test Packed Batches
+# ============================================================================
+print("\n[6/7] Testing Packed Batches...")
+
+# Two names packed into one row must give the same logits as running each
+# name on its own: positions restart and attention stays within each name.
+names = ["emma", "liam"]
+seqs = [[BOS] + encode(name) for name in names]
+row_ids = torch.tensor([seqs[0] + seqs[1]])
+row_pos = torch.tensor([list(range(len(seqs[0]))) + list(range(len(seqs[1])))])
+doc_ids = torch.tensor([[0] * len(seqs[0]) + [1] * len(seqs[1])])
+causal = torch.ones(row_ids.size(1), row_ids.size(1), dtype=torch.bool).tril()
+mask = ((doc_ids[:, :, None] == doc_ids[:, None, :]) & causal).unsqueeze(1)
+
+with torch.no_grad():
+    packed = model(row_ids, row_pos, mask)[0]
+    separate = torch.cat([model(torch.tensor(seq), torch.arange(len(seq))) for seq in seqs])
+assert torch.allclose(packed, separate, atol=1e-5), "Packed logits differ from per-name logits"
+print(f"  ✓ Packed row of {len(names)} names matches per-name forward passes")
+
+# Padding is excluded from the loss with ignore_index
+targets = torch.tensor([[1, 2, -100, -100]])
+logits = torch.randn(1, 4, vocab_size)
+masked = F.cross_entropy(logits.view(-1, vocab_size), targets.view(-1), ignore_index=-100)
+unpadded = F.cross_entropy(logits[0, :2], targets[0, :2])
+assert torch.allclose(masked, unpadded), "Loss masking failed"
+print("  ✓ Loss masking ignores padded targets")
+
+# ============================================================================
+# PART 7: Test KV Cache and Sampling
+# ============================================================================
+print("\n[7/7] Testing KV Cache and Sampling...")
+
+# Decoding token by token with the cache must match one full forward pass
+seq = torch.tensor([[BOS] + encode("olivia"), [BOS] + encode("noahxy")])
+positions = torch.arange(seq.size(1)).expand(seq.size(0), -1)
+cache = KVCache(seq.size(0))
+with torch.no_grad():
+    full = model(seq, positions)
+    prefill = model(seq[:, :3], positions[:, :3], kv_cache=cache)
+    steps = [model(seq[:, t:t + 1], positions[:, t:t + 1], kv_cache=cache) for t in range(3, seq.size(1))]
+incremental = torch.cat([prefill] + steps, dim=1)
+assert torch.allclose(full, incremental, atol=1e-5), "KV-cache decoding differs from full forward pass"
+print(f"  ✓ KV-cache decoding matches the full forward pass ({seq.size(1)} positions, batch {seq.size(0)})")
+
+# top-k keeps only the k most likely tokens
+logits = torch.randn(64, vocab_size)
+top_k = 3
+kth = torch.topk(logits, top_k, dim=-1).values[:, -1:]
+probs = F.softmax(logits.masked_fill(logits < kth, float('-inf')), dim=-1)
+samples = torch.multinomial(probs, 1)
+allowed = torch.topk(logits, top_k, dim=-1).indices
+assert (samples == allowed).any(dim=-1).all(), "top-k sampled outside the k most likely tokens"
+print(f"  ✓ top-k={top_k} samples stay within the {top_k} most likely tokens")
+
 # ============================================================================
 # SUMMARY
 # ============================================================================
@@ -13,7 +13,8 @@ import logging
 from datetime import datetime
 import asyncio
 
-from models.pdf_processor import EnergyPDFProcessor
+from api.schemas import BatchQueryRequest, BatchSearchResponse, SearchResponse
+from models.pdf_processor import EnergyPDFProcessor, OCRCache
 from models.rag_system import EnergyRAGSystem
 from models.agent_workflow import EnergyDocumentAgent
 from utils.config import settings
@@ -74,6 +75,12 @@ rag_system: Optional[EnergyRAGSystem] = None
 agent: Optional[EnergyDocumentAgent] = None
 start_time = datetime.now()
 
+# Processing progress per uploaded document, keyed by document_id
+document_progress: Dict[str, Dict[str, Any]] = {}
+
+# OCR results by page-content hash, shared by all uploads
+ocr_cache = OCRCache(settings.ocr_cache_dir or None)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize components on startup"""
@@ -275,38 +282,92 @@ async def process_document_background(
     document_id: str,
     rag: EnergyRAGSystem
 ):
-    """Background task for document processing"""
+    """Background task for document processing
+
+    Pages are stored in the RAG system as soon as their text is extracted
+    (text layer, OCR cache or GPT-4o OCR), so a long document becomes
+    searchable incrementally. Progress is tracked in `document_progress`
+    and exposed at /documents/{document_id}/progress.
+    """
+    progress = document_progress[document_id] = {
+        "document_id": document_id,
+        "filename": filename,
+        "status": "processing",
+        "pages_total": None,
+        "pages_done": 0,
+        "pages_failed": 0,
+        "pages_by_source": {"native": 0, "cache": 0, "ocr": 0},
+        "chunks_stored": 0,
+        "updated_at": datetime.now().isoformat()
+    }
+    pages = None
     try:
         # Initialize processor
         processor = EnergyPDFProcessor(
             openai_api_key=settings.openai_api_key,
-            dpi=settings.pdf_dpi
+            dpi=settings.pdf_dpi,
+            max_concurrency=settings.ocr_max_concurrency,
+            requests_per_minute=settings.ocr_requests_per_minute,
+            max_retries=settings.ocr_max_retries,
+            image_format=settings.ocr_image_format,
+            ocr_cache=ocr_cache
         )
+        metadata = {
+            "document_id": document_id,
+            "upload_timestamp": datetime.now().isoformat(),
+            "file_size": os.path.getsize(file_path)
+        }
 
-        # Extract text
-        extracted_text = processor.extract_and_combine_text(file_path, document_type)
-
-        # Store in RAG system
-        chunks_stored = rag.process_and_store_document(
-            text=extracted_text,
-            document_name=filename,
-            document_type=document_type,
-            metadata={
-                "document_id": document_id,
-                "upload_timestamp": datetime.now().isoformat(),
-                "file_size": os.path.getsize(file_path)
-            }
-        )
+        # Pull finished pages off the worker pool without blocking the event loop
+        pages = processor.iter_pages(file_path, document_type)
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                break
+
+            progress["pages_total"] = page["num_pages"]
+            progress["pages_done"] += 1
+            progress["pages_by_source"][page["source"]] += 1
+            progress["updated_at"] = datetime.now().isoformat()
+            if page["error"]:
+                progress["pages_failed"] += 1
+                logger.warning(f"{filename} page {page['page_number']}: {page['text']}")
+                continue
+
+            page_text = (f"# Document: {filename}\n\n"
+                         f"## Page {page['page_number']}\n\n{page['text']}")
+            progress["chunks_stored"] += await asyncio.to_thread(
+                rag.process_and_store_document,
+                text=page_text,
+                document_name=filename,
+                document_type=document_type,
+                metadata={**metadata, "page_number": page["page_number"]}
+            )
 
-        logger.info(f"Successfully processed {filename}: {chunks_stored} chunks")
+        progress["status"] = "completed"
+        logger.info(f"Successfully processed {filename}: {progress['chunks_stored']} chunks")
 
     except Exception as e:
+        progress["status"] = "failed"
+        progress["error"] = str(e)
         logger.error(f"Background processing failed for {filename}: {e}")
     finally:
+        if pages is not None:
+            # Stops queued OCR work if we bailed out early; waits for in-flight pages
+            await asyncio.to_thread(pages.close)
+        progress["updated_at"] = datetime.now().isoformat()
         # Clean up temp file
         if os.path.exists(file_path):
             os.unlink(file_path)
 
+@app.get("/documents/{document_id}/progress")
+async def get_document_progress(document_id: str):
+    """Get processing progress for an uploaded document"""
+    progress = document_progress.get(document_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Unknown document {document_id}")
+    return progress
+
 @app.post("/query", response_model=QueryResponse)
 async def process_query(
     request: QueryRequest,
@@ -384,6 +445,57 @@ async def search_documents(
         logger.error(f"Error searching documents: {e}")
         raise HTTPException(status_code=500, detail=f"Search failed: {e}")
 
+@app.post("/documents/search/batch", response_model=BatchSearchResponse)
+async def batch_search_documents(
+    request: BatchQueryRequest,
+    rag: EnergyRAGSystem = Depends(get_rag_system)
+):
+    """Search documents for several queries with one batched embedding and vector search"""
+    start = datetime.now()
+    try:
+        queries = [query.strip() for query in request.queries]
+        if not all(queries):
+            raise HTTPException(status_code=400, detail="Queries cannot be empty")
+
+        if not rag.is_available():
+            raise HTTPException(
+                status_code=503,
+                detail="Search unavailable: RAG system not fully operational"
+            )
+
+        results = await asyncio.to_thread(
+            rag.batch_similarity_search,
+            queries,
+            k=request.max_results_per_query,
+            document_type=request.document_type,
+            score_threshold=0.5
+        )
+
+        timestamp = datetime.now().isoformat()
+        search_time_ms = int((datetime.now() - start).total_seconds() * 1000)
+        return BatchSearchResponse(
+            results=[
+                SearchResponse(
+                    query=query,
+                    results=hits,
+                    total_found=len(hits),
+                    timestamp=timestamp,
+                    search_time_ms=search_time_ms
+                )
+                for query, hits in zip(queries, results)
+            ],
+            total_queries=len(queries),
+            total_found=sum(len(hits) for hits in results),
+            timestamp=timestamp,
+            search_time_ms=search_time_ms
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch search: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch search failed: {e}")
+
 @app.get("/documents/stats")
 async def get_document_statistics(rag: EnergyRAGSystem = Depends(get_rag_system)):
     """Get document collection statistics"""
@@ -126,3 +126,11 @@ class BatchQueryResponse(BaseModel):
     successful_queries: int
     failed_queries: int
     total_processing_time_ms: int
+
+class BatchSearchResponse(BaseModel):
+    """Batch search response schema (one SearchResponse per query, in request order)"""
+    results: List[SearchResponse]
+    total_queries: int
+    total_found: int
+    timestamp: str
+    search_time_ms: int
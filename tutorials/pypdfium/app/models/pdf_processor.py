@@ -1,48 +1,332 @@
 """
 PDF Processing Module for Energy Document AI
 Uses pypdfium2 for high-resolution rendering and GPT-4o for OCR extraction
+
+Pages run through a pipeline: the document is opened once, a pool of workers
+renders each page straight to the vision model's tile limits, encodes it as
+JPEG/WebP and sends it for OCR. Requests are rate limited and retried, and
+finished pages are yielded as soon as they are ready.
+
+Born-digital pages skip OCR: each page is classified from its text layer
+(character count, text coverage) and image area, and only scanned or
+figure-heavy pages are sent to the vision model. OCR results are cached by
+a hash of the rendered page so re-uploads of the same report are free.
 """
 
 import pypdfium2 as pdfium
 from PIL import Image
 from io import BytesIO
 import base64
+import hashlib
+import openai
 from openai import OpenAI
 import os
-from typing import List, Dict, Tuple
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple, Iterator, Optional
 import logging
 
+import pypdfium2.raw as pdfium_c
+
+try:
+    import pdfplumber
+except ImportError:  # tables are then left in the plain text layer
+    pdfplumber = None
+
 logger = logging.getLogger(__name__)
 
+# GPT-4o "high" detail fits images into 2048x2048, then scales the shortest
+# side down to 768px. Anything larger is only resized again server-side.
+VISION_MAX_LONG_SIDE = 2048
+VISION_MAX_SHORT_SIDE = 768
+
+IMAGE_FORMATS = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+IMAGE_QUALITY = 85
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+OCR_MODEL = "gpt-4o"
+
+# Page routing: a page keeps its native text layer unless it looks scanned
+# (little or unreadable text) or is dominated by images (figures, photos)
+MIN_NATIVE_CHARS = 32
+MIN_TEXT_COVERAGE = 0.005     # text box area / page area
+MAX_IMAGE_COVERAGE = 0.3      # image area / page area
+MAX_UNREADABLE_CHARS = 0.1    # share of U+FFFD / control chars from broken fonts
+
+# PDFium is not thread-safe, not even across separate documents
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _box_area(box: Tuple[float, float, float, float], clip: Tuple[float, float, float, float]) -> float:
+    """Area of (left, bottom, right, top) `box` inside `clip`"""
+    left, bottom = max(box[0], clip[0]), max(box[1], clip[1])
+    right, top = min(box[2], clip[2]), min(box[3], clip[3])
+    return max(right - left, 0.0) * max(top - bottom, 0.0)
+
+
+def _markdown_table(rows: List[List[Optional[str]]]) -> str:
+    """Format extracted table rows as a markdown table (first row is the header)"""
+    def cell(value: Optional[str]) -> str:
+        return (value or "").replace("\n", " ").replace("|", "\\|").strip()
+
+    width = max(len(row) for row in rows)
+    lines = []
+    for i, row in enumerate(rows):
+        cells = [cell(v) for v in row] + [""] * (width - len(row))
+        lines.append("| " + " | ".join(cells) + " |")
+        if i == 0:
+            lines.append("|" + " --- |" * width)
+    return "\n".join(lines)
+
+
+class OCRCache:
+    """OCR text keyed by page-content hash, kept in memory and optionally on disk
+
+    Each entry is one `<hash>.md` file under `cache_dir`, written atomically,
+    so the cache survives restarts and can be shared between workers.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(image_bytes: bytes, page_context: str) -> str:
+        digest = hashlib.sha256(f"{OCR_MODEL}:{page_context}:".encode("utf-8"))
+        digest.update(image_bytes)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.md")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._entries[key] = text
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._entries[key] = text
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write OCR cache entry {key}: {e}")
+
+
+class RateLimiter:
+    """Spaces calls evenly to stay under a requests-per-minute budget"""
+
+    def __init__(self, requests_per_minute: Optional[int]):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _TableFinder:
+    """Lazily opened pdfplumber document used for table detection on native pages"""
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self._pdf = None
+        self._lock = threading.Lock()
+
+    def find_tables(self, page_num: int) -> List:
+        with self._lock:
+            try:
+                if self._pdf is None:
+                    self._pdf = pdfplumber.open(self.pdf_path)
+                return self._pdf.pages[page_num].find_tables()
+            except Exception as e:
+                logger.warning(f"Table detection failed on page {page_num + 1}: {e}")
+                return []
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pdf is not None:
+                self._pdf.close()
+                self._pdf = None
+
+
 class EnergyPDFProcessor:
     """PDF processor optimized for energy sector documents with figures and tables"""
 
-    def __init__(self, openai_api_key: str, dpi: int = 300):
-        self.client = OpenAI(api_key=openai_api_key)
+    def __init__(self,
+                 openai_api_key: str,
+                 dpi: int = 300,
+                 max_concurrency: int = 4,
+                 requests_per_minute: Optional[int] = None,
+                 max_retries: int = 3,
+                 image_format: str = "JPEG",
+                 ocr_cache: Optional[OCRCache] = None):
+        # Retries are handled here so they share the rate limiter
+        self.client = OpenAI(api_key=openai_api_key, max_retries=0)
         self.dpi = dpi
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.image_format = image_format.upper()
+        if self.image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format {image_format!r}; expected one of {list(IMAGE_FORMATS)}")
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.ocr_cache = ocr_cache if ocr_cache is not None else OCRCache()
+
+    def vision_scale(self, width: float, height: float) -> float:
+        """Render scale that fits a page of `width` x `height` points into the vision tile limits"""
+        long_side, short_side = max(width, height), min(width, height)
+        return min(self.dpi / 72,
+                   VISION_MAX_LONG_SIDE / long_side,
+                   VISION_MAX_SHORT_SIDE / short_side)
+
+    def _render_page(self, pdf: pdfium.PdfDocument, page_num: int,
+                     scale: Optional[float] = None) -> Image.Image:
+        """Render one page of an already open document (defaults to vision_scale)"""
+        with _PDFIUM_LOCK:
+            page = pdf.get_page(page_num)
+            try:
+                if scale is None:
+                    scale = self.vision_scale(*page.get_size())
+                return page.render(scale=scale).to_pil()
+            finally:
+                page.close()
 
     def render_page_to_image(self, pdf_path: str, page_num: int) -> Image.Image:
         """Render PDF page to high-resolution image"""
         try:
             pdf = pdfium.PdfDocument(pdf_path)
-            page = pdf.get_page(page_num)
-            # Render at high DPI for better OCR quality
-            pil_image = page.render(scale=self.dpi / 72).to_pil()
-            page.close()
-            pdf.close()
-            return pil_image
+            try:
+                # Render at high DPI for better OCR quality
+                return self._render_page(pdf, page_num, scale=self.dpi / 72)
+            finally:
+                pdf.close()
         except Exception as e:
             logger.error(f"Error rendering page {page_num}: {e}")
             raise
 
-    def image_to_base64(self, image: Image.Image) -> str:
-        """Convert PIL image to base64 string"""
+    def encode_image(self, image: Image.Image, image_format: Optional[str] = None) -> bytes:
+        """Encode PIL image as JPEG (default), WebP or PNG"""
+        image_format = (image_format or self.image_format).upper()
+        if image_format != "PNG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
         buffered = BytesIO()
-        image.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode("utf-8")
+        if image_format == "PNG":
+            image.save(buffered, format="PNG")
+        else:
+            image.save(buffered, format=image_format, quality=IMAGE_QUALITY)
+        return buffered.getvalue()
+
+    def image_to_base64(self, image: Image.Image, image_format: Optional[str] = None) -> str:
+        """Convert PIL image to base64 string (JPEG by default)"""
+        return base64.b64encode(self.encode_image(image, image_format)).decode("utf-8")
+
+    def classify_page(self, page: pdfium.PdfPage, text: str, textpage: pdfium.PdfTextPage) -> Dict:
+        """Decide whether a page's native text layer can replace OCR
+
+        Call with the PDFium lock held. Returns the measurements and a
+        'route' of "native" or "ocr" with the reason.
+        """
+        page_box = page.get_cropbox()
+        page_area = max(_box_area(page_box, page_box), 1.0)
+
+        text_area = sum(_box_area(textpage.get_rect(i), page_box)
+                        for i in range(textpage.count_rects()))
+        image_area = sum(_box_area(obj.get_pos(), page_box)
+                         for obj in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE]))
+
+        visible = [ch for ch in text if not ch.isspace()]
+        unreadable = sum(1 for ch in visible if ch == "\ufffd" or ord(ch) < 32)
+        stats = {
+            'char_count': len(visible),
+            'text_coverage': round(text_area / page_area, 4),
+            'image_coverage': round(min(image_area / page_area, 1.0), 4),
+        }
+
+        if len(visible) < MIN_NATIVE_CHARS or stats['text_coverage'] < MIN_TEXT_COVERAGE:
+            route, reason = "ocr", "scanned"
+        elif unreadable > MAX_UNREADABLE_CHARS * len(visible):
+            route, reason = "ocr", "unreadable_text"
+        elif stats['image_coverage'] >= MAX_IMAGE_COVERAGE:
+            route, reason = "ocr", "figures"
+        else:
+            route, reason = "native", "text_layer"
+        return {**stats, 'route': route, 'reason': reason}
+
+    def _native_page_text(self, page: pdfium.PdfPage, textpage: pdfium.PdfTextPage,
+                          tables: List) -> str:
+        """Page text from the text layer with detected tables inlined as markdown
 
-    def ocr_page_with_gpt4o(self, base64_image: str, page_context: str = "energy") -> str:
-        """Extract text from image using GPT-4o with energy sector context"""
+        `tables` are pdfplumber tables (top-left origin). Text outside them is
+        read band by band from PDFium so the reading order is kept. Call with
+        the PDFium lock held.
+        """
+        if not tables or page.get_rotation():
+            return textpage.get_text_range()
+
+        left, bottom, right, top = page.get_cropbox()
+
+        def bounded(x0: float, y_top: float, x1: float, y_bottom: float) -> str:
+            # pdfplumber measures y down from the top of the crop box
+            if x1 <= x0 or y_bottom <= y_top:
+                return ""
+            return textpage.get_text_bounded(left=left + x0, bottom=top - y_bottom,
+                                             right=left + x1, top=top - y_top).strip()
+
+        width = right - left
+        parts, cursor = [], 0.0
+        for table in sorted(tables, key=lambda t: t.bbox[1]):
+            x0, t_top, x1, t_bottom = table.bbox
+            rows = [row for row in table.extract() if any(row)]
+            parts.append(bounded(0, cursor, width, t_top))
+            parts.append(bounded(0, t_top, x0, t_bottom))
+            if rows:
+                parts.append(_markdown_table(rows))
+            parts.append(bounded(x1, t_top, width, t_bottom))
+            cursor = max(cursor, t_bottom)
+        parts.append(bounded(0, cursor, width, top - bottom))
+        return "\n\n".join(part for part in parts if part)
+
+    def ocr_page_with_gpt4o(self, base64_image: str, page_context: str = "energy",
+                            mime_type: Optional[str] = None) -> str:
+        """Extract text from image using GPT-4o with energy sector context
+
+        Transient API errors (rate limits, timeouts, 5xx) are retried with
+        exponential backoff up to `max_retries` times.
+        """
+        mime_type = mime_type or IMAGE_FORMATS[self.image_format]
         energy_prompt = f"""
         Extract all text from this {page_context} document page, paying special attention to:
 
@@ -63,55 +347,126 @@ class EnergyPDFProcessor:
         If you see diagrams or charts, provide detailed descriptions of what they show.
         """
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": energy_prompt},
-                            {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{base64_image}"}},
-                        ],
-                    }
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": energy_prompt},
+                    {"type": "image_url", "image_url": {
+                        "url": f"data:{mime_type};base64,{base64_image}",
+                        "detail": "high",
+                    }},
                 ],
-                max_tokens=2000,
-                temperature=0.1,  # Low temperature for accuracy
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            logger.error(f"Error in OCR processing: {e}")
-            return f"Error processing page: {e}"
+            }
+        ]
 
-    def extract_text_from_pdf(self, pdf_path: str, document_type: str = "energy") -> Dict[int, str]:
-        """Extract text from all pages of PDF with energy sector optimization"""
-        try:
-            pdf = pdfium.PdfDocument(pdf_path)
-            num_pages = len(pdf)
-            extracted_pages = {}
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.client.chat.completions.create(
+                    model=OCR_MODEL,
+                    messages=messages,
+                    max_tokens=2000,
+                    temperature=0.1,  # Low temperature for accuracy
+                )
+                # content is None when the model refuses or the output is filtered
+                return response.choices[0].message.content or ""
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Error in OCR processing after {attempt + 1} attempts: {e}")
+                    return f"Error processing page: {e}"
+                delay = 2 ** attempt + random.uniform(0, 1)
+                logger.warning(f"OCR request failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+            except Exception as e:
+                logger.error(f"Error in OCR processing: {e}")
+                return f"Error processing page: {e}"
 
-            logger.info(f"Processing {num_pages} pages from {pdf_path}")
+    def _process_page(self, pdf: pdfium.PdfDocument, page_num: int, document_type: str,
+                      tables_pdf=None) -> Dict:
+        """Extract one page from its text layer, the OCR cache, or GPT-4o OCR"""
+        with _PDFIUM_LOCK:
+            page = pdf.get_page(page_num)
+            textpage = page.get_textpage()
+        try:
+            with _PDFIUM_LOCK:
+                classification = self.classify_page(page, textpage.get_text_range(), textpage)
+            if classification['route'] == "native":
+                # Table detection is pure Python; keep it outside the PDFium lock
+                tables = tables_pdf.find_tables(page_num) if tables_pdf else []
+                with _PDFIUM_LOCK:
+                    page_text = self._native_page_text(page, textpage, tables)
+        finally:
+            with _PDFIUM_LOCK:
+                textpage.close()
+                page.close()
 
-            for page_num in range(num_pages):
-                logger.info(f"Processing page {page_num + 1}/{num_pages}")
+        if classification['route'] == "native":
+            source = "native"
+        else:
+            image_bytes = self.encode_image(self._render_page(pdf, page_num))
+            cache_key = OCRCache.key(image_bytes, document_type)
+            page_text = self.ocr_cache.get(cache_key)
+            if page_text is not None:
+                source = "cache"
+            else:
+                source = "ocr"
+                page_text = self.ocr_page_with_gpt4o(
+                    base64.b64encode(image_bytes).decode("utf-8"), document_type)
 
-                # Render page to image
-                image = self.render_page_to_image(pdf_path, page_num)
+        is_error = source == "ocr" and page_text.startswith("Error processing page:")
+        if source == "ocr" and not is_error:
+            self.ocr_cache.put(cache_key, page_text)
 
-                # Convert to base64
-                base64_image = self.image_to_base64(image)
+        return {
+            'text': page_text.replace("\r\n", "\n"),
+            'page_number': page_num + 1,
+            'document_type': document_type,
+            'source': source,
+            'classification': classification,
+            'error': is_error,
+        }
 
-                # Extract text with GPT-4o
-                page_text = self.ocr_page_with_gpt4o(base64_image, document_type)
+    def iter_pages(self, pdf_path: str, document_type: str = "energy") -> Iterator[Dict]:
+        """Yield extracted pages as they finish (not necessarily in page order)
 
-                extracted_pages[page_num] = {
-                    'text': page_text,
-                    'page_number': page_num + 1,
-                    'document_type': document_type
-                }
+        Each item carries 'page_number', 'num_pages', 'source' ("native",
+        "cache" or "ocr") and the page 'classification' in addition to the
+        fields returned by extract_text_from_pdf. At most `max_concurrency`
+        pages are in flight at any time.
+        """
+        pdf = pdfium.PdfDocument(pdf_path)
+        tables_pdf = _TableFinder(pdf_path) if pdfplumber else None
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                      thread_name_prefix="pdf-ocr")
+        try:
+            num_pages = len(pdf)
+            logger.info(f"Processing {num_pages} pages from {pdf_path}")
 
+            futures = {
+                executor.submit(self._process_page, pdf, page_num, document_type, tables_pdf): page_num
+                for page_num in range(num_pages)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                page_data = future.result()
+                page_data['num_pages'] = num_pages
+                logger.info(f"Processed page {page_data['page_number']} via {page_data['source']} "
+                            f"({done}/{num_pages})")
+                yield page_data
+        finally:
+            # Drop queued pages if the consumer stops early, then release the document
+            executor.shutdown(wait=True, cancel_futures=True)
+            if tables_pdf:
+                tables_pdf.close()
             pdf.close()
-            return extracted_pages
+
+    def extract_text_from_pdf(self, pdf_path: str, document_type: str = "energy") -> Dict[int, str]:
+        """Extract text from all pages of PDF with energy sector optimization"""
+        try:
+            extracted_pages = {}
+            for page_data in self.iter_pages(pdf_path, document_type):
+                extracted_pages[page_data['page_number'] - 1] = page_data
+            return dict(sorted(extracted_pages.items()))
 
         except Exception as e:
             logger.error(f"Error processing PDF {pdf_path}: {e}")
@@ -1,19 +1,52 @@
 """
 RAG System for Energy Document AI
 Handles vector storage, embeddings, and retrieval using Qdrant
+
+Ingestion streams chunks through bounded embedding batches and upserts them
+in parallel; point IDs are derived from chunk content so re-ingesting a
+document overwrites its points instead of duplicating them. Query
+embeddings are cached, and several queries can be answered with a single
+batched Qdrant call.
 """
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
+from qdrant_client.http.models import (
+    Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, QueryRequest
+)
+import hashlib
+import threading
 import uuid
-from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_BATCH_SIZE = 64    # chunks per embeddings request
+UPSERT_WORKERS = 4           # parallel upsert requests in flight
+QUERY_CACHE_SIZE = 1024      # cached query embeddings
+
+# Namespace for deterministic chunk point IDs
+CHUNK_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "energy-document-ai/chunks")
+
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def chunk_point_id(document_key: str, chunk_index: int, chunk: str,
+                   page_number: Optional[int] = None) -> str:
+    """Stable point ID for a chunk: same document, position and text -> same ID"""
+    content_hash = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, f"{document_key}:{page_number}:{chunk_index}:{content_hash}"))
+
 class EnergyRAGSystem:
     """RAG system optimized for energy sector documents"""
 
@@ -21,13 +54,22 @@ class EnergyRAGSystem:
                  qdrant_url: str = "localhost", 
                  qdrant_port: int = 6333,
                  openai_api_key: str = None,
-                 collection_name: str = "energy_documents"):
+                 collection_name: str = "energy_documents",
+                 embedding_batch_size: int = EMBEDDING_BATCH_SIZE,
+                 upsert_workers: int = UPSERT_WORKERS,
+                 query_cache_size: int = QUERY_CACHE_SIZE):
 
         self.qdrant_url = qdrant_url
         self.qdrant_port = qdrant_port
         self.collection_name = collection_name
         self.qdrant_available = False
         self.qdrant_client = None
+        self.embedding_batch_size = max(1, embedding_batch_size)
+        self.upsert_workers = max(1, upsert_workers)
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._collection_ready = False
         
         # Initialize embeddings if API key available
         self.embeddings = None
@@ -82,6 +124,8 @@ class EnergyRAGSystem:
         if not self.qdrant_available:
             logger.warning("Qdrant not available, cannot create collection")
             return False
+        if self._collection_ready:
+            return True
             
         try:
             collections = self.qdrant_client.get_collections()
@@ -102,6 +146,9 @@ class EnergyRAGSystem:
             else:
                 logger.info(f"Collection {self.collection_name} already exists")
 
+            self._collection_ready = True
+            return True
+
         except Exception as e:
             logger.error(f"Error ensuring collection exists: {e}")
             raise
@@ -119,55 +166,137 @@ class EnergyRAGSystem:
             return len(chunks)  # Return number of chunks that would have been stored
             
         try:
-            # Ensure collection exists
-            if not self.ensure_collection_exists():
-                return 0
-
             # Split text into chunks
             chunks = self.text_splitter.split_text(text)
             logger.info(f"Split document into {len(chunks)} chunks")
 
-            # Generate embeddings
-            embeddings_list = self.embeddings.embed_documents(chunks)
-
-            # Prepare points for insertion
-            points = []
-            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings_list)):
-                point_id = str(uuid.uuid4())
-
-                # Prepare metadata
-                point_metadata = {
-                    "document_name": document_name,
-                    "document_type": document_type,
-                    "chunk_index": i,
-                    "chunk_text": chunk,
-                    "timestamp": datetime.now().isoformat(),
-                    "text_length": len(chunk)
-                }
-
-                # Add additional metadata if provided
-                if metadata:
-                    point_metadata.update(metadata)
+            stored = self.store_chunks(chunks, document_name, document_type, metadata)
 
-                points.append(PointStruct(
-                    id=point_id,
-                    vector=embedding,
-                    payload=point_metadata
-                ))
-
-            # Insert into Qdrant
-            self.qdrant_client.upsert(
-                collection_name=self.collection_name,
-                points=points
-            )
-
-            logger.info(f"Stored {len(points)} chunks from {document_name}")
-            return len(points)
+            logger.info(f"Stored {stored} chunks from {document_name}")
+            return stored
 
         except Exception as e:
             logger.error(f"Error processing document {document_name}: {e}")
             raise
 
+    def store_chunks(self,
+                     chunks: Iterable[str],
+                     document_name: str,
+                     document_type: str = "energy",
+                     metadata: Dict = None) -> int:
+        """Embed and upsert chunks in bounded batches
+
+        `chunks` is consumed lazily: one batch is embedded while up to
+        `upsert_workers` earlier batches are being written, so memory and
+        request size stay constant regardless of document length. Point IDs
+        are content hashes, so storing the same document again is idempotent.
+        """
+        if not self.ensure_collection_exists():
+            return 0
+
+        metadata = metadata or {}
+        document_key = metadata.get("document_id") or document_name
+        page_number = metadata.get("page_number")
+        stored = 0
+        pending = []
+
+        with ThreadPoolExecutor(max_workers=self.upsert_workers,
+                                thread_name_prefix="qdrant-upsert") as executor:
+            offset = 0
+            for batch in _batched(chunks, self.embedding_batch_size):
+                embeddings_list = self.embeddings.embed_documents(batch)
+                timestamp = datetime.now().isoformat()
+
+                points = []
+                for i, (chunk, embedding) in enumerate(zip(batch, embeddings_list), start=offset):
+                    # Prepare metadata
+                    point_metadata = {
+                        "document_name": document_name,
+                        "document_type": document_type,
+                        "chunk_index": i,
+                        "chunk_text": chunk,
+                        "timestamp": timestamp,
+                        "text_length": len(chunk)
+                    }
+
+                    # Add additional metadata if provided
+                    point_metadata.update(metadata)
+
+                    points.append(PointStruct(
+                        id=chunk_point_id(document_key, i, chunk, page_number),
+                        vector=embedding,
+                        payload=point_metadata
+                    ))
+                offset += len(batch)
+
+                # Bound the number of batches held in memory
+                if len(pending) >= self.upsert_workers:
+                    stored += pending.pop(0).result()
+                pending.append(executor.submit(self._upsert_points, points))
+
+            for future in pending:
+                stored += future.result()
+
+        return stored
+
+    def _upsert_points(self, points: List[PointStruct]) -> int:
+        self.qdrant_client.upsert(
+            collection_name=self.collection_name,
+            points=points,
+            wait=True
+        )
+        return len(points)
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Query embeddings in order, from the LRU cache or one batched request"""
+        vectors: Dict[str, List[float]] = {}
+        with self._query_cache_lock:
+            for query in queries:
+                if query in self._query_cache:
+                    self._query_cache.move_to_end(query)
+                    vectors[query] = self._query_cache[query]
+
+        missing = list(dict.fromkeys(q for q in queries if q not in vectors))
+        if missing:
+            if len(missing) == 1:
+                embedded = [self.embeddings.embed_query(missing[0])]
+            else:
+                embedded = self.embeddings.embed_documents(missing)
+            vectors.update(zip(missing, embedded))
+
+            with self._query_cache_lock:
+                for query in missing:
+                    self._query_cache[query] = vectors[query]
+                    self._query_cache.move_to_end(query)
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+
+        return [vectors[query] for query in queries]
+
+    @staticmethod
+    def _document_type_filter(document_type: Optional[str]) -> Optional[Filter]:
+        if not document_type:
+            return None
+        return Filter(
+            must=[
+                FieldCondition(
+                    key="document_type",
+                    match=MatchValue(value=document_type)
+                )
+            ]
+        )
+
+    @staticmethod
+    def _format_hit(hit) -> Dict:
+        return {
+            "content": hit.payload["chunk_text"],
+            "score": hit.score,
+            "document_name": hit.payload["document_name"],
+            "document_type": hit.payload["document_type"],
+            "chunk_index": hit.payload["chunk_index"],
+            "metadata": hit.payload
+        }
+
     def similarity_search(self, 
                          query: str, 
                          k: int = 5,
@@ -180,41 +309,19 @@ class EnergyRAGSystem:
             
         try:
             # Generate query embedding
-            query_embedding = self.embeddings.embed_query(query)
-
-            # Prepare filter if document type specified
-            query_filter = None
-            if document_type:
-                query_filter = Filter(
-                    must=[
-                        FieldCondition(
-                            key="document_type",
-                            match=MatchValue(value=document_type)
-                        )
-                    ]
-                )
+            query_embedding = self.embed_queries([query])[0]
 
             # Search in Qdrant
             search_results = self.qdrant_client.search(
                 collection_name=self.collection_name,
                 query_vector=query_embedding,
-                query_filter=query_filter,
+                query_filter=self._document_type_filter(document_type),
                 limit=k,
                 score_threshold=score_threshold
             )
 
             # Format results
-            results = []
-            for hit in search_results:
-                result = {
-                    "content": hit.payload["chunk_text"],
-                    "score": hit.score,
-                    "document_name": hit.payload["document_name"],
-                    "document_type": hit.payload["document_type"],
-                    "chunk_index": hit.payload["chunk_index"],
-                    "metadata": hit.payload
-                }
-                results.append(result)
+            results = [self._format_hit(hit) for hit in search_results]
 
             logger.info(f"Found {len(results)} relevant chunks for query")
             return results
@@ -223,6 +330,43 @@ class EnergyRAGSystem:
             logger.error(f"Error in similarity search: {e}")
             return []
 
+    def batch_similarity_search(self,
+                                queries: List[str],
+                                k: int = 5,
+                                document_type: Optional[str] = None,
+                                score_threshold: float = 0.7) -> List[List[Dict]]:
+        """Similarity search for several queries with one embedding and one Qdrant request"""
+        if not self.is_available():
+            logger.warning("RAG system not available, cannot perform similarity search")
+            return [[] for _ in queries]
+
+        try:
+            query_filter = self._document_type_filter(document_type)
+            requests = [
+                QueryRequest(
+                    query=embedding,
+                    filter=query_filter,
+                    limit=k,
+                    score_threshold=score_threshold,
+                    with_payload=True
+                )
+                for embedding in self.embed_queries(queries)
+            ]
+
+            responses = self.qdrant_client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=requests
+            )
+
+            results = [[self._format_hit(hit) for hit in response.points] for response in responses]
+            logger.info(f"Batch search for {len(queries)} queries found "
+                        f"{sum(len(r) for r in results)} relevant chunks")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in batch similarity search: {e}")
+            return [[] for _ in queries]
+
     def get_document_stats(self) -> Dict:
         """Get statistics about stored documents"""
         if not self.qdrant_available:
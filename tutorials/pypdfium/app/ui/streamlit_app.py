@@ -17,7 +17,7 @@ import plotly.graph_objects as go
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.pdf_processor import EnergyPDFProcessor
+from models.pdf_processor import EnergyPDFProcessor, OCRCache
 from models.rag_system import EnergyRAGSystem
 from models.agent_workflow import EnergyDocumentAgent
 from utils.config import settings, ENERGY_DOCUMENT_TYPES
@@ -643,7 +643,12 @@ class EnergyDocumentAI:
             # Initialize processor
             processor = EnergyPDFProcessor(
                 openai_api_key=settings.openai_api_key,
-                dpi=settings.pdf_dpi
+                dpi=settings.pdf_dpi,
+                max_concurrency=settings.ocr_max_concurrency,
+                requests_per_minute=settings.ocr_requests_per_minute,
+                max_retries=settings.ocr_max_retries,
+                image_format=settings.ocr_image_format,
+                ocr_cache=OCRCache(settings.ocr_cache_dir or None)
             )
 
             # Extract text with modern status
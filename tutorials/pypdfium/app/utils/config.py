@@ -23,6 +23,11 @@ class Settings(BaseSettings):
     # PDF Processing
     pdf_dpi: int = 300
     max_file_size_mb: int = 50
+    ocr_max_concurrency: int = 4
+    ocr_requests_per_minute: int = 60
+    ocr_max_retries: int = 3
+    ocr_image_format: str = "JPEG"
+    ocr_cache_dir: str = "data/processed/ocr_cache"  # empty to keep the cache in memory only
 
     # RAG Settings
     chunk_size: int = 800
@@ -10,6 +10,7 @@ import sys
 
 # Add app directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+sys.path.append(os.path.dirname(__file__))
 
 from api.endpoints import app
 
@@ -96,6 +97,38 @@ class TestEnergyDocumentAPI:
         finally:
             os.unlink(tmp_file_path)
 
+    def test_batch_search(self, client):
+        """Batch search answers every query from an in-memory Qdrant"""
+        from unittest.mock import patch
+        from api.endpoints import get_rag_system
+        from models.rag_system import EnergyRAGSystem
+        from test_rag import FakeEmbeddings
+
+        with patch('models.rag_system.OpenAIEmbeddings', FakeEmbeddings):
+            rag = EnergyRAGSystem(qdrant_url=":memory:", openai_api_key="test_key",
+                                  collection_name="test_collection")
+        rag.process_and_store_document(
+            "wind turbine rotor. " * 30 + "\n\n" + "solar inverter. " * 40,
+            document_name="test_doc.pdf",
+            document_type="renewable"
+        )
+
+        app.dependency_overrides[get_rag_system] = lambda: rag
+        try:
+            response = client.post("/documents/search/batch", json={
+                "queries": ["wind turbine", "solar inverter"],
+                "max_results_per_query": 2
+            })
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_queries"] == 2
+        assert [r["query"] for r in data["results"]] == ["wind turbine", "solar inverter"]
+        assert data["results"][0]["results"][0]["content"].startswith("wind turbine rotor")
+        assert data["results"][1]["results"][0]["content"].startswith("solar inverter")
+
 @pytest.mark.asyncio
 async def test_api_startup():
     """Test API startup process"""
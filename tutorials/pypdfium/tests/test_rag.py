@@ -5,14 +5,18 @@ Tests for RAG system functionality
 import pytest
 import tempfile
 import os
+import hashlib
+import re
 from unittest.mock import Mock, patch
 import sys
+import openai
+import pypdfium2 as pdfium
 
 # Add app directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
 
 from models.rag_system import EnergyRAGSystem
-from models.pdf_processor import EnergyPDFProcessor
+from models.pdf_processor import EnergyPDFProcessor, OCRCache
 from utils.config import settings
 
 class TestEnergyRAGSystem:
@@ -90,6 +94,94 @@ class TestEnergyRAGSystem:
         assert results[0]["score"] == 0.85
         assert results[0]["document_name"] == "test_doc.pdf"
 
+class FakeEmbeddings:
+    """Deterministic bag-of-words embeddings that count calls"""
+
+    def __init__(self, *args, **kwargs):
+        self.document_calls = []
+        self.query_calls = []
+
+    @staticmethod
+    def _vector(text):
+        vector = [0.0] * 64
+        for word in re.findall(r"[a-z]+", text.lower()):
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0
+        return vector
+
+    def embed_documents(self, texts):
+        self.document_calls.append(list(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.query_calls.append(text)
+        return self._vector(text)
+
+
+class TestEnergyRAGSystemInMemory:
+    """Ingestion and search against a local in-memory Qdrant"""
+
+    @pytest.fixture
+    def rag_system(self):
+        with patch('models.rag_system.OpenAIEmbeddings', FakeEmbeddings):
+            yield EnergyRAGSystem(
+                qdrant_url=":memory:",
+                openai_api_key="test_key",
+                collection_name="test_collection",
+                embedding_batch_size=4,
+                upsert_workers=2
+            )
+
+    @pytest.fixture
+    def document(self):
+        topics = ["solar inverter efficiency", "wind turbine rotor maintenance",
+                  "substation transformer protection", "grid frequency regulation"]
+        # One topic per ~700 character section, so each chunk is about one topic
+        return "\n\n".join(f"Section {i}. " + f"{topics[i % 4]}. " * 22 for i in range(20))
+
+    def test_store_embeds_in_bounded_batches(self, rag_system, document):
+        """Chunks are embedded at most embedding_batch_size at a time"""
+        stored = rag_system.process_and_store_document(document, "report.pdf", "technical")
+
+        batches = rag_system.embeddings.document_calls
+        assert stored == sum(len(batch) for batch in batches)
+        assert len(batches) > 1 and max(len(batch) for batch in batches) <= 4
+        assert rag_system.get_document_stats()["total_points"] == stored
+
+    def test_reingest_is_idempotent(self, rag_system, document):
+        """Storing the same document twice overwrites the same points"""
+        metadata = {"document_id": "abc123"}
+        first = rag_system.process_and_store_document(document, "report.pdf", "technical", metadata)
+        second = rag_system.process_and_store_document(document, "report.pdf", "technical", metadata)
+
+        assert first == second
+        assert rag_system.get_document_stats()["total_points"] == first
+
+    def test_batch_search_single_request_and_query_cache(self, rag_system, document):
+        """Batch search embeds misses once and issues one Qdrant request"""
+        rag_system.process_and_store_document(document, "report.pdf", "technical")
+        embeddings = rag_system.embeddings
+        embeddings.document_calls.clear()
+        embeddings.query_calls.clear()
+
+        queries = ["wind turbine rotor", "solar inverter", "wind turbine rotor"]
+        with patch.object(rag_system.qdrant_client, 'query_batch_points',
+                          wraps=rag_system.qdrant_client.query_batch_points) as batch_call:
+            results = rag_system.batch_similarity_search(queries, k=3, score_threshold=0.1)
+
+        batch_call.assert_called_once()
+        assert embeddings.document_calls == [["wind turbine rotor", "solar inverter"]]
+        assert len(results) == 3 and all(results)
+        assert "wind turbine rotor" in results[0][0]["content"]
+        assert "solar inverter" in results[1][0]["content"]
+        assert results[2] == results[0]
+
+        # Repeated queries are served from the embedding cache
+        rag_system.similarity_search("solar inverter", k=3, score_threshold=0.1)
+        rag_system.batch_similarity_search(queries, k=3, score_threshold=0.1)
+        assert embeddings.query_calls == []
+        assert len(embeddings.document_calls) == 1
+
+
 class TestEnergyPDFProcessor:
     """Test suite for EnergyPDFProcessor"""
 
@@ -139,6 +231,113 @@ class TestEnergyPDFProcessor:
             mock_page.close.assert_called_once()
             mock_doc.close.assert_called_once()
 
+    def test_vision_scale_fits_tile_limits(self, mock_pdf_processor):
+        """Pages are rendered no larger than the vision model will use"""
+        processor, _ = mock_pdf_processor
+
+        # US Letter in points: 300 DPI would be 2550x3300
+        scale = processor.vision_scale(612, 792)
+        assert round(612 * scale) <= 768
+        assert round(792 * scale) <= 2048
+
+        # Tiny pages are capped by the configured DPI
+        assert processor.vision_scale(36, 36) == 300 / 72
+
+    @pytest.fixture
+    def scanned_pdf(self):
+        """Two image-only pages, as produced by a scanner"""
+        from PIL import Image, ImageDraw
+
+        scans = []
+        for label in ("Page one", "Page two"):
+            scan = Image.new("RGB", (850, 1100), "white")
+            ImageDraw.Draw(scan).text((100, 100), label, fill="black")
+            scans.append(scan)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = os.path.join(tmp_dir, "scan.pdf")
+            scans[0].save(pdf_path, "PDF", resolution=100, save_all=True, append_images=scans[1:])
+            yield pdf_path
+
+    def test_native_pages_skip_ocr(self, mock_pdf_processor):
+        """Born-digital pages use the text layer, with tables as markdown"""
+        processor, mock_openai = mock_pdf_processor
+        pdf_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_pdfs',
+                                'solar_panel_technical_specifications.pdf')
+
+        pages = list(processor.iter_pages(pdf_path, "technical"))
+
+        assert all(p['source'] == "native" for p in pages)
+        mock_openai.return_value.chat.completions.create.assert_not_called()
+        first_page = next(p for p in pages if p['page_number'] == 1)
+        assert "Solar Panel Technical Specifications" in first_page['text']
+        assert "| Maximum Power (Pmax) | 400 | W | ±3% |" in first_page['text']
+
+    def test_scanned_pages_ocr_from_single_open(self, mock_pdf_processor, scanned_pdf):
+        """Scanned pages are OCR'd from a single open document"""
+        processor, mock_openai = mock_pdf_processor
+
+        with patch('models.pdf_processor.pdfium.PdfDocument',
+                   wraps=pdfium.PdfDocument) as mock_pdf_doc:
+            pages = list(processor.iter_pages(scanned_pdf, "technical"))
+
+        mock_pdf_doc.assert_called_once()
+        assert sorted(p['page_number'] for p in pages) == [1, 2]
+        assert all(p['source'] == "ocr" and p['classification']['reason'] == "scanned" for p in pages)
+        assert all(p['text'] == "Extracted text from PDF" and not p['error'] for p in pages)
+
+        calls = mock_openai.return_value.chat.completions.create.call_args_list
+        assert len(calls) == 2
+        image_url = calls[0].kwargs['messages'][0]['content'][1]['image_url']['url']
+        assert image_url.startswith("data:image/jpeg;base64,")
+
+    def test_ocr_results_cached_by_page_content(self, mock_pdf_processor, scanned_pdf, tmp_path):
+        """Re-processing the same pages is served from the OCR cache"""
+        processor, mock_openai = mock_pdf_processor
+        create = mock_openai.return_value.chat.completions.create
+        processor.ocr_cache = OCRCache(str(tmp_path))
+
+        processor.extract_text_from_pdf(scanned_pdf)
+        assert create.call_count == 2
+        assert len(list(tmp_path.glob("*.md"))) == 2
+
+        # A fresh cache on the same directory, as after a restart
+        processor.ocr_cache = OCRCache(str(tmp_path))
+        pages = processor.extract_text_from_pdf(scanned_pdf)
+        assert create.call_count == 2
+        assert [p['source'] for p in pages.values()] == ["cache", "cache"]
+        assert pages[0]['text'] == "Extracted text from PDF"
+
+    def test_ocr_retries_transient_errors(self, mock_pdf_processor):
+        """Transient API errors are retried before giving up"""
+        processor, mock_openai = mock_pdf_processor
+        create = mock_openai.return_value.chat.completions.create
+        transient = openai.APIConnectionError(request=Mock())
+        create.side_effect = [transient, create.return_value]
+
+        with patch('models.pdf_processor.time.sleep') as mock_sleep:
+            assert processor.ocr_page_with_gpt4o("aGVsbG8=") == "Extracted text from PDF"
+            assert create.call_count == 2
+            mock_sleep.assert_called_once()
+
+            create.side_effect = transient
+            create.reset_mock()
+            result = processor.ocr_page_with_gpt4o("aGVsbG8=")
+            assert result.startswith("Error processing page:")
+            assert create.call_count == processor.max_retries + 1
+
+    def test_ocr_none_content_is_empty_text(self, mock_pdf_processor, scanned_pdf, tmp_path):
+        """A response without content yields empty page text, not an exception"""
+        processor, mock_openai = mock_pdf_processor
+        create = mock_openai.return_value.chat.completions.create
+        create.return_value.choices[0].message.content = None
+        processor.ocr_cache = OCRCache(str(tmp_path))
+
+        assert processor.ocr_page_with_gpt4o("aGVsbG8=") == ""
+
+        pages = list(processor.iter_pages(scanned_pdf, "technical"))
+        assert all(p['text'] == "" and not p['error'] for p in pages)
+
 def test_configuration():
     """Test configuration loading"""
     assert settings.app_name is not None